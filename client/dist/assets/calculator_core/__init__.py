@@ -0,0 +1,164 @@
+"""
+Calculator Core
+UI-free calculation functions behind the financial calculator pages
+
+The Streamlit pages wrap these functions (adding st.cache_data and the
+widgets); API handlers and batch jobs import them directly without loading
+Streamlit, Plotly or pandas. Importing the package must stay cheap, so the
+modules imported here depend on the standard library only. The NumPy
+array engines load on first attribute access; `python -m
+calculator_core.benchmarks` checks the import time against its budget.
+"""
+
+import importlib
+
+from .deposits import (
+    calculate_fd,
+    calculate_rd,
+    calculate_yes_bank_fd,
+    calculate_kotak_fd,
+    calculate_axis_fd,
+    calculate_icici_fd,
+    calculate_hdfc_fd,
+    calculate_sbi_fd,
+    calculate_post_office_fd,
+    calculate_post_office_rd,
+    calculate_post_office_mis,
+)
+from .fd_engine import (
+    RATE_CARD_VERSION,
+    RATE_CARDS,
+    PAYOUT_FREQUENCIES,
+    RateCard,
+    GrowthDetails,
+    fd_returns,
+    calculate_bank_fd,
+    compare_banks,
+)
+from .insurance import calculate_term_insurance
+from .interest import (
+    calculate_compound_interest,
+    calculate_simple_interest,
+    calculate_cagr,
+    calculate_inflation_effect,
+    calculate_discount,
+    calculate_gst,
+)
+from .investments import (
+    calculate_sip_returns,
+    calculate_swp_returns,
+    calculate_stp_returns,
+    calculate_mutual_fund_comparison,
+    calculate_retirement_needs,
+    calculate_stock_average,
+    calculate_brokerage,
+)
+from .loans import calculate_loan_emi, calculate_credit_card_emi
+from .prepayment import (
+    REDUCE_EMI,
+    REDUCE_TENURE,
+    Prepayment,
+    RateReset,
+    EmiStepUp,
+    Moratorium,
+    simulate_loan,
+    balance_path,
+    compare_strategies,
+)
+from .salary import calculate_salary_details, calculate_hra_exemption, calculate_gratuity
+from .schemes import (
+    calculate_ppf,
+    calculate_post_office_ppf,
+    calculate_nps,
+    calculate_apy,
+    calculate_ssy_returns,
+)
+
+# Array engines (which import NumPy) and the page registry load on first use (see __getattr__)
+_LAZY_EXPORTS = {
+    "batch_emi": "amortization",
+    "batch_amortization": "amortization",
+    "AmortizationBatch": "amortization",
+    "fd_grid": "fd_compare",
+    "rank_fd_offers": "fd_compare",
+    "project_corpus": "monte_carlo",
+    "goal_seek": "goal_seek",
+    "register_solvable": "goal_seek",
+    "Solvable": "goal_seek",
+    "xirr": "xirr_engine",
+    "xirr_batch": "xirr_engine",
+    "irr": "xirr_engine",
+    "year_fractions": "xirr_engine",
+    "sweep": "sweep",
+    "register_kernel": "sweep",
+    "CATEGORIES": "registry",
+    "CALCULATORS": "registry",
+    "Calculator": "registry",
+    "get_calculator": "registry",
+    "calculator_metadata": "registry",
+}
+
+__all__ = [
+    "calculate_fd",
+    "calculate_rd",
+    "calculate_yes_bank_fd",
+    "calculate_kotak_fd",
+    "calculate_axis_fd",
+    "calculate_icici_fd",
+    "calculate_hdfc_fd",
+    "calculate_sbi_fd",
+    "calculate_post_office_fd",
+    "calculate_post_office_rd",
+    "calculate_post_office_mis",
+    "RATE_CARD_VERSION",
+    "RATE_CARDS",
+    "PAYOUT_FREQUENCIES",
+    "RateCard",
+    "GrowthDetails",
+    "fd_returns",
+    "calculate_bank_fd",
+    "compare_banks",
+    "calculate_term_insurance",
+    "calculate_compound_interest",
+    "calculate_simple_interest",
+    "calculate_cagr",
+    "calculate_inflation_effect",
+    "calculate_discount",
+    "calculate_gst",
+    "calculate_sip_returns",
+    "calculate_swp_returns",
+    "calculate_stp_returns",
+    "calculate_mutual_fund_comparison",
+    "calculate_retirement_needs",
+    "calculate_stock_average",
+    "calculate_brokerage",
+    "calculate_loan_emi",
+    "calculate_credit_card_emi",
+    "REDUCE_EMI",
+    "REDUCE_TENURE",
+    "Prepayment",
+    "RateReset",
+    "EmiStepUp",
+    "Moratorium",
+    "simulate_loan",
+    "balance_path",
+    "compare_strategies",
+    "calculate_salary_details",
+    "calculate_hra_exemption",
+    "calculate_gratuity",
+    "calculate_ppf",
+    "calculate_post_office_ppf",
+    "calculate_nps",
+    "calculate_apy",
+    "calculate_ssy_returns",
+    *_LAZY_EXPORTS,
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
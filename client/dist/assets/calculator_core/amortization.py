@@ -0,0 +1,129 @@
+"""
+Amortization
+Closed-form EMIs and amortization schedules for many loan scenarios at once
+
+calculate_loan_emi walks a schedule month by month for one loan. Here every
+scenario (principal, rate, tenure) is a row and every month a column: the
+outstanding balance after k payments has the closed form
+
+    B_k = P * g**k - EMI * (g**k - 1) / r,    g = 1 + r
+
+so whole schedules are array expressions instead of Python loops. Months past
+a scenario's tenure are zero. Rows agree with calculate_loan_emi to floating
+point rounding.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+def _as_scenarios(principals, annual_rates, tenures_months):
+    """Broadcast inputs to equal-length 1-D arrays (monthly rate as a fraction)"""
+    principal, rate, tenure = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principals, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rates, dtype=float)),
+        np.atleast_1d(np.asarray(tenures_months)),
+    )
+    if np.any(tenure < 1) or np.any(tenure != np.round(tenure)):
+        raise ValueError("Tenures must be whole months of at least 1")
+    return principal.ravel(), rate.ravel() / (12 * 100), tenure.ravel().astype(np.int64)
+
+
+def _emi(principal: np.ndarray, monthly_rate: np.ndarray, tenure: np.ndarray) -> np.ndarray:
+    growth = (1 + monthly_rate) ** tenure
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = principal * monthly_rate * growth / (growth - 1)
+    # Interest-free loans repay in equal parts
+    return np.where(monthly_rate == 0, principal / tenure, emi)
+
+
+def batch_emi(principals, annual_rates, tenures_months) -> np.ndarray:
+    """
+    EMIs of many loans in closed form
+
+    Args:
+        principals: Loan amounts (scalar or array)
+        annual_rates: Annual interest rates in percent (scalar or array)
+        tenures_months: Tenures in months (scalar or array)
+
+    Returns:
+        1-D array of EMIs, one per broadcast scenario
+    """
+    return _emi(*_as_scenarios(principals, annual_rates, tenures_months))
+
+
+@dataclass
+class AmortizationBatch:
+    """Schedules of a batch of loans; 2-D arrays are scenario x month (month 1 in column 0)"""
+    loan_amount: np.ndarray
+    monthly_rate: np.ndarray
+    tenure_months: np.ndarray
+    emi: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+
+    @property
+    def total_interest(self) -> np.ndarray:
+        return self.interest.sum(axis=1)
+
+    @property
+    def total_payment(self) -> np.ndarray:
+        return self.loan_amount + self.total_interest
+
+    def schedule(self, scenario: int) -> List[Dict[str, Any]]:
+        """One scenario's schedule as the list of dicts calculate_loan_emi returns"""
+        months = int(self.tenure_months[scenario])
+        emi = float(self.emi[scenario])
+        return [
+            {'month': month + 1, 'emi': emi, 'principal': principal, 'interest': interest, 'balance': balance}
+            for month, (principal, interest, balance) in enumerate(zip(
+                self.principal[scenario, :months].tolist(),
+                self.interest[scenario, :months].tolist(),
+                self.balance[scenario, :months].tolist()
+            ))
+        ]
+
+
+def batch_amortization(principals, annual_rates, tenures_months) -> AmortizationBatch:
+    """
+    Full amortization schedules of many loans as scenario x month arrays
+
+    Memory is three float arrays of scenarios x longest tenure, e.g. about
+    26 MB for 3,000 thirty-year loans.
+
+    Args:
+        principals: Loan amounts (scalar or array)
+        annual_rates: Annual interest rates in percent (scalar or array)
+        tenures_months: Tenures in months (scalar or array)
+
+    Returns:
+        AmortizationBatch with EMIs and per-month principal, interest and balance
+    """
+    principal, monthly_rate, tenure = _as_scenarios(principals, annual_rates, tenures_months)
+    emi = _emi(principal, monthly_rate, tenure)
+
+    months = np.arange(tenure.max() + 1)
+    rate = monthly_rate[:, None]
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        paid_factor = np.where(rate == 0, months, (growth - 1) / rate)
+    # Balance after k payments, k = 0..max tenure
+    balance = principal[:, None] * growth - emi[:, None] * paid_factor
+
+    active = months[1:] <= tenure[:, None]
+    interest = np.where(active, balance[:, :-1] * rate, 0.0)
+    principal_paid = np.where(active, emi[:, None] - interest, 0.0)
+    closing = np.where(active, np.maximum(balance[:, 1:], 0.0), 0.0)
+
+    return AmortizationBatch(
+        loan_amount=principal,
+        monthly_rate=monthly_rate,
+        tenure_months=tenure,
+        emi=emi,
+        principal=principal_paid,
+        interest=interest,
+        balance=closing,
+    )
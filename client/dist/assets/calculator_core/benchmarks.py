@@ -0,0 +1,180 @@
+"""
+Benchmarks
+Timing budgets of the calculator core, run with `python -m calculator_core.benchmarks`
+
+Each benchmark returns its measured time and budget in milliseconds; the
+command prints one line per benchmark and exits non-zero if any is over budget.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+# Median cold import of the package in a fresh interpreter
+IMPORT_BUDGET_MS = 25.0
+IMPORT_RUNS = 7
+# Heavy modules the package must not load at import time
+FORBIDDEN_IMPORTS = ("streamlit", "plotly", "pandas", "numpy")
+# Full schedules of a batch of loans with random amounts, rates and 1-30 year tenures
+AMORTIZATION_SCENARIOS = 5000
+AMORTIZATION_BUDGET_MS = 150.0
+# Top offers across every bank, default tenure and payout, with the rate grid cached
+FD_RANKING_BUDGET_MS = 10.0
+# Percentile bands and goal probability of a 40-year SIP over the default number of paths
+MONTE_CARLO_BUDGET_MS = 200.0
+# Required SIP return for a grid of targets and horizons (solved numerically)
+GOAL_SEEK_TARGETS = 10000
+GOAL_SEEK_BUDGET_MS = 50.0
+# XIRR of a batch of 10-year monthly SIPs with skipped instalments
+XIRR_SERIES = 5000
+XIRR_BUDGET_MS = 100.0
+# 30-year loan with monthly prepayments, an EMI step-up and rate resets, events given as a generator
+LOAN_SIMULATION_BUDGET_MS = 10.0
+# 50 x 50 sensitivity surfaces: loan EMI (closed form) and SWP final corpus (loop kernel, 1-50 years)
+SWEEP_GRID = 50
+SWEEP_BUDGET_MS = 25.0
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import calculator_core
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def bench_import() -> Tuple[float, float]:
+    """Median import time of calculator_core in fresh interpreters"""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(IMPORT_RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE % (FORBIDDEN_IMPORTS,)],
+            cwd=package_root, capture_output=True, text=True, check=True
+        ).stdout
+        probe = json.loads(output)
+        if probe["loaded"]:
+            raise AssertionError(f"calculator_core imports {', '.join(probe['loaded'])}")
+        timings.append(probe["ms"])
+    return statistics.median(timings), IMPORT_BUDGET_MS
+
+
+def _best_of(function: Callable[[], object], runs: int = 5) -> float:
+    """Fastest of several warm runs, in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def bench_batch_amortization() -> Tuple[float, float]:
+    import numpy as np
+    from .amortization import batch_amortization
+
+    rng = np.random.default_rng(42)
+    principals = rng.uniform(1e5, 1e7, AMORTIZATION_SCENARIOS)
+    rates = rng.uniform(6.0, 16.0, AMORTIZATION_SCENARIOS)
+    tenures = rng.integers(12, 361, AMORTIZATION_SCENARIOS)
+    return _best_of(lambda: batch_amortization(principals, rates, tenures)), AMORTIZATION_BUDGET_MS
+
+
+def bench_fd_ranking() -> Tuple[float, float]:
+    from .fd_compare import rank_fd_offers
+
+    return _best_of(lambda: rank_fd_offers(500000, tax_rate=30, senior_citizen=True)), FD_RANKING_BUDGET_MS
+
+
+def bench_monte_carlo() -> Tuple[float, float]:
+    from .investments import calculate_sip_returns
+    from .monte_carlo import project_corpus
+
+    # With monthly compounding the fixed-return line is the SIP calculator's own result
+    fixed = project_corpus(0, 10000, 15, 12, 0, compounding="monthly", paths=1)['deterministic'][-1]
+    if abs(fixed - calculate_sip_returns(10000, 12, 15)[0]) > 1e-6 * fixed:
+        raise AssertionError("project_corpus disagrees with calculate_sip_returns under monthly compounding")
+    return _best_of(lambda: project_corpus(100000, 10000, 40, goal=5e7, inflation_rate=6, seed=7)), MONTE_CARLO_BUDGET_MS
+
+
+def bench_goal_seek() -> Tuple[float, float]:
+    import numpy as np
+    from .goal_seek import goal_seek
+
+    targets = np.linspace(1e6, 5e7, GOAL_SEEK_TARGETS)
+    horizons = np.arange(GOAL_SEEK_TARGETS) % 30 + 5
+    return _best_of(lambda: goal_seek("calculate_sip_returns", "expected_return", targets,
+                                      monthly_investment=10000, time_period=horizons)), GOAL_SEEK_BUDGET_MS
+
+
+def bench_xirr_batch() -> Tuple[float, float]:
+    import numpy as np
+    from .xirr_engine import xirr_batch
+
+    rng = np.random.default_rng(11)
+    flows = np.zeros((XIRR_SERIES, 121))
+    flows[:, :-1] = -rng.uniform(1000, 10000, (XIRR_SERIES, 120)) * (rng.random((XIRR_SERIES, 120)) < 0.8)
+    flows[:, -1] = -flows[:, :-1].sum(axis=1) * rng.uniform(0.3, 3.0, XIRR_SERIES)
+
+    # Flows that all fall on one date have no rate, even when they net to zero
+    if not np.isnan(xirr_batch([[-100, 100], [-100, 110]], [[0, 0], [0, 0]])).all():
+        raise AssertionError("xirr_batch solves a series whose flows all fall on one date")
+    return _best_of(lambda: xirr_batch(flows, np.arange(121) / 12)), XIRR_BUDGET_MS
+
+
+def bench_loan_simulation() -> Tuple[float, float]:
+    from .prepayment import EmiStepUp, Prepayment, RateReset, simulate_loan
+
+    def events():
+        yield Prepayment(month=12, amount=20000, every=1)
+        yield EmiStepUp(month=24, percent=5, every=12)
+        yield RateReset(month=60, annual_rate=8.0)
+        yield RateReset(month=120, annual_rate=9.5)
+
+    # Events may be any iterable; a generator must give the same schedule as a list
+    if simulate_loan(5e6, 9.0, 360, events()) != simulate_loan(5e6, 9.0, 360, list(events())):
+        raise AssertionError("simulate_loan gives a different schedule for generator events")
+    return _best_of(lambda: simulate_loan(5e6, 9.0, 360, events())), LOAN_SIMULATION_BUDGET_MS
+
+
+def bench_sweep() -> Tuple[float, float]:
+    import numpy as np
+    from .sweep import sweep
+
+    def run():
+        sweep("calculate_loan_emi", "interest_rate", np.linspace(6, 16, SWEEP_GRID),
+              "tenure_months", np.linspace(12, 360, SWEEP_GRID).round(), principal=5e6)
+        sweep("calculate_swp_returns", "withdrawal_rate", np.linspace(1, 20, SWEEP_GRID),
+              "time_period", np.arange(1, SWEEP_GRID + 1), corpus=1e7, expected_return=10)
+
+    return _best_of(run), SWEEP_BUDGET_MS
+
+
+BENCHMARKS: Dict[str, Callable[[], Tuple[float, float]]] = {
+    "import": bench_import,
+    "batch_amortization": bench_batch_amortization,
+    "fd_ranking": bench_fd_ranking,
+    "monte_carlo": bench_monte_carlo,
+    "goal_seek": bench_goal_seek,
+    "xirr_batch": bench_xirr_batch,
+    "loan_simulation": bench_loan_simulation,
+    "sweep": bench_sweep,
+}
+
+
+def main() -> int:
+    failed = 0
+    for name, benchmark in BENCHMARKS.items():
+        measured, budget = benchmark()
+        status = "ok" if measured <= budget else "OVER BUDGET"
+        failed += measured > budget
+        print(f"{name:<24} {measured:8.2f} ms  (budget {budget:.0f} ms)  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
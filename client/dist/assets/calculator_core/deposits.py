@@ -0,0 +1,367 @@
+"""
+Deposits
+Fixed and recurring deposits: generic, per-bank and Post Office schemes
+"""
+
+from .fd_engine import RATE_CARDS, fd_returns
+
+
+def _tax_saving_benefit(principal):
+    """80C deduction value of a tax-saving FD, assuming the 30% bracket"""
+    return min(principal, 150000) * 0.3
+
+
+def _nre_tax_benefit(interest_earned):
+    """Tax not paid on NRE deposit interest, assuming the 30% bracket"""
+    return interest_earned * 0.3
+
+def calculate_fd(principal, interest_rate, tenure_years, compounding_frequency=4):
+    """Calculate Fixed Deposit returns"""
+    # Compounding frequency: 1=annual, 4=quarterly, 12=monthly
+    periods = tenure_years * compounding_frequency
+    rate_per_period = interest_rate / (100 * compounding_frequency)
+    
+    maturity_amount = principal * ((1 + rate_per_period) ** periods)
+    interest_earned = maturity_amount - principal
+    
+    return maturity_amount, interest_earned
+
+
+def calculate_rd(monthly_investment, interest_rate, tenure_months, compounding_frequency=4):
+    """Calculate Recurring Deposit returns"""
+    # Formula for RD: P * n * (1 + r/q)^(nq) - 1 / (1 + r/q)^(1/q) - 1
+    # Where P = monthly installment, n = tenure in months, r = rate/100, q = compounding frequency
+    
+    r = interest_rate / 100
+    q = compounding_frequency
+    n = tenure_months / 12  # Convert months to years
+    
+    # For quarterly compounding in RD
+    maturity_amount = monthly_investment * tenure_months * (1 + r/q)**(n*q)
+    
+    total_investment = monthly_investment * tenure_months
+    interest_earned = maturity_amount - total_investment
+    
+    return maturity_amount, interest_earned, total_investment
+
+
+def calculate_yes_bank_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, yes_premia=False, yes_first=False):
+    """
+    Calculate Yes Bank Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 10000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
+        yes_premia: Whether the investor is a Yes Premia customer (gets 0.1% additional interest)
+        yes_first: Whether the investor is a Yes First customer (gets 0.25% additional interest)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
+    """
+    effective_rate = RATE_CARDS["yes"].effective_rate(interest_rate, senior_citizen=senior_citizen, yes_first=yes_first, yes_premia=yes_premia)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    nre_tax_benefit = _nre_tax_benefit(interest_earned) if nre_account else None
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit
+
+
+def calculate_kotak_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, digital_fd=False):
+    """
+    Calculate Kotak Mahindra Bank Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 5000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
+        digital_fd: Whether the FD is booked through digital channels (gets 0.1% additional interest)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
+    """
+    effective_rate = RATE_CARDS["kotak"].effective_rate(interest_rate, senior_citizen=senior_citizen, digital_fd=digital_fd)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    nre_tax_benefit = _nre_tax_benefit(interest_earned) if nre_account else None
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit
+
+
+def calculate_axis_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, woman_depositor=False, staff_special_rate=False):
+    """
+    Calculate Axis Bank Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 5000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
+        woman_depositor: Whether the depositor is a woman (gets 0.1% additional interest in some schemes)
+        staff_special_rate: Whether the depositor is a staff member (gets 1% additional interest)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
+    """
+    effective_rate = RATE_CARDS["axis"].effective_rate(interest_rate, senior_citizen=senior_citizen, woman_depositor=woman_depositor, staff=staff_special_rate)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    nre_tax_benefit = _nre_tax_benefit(interest_earned) if nre_account else None
+    
+    # Calculate loyalty bonus if applicable (for renewals)
+    loyalty_bonus = 0
+    loyalty_bonus_text = ""
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit, loyalty_bonus, loyalty_bonus_text
+
+
+def calculate_icici_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False):
+    """
+    Calculate ICICI Bank Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 10000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
+    """
+    effective_rate = RATE_CARDS["icici"].effective_rate(interest_rate, senior_citizen=senior_citizen)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    nre_tax_benefit = _nre_tax_benefit(interest_earned) if nre_account else None
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit
+
+
+def calculate_hdfc_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, super_senior=False):
+    """
+    Calculate HDFC Bank Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 5000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        super_senior: Whether the investor is a super senior citizen (80+ years, gets 0.75% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
+    """
+    effective_rate = RATE_CARDS["hdfc"].effective_rate(interest_rate, senior_citizen=senior_citizen, super_senior=super_senior)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings
+
+
+def calculate_sbi_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False):
+    """
+    Calculate SBI Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested (Min: 1000)
+        interest_rate: Annual interest rate (%)
+        tenure_days: Tenure in days
+        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
+    """
+    effective_rate = RATE_CARDS["sbi"].effective_rate(interest_rate, senior_citizen=senior_citizen)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    tax_savings = _tax_saving_benefit(principal) if tax_saving else None
+    
+    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings
+
+
+def calculate_post_office_fd(principal, interest_rate, tenure_years, senior_citizen=False):
+    """
+    Calculate Post Office Fixed Deposit returns
+    
+    Args:
+        principal: Principal amount invested
+        interest_rate: Annual interest rate (%)
+        tenure_years: Tenure in years (1, 2, 3, or 5 years)
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        
+    Returns:
+        Tuple containing (maturity_amount, interest_earned, effective_rate, quarterly_interest)
+    """
+    # Post Office FD has interest compounded quarterly but paid annually
+    compounding_frequency = 4  # Quarterly compounding
+    
+    # Apply senior citizen additional interest if applicable
+    effective_rate = interest_rate
+    if senior_citizen:
+        effective_rate += 0.5  # 0.5% additional for senior citizens
+    
+    # Periods for quarterly compounding
+    periods = tenure_years * compounding_frequency
+    rate_per_period = effective_rate / (100 * compounding_frequency)
+    
+    # Calculate maturity amount
+    maturity_amount = principal * ((1 + rate_per_period) ** periods)
+    interest_earned = maturity_amount - principal
+    
+    # Calculate quarterly interest (for quarterly payout option)
+    quarterly_interest = principal * (effective_rate / 400)  # Principal * (rate/4)/100
+    
+    # Generate growth details
+    growth_details = []
+    current_value = principal
+    
+    for quarter in range(1, periods + 1):
+        opening_balance = current_value
+        interest = opening_balance * rate_per_period
+        current_value = opening_balance + interest
+        
+        growth_details.append({
+            'quarter': quarter,
+            'opening_balance': opening_balance,
+            'interest': interest,
+            'closing_balance': current_value
+        })
+    
+    return maturity_amount, interest_earned, effective_rate, quarterly_interest, growth_details
+
+
+def calculate_post_office_rd(monthly_investment, interest_rate, tenure_months, senior_citizen=False):
+    """
+    Calculate Post Office Recurring Deposit (RD) returns
+    
+    Args:
+        monthly_investment: Monthly investment amount (Min: 100)
+        interest_rate: Annual interest rate (%)
+        tenure_months: Tenure in months (must be in multiples of 12, between 12 and 120)
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        
+    Returns:
+        Tuple containing (maturity_amount, total_investment, interest_earned, effective_rate, monthly_details)
+    """
+    # Apply senior citizen additional interest if applicable
+    effective_rate = interest_rate
+    if senior_citizen:
+        effective_rate += 0.5  # 0.5% additional for senior citizens
+    
+    # Convert annual rate to monthly
+    monthly_rate = effective_rate / (12 * 100)
+    
+    # Initialize tracking variables
+    total_investment = 0
+    monthly_details = []
+    current_value = 0
+    
+    # Calculate month by month growth
+    for month in range(1, tenure_months + 1):
+        # Add this month's deposit
+        total_investment += monthly_investment
+        
+        # Calculate opening balance (previous month's closing balance)
+        opening_balance = current_value
+        
+        # Add monthly deposit
+        balance_after_deposit = opening_balance + monthly_investment
+        
+        # Calculate interest for the month
+        # In Post Office RD, interest is calculated on end-of-month balance
+        # For each completed month
+        if month > 1:
+            interest = opening_balance * monthly_rate
+        else:
+            interest = 0  # No interest in first month on the first deposit
+        
+        # Update current value
+        current_value = balance_after_deposit + interest
+        
+        # Store monthly details
+        monthly_details.append({
+            'month': month,
+            'opening_balance': opening_balance,
+            'deposit': monthly_investment,
+            'interest': interest,
+            'closing_balance': current_value
+        })
+    
+    maturity_amount = current_value
+    interest_earned = maturity_amount - total_investment
+    
+    return maturity_amount, total_investment, interest_earned, effective_rate, monthly_details
+
+
+def calculate_post_office_mis(principal, interest_rate, tenure_years=5, senior_citizen=False):
+    """
+    Calculate Post Office Monthly Income Scheme (MIS) returns
+    
+    Args:
+        principal: Principal amount invested (Min: 1000, Max: 4.5 lakhs for single, 9 lakhs for joint account)
+        interest_rate: Annual interest rate (%)
+        tenure_years: Tenure in years (fixed at 5 years for Post Office MIS)
+        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
+        
+    Returns:
+        Tuple containing (monthly_income, total_income, maturity_amount, effective_rate, monthly_details)
+    """
+    # Apply senior citizen additional interest if applicable
+    effective_rate = interest_rate
+    if senior_citizen:
+        effective_rate += 0.5  # 0.5% additional for senior citizens
+    
+    # Calculate monthly income (principal * annual rate / 12)
+    monthly_income = principal * (effective_rate / 100) / 12
+    
+    # Calculate total income over the tenure
+    total_months = tenure_years * 12
+    total_income = monthly_income * total_months
+    
+    # Maturity amount equals principal (no compound interest, just monthly payouts)
+    maturity_amount = principal
+    
+    # Generate monthly details
+    monthly_details = []
+    for month in range(1, total_months + 1):
+        year = (month - 1) // 12 + 1
+        month_in_year = (month - 1) % 12 + 1
+        
+        monthly_details.append({
+            'month': month,
+            'year': year,
+            'month_in_year': month_in_year,
+            'monthly_income': monthly_income,
+            'cumulative_income': monthly_income * month,
+            'principal_balance': principal  # Constant throughout
+        })
+    
+    return monthly_income, total_income, maturity_amount, effective_rate, monthly_details
@@ -0,0 +1,182 @@
+"""
+FD Compare
+Every bank x tenure x payout option of a deposit, ranked by post-tax yield
+
+The grid of all-in rates and growth factors depends only on the rate cards,
+the tenures and the depositor profile, not on the amount or the tax bracket,
+so it is built once per RATE_CARD_VERSION and reused: a repeat comparison
+only scales the cached factors by the principal and applies the tax rate.
+Ranking takes the top K with a partial sort instead of sorting the grid.
+
+Yields are annualised and comparable across payout options: interest paid
+at maturity compounds in the deposit, while periodic payouts are assumed to
+be reinvested at the same post-tax rate.
+
+Run `python -m calculator_core.fd_compare <principal> <min_days> <max_days>
+[tax_rate%] [flag ...]` for the ranking as JSON.
+"""
+
+import json
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .fd_engine import PAYOUT_FREQUENCIES, PROFILE_FLAGS, RATE_CARD_VERSION, RATE_CARDS
+
+# Tenures compared when none are given: monthly steps from 3 months to 10 years
+DEFAULT_TENURES = tuple(range(90, 3651, 30))
+# Cached rate grids (one per version, bank set, tenure set and profile)
+GRID_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def _rate_grid(version: str, banks: Tuple[str, ...], tenures: Tuple[int, ...], payouts: Tuple[str, ...],
+               profile: Tuple[Tuple[str, bool], ...]) -> Dict[str, np.ndarray]:
+    """
+    All-in rates and per-rupee growth of every bank x tenure x payout cell
+
+    `version` only keys the cache: a new rate-card version gets a new grid.
+    Cells a bank's card does not cover hold NaN.
+    """
+    flags = dict(profile)
+    rates = np.full((len(banks), len(tenures)), np.nan)
+    for i, bank in enumerate(banks):
+        card = RATE_CARDS[bank]
+        for j, days in enumerate(tenures):
+            slab = card.slab_for(days)
+            if slab is not None:
+                rates[i, j] = card.effective_rate(slab[2], **flags)
+
+    years = np.asarray(tenures, dtype=float) / 365.25
+    frequency = np.array([PAYOUT_FREQUENCIES[payout] for payout in payouts], dtype=float)
+    at_maturity = np.array([payout == "At Maturity" for payout in payouts])
+
+    rate = rates[:, :, None] / 100
+    compound = (1 + rate) ** years[None, :, None] - 1
+    simple = rate * years[None, :, None]
+    # Interest per rupee: compounded annually at maturity, simple interest for payouts
+    interest_factor = np.where(at_maturity[None, None, :], compound, simple)
+    return {
+        'rates': rates,
+        'years': years,
+        'frequency': frequency,
+        'at_maturity': at_maturity,
+        'interest_factor': interest_factor
+    }
+
+
+def fd_grid(principal: float, tenures: Optional[Iterable[int]] = None, payouts: Optional[Iterable[str]] = None,
+            banks: Optional[Iterable[str]] = None, tax_rate: float = 0.0, **profile: bool) -> Dict[str, Any]:
+    """
+    Evaluate a deposit at every bank, tenure and payout option at once
+
+    Args:
+        principal: Amount deposited
+        tenures: Tenures in days (default DEFAULT_TENURES)
+        payouts: Payout options (default all of PAYOUT_FREQUENCIES)
+        banks: Keys of RATE_CARDS (default every card with slabs)
+        tax_rate: Income tax rate on interest (%)
+        **profile: Depositor flags (see fd_engine.PROFILE_FLAGS)
+
+    Returns:
+        Dictionary with the banks, tenures and payouts axes and bank x tenure x
+        payout arrays effective_rate, maturity_amount, interest_earned,
+        post_tax_interest and post_tax_yield (NaN where a bank has no rate or
+        the principal is below its minimum deposit)
+    """
+    unknown = set(profile) - set(PROFILE_FLAGS)
+    if unknown:
+        raise TypeError(f"Unknown depositor flags: {', '.join(sorted(unknown))}")
+    banks = tuple(banks or (bank for bank, card in RATE_CARDS.items() if card.slabs))
+    tenures = tuple(int(days) for days in (tenures if tenures is not None else DEFAULT_TENURES))
+    payouts = tuple(payouts or PAYOUT_FREQUENCIES)
+    profile_key = tuple(sorted((flag, bool(value)) for flag, value in profile.items()))
+    grid = _rate_grid(RATE_CARD_VERSION, banks, tenures, payouts, profile_key)
+
+    eligible = np.array([principal >= RATE_CARDS[bank].min_deposit for bank in banks])
+    interest_factor = np.where(eligible[:, None, None], grid['interest_factor'], np.nan)
+    interest = principal * interest_factor
+    post_tax_interest = interest * (1 - tax_rate / 100)
+
+    missing = np.isnan(interest)
+    at_maturity = grid['at_maturity'][None, None, :]
+    years = grid['years'][None, :, None]
+    post_tax_rate = grid['rates'][:, :, None] / 100 * (1 - tax_rate / 100)
+    frequency = grid['frequency'][None, None, :]
+    with np.errstate(invalid="ignore"):
+        grown = (1 + post_tax_interest / principal) ** (1 / years) - 1
+        reinvested = (1 + post_tax_rate / frequency) ** frequency - 1
+    post_tax_yield = np.where(missing, np.nan, np.where(at_maturity, grown, reinvested))
+
+    return {
+        'banks': banks,
+        'tenures': tenures,
+        'payouts': payouts,
+        'effective_rate': np.where(missing, np.nan, grid['rates'][:, :, None]),
+        # Periodic payouts return the principal at maturity
+        'maturity_amount': np.where(missing, np.nan, np.where(at_maturity, principal + interest, principal)),
+        'interest_earned': interest,
+        'post_tax_interest': post_tax_interest,
+        'post_tax_yield': post_tax_yield * 100
+    }
+
+
+def rank_fd_offers(principal: float, tenures: Optional[Iterable[int]] = None, payouts: Optional[Iterable[str]] = None,
+                   banks: Optional[Iterable[str]] = None, tax_rate: float = 0.0, top_k: int = 10,
+                   **profile: bool) -> List[Dict[str, Any]]:
+    """
+    Best `top_k` bank, tenure and payout combinations by post-tax yield
+
+    Args:
+        principal, tenures, payouts, banks, tax_rate, **profile: As for fd_grid
+        top_k: Number of offers returned
+
+    Returns:
+        List of dictionaries (bank, tenure_days, payout_frequency, effective_rate,
+        maturity_amount, interest_earned, post_tax_interest, post_tax_yield), best first
+    """
+    grid = fd_grid(principal, tenures, payouts, banks, tax_rate, **profile)
+    yields = np.nan_to_num(grid['post_tax_yield'].ravel(), nan=-np.inf)
+    available = int(np.isfinite(yields).sum())
+    k = min(top_k, available)
+    if k <= 0:
+        return []
+
+    best = np.argpartition(-yields, k - 1)[:k]
+    # Ties go to the bank, then tenure and payout, listed first
+    best = best[np.lexsort((best, -yields[best]))]
+    shape = grid['post_tax_yield'].shape
+    offers = []
+    for flat in best:
+        i, j, p = np.unravel_index(flat, shape)
+        offers.append({
+            'bank': RATE_CARDS[grid['banks'][i]].name,
+            'tenure_days': grid['tenures'][j],
+            'payout_frequency': grid['payouts'][p],
+            'effective_rate': float(grid['effective_rate'][i, j, p]),
+            'maturity_amount': float(grid['maturity_amount'][i, j, p]),
+            'interest_earned': float(grid['interest_earned'][i, j, p]),
+            'post_tax_interest': float(grid['post_tax_interest'][i, j, p]),
+            'post_tax_yield': float(grid['post_tax_yield'][i, j, p])
+        })
+    return offers
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 3:
+        print("Usage: python -m calculator_core.fd_compare <principal> <min_days> <max_days> [tax_rate%] "
+              f"[{'|'.join(PROFILE_FLAGS)} ...]", file=sys.stderr)
+        return 2
+    principal, first, last = float(argv[0]), int(argv[1]), int(argv[2])
+    rest = argv[3:]
+    tax_rate = float(rest.pop(0)) if rest and rest[0].replace(".", "", 1).isdigit() else 0.0
+    tenures = range(first, last + 1, max(1, (last - first) // 120 or 1))
+    offers = rank_fd_offers(principal, tenures, tax_rate=tax_rate, **{flag: True for flag in rest})
+    print(json.dumps({"rateCardVersion": RATE_CARD_VERSION, "offers": offers}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
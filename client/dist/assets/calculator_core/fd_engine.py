@@ -0,0 +1,330 @@
+"""
+FD Engine
+One fixed deposit engine for every bank, driven by rate cards
+
+A rate card holds a bank's tenure slabs (sorted, non-overlapping day ranges)
+and its category bonuses. Looking up the rate of a tenure is a binary search
+over the slab starts, so it costs O(log n) however detailed the card is. The
+per-bank calculate_*_fd functions are thin wrappers over fd_returns, and
+compare_banks computes maturities for every card in one array expression.
+
+Per-period growth tables are only built when they are read (GrowthDetails),
+so rankings and comparisons never pay for them.
+"""
+
+import bisect
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Version of the rate tables below; caches of derived results key on it
+RATE_CARD_VERSION = "2025-04"
+
+# Interest payout options and their compounding (or payout) periods per year
+PAYOUT_FREQUENCIES = {
+    "At Maturity": 1,  # Annual compounding for maturity payout
+    "Yearly": 1,
+    "Half-Yearly": 2,
+    "Quarterly": 4,
+    "Monthly": 12
+}
+
+# Depositor categories a rate card may reward
+PROFILE_FLAGS = ("senior_citizen", "super_senior", "woman_depositor", "digital_fd", "staff", "yes_first", "yes_premia")
+
+
+class RateCard:
+    """Tenure slabs and category bonuses of one bank"""
+
+    def __init__(self, bank: str, name: str, slabs: Iterable[Tuple[int, int, float]],
+                 bonuses: Optional[Dict[str, float]] = None, min_deposit: float = 1000,
+                 tiers: Tuple[str, ...] = ()):
+        """
+        Args:
+            bank: Short key of the bank
+            name: Display name
+            slabs: (first day, last day, annual rate %) of each tenure band
+            bonuses: Additional rate (%) per depositor flag in PROFILE_FLAGS
+            min_deposit: Smallest deposit accepted
+            tiers: Flags of customer tiers, of which only the best one applies
+        """
+        self.bank = bank
+        self.name = name
+        self.slabs = sorted(slabs)
+        self.bonuses = bonuses or {}
+        self.min_deposit = min_deposit
+        self.tiers = tiers
+        self._starts = [slab[0] for slab in self.slabs]
+        for (_, end, _), (start, _, _) in zip(self.slabs, self.slabs[1:]):
+            if start <= end:
+                raise ValueError(f"Overlapping tenure slabs in the {name} rate card")
+
+    @property
+    def tenure_range(self) -> Tuple[int, int]:
+        return (self.slabs[0][0], self.slabs[-1][1]) if self.slabs else (0, -1)
+
+    def slab_for(self, tenure_days: int) -> Optional[Tuple[int, int, float]]:
+        """Slab covering a tenure, or None outside the card"""
+        index = bisect.bisect_right(self._starts, tenure_days) - 1
+        if index >= 0 and tenure_days <= self.slabs[index][1]:
+            return self.slabs[index]
+        return None
+
+    def base_rate(self, tenure_days: int) -> float:
+        """
+        Card rate of a tenure
+
+        Raises:
+            ValueError: If the bank has no slab for the tenure
+        """
+        slab = self.slab_for(tenure_days)
+        if slab is None:
+            raise ValueError(f"{self.name} has no FD rate for {tenure_days} days")
+        return slab[2]
+
+    def effective_rate(self, base_rate: float, **profile: bool) -> float:
+        """
+        Base rate plus the depositor's bonuses
+
+        Staff rates replace the age and women's bonuses, a super-senior bonus
+        replaces the senior one (a super senior is a senior elsewhere), and of
+        several customer tiers only the best counts.
+        """
+        unknown = set(profile) - set(PROFILE_FLAGS)
+        if unknown:
+            raise TypeError(f"Unknown depositor flags: {', '.join(sorted(unknown))}")
+        rate = base_rate
+        flags = {flag for flag, enabled in profile.items() if enabled}
+
+        if "staff" in flags and "staff" in self.bonuses:
+            rate += self.bonuses["staff"]
+        else:
+            if "super_senior" in flags and "super_senior" in self.bonuses:
+                rate += self.bonuses["super_senior"]
+            elif flags & {"senior_citizen", "super_senior"}:
+                rate += self.bonuses.get("senior_citizen", 0.0)
+            rate += self.bonuses.get("woman_depositor", 0.0) if "woman_depositor" in flags else 0.0
+
+        if "digital_fd" in flags:
+            rate += self.bonuses.get("digital_fd", 0.0)
+        tier_bonuses = [self.bonuses[tier] for tier in self.tiers if tier in flags and tier in self.bonuses]
+        if tier_bonuses:
+            rate += max(tier_bonuses)
+        return rate
+
+
+# Rates as of April 2025 (simplified), as shown on the bank calculator pages
+RATE_CARDS: Dict[str, RateCard] = {card.bank: card for card in (
+    RateCard("sbi", "SBI", [
+        (7, 45, 3.0), (46, 179, 4.5), (180, 210, 5.25), (211, 364, 5.5),
+        (365, 729, 6.0), (730, 1094, 6.25), (1095, 1824, 6.5), (1825, 3650, 6.75)
+    ], {"senior_citizen": 0.5}, min_deposit=1000),
+    RateCard("hdfc", "HDFC Bank", [
+        (7, 14, 3.0), (15, 29, 3.5), (30, 45, 4.0), (46, 60, 4.5), (61, 90, 4.75), (91, 120, 5.0),
+        (121, 179, 5.25), (180, 270, 5.75), (271, 364, 6.0), (365, 729, 6.25), (730, 1094, 6.5),
+        (1095, 1824, 6.75), (1825, 3650, 7.0)
+    ], {"senior_citizen": 0.5, "super_senior": 0.75}, min_deposit=5000),
+    RateCard("icici", "ICICI Bank", [
+        (7, 14, 3.0), (15, 29, 3.0), (30, 45, 3.5), (46, 60, 4.25), (61, 90, 4.5), (91, 120, 4.75),
+        (121, 180, 5.0), (181, 270, 5.5), (271, 365, 5.75), (366, 730, 6.25), (731, 1095, 6.5),
+        (1096, 1825, 6.7), (1826, 3650, 6.9)
+    ], {"senior_citizen": 0.5}, min_deposit=10000),
+    RateCard("axis", "Axis Bank", [
+        (7, 14, 3.0), (15, 29, 3.0), (30, 45, 3.5), (46, 60, 4.25), (61, 90, 4.5), (91, 179, 4.75),
+        (180, 364, 5.5), (365, 375, 6.0), (376, 539, 6.0), (540, 700, 6.25), (701, 800, 6.5),
+        (801, 899, 6.7), (900, 999, 6.75), (1000, 3650, 6.9)
+    ], {"senior_citizen": 0.5, "woman_depositor": 0.1, "staff": 1.0}, min_deposit=5000),
+    RateCard("kotak", "Kotak Mahindra Bank", [
+        (7, 14, 4.5), (15, 29, 4.75), (30, 44, 5.0), (45, 89, 5.25), (90, 179, 5.5), (180, 269, 5.75),
+        (270, 364, 5.9), (365, 547, 6.25), (548, 729, 6.4), (730, 1094, 6.5), (1095, 1824, 6.6),
+        (1825, 3649, 6.5), (3650, 3650, 6.25)
+    ], {"senior_citizen": 0.5, "digital_fd": 0.1}, min_deposit=5000),
+    # No published slabs in the app yet: usable with an explicit rate, left out of comparisons
+    RateCard("yes", "Yes Bank", [], {"senior_citizen": 0.5, "yes_first": 0.25, "yes_premia": 0.1},
+             min_deposit=10000, tiers=("yes_first", "yes_premia")),
+)}
+
+
+class GrowthDetails(Sequence):
+    """
+    Period-by-period growth table of a deposit, built on first access
+
+    Behaves as the list of dicts the bank calculators used to return
+    (period, period_type, opening_balance, interest, payout, closing_balance).
+    """
+
+    def __init__(self, principal: float, effective_rate: float, tenure_years: float, payout_frequency: str):
+        self.principal = principal
+        self.effective_rate = effective_rate
+        self.tenure_years = tenure_years
+        self.payout_frequency = payout_frequency
+        self._rows: Optional[List[Dict[str, Any]]] = None
+
+    def _build(self) -> List[Dict[str, Any]]:
+        compounding_frequency = PAYOUT_FREQUENCIES[self.payout_frequency]
+        periods_total = int(self.tenure_years * compounding_frequency)
+        period_type = f"{12 // compounding_frequency} months"
+        rows = []
+
+        if self.payout_frequency == "At Maturity":
+            # Compound interest growth
+            rate_per_period = self.effective_rate / (100 * compounding_frequency)
+            current_value = self.principal
+            for period in range(1, periods_total + 1):
+                opening_balance = current_value
+                interest = opening_balance * rate_per_period
+                current_value = opening_balance + interest
+                rows.append({
+                    'period': period,
+                    'period_type': period_type,
+                    'opening_balance': opening_balance,
+                    'interest': interest,
+                    'payout': 0,
+                    'closing_balance': current_value
+                })
+        else:
+            # Simple interest with periodic payouts; the balance stays at the principal
+            interest = self.principal * (self.effective_rate / 100) / compounding_frequency
+            for period in range(1, periods_total + 1):
+                rows.append({
+                    'period': period,
+                    'period_type': period_type,
+                    'opening_balance': self.principal,
+                    'interest': interest,
+                    'payout': interest,
+                    'closing_balance': self.principal
+                })
+        return rows
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        if self._rows is None:
+            self._rows = self._build()
+        return self._rows
+
+    def __len__(self) -> int:
+        if self._rows is None:
+            return int(self.tenure_years * PAYOUT_FREQUENCIES[self.payout_frequency])
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def __repr__(self) -> str:
+        state = "built" if self._rows is not None else "pending"
+        return f"GrowthDetails({len(self)} periods, {state})"
+
+
+def fd_returns(principal: float, effective_rate: float, tenure_days: int,
+               payout_frequency: str = "At Maturity") -> Tuple[float, float, float, GrowthDetails]:
+    """
+    Maturity of a bank FD at an all-in rate
+
+    Interest compounds annually when paid at maturity; periodic payouts are
+    simple interest and the principal is returned at maturity.
+
+    Args:
+        principal: Amount deposited
+        effective_rate: Annual rate including bonuses (%)
+        tenure_days: Tenure in days
+        payout_frequency: One of PAYOUT_FREQUENCIES
+
+    Returns:
+        Tuple of (maturity_amount, interest_earned, periodic_payout, growth_details)
+    """
+    compounding_frequency = PAYOUT_FREQUENCIES[payout_frequency]
+    tenure_years = tenure_days / 365.25
+
+    if payout_frequency == "At Maturity":
+        rate_per_period = effective_rate / (100 * compounding_frequency)
+        maturity_amount = principal * ((1 + rate_per_period) ** (tenure_years * compounding_frequency))
+        interest_earned = maturity_amount - principal
+        periodic_payout = 0
+    else:
+        annual_interest = principal * (effective_rate / 100)
+        periodic_payout = annual_interest / compounding_frequency
+        interest_earned = annual_interest * tenure_years
+        maturity_amount = principal
+
+    growth_details = GrowthDetails(principal, effective_rate, tenure_years, payout_frequency)
+    return maturity_amount, interest_earned, periodic_payout, growth_details
+
+
+def calculate_bank_fd(bank: str, principal: float, tenure_days: int, payout_frequency: str = "At Maturity",
+                      interest_rate: Optional[float] = None, **profile: bool) -> Dict[str, Any]:
+    """
+    FD returns at a bank, with the rate taken from its rate card unless given
+
+    Args:
+        bank: Key of RATE_CARDS
+        principal: Amount deposited
+        tenure_days: Tenure in days
+        payout_frequency: One of PAYOUT_FREQUENCIES
+        interest_rate: Base rate (%) overriding the card
+        **profile: Depositor flags (see PROFILE_FLAGS)
+
+    Returns:
+        Dictionary with bank, base_rate, effective_rate, maturity_amount,
+        interest_earned, periodic_payout and growth_details
+    """
+    card = RATE_CARDS[bank]
+    base_rate = card.base_rate(tenure_days) if interest_rate is None else interest_rate
+    effective_rate = card.effective_rate(base_rate, **profile)
+    maturity_amount, interest_earned, periodic_payout, growth_details = fd_returns(
+        principal, effective_rate, tenure_days, payout_frequency
+    )
+    return {
+        'bank': card.name,
+        'base_rate': base_rate,
+        'effective_rate': effective_rate,
+        'maturity_amount': maturity_amount,
+        'interest_earned': interest_earned,
+        'periodic_payout': periodic_payout,
+        'growth_details': growth_details
+    }
+
+
+def compare_banks(principal: float, tenure_days: int, payout_frequency: str = "At Maturity",
+                  banks: Optional[Iterable[str]] = None, **profile: bool) -> List[Dict[str, Any]]:
+    """
+    Maturity of the same deposit at every bank whose card covers the tenure, best first
+
+    The compounding runs once over an array of all-in rates, one per bank.
+
+    Args:
+        principal: Amount deposited
+        tenure_days: Tenure in days
+        payout_frequency: One of PAYOUT_FREQUENCIES
+        banks: Keys of RATE_CARDS to include (default all)
+        **profile: Depositor flags (see PROFILE_FLAGS)
+
+    Returns:
+        List of dictionaries with bank, base_rate, effective_rate, maturity_amount
+        and interest_earned, highest interest first
+    """
+    import numpy as np  # deferred so importing the package stays free of NumPy
+
+    cards = [RATE_CARDS[bank] for bank in (banks or RATE_CARDS)]
+    cards = [card for card in cards if card.slab_for(tenure_days) is not None and principal >= card.min_deposit]
+    if not cards:
+        return []
+    base = np.array([card.base_rate(tenure_days) for card in cards])
+    rates = np.array([card.effective_rate(rate, **profile) for card, rate in zip(cards, base)])
+
+    tenure_years = tenure_days / 365.25
+    if payout_frequency == "At Maturity":
+        maturity = principal * (1 + rates / 100) ** tenure_years
+        interest = maturity - principal
+    elif payout_frequency in PAYOUT_FREQUENCIES:
+        interest = principal * rates / 100 * tenure_years
+        maturity = np.full_like(rates, float(principal))
+    else:
+        raise ValueError(f"Unknown payout frequency {payout_frequency!r}")
+
+    order = np.argsort(-interest, kind="stable")
+    return [{
+        'bank': cards[i].name,
+        'base_rate': float(base[i]),
+        'effective_rate': float(rates[i]),
+        'maturity_amount': float(maturity[i]),
+        'interest_earned': float(interest[i])
+    } for i in order]
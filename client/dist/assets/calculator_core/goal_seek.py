@@ -0,0 +1,290 @@
+"""
+Goal Seek
+Solve any one input of a registered calculator for a target output
+
+The calculators run forward, from inputs to maturity. goal_seek runs them
+backwards ("what monthly SIP reaches ₹1 crore in 15 years?") on an array
+model of each calculator that mirrors its formula, so one call solves a
+whole grid of targets and inputs at once:
+
+- inputs the outputs are proportional to (amounts) are solved in closed
+  form from one model evaluation;
+- tenures have logarithmic closed forms where the formula allows;
+- anything else (rates, ages) is solved by vectorized false position
+  (Illinois) inside the input's bounds.
+
+Whole-number inputs (years, months, ages) are rounded to the neighbouring
+whole value on the side that reaches the target. Targets that no value
+within the bounds reaches come back as NaN.
+"""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# False-position iterations and relative tolerance on the solved input
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-10
+
+
+class Solvable(NamedTuple):
+    """Array model of a calculator and how each of its inputs can be solved for"""
+    model: Callable[..., Dict[str, np.ndarray]]
+    outputs: Tuple[str, ...]
+    # (lower, upper) per input, or a function of the other inputs returning them
+    bounds: Dict[str, Any]
+    linear: Tuple[str, ...] = ()
+    integer: Tuple[str, ...] = ()
+    closed_forms: Dict[Tuple[str, str], Callable[..., np.ndarray]] = {}
+
+
+def _annuity_due_factor(monthly_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Value of 1 invested at the start of each of `months` months"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (1 + monthly_rate) * ((1 + monthly_rate) ** months - 1) / monthly_rate
+    return np.where(monthly_rate == 0, months, factor)
+
+
+def _sip_model(monthly_investment, expected_return, time_period):
+    months = time_period * 12
+    future_value = monthly_investment * _annuity_due_factor(expected_return / 100 / 12, months)
+    total_investment = monthly_investment * months
+    return {
+        'future_value': future_value,
+        'total_investment': total_investment,
+        'returns': future_value - total_investment
+    }
+
+
+def _periods_for_annuity_due(target, payment, monthly_rate):
+    """Number of start-of-period payments whose future value is `target`"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        periods = np.log1p(target * monthly_rate / (payment * (1 + monthly_rate))) / np.log1p(monthly_rate)
+    return np.where(monthly_rate == 0, target / payment, periods)
+
+
+def _fd_model(principal, interest_rate, tenure_years, compounding_frequency=4):
+    maturity_amount = principal * (1 + interest_rate / (100 * compounding_frequency)) ** (tenure_years * compounding_frequency)
+    return {'maturity_amount': maturity_amount, 'interest_earned': maturity_amount - principal}
+
+
+def _ppf_model(annual_investment, interest_rate, years=15):
+    rate = np.asarray(interest_rate / 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = (1 + rate) * ((1 + rate) ** years - 1) / rate
+    maturity_amount = annual_investment * np.where(rate == 0, years, factor)
+    total_investment = annual_investment * years
+    return {
+        'maturity_amount': maturity_amount,
+        'total_investment': total_investment,
+        'total_interest': maturity_amount - total_investment
+    }
+
+
+def _nps_model(monthly_contribution, expected_return, current_age, retirement_age=60):
+    months = (retirement_age - current_age) * 12
+    corpus = monthly_contribution * _annuity_due_factor(expected_return / (12 * 100), months)
+    total_investment = monthly_contribution * months
+    return {
+        'corpus': corpus,
+        'lump_sum': corpus * 0.6,
+        'annuity': corpus * 0.4,
+        'total_investment': total_investment,
+        'total_returns': corpus - total_investment
+    }
+
+
+def _retirement_model(current_age, retirement_age, life_expectancy, monthly_expenses, inflation_rate, return_rate):
+    years_to_retirement = retirement_age - current_age
+    total_needed = monthly_expenses * (1 + inflation_rate / 100) ** years_to_retirement * 12 * (life_expectancy - retirement_age)
+    with np.errstate(divide="ignore"):
+        monthly_payment = total_needed / ((1 + return_rate / 100) ** years_to_retirement - 1) / (return_rate / 100 * 12)
+    return {'total_needed': total_needed, 'monthly_payment': monthly_payment}
+
+
+def _loan_model(principal, interest_rate, tenure_months):
+    monthly_rate = interest_rate / (12 * 100)
+    growth = (1 + monthly_rate) ** tenure_months
+    emi = principal * monthly_rate * growth / (growth - 1)
+    total_payment = emi * tenure_months
+    return {'emi': emi, 'total_interest': total_payment - principal, 'total_payment': total_payment}
+
+
+GOAL_SEEK_CALCULATORS: Dict[str, Solvable] = {
+    "calculate_sip_returns": Solvable(
+        model=_sip_model,
+        outputs=('future_value', 'total_investment', 'returns'),
+        bounds={'expected_return': (1e-6, 100.0), 'time_period': (0.0, 100.0)},
+        linear=('monthly_investment',),
+        integer=('time_period',),
+        closed_forms={
+            ('time_period', 'future_value'): lambda target, monthly_investment, expected_return: _periods_for_annuity_due(
+                target, monthly_investment, expected_return / 100 / 12) / 12
+        }
+    ),
+    "calculate_fd": Solvable(
+        model=_fd_model,
+        outputs=('maturity_amount', 'interest_earned'),
+        bounds={'interest_rate': (1e-6, 100.0), 'tenure_years': (0.0, 100.0)},
+        linear=('principal',),
+        closed_forms={
+            ('interest_rate', 'maturity_amount'): lambda target, principal, tenure_years, compounding_frequency=4: (
+                100 * compounding_frequency * ((target / principal) ** (1 / (tenure_years * compounding_frequency)) - 1)),
+            ('tenure_years', 'maturity_amount'): lambda target, principal, interest_rate, compounding_frequency=4: (
+                np.log(target / principal) / (compounding_frequency * np.log1p(interest_rate / (100 * compounding_frequency))))
+        }
+    ),
+    "calculate_ppf": Solvable(
+        model=_ppf_model,
+        outputs=('maturity_amount', 'total_investment', 'total_interest'),
+        bounds={'interest_rate': (1e-6, 100.0), 'years': (0.0, 100.0)},
+        linear=('annual_investment',),
+        integer=('years',),
+        closed_forms={
+            ('years', 'maturity_amount'): lambda target, annual_investment, interest_rate: _periods_for_annuity_due(
+                target, annual_investment, interest_rate / 100)
+        }
+    ),
+    "calculate_nps": Solvable(
+        model=_nps_model,
+        outputs=('corpus', 'lump_sum', 'annuity', 'total_investment', 'total_returns'),
+        bounds={
+            'expected_return': (1e-6, 100.0),
+            'current_age': lambda retirement_age=60, **_: (0.0, retirement_age),
+            'retirement_age': lambda current_age, **_: (current_age, 120.0)
+        },
+        linear=('monthly_contribution',),
+        integer=('current_age', 'retirement_age'),
+        closed_forms={
+            ('retirement_age', 'corpus'): lambda target, monthly_contribution, expected_return, current_age: (
+                current_age + _periods_for_annuity_due(target, monthly_contribution, expected_return / (12 * 100)) / 12)
+        }
+    ),
+    "calculate_retirement_needs": Solvable(
+        model=_retirement_model,
+        outputs=('monthly_payment', 'total_needed'),
+        bounds={
+            'return_rate': (1e-6, 100.0),
+            'inflation_rate': (0.0, 100.0),
+            'current_age': lambda retirement_age, **_: (0.0, retirement_age - 1e-6),
+            'retirement_age': lambda current_age, life_expectancy, **_: (current_age + 1e-6, life_expectancy),
+            'life_expectancy': lambda retirement_age, **_: (retirement_age, 150.0)
+        },
+        linear=('monthly_expenses',),
+        integer=('current_age', 'retirement_age', 'life_expectancy')
+    ),
+    "calculate_loan_emi": Solvable(
+        model=_loan_model,
+        outputs=('emi', 'total_interest', 'total_payment'),
+        bounds={'interest_rate': (1e-6, 100.0), 'tenure_months': (1.0, 1200.0)},
+        linear=('principal',),
+        integer=('tenure_months',),
+        closed_forms={
+            ('tenure_months', 'emi'): lambda target, principal, interest_rate: (
+                -np.log1p(-principal * interest_rate / (12 * 100) / target) / np.log1p(interest_rate / (12 * 100)))
+        }
+    ),
+}
+
+
+def register_solvable(name: str, solvable: Solvable) -> None:
+    """Make another calculator available to goal_seek under `name`"""
+    GOAL_SEEK_CALCULATORS[name] = solvable
+
+
+def _false_position(residual: Callable[[np.ndarray], np.ndarray], lower: np.ndarray,
+                    upper: np.ndarray) -> np.ndarray:
+    """Roots of a monotone residual inside [lower, upper], element-wise; NaN where it has no sign change"""
+    f_lower, f_upper = residual(lower), residual(upper)
+    bracketed = np.sign(f_lower) * np.sign(f_upper) <= 0
+    lower, upper = lower.copy(), upper.copy()
+    side = np.zeros(lower.shape, dtype=np.int8)
+    root = lower.copy()
+    for _ in range(MAX_ITERATIONS):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = np.where(f_upper != f_lower, upper - f_upper * (upper - lower) / (f_upper - f_lower), lower)
+        root = np.where(np.isfinite(root), root, (lower + upper) / 2)
+        f_root = residual(root)
+        # Illinois step: halve the kept endpoint's residual when the same endpoint is replaced twice running
+        replace_upper = np.sign(f_root) == np.sign(f_upper)
+        f_lower = np.where(replace_upper, np.where(side == 1, f_lower / 2, f_lower), f_root)
+        f_upper = np.where(replace_upper, f_root, np.where(side == -1, f_upper / 2, f_upper))
+        lower = np.where(replace_upper, lower, root)
+        upper = np.where(replace_upper, root, upper)
+        side = np.where(replace_upper, 1, -1).astype(np.int8)
+        if np.all((np.abs(upper - lower) <= TOLERANCE * (1 + np.abs(root))) | (f_root == 0) | ~bracketed):
+            break
+    return np.where(bracketed, root, np.nan)
+
+
+def goal_seek(calculator: str, solve_for: str, target: Any, output: Optional[str] = None,
+              at_least: bool = True, **inputs: Any) -> Any:
+    """
+    Value of one calculator input that makes an output hit a target
+
+    Args:
+        calculator: Name in GOAL_SEEK_CALCULATORS (the core function's name)
+        solve_for: Input to solve for
+        target: Target value of the output; scalar or array
+        output: Output to match (default the first of the calculator's outputs)
+        at_least: Round whole-number inputs so the output is at least (True)
+            or at most (False) the target
+        **inputs: The calculator's other inputs; scalars or arrays broadcast with target
+
+    Returns:
+        The solved input, a float for scalar arguments and an array otherwise
+        (NaN where the target cannot be reached)
+    """
+    solvable = GOAL_SEEK_CALCULATORS.get(calculator)
+    if solvable is None:
+        raise ValueError(f"Unknown calculator {calculator!r}; expected one of {', '.join(GOAL_SEEK_CALCULATORS)}")
+    output = output or solvable.outputs[0]
+    if output not in solvable.outputs:
+        raise ValueError(f"{calculator} has no output {output!r}; expected one of {', '.join(solvable.outputs)}")
+    if solve_for in inputs:
+        raise TypeError(f"{solve_for!r} is being solved for and cannot also be given")
+    if solve_for not in solvable.linear and solve_for not in solvable.bounds:
+        solvable_inputs = (*solvable.linear, *solvable.bounds)
+        raise ValueError(f"Cannot solve {calculator} for {solve_for!r}; expected one of {', '.join(solvable_inputs)}")
+
+    scalar = np.ndim(target) == 0 and all(np.ndim(value) == 0 for value in inputs.values())
+    arrays = np.broadcast_arrays(np.asarray(target, dtype=float), *(np.asarray(value, dtype=float) for value in inputs.values()))
+    target, inputs = arrays[0], dict(zip(inputs, arrays[1:]))
+
+    def evaluate(value: np.ndarray) -> np.ndarray:
+        return solvable.model(**inputs, **{solve_for: value})[output]
+
+    if solve_for in solvable.linear:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            solution = target / evaluate(np.ones_like(target))
+    else:
+        bounds = solvable.bounds[solve_for]
+        lower, upper = bounds(**inputs) if callable(bounds) else bounds
+        lower = np.broadcast_to(np.asarray(lower, dtype=float), target.shape)
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), target.shape)
+        closed_form = solvable.closed_forms.get((solve_for, output))
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if closed_form is not None:
+                solution = np.asarray(closed_form(target, **inputs), dtype=float)
+                solution = np.where((solution >= lower) & (solution <= upper), solution, np.nan)
+            else:
+                solution = _false_position(lambda value: evaluate(value) - target, lower, upper)
+
+    if solve_for in solvable.integer:
+        solution = _round_to_target(solution, target, evaluate, at_least)
+    return float(solution) if scalar else solution
+
+
+def _round_to_target(solution: np.ndarray, target: np.ndarray, evaluate: Callable[[np.ndarray], np.ndarray],
+                     at_least: bool) -> np.ndarray:
+    """Neighbouring whole number whose output reaches the target (the nearer one if both do)"""
+    floor, ceil = np.floor(solution), np.ceil(solution)
+    slack = 1e-9 * np.abs(target)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        floor_out, ceil_out = evaluate(floor), evaluate(ceil)
+    if at_least:
+        floor_meets, ceil_meets = floor_out >= target - slack, ceil_out >= target - slack
+    else:
+        floor_meets, ceil_meets = floor_out <= target + slack, ceil_out <= target + slack
+    prefer_floor = floor_meets & (~ceil_meets | (solution - floor <= ceil - solution))
+    return np.where(np.isnan(solution), np.nan, np.where(prefer_floor, floor, ceil))
@@ -0,0 +1,202 @@
+"""
+Insurance
+Term insurance cover recommendations
+"""
+
+def calculate_term_insurance(age, annual_income, liabilities, dependent_years, existing_coverage=0, savings=0, investment_assets=0, income_replacement=0.6, expense_multiple=300, method="income_replacement"):
+    """
+    Calculate adequate term insurance coverage based on different methods
+    
+    Args:
+        age: Current age of the individual
+        annual_income: Annual income before tax
+        liabilities: Outstanding loans and liabilities
+        dependent_years: Number of years dependents will rely on the income
+        existing_coverage: Existing term insurance coverage (if any)
+        savings: Current liquid savings
+        investment_assets: Current investment assets (excluding real estate)
+        income_replacement: Percentage of income to be replaced (0.5 to 0.7 typically)
+        expense_multiple: Multiple of annual expenses for Human Life Value method
+        method: Calculation method ("income_replacement", "income_multiple", "human_life_value")
+        
+    Returns:
+        Dictionary containing coverage recommendations, rationale and detailed breakdown
+    """
+    results = {}
+    
+    # Method 1: Income Replacement Method
+    monthly_income = annual_income / 12
+    years_to_retirement = min(60 - age, dependent_years) if age < 60 else 0
+    if years_to_retirement <= 0:
+        income_replacement_value = 0
+    else:
+        # Calculate present value of future income stream
+        # Assuming 7% interest rate and 5% inflation, net discount rate is ~2%
+        discount_rate = 0.02
+        
+        # Formula for present value of future income stream
+        # PV = PMT * ((1 - (1 + r)^-n) / r)
+        if discount_rate > 0:
+            income_replacement_value = (monthly_income * income_replacement * 12) * (
+                (1 - (1 + discount_rate) ** -years_to_retirement) / discount_rate
+            )
+        else:
+            income_replacement_value = (monthly_income * income_replacement * 12) * years_to_retirement
+            
+    # Add liabilities to the required coverage
+    income_replacement_coverage = income_replacement_value + liabilities
+    
+    # Deduct existing assets
+    income_replacement_coverage = max(0, income_replacement_coverage - savings - investment_assets - existing_coverage)
+    
+    # Round to nearest lakh
+    income_replacement_coverage = round(income_replacement_coverage / 100000) * 100000
+    
+    # Method 2: Income Multiple Method (10-15x annual income)
+    income_multiple = 10 if age <= 30 else (
+        15 if age <= 40 else (
+            12 if age <= 50 else 10
+        )
+    )
+    
+    income_multiple_coverage = annual_income * income_multiple
+    income_multiple_coverage = max(0, income_multiple_coverage - existing_coverage)
+    income_multiple_coverage = round(income_multiple_coverage / 100000) * 100000
+    
+    # Method 3: Human Life Value Method
+    annual_expenses = annual_income * 0.7  # Assuming 70% of income goes to expenses
+    hlv_base = annual_expenses * expense_multiple / 100  # Convert expense_multiple from percentage
+    
+    # Adjust for age (younger age means more coverage)
+    age_factor = 1.2 if age < 30 else (
+        1 if age < 40 else (
+            0.8 if age < 50 else 0.6
+        )
+    )
+    
+    hlv_coverage = hlv_base * age_factor
+    hlv_coverage = max(0, hlv_coverage - existing_coverage)
+    hlv_coverage = round(hlv_coverage / 100000) * 100000
+    
+    # Store all method results for comparison
+    results["income_replacement"] = {
+        "coverage": income_replacement_coverage,
+        "description": f"{income_replacement*100:.0f}% income replacement for {years_to_retirement} years + liabilities - assets",
+        "formula": f"({monthly_income:,.0f} × {income_replacement:.1f} × 12 × PV factor for {years_to_retirement} years) + {liabilities:,.0f} - {savings + investment_assets:,.0f} - {existing_coverage:,.0f}",
+        "breakdown": {
+            "future_income_pv": income_replacement_value,
+            "liabilities": liabilities,
+            "assets_deducted": savings + investment_assets + existing_coverage,
+            "years_considered": years_to_retirement,
+            "income_percentage": income_replacement
+        }
+    }
+    
+    results["income_multiple"] = {
+        "coverage": income_multiple_coverage,
+        "description": f"{income_multiple}x annual income - existing coverage",
+        "formula": f"{annual_income:,.0f} × {income_multiple} - {existing_coverage:,.0f}",
+        "breakdown": {
+            "income_multiple_used": income_multiple,
+            "annual_income": annual_income,
+            "existing_coverage": existing_coverage
+        }
+    }
+    
+    results["human_life_value"] = {
+        "coverage": hlv_coverage,
+        "description": f"{expense_multiple}x monthly expenses adjusted for age",
+        "formula": f"({annual_income:,.0f} × 0.7 × {expense_multiple/100:.1f}) × {age_factor:.1f} - {existing_coverage:,.0f}",
+        "breakdown": {
+            "annual_expenses": annual_expenses,
+            "expense_multiple": expense_multiple/100,
+            "age_factor": age_factor,
+            "existing_coverage": existing_coverage
+        }
+    }
+    
+    # Determine recommended coverage based on selected method
+    if method == "income_replacement":
+        recommended_coverage = income_replacement_coverage
+        method_description = "Income Replacement Method"
+    elif method == "income_multiple":
+        recommended_coverage = income_multiple_coverage
+        method_description = "Income Multiple Method"
+    elif method == "human_life_value":
+        recommended_coverage = hlv_coverage
+        method_description = "Human Life Value Method"
+    
+    # Additional insights
+    recommendations = []
+    
+    if age < 30:
+        recommendations.append("Consider longer policy term (up to age 60-65) for cost efficiency")
+    
+    if liabilities > annual_income * 5:
+        recommendations.append("High debt ratio detected. Consider separate mortgage protection insurance")
+    
+    if dependent_years > 0 and dependent_years < 10:
+        recommendations.append("Short-term dependency detected. Consider decreasing term coverage")
+    
+    if annual_income > 2500000:
+        recommendations.append("Higher income detected. Consider critical illness and disability riders")
+    
+    if existing_coverage > 0 and existing_coverage < recommended_coverage * 0.5:
+        recommendations.append("Significant coverage gap detected. Consider increasing coverage")
+    
+    results["recommended"] = {
+        "coverage": recommended_coverage,
+        "method": method_description,
+        "recommendations": recommendations
+    }
+    
+    # Premium estimate (approximation based on average term rates)
+    # These are rough estimates - actual premiums will vary by insurer
+    base_premium_per_lakh = 0
+    
+    if age < 30:
+        base_premium_per_lakh = 600
+    elif age < 35:
+        base_premium_per_lakh = 700
+    elif age < 40:
+        base_premium_per_lakh = 850
+    elif age < 45:
+        base_premium_per_lakh = 1100
+    elif age < 50:
+        base_premium_per_lakh = 1600
+    elif age < 55:
+        base_premium_per_lakh = 2400
+    else:
+        base_premium_per_lakh = 3500
+    
+    # Adjust for policy term
+    policy_term = min(60 - age, dependent_years) if age < 60 else 0
+    term_factor = 1.0
+    
+    if policy_term > 30:
+        term_factor = 1.3
+    elif policy_term > 25:
+        term_factor = 1.2
+    elif policy_term > 20:
+        term_factor = 1.1
+    elif policy_term < 15:
+        term_factor = 0.9
+    
+    coverage_in_lakhs = recommended_coverage / 100000
+    annual_premium_estimate = base_premium_per_lakh * coverage_in_lakhs * term_factor
+    monthly_premium_estimate = annual_premium_estimate / 12
+    
+    results["premium_estimate"] = {
+        "annual": annual_premium_estimate,
+        "monthly": monthly_premium_estimate,
+        "parameters": {
+            "age": age,
+            "coverage_in_lakhs": coverage_in_lakhs,
+            "policy_term": policy_term,
+            "base_premium_per_lakh": base_premium_per_lakh,
+            "term_factor": term_factor
+        }
+    }
+    
+    # Return complete results
+    return results
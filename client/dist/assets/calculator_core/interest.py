@@ -0,0 +1,47 @@
+"""
+Interest
+Compound and simple interest, CAGR, inflation, discount and GST
+"""
+
+def calculate_compound_interest(principal, rate, time, frequency=12):
+    """Calculate compound interest with optional monthly contributions"""
+    rate = rate / 100  # Convert percentage to decimal
+    amount = principal * (1 + rate/frequency)**(frequency*time)
+    return amount
+
+
+def calculate_simple_interest(principal, rate, time):
+    """Calculate simple interest and total amount"""
+    rate = rate / 100  # Convert percentage to decimal
+    interest = principal * rate * time
+    total_amount = principal + interest
+    return interest, total_amount
+
+
+def calculate_cagr(initial_investment, final_value, time_period_years):
+    """Calculate Compound Annual Growth Rate"""
+    if initial_investment <= 0 or time_period_years <= 0:
+        return 0
+    cagr = (final_value / initial_investment) ** (1 / time_period_years) - 1
+    return cagr * 100  # Convert to percentage
+
+
+def calculate_inflation_effect(current_amount, inflation_rate, years):
+    """Calculate the effect of inflation on purchasing power"""
+    inflation_rate = inflation_rate / 100
+    future_value = current_amount / ((1 + inflation_rate) ** years)
+    return future_value
+
+
+def calculate_discount(original_price, discount_percentage):
+    """Calculate discount amount and final price"""
+    discount_amount = original_price * (discount_percentage / 100)
+    final_price = original_price - discount_amount
+    return discount_amount, final_price
+
+
+def calculate_gst(base_amount, gst_rate):
+    """Calculate GST amount and total price"""
+    gst_amount = base_amount * (gst_rate / 100)
+    total_amount = base_amount + gst_amount
+    return gst_amount, total_amount
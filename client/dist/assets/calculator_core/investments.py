@@ -0,0 +1,294 @@
+"""
+Investments
+SIP, SWP and STP projections, fund cost comparison, retirement savings, stock averaging and brokerage
+"""
+
+def calculate_sip_returns(monthly_investment, expected_return, time_period):
+    """Calculate returns for SIP investments"""
+    rate = expected_return / 100 / 12  # Monthly rate
+    months = time_period * 12
+
+    # Formula for SIP calculation
+    future_value = monthly_investment * ((1 + rate) * (((1 + rate)**months - 1) / rate))
+    total_investment = monthly_investment * months
+    returns = future_value - total_investment
+
+    # Calculate year-wise growth for visualization
+    years = list(range(time_period + 1))
+    invested_amounts = []
+    future_values = []
+
+    for year in years:
+        months = year * 12
+        if months == 0:
+            invested_amounts.append(0)
+            future_values.append(0)
+        else:
+            invested = monthly_investment * months
+            future = monthly_investment * ((1 + rate) * (((1 + rate)**months - 1) / rate))
+            invested_amounts.append(invested)
+            future_values.append(future)
+
+    return future_value, total_investment, returns, years, invested_amounts, future_values
+
+
+def calculate_swp_returns(corpus, withdrawal_rate, expected_return, time_period):
+    """Calculate Systematic Withdrawal Plan returns"""
+    monthly_withdrawal = corpus * (withdrawal_rate/100/12)
+    rate = expected_return/100/12  # Monthly rate
+    months = time_period * 12
+
+    # Calculate month-wise corpus and withdrawals
+    corpus_values = []
+    withdrawal_values = []
+    remaining_corpus = corpus
+
+    for month in range(months + 1):
+        corpus_values.append(remaining_corpus)
+        if month > 0:
+            withdrawal_values.append(monthly_withdrawal)
+            remaining_corpus = (remaining_corpus - monthly_withdrawal) * (1 + rate)
+        else:
+            withdrawal_values.append(0)
+
+    total_withdrawal = sum(withdrawal_values)
+    final_corpus = corpus_values[-1]
+
+    return {
+        'corpus_values': corpus_values,
+        'withdrawal_values': withdrawal_values,
+        'monthly_withdrawal': monthly_withdrawal,
+        'total_withdrawal': total_withdrawal,
+        'final_corpus': final_corpus
+    }
+
+
+def calculate_stp_returns(initial_amount, monthly_transfer, source_return, target_return, time_period_months):
+    """Calculate Systematic Transfer Plan (STP) returns
+    
+    Args:
+        initial_amount: Initial investment in source fund
+        monthly_transfer: Amount to transfer monthly from source to target
+        source_return: Expected annual return of source fund (%)
+        target_return: Expected annual return of target fund (%)
+        time_period_months: Duration of STP in months
+        
+    Returns:
+        Dictionary with STP analysis results
+    """
+    # Convert annual returns to monthly
+    source_monthly_return = (1 + source_return/100) ** (1/12) - 1
+    target_monthly_return = (1 + target_return/100) ** (1/12) - 1
+    
+    # Initialize values
+    source_fund = [initial_amount]
+    target_fund = [0]
+    total_value = [initial_amount]
+    lumpsum_target = [initial_amount]  # For comparison: direct lumpsum in target fund
+    
+    # Run calculation for each month
+    for month in range(1, time_period_months + 1):
+        # Calculate source fund value after growth and transfer
+        prev_source = source_fund[-1]
+        source_growth = prev_source * source_monthly_return
+        new_source = prev_source + source_growth - monthly_transfer
+        
+        # Ensure source fund doesn't go negative
+        if new_source < 0:
+            # Adjust final transfer if not enough funds
+            monthly_transfer = prev_source + source_growth
+            new_source = 0
+        
+        source_fund.append(max(0, new_source))
+        
+        # Calculate target fund value after transfer and growth
+        prev_target = target_fund[-1]
+        new_target = prev_target * (1 + target_monthly_return) + monthly_transfer
+        target_fund.append(new_target)
+        
+        # Calculate total portfolio value
+        total_value.append(new_source + new_target)
+        
+        # Calculate lumpsum alternative (if had invested all at once in target fund)
+        lumpsum_target.append(initial_amount * (1 + target_monthly_return) ** month)
+    
+    # Calculate returns and other metrics
+    total_transferred = monthly_transfer * time_period_months
+    if total_transferred > initial_amount:
+        total_transferred = initial_amount
+        
+    final_value = total_value[-1]
+    absolute_return = final_value - initial_amount
+    return_percentage = (absolute_return / initial_amount) * 100
+    
+    # Calculate CAGR
+    time_years = time_period_months / 12
+    cagr = ((final_value / initial_amount) ** (1 / time_years) - 1) * 100
+    
+    # Calculate lumpsum comparison
+    lumpsum_final = lumpsum_target[-1]
+    lumpsum_diff = final_value - lumpsum_final
+    lumpsum_diff_percentage = (lumpsum_diff / lumpsum_final) * 100
+    
+    # Generate x-axis labels (months)
+    months = list(range(time_period_months + 1))
+    
+    return {
+        'source_fund': source_fund,
+        'target_fund': target_fund,
+        'total_value': total_value,
+        'lumpsum_target': lumpsum_target,
+        'months': months,
+        'final_value': final_value,
+        'absolute_return': absolute_return,
+        'return_percentage': return_percentage,
+        'cagr': cagr,
+        'lumpsum_comparison': {
+            'final_value': lumpsum_final,
+            'difference': lumpsum_diff,
+            'difference_percentage': lumpsum_diff_percentage
+        }
+    }
+
+
+def calculate_mutual_fund_comparison(investment_amount, regular_expense_ratio, direct_expense_ratio, expected_return, time_period):
+    """Compare regular and direct mutual fund returns"""
+    # Convert percentages to decimals
+    regular_expense = regular_expense_ratio / 100
+    direct_expense = direct_expense_ratio / 100
+    expected_return_decimal = expected_return / 100
+    
+    # Calculate net returns after expenses
+    regular_net_return = expected_return_decimal - regular_expense
+    direct_net_return = expected_return_decimal - direct_expense
+    
+    # Calculate future values
+    regular_future_value = investment_amount * ((1 + regular_net_return) ** time_period)
+    direct_future_value = investment_amount * ((1 + direct_net_return) ** time_period)
+    
+    # Calculate total returns
+    regular_total_return = regular_future_value - investment_amount
+    direct_total_return = direct_future_value - investment_amount
+    
+    # Calculate expense impact
+    expense_impact = direct_future_value - regular_future_value
+    expense_impact_percentage = (expense_impact / investment_amount) * 100
+    
+    # Generate yearly data for plotting
+    years = list(range(time_period + 1))
+    regular_values = [investment_amount * ((1 + regular_net_return) ** year) for year in years]
+    direct_values = [investment_amount * ((1 + direct_net_return) ** year) for year in years]
+    
+    return {
+        'regular_future_value': regular_future_value,
+        'direct_future_value': direct_future_value,
+        'regular_total_return': regular_total_return,
+        'direct_total_return': direct_total_return,
+        'expense_impact': expense_impact,
+        'expense_impact_percentage': expense_impact_percentage,
+        'years': years,
+        'regular_values': regular_values,
+        'direct_values': direct_values
+    }
+
+
+def calculate_retirement_needs(current_age, retirement_age, life_expectancy, 
+                             monthly_expenses, inflation_rate, return_rate):
+    """Calculate retirement needs and required monthly savings"""
+    years_to_retirement = retirement_age - current_age
+    retirement_duration = life_expectancy - retirement_age
+    inflation_rate = inflation_rate / 100
+    return_rate = return_rate / 100
+
+    # Calculate future monthly expenses
+    future_monthly_expenses = monthly_expenses * (1 + inflation_rate)**years_to_retirement
+    total_needed = future_monthly_expenses * 12 * retirement_duration
+
+    # Calculate required monthly savings
+    monthly_payment = total_needed / ((1 + return_rate)**(years_to_retirement) - 1) / (return_rate * 12)
+
+    return total_needed, monthly_payment
+
+
+def calculate_stock_average(holdings, new_purchase_price, new_purchase_quantity):
+    """Calculate average stock price after a new purchase"""
+    if not holdings:
+        return new_purchase_price, new_purchase_quantity, new_purchase_price * new_purchase_quantity, 0, 0
+    
+    total_quantity = sum(holding['quantity'] for holding in holdings) + new_purchase_quantity
+    total_investment = sum(holding['price'] * holding['quantity'] for holding in holdings) + (new_purchase_price * new_purchase_quantity)
+    average_price = total_investment / total_quantity
+    
+    # Calculate price impact
+    old_average = sum(holding['price'] * holding['quantity'] for holding in holdings) / sum(holding['quantity'] for holding in holdings) if holdings else 0
+    price_change = average_price - old_average
+    percentage_change = (price_change / old_average) * 100 if old_average else 0
+    
+    return average_price, total_quantity, total_investment, price_change, percentage_change
+
+
+def calculate_brokerage(transaction_type, exchange, delivery, quantity, price, turnover=None):
+    """Calculate brokerage charges for stock transactions"""
+    if not turnover:
+        turnover = quantity * price
+    
+    # Default charges (illustrative)
+    brokerage = 0  # Many discount brokers offer zero brokerage
+    
+    # Exchange Transaction Charges
+    if exchange == "NSE":
+        transaction_charges = turnover * 0.00325 / 100
+    elif exchange == "BSE":
+        transaction_charges = turnover * 0.00375 / 100
+    else:  # For others like MCX, etc.
+        transaction_charges = turnover * 0.005 / 100
+    
+    # SEBI Charges
+    sebi_charges = turnover * 0.0001 / 100
+    
+    # Securities Transaction Tax (STT)
+    if delivery:
+        if transaction_type == "Buy":
+            stt = turnover * 0.1 / 100
+        else:  # Sell
+            stt = turnover * 0.1 / 100
+    else:  # Intraday
+        if transaction_type == "Buy":
+            stt = 0
+        else:  # Sell
+            stt = turnover * 0.025 / 100
+    
+    # GST (18% on brokerage and transaction charges)
+    gst = (brokerage + transaction_charges) * 18 / 100
+    
+    # Stamp Duty (on buy side only)
+    if transaction_type == "Buy":
+        if delivery:
+            stamp_duty = turnover * 0.015 / 100
+        else:  # Intraday
+            stamp_duty = turnover * 0.003 / 100
+    else:  # Sell
+        stamp_duty = 0
+    
+    # Total charges
+    total_charges = brokerage + transaction_charges + sebi_charges + stt + gst + stamp_duty
+    
+    # Net amount
+    if transaction_type == "Buy":
+        net_amount = turnover + total_charges
+    else:  # Sell
+        net_amount = turnover - total_charges
+        
+    # Return a dictionary with all the details
+    return {
+        'turnover': turnover,
+        'brokerage': brokerage,
+        'transaction_charges': transaction_charges,
+        'sebi_charges': sebi_charges,
+        'stt': stt,
+        'gst': gst,
+        'stamp_duty': stamp_duty,
+        'total_charges': total_charges,
+        'net_amount': net_amount,
+        'percentage_impact': (total_charges / turnover) * 100
+    }
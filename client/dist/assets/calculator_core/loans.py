@@ -0,0 +1,44 @@
+"""
+Loans
+EMI and amortization of term loans and credit card conversions
+"""
+
+def calculate_loan_emi(principal, interest_rate, tenure_months):
+    """Calculate Equated Monthly Installment for a loan"""
+    monthly_rate = interest_rate / (12 * 100)  # Convert annual rate to monthly and percentage to decimal
+    emi = principal * monthly_rate * ((1 + monthly_rate) ** tenure_months) / (((1 + monthly_rate) ** tenure_months) - 1)
+    
+    # Calculate amortization schedule
+    balance = principal
+    amortization_schedule = []
+    total_interest = 0
+    
+    for month in range(1, tenure_months + 1):
+        interest_payment = balance * monthly_rate
+        principal_payment = emi - interest_payment
+        balance = balance - principal_payment
+        total_interest += interest_payment
+        
+        amortization_schedule.append({
+            'month': month,
+            'emi': emi,
+            'principal': principal_payment,
+            'interest': interest_payment,
+            'balance': max(0, balance)
+        })
+    
+    return emi, total_interest, principal + total_interest, amortization_schedule
+
+
+def calculate_credit_card_emi(purchase_amount, interest_rate, tenure_months, processing_fee_percentage=0):
+    """Calculate EMI for credit card purchases"""
+    processing_fee = purchase_amount * (processing_fee_percentage / 100)
+    loan_amount = purchase_amount + processing_fee
+    
+    monthly_rate = interest_rate / (12 * 100)
+    emi = loan_amount * monthly_rate * ((1 + monthly_rate) ** tenure_months) / (((1 + monthly_rate) ** tenure_months) - 1)
+    
+    total_payment = emi * tenure_months
+    total_interest = total_payment - loan_amount
+    
+    return emi, total_interest, total_payment, processing_fee
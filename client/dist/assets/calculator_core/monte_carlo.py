@@ -0,0 +1,194 @@
+"""
+Monte Carlo
+Stochastic SIP and lumpsum projections with percentile bands and goal probability
+
+Each path draws one return per year, lognormal with the given arithmetic
+mean and volatility or bootstrapped from calendar-year index returns
+(NIFTY_50_ANNUAL_RETURNS by default), and accrues it evenly over the year's
+months. Twelve start-of-month SIP instalments then grow by a geometric
+series with a closed form, so a year of a path is two multiply-adds and a
+simulation costs paths x years operations rather than paths x months
+random draws.
+
+Paths are simulated in chunks of CHUNK_SIZE. The year-end values of each
+chunk are folded into log-spaced histograms and then discarded, so memory is
+bounded by the chunk size whatever the number of paths; percentiles are read
+off the merged histograms (within about 0.1% of the exact sample percentiles).
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+LOGNORMAL = "lognormal"
+BOOTSTRAP = "bootstrap"
+METHODS = (LOGNORMAL, BOOTSTRAP)
+
+# How expected_return compounds: as an effective annual rate, or (like
+# calculate_sip_returns) as a nominal annual rate credited at rate / 12 a month
+ANNUAL = "annual"
+MONTHLY = "monthly"
+COMPOUNDING = (ANNUAL, MONTHLY)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_PATHS = 20000
+# Paths simulated together; bounds the working set to a few CHUNK_SIZE x years arrays
+CHUNK_SIZE = 10000
+# Histogram resolution per projected year
+HISTOGRAM_BINS = 4096
+# The first chunk's range is widened by this factor each side; later outliers land in the edge bins
+RANGE_PADDING = 8.0
+
+# NIFTY 50 calendar-year price returns (%), 2000-2024
+NIFTY_50_ANNUAL_RETURNS = (
+    -14.7, -16.2, 3.3, 71.9, 10.7, 36.3, 39.8, 54.8, -51.8, 75.8,
+    17.9, -24.6, 27.7, 6.8, 31.4, -4.1, 3.0, 28.6, 3.2, 12.0,
+    14.9, 24.1, 4.3, 20.0, 8.8,
+)
+
+
+class _StreamingPercentiles:
+    """Log-spaced histogram per series, merged chunk by chunk"""
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, bins: int = HISTOGRAM_BINS):
+        self.bins = bins
+        self.log_lower = np.log(lower)
+        self.width = (np.log(upper) - self.log_lower) / bins
+        self.counts = np.zeros((len(lower), bins), dtype=np.int64)
+        self._offsets = np.arange(len(lower))[:, None] * bins
+        self.minimum = np.full(len(lower), np.inf)
+        self.maximum = np.full(len(lower), -np.inf)
+
+    def add(self, values: np.ndarray) -> None:
+        """Fold in one chunk of values, shaped series x paths"""
+        np.minimum(self.minimum, values.min(axis=1), out=self.minimum)
+        np.maximum(self.maximum, values.max(axis=1), out=self.maximum)
+        index = ((np.log(values) - self.log_lower[:, None]) / self.width[:, None]).astype(np.int64)
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.counts += np.bincount((index + self._offsets).ravel(),
+                                   minlength=self.counts.size).reshape(self.counts.shape)
+
+    def percentiles(self, percentiles: Sequence[float]) -> np.ndarray:
+        """Percentiles of every series (series x percentiles), interpolated within bins and kept within the data"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        total = cumulative[:, -1:]
+        targets = total * np.asarray(percentiles, dtype=float)[None, :] / 100
+        result = np.empty(targets.shape)
+        for series in range(len(self.counts)):
+            bin_index = np.searchsorted(cumulative[series], targets[series], side="left")
+            np.minimum(bin_index, self.bins - 1, out=bin_index)
+            below = np.where(bin_index > 0, cumulative[series, bin_index - 1], 0)
+            in_bin = np.maximum(self.counts[series, bin_index], 1)
+            fraction = np.clip((targets[series] - below) / in_bin, 0, 1)
+            result[series] = self.log_lower[series] + (bin_index + fraction) * self.width[series]
+        return np.clip(np.exp(result), self.minimum[:, None], self.maximum[:, None])
+
+
+def _annual_log_returns(rng: np.random.Generator, paths: int, years: int, method: str, expected_return: float,
+                        volatility: float, history: np.ndarray) -> np.ndarray:
+    if method == LOGNORMAL:
+        # Log return ~ N(log(1 + mean) - sigma^2 / 2, sigma^2), so the arithmetic mean is `expected_return`
+        sigma = np.sqrt(np.log1p((volatility / 100) ** 2 / (1 + expected_return / 100) ** 2))
+        returns = rng.standard_normal((paths, years))
+        returns *= sigma
+        returns += np.log1p(expected_return / 100) - sigma ** 2 / 2
+        return returns
+    return history[rng.integers(0, len(history), (paths, years))]
+
+
+def project_corpus(initial: float = 0.0, monthly_investment: float = 0.0, years: int = 10,
+                   expected_return: float = 12.0, volatility: float = 15.0, goal: Optional[float] = None,
+                   inflation_rate: float = 0.0, paths: int = DEFAULT_PATHS, method: str = LOGNORMAL,
+                   history: Optional[Sequence[float]] = None, seed: Optional[int] = None,
+                   chunk_size: int = CHUNK_SIZE, compounding: str = ANNUAL) -> Dict[str, Any]:
+    """
+    Distribution of a lumpsum and/or monthly SIP corpus over simulated return paths
+
+    Args:
+        initial: Lumpsum invested at the start
+        monthly_investment: SIP amount invested at the start of every month
+        years: Projection horizon in years
+        expected_return: Arithmetic mean annual return (%) for the lognormal model
+        volatility: Annual volatility (%) for the lognormal model
+        goal: Target corpus; when set, the probability of reaching it is returned
+        inflation_rate: Annual inflation (%) used for the real-terms bands
+        paths: Number of simulated paths
+        method: "lognormal" or "bootstrap" (resample calendar-year returns)
+        history: Annual returns (%) to bootstrap from (default NIFTY_50_ANNUAL_RETURNS)
+        seed: Random seed for reproducible projections
+        chunk_size: Paths simulated per batch
+        compounding: "annual" (expected_return is the effective annual return) or
+            "monthly" (expected_return / 12 a month, as the SIP calculator compounds)
+
+    Returns:
+        Dictionary with years, invested and deterministic (the corpus if every
+        year returned exactly expected_return) per year, percentiles and
+        real_percentiles (percentile -> corpus per year), mean_final,
+        goal_probability and goal_probability_by_year (None without a goal),
+        paths and method
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {', '.join(METHODS)}")
+    if compounding not in COMPOUNDING:
+        raise ValueError(f"Unknown compounding {compounding!r}; expected one of {', '.join(COMPOUNDING)}")
+    if years < 1:
+        raise ValueError("Projection must cover at least one year")
+    if initial < 0 or monthly_investment < 0 or initial + monthly_investment <= 0:
+        raise ValueError("Invest a positive lumpsum and/or monthly amount")
+    if paths < 1 or chunk_size < 1:
+        raise ValueError("Paths and chunk size must be positive")
+
+    if compounding == MONTHLY:
+        # The same growth as an effective annual rate, so paths and the fixed projection agree with the page
+        expected_return = ((1 + expected_return / 1200) ** 12 - 1) * 100
+
+    rng = np.random.default_rng(seed)
+    log_history = np.log1p(np.asarray(history if history is not None else NIFTY_50_ANNUAL_RETURNS, float) / 100)
+
+    histogram = None
+    reached = np.zeros(years, dtype=np.int64)
+    total_final = 0.0
+    done = 0
+    while done < paths:
+        size = min(chunk_size, paths - done)
+        log_returns = _annual_log_returns(rng, size, years, method, expected_return, volatility, log_history)
+        growth = np.exp(log_returns)
+        # Year-end value of twelve instalments: sum of e^(j * l) for j = 1..12, l the monthly log return
+        monthly = log_returns / 12
+        with np.errstate(invalid="ignore", divide="ignore"):
+            instalments = np.where(monthly != 0, np.exp(monthly) * np.expm1(log_returns) / np.expm1(monthly), 12.0)
+        instalments *= monthly_investment
+
+        corpus = np.empty((years, size))
+        value = np.full(size, float(initial))
+        for year in range(years):
+            value = value * growth[:, year] + instalments[:, year]
+            corpus[year] = value
+
+        if histogram is None:
+            histogram = _StreamingPercentiles(corpus.min(axis=1) / RANGE_PADDING, corpus.max(axis=1) * RANGE_PADDING)
+        histogram.add(corpus)
+        if goal is not None:
+            reached += (corpus >= goal).sum(axis=1)
+        total_final += float(corpus[-1].sum())
+        done += size
+
+    bands = np.vstack([np.full(len(PERCENTILES), float(initial)), histogram.percentiles(PERCENTILES)])
+    deflator = (1 + inflation_rate / 100) ** np.arange(years + 1)
+    month_counts = np.arange(years + 1) * 12
+    rate = (1 + expected_return / 100) ** (1 / 12) - 1
+    compounded = (1 + rate) ** month_counts
+    sip_factor = (1 + rate) * (compounded - 1) / rate if rate else month_counts.astype(float)
+
+    return {
+        'years': list(range(years + 1)),
+        'invested': initial + monthly_investment * month_counts,
+        'deterministic': initial * compounded + monthly_investment * sip_factor,
+        'percentiles': {p: bands[:, i] for i, p in enumerate(PERCENTILES)},
+        'real_percentiles': {p: bands[:, i] / deflator for i, p in enumerate(PERCENTILES)},
+        'mean_final': total_final / paths,
+        'goal_probability': float(reached[-1] / paths) if goal is not None else None,
+        'goal_probability_by_year': np.concatenate([[float(initial >= goal)], reached / paths]) if goal is not None else None,
+        'paths': paths,
+        'method': method
+    }
@@ -0,0 +1,161 @@
+"""
+Registry
+Every calculator page with its menu label, category, compute function and inputs
+
+The calculators page builds its menu from CALCULATORS and dispatches the
+selection with one dictionary lookup. Each entry names its UI function as a
+"module:function" string, or just "function" for functions defined on the
+calculators page itself, so no page module is imported until the calculator
+is first selected.
+
+compute names the calculator_core function behind the page, when there is
+one; the input schema of calculator_metadata() is read off its signature.
+`python -m calculator_core.registry` prints the metadata as JSON.
+"""
+
+import importlib
+import json
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+INTEREST = "Interest & General"
+SALARY_TAX = "Salary & Tax"
+INVESTMENT = "Investment"
+RETIREMENT = "Retirement & Pension"
+FIXED_INCOME = "Fixed Income & Savings"
+LOANS = "Loans"
+OTHER = "Other Financial"
+CATEGORIES = (INTEREST, SALARY_TAX, INVESTMENT, RETIREMENT, FIXED_INCOME, LOANS, OTHER)
+
+
+class Calculator(NamedTuple):
+    """One calculator page"""
+    key: str
+    label: str
+    category: str
+    ui: str
+    compute: Optional[str] = None
+
+
+_CALCULATORS = (
+    Calculator("simple_interest", "Simple Interest 💹", INTEREST, "show_simple_interest_calculator", "calculate_simple_interest"),
+    Calculator("compound_interest", "Compound Interest 📊", INTEREST, "show_compound_interest_calculator", "calculate_compound_interest"),
+    Calculator("cagr", "CAGR Calculator 📊", INTEREST, "show_cagr_calculator", "calculate_cagr"),
+    Calculator("interest_rate", "Interest Rate Calculator 📊", INTEREST, "show_interest_rate_calculator"),
+    Calculator("inflation", "Inflation Calculator 💸", INTEREST, "show_inflation_calculator", "calculate_inflation_effect"),
+    Calculator("discount", "Discount Calculator 💰", INTEREST, "show_discount_calculator", "calculate_discount"),
+    Calculator("gst", "GST Calculator 🧾", INTEREST, "show_gst_calculator", "calculate_gst"),
+    Calculator("gratuity", "Gratuity Calculator 💼", INTEREST, "show_gratuity_calculator", "calculate_gratuity"),
+
+    Calculator("salary", "Salary Calculator 💼", SALARY_TAX, "show_salary_calculator", "calculate_salary_details"),
+    Calculator("hra", "HRA Calculator 🏠", SALARY_TAX, "show_hra_calculator", "calculate_hra_exemption"),
+    Calculator("income_tax", "Income Tax Calculator 💰", SALARY_TAX, "show_income_tax_calculator"),
+
+    Calculator("sip", "SIP Calculator 📈", INVESTMENT, "show_sip_calculator", "calculate_sip_returns"),
+    Calculator("lumpsum", "Lumpsum Calculator 📈", INVESTMENT, "show_lumpsum_calculator"),
+    Calculator("swp", "SWP Calculator 💸", INVESTMENT, "show_swp_calculator", "calculate_swp_returns"),
+    Calculator("stp", "STP Calculator 📊", INVESTMENT, "show_stp_calculator", "calculate_stp_returns"),
+    Calculator("stock_average", "Stock Average Calculator 📈", INVESTMENT, "show_stock_average_calculator", "calculate_stock_average"),
+    Calculator("brokerage", "Brokerage Calculator 💹", INVESTMENT, "show_brokerage_calculator", "calculate_brokerage"),
+    Calculator("regular_vs_direct", "Regular vs Direct Mutual Fund Calculator 📊", INVESTMENT,
+               "show_regular_vs_direct_calculator", "calculate_mutual_fund_comparison"),
+    Calculator("gold_investment", "Gold Investment Calculator 💍", INVESTMENT, "show_gold_investment_calculator"),
+
+    Calculator("retirement", "Retirement Planning 👴", RETIREMENT, "show_retirement_calculator", "calculate_retirement_needs"),
+    Calculator("nps", "NPS Calculator 👵", RETIREMENT, "show_nps_calculator", "calculate_nps"),
+    Calculator("apy", "APY Calculator 👴", RETIREMENT, "show_apy_calculator", "calculate_apy"),
+
+    Calculator("ppf", "PPF Calculator 💰", FIXED_INCOME, "show_ppf_calculator", "calculate_ppf"),
+    Calculator("ssy", "SSY Calculator 👧", FIXED_INCOME, "show_ssy_calculator", "calculate_ssy_returns"),
+    Calculator("nsc", "NSC Calculator 📃", FIXED_INCOME, "show_nsc_calculator"),
+    Calculator("fd", "FD Calculator 🏦", FIXED_INCOME, "show_fd_calculator", "calculate_fd"),
+    Calculator("rd", "RD Calculator 💹", FIXED_INCOME, "show_rd_calculator", "calculate_rd"),
+    Calculator("post_office_ppf", "Post Office PPF Calculator 🏤", FIXED_INCOME, "show_post_office_ppf_calculator", "calculate_post_office_ppf"),
+    Calculator("post_office_fd", "Post Office FD Calculator 🏤", FIXED_INCOME, "show_post_office_fd_calculator", "calculate_post_office_fd"),
+    Calculator("post_office_rd", "Post Office RD Calculator 🏤", FIXED_INCOME, "show_post_office_rd_calculator", "calculate_post_office_rd"),
+    Calculator("post_office_mis", "Post Office MIS Calculator 🏤", FIXED_INCOME, "show_post_office_mis_calculator", "calculate_post_office_mis"),
+    Calculator("hdfc_fd", "HDFC FD Calculator 🏦", FIXED_INCOME, "show_hdfc_fd_calculator", "calculate_hdfc_fd"),
+    Calculator("sbi_fd", "SBI FD Calculator 🏦", FIXED_INCOME, "show_sbi_fd_calculator", "calculate_sbi_fd"),
+    Calculator("icici_fd", "ICICI FD Calculator 🏦", FIXED_INCOME, "show_icici_fd_calculator", "calculate_icici_fd"),
+    Calculator("axis_fd", "Axis Bank FD Calculator 🏦", FIXED_INCOME, "show_axis_fd_calculator", "calculate_axis_fd"),
+    Calculator("kotak_fd", "Kotak Mahindra Bank FD Calculator 🏦", FIXED_INCOME, "show_kotak_fd_calculator", "calculate_kotak_fd"),
+    Calculator("yes_bank_fd", "Yes Bank FD Calculator 🏦", FIXED_INCOME,
+               "pages.yes_bank_fd_calculator:show_yes_bank_fd_calculator", "calculate_yes_bank_fd"),
+
+    Calculator("loan_emi", "Loan EMI 💳", LOANS, "show_loan_emi_calculator", "calculate_loan_emi"),
+    Calculator("home_loan", "Home Loan EMI Calculator 🏠", LOANS, "show_home_loan_calculator", "calculate_loan_emi"),
+    Calculator("personal_loan", "Personal Loan EMI Calculator 💵", LOANS, "show_personal_loan_calculator", "calculate_loan_emi"),
+    Calculator("car_loan", "Car Loan EMI Calculator 🚗", LOANS, "show_car_loan_calculator", "calculate_loan_emi"),
+    Calculator("bike_loan", "Bike Loan EMI Calculator 🏍️", LOANS,
+               "utils.calculators.bike_loan_calculator:show_bike_loan_calculator", "calculate_loan_emi"),
+    Calculator("education_loan", "Education Loan EMI Calculator 🎓", LOANS, "show_education_loan_calculator", "calculate_loan_emi"),
+    Calculator("credit_card_emi", "Credit Card EMI Calculator 💳", LOANS,
+               "utils.calculators.credit_card_emi_calculator:show_credit_card_emi_calculator", "calculate_credit_card_emi"),
+    Calculator("sbi_home_loan", "SBI Home Loan EMI Calculator 🏦", LOANS, "utils.calculators:show_sbi_home_loan_calculator", "calculate_loan_emi"),
+    Calculator("hdfc_home_loan", "HDFC Home Loan EMI Calculator 🏦", LOANS, "utils.calculators:show_hdfc_home_loan_calculator", "calculate_loan_emi"),
+    Calculator("sbi_personal_loan", "SBI Personal Loan EMI Calculator 🏦", LOANS,
+               "utils.calculators:show_sbi_personal_loan_calculator", "calculate_loan_emi"),
+    Calculator("hdfc_personal_loan", "HDFC Personal Loan EMI Calculator 🏦", LOANS,
+               "utils.calculators:show_hdfc_personal_loan_calculator", "calculate_loan_emi"),
+    Calculator("icici_personal_loan", "ICICI Personal Loan EMI Calculator 🏦", LOANS,
+               "utils.calculators:show_icici_personal_loan_calculator", "calculate_loan_emi"),
+    Calculator("axis_personal_loan", "Axis Personal Loan EMI Calculator 🏦", LOANS,
+               "utils.calculators:show_axis_personal_loan_calculator", "calculate_loan_emi"),
+
+    Calculator("term_insurance", "Term Insurance Calculator 🛡️", OTHER,
+               "pages.term_insurance_calculator:show_term_insurance_calculator", "calculate_term_insurance"),
+    Calculator("health_insurance", "Health Insurance Premium Calculator 🏥", OTHER, "show_health_insurance_calculator"),
+    Calculator("education_savings", "Education Savings 🎓", OTHER, "show_education_savings_calculator"),
+    Calculator("emergency_fund", "Emergency Fund 🏦", OTHER, "show_emergency_fund_calculator"),
+    Calculator("home_down_payment", "Home Down Payment 🏠", OTHER, "show_home_down_payment_calculator"),
+    Calculator("net_worth", "Net Worth Tracker 💎", OTHER, "show_net_worth_tracker"),
+    Calculator("investment_returns", "Investment Returns 📊", OTHER, "show_investment_returns_calculator"),
+    Calculator("vehicle_comparison", "Vehicle Comparison Calculator 🚗", OTHER,
+               "utils.calculators.vehicle_comparison_calculator:show_vehicle_comparison_calculator"),
+)
+
+# Menu order; keys are stable identifiers for links and the API, labels may change
+CALCULATORS: Dict[str, Calculator] = {calculator.key: calculator for calculator in _CALCULATORS}
+_BY_LABEL: Dict[str, Calculator] = {calculator.label: calculator for calculator in _CALCULATORS}
+
+
+def get_calculator(name: str) -> Optional[Calculator]:
+    """Calculator by key or menu label, None if there is no such calculator"""
+    return CALCULATORS.get(name) or _BY_LABEL.get(name)
+
+
+def _input_schema(compute: Optional[str]) -> List[Dict[str, Any]]:
+    """Parameters of a calculator_core function, with their defaults"""
+    if compute is None:
+        return []
+    function = getattr(importlib.import_module(__package__), compute)
+    code = function.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = function.__defaults__ or ()
+    first_default = len(names) - len(defaults)
+    schema = []
+    for index, name in enumerate(names):
+        field: Dict[str, Any] = {"name": name, "required": index < first_default}
+        if index >= first_default:
+            field["default"] = defaults[index - first_default]
+        schema.append(field)
+    return schema
+
+
+def calculator_metadata() -> List[Dict[str, Any]]:
+    """Every calculator as a JSON-serialisable dict: key, label, category, ui, compute and inputs"""
+    return [{**calculator._asdict(), "inputs": _input_schema(calculator.compute)} for calculator in _CALCULATORS]
+
+
+def main(argv: List[str]) -> int:
+    category = argv[0] if argv else None
+    if category is not None and category not in CATEGORIES:
+        print(f"Usage: python -m calculator_core.registry [{'|'.join(CATEGORIES)}]", file=sys.stderr)
+        return 2
+    metadata = [entry for entry in calculator_metadata() if category in (None, entry["category"])]
+    print(json.dumps({"categories": list(CATEGORIES), "calculators": metadata}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,186 @@
+"""
+Salary
+Salary breakdown, income tax, HRA exemption and gratuity
+"""
+
+def calculate_salary_details(basic_salary, hra, allowances, bonus, investments, rent_paid, metro_city, pf_contribution=0, 
+                        professional_tax=2400, is_self_employed=False, standard_deduction=50000):
+    """Calculate salary breakdown and tax details
+    
+    Args:
+        basic_salary: Annual basic salary
+        hra: Annual House Rent Allowance
+        allowances: Annual other allowances (all taxable)
+        bonus: Annual bonus/performance pay
+        investments: Annual tax saving investments (up to 150000 under 80C)
+        rent_paid: Annual rent paid for HRA exemption
+        metro_city: Whether living in a metro city (for HRA exemption)
+        pf_contribution: Annual employee PF contribution (default 0)
+        professional_tax: Annual professional tax (default 2400)
+        is_self_employed: Whether person is self-employed (default False)
+        standard_deduction: Standard deduction amount (default 50000)
+        
+    Returns:
+        Dictionary with salary, tax and take-home pay details
+    """
+    # Calculate annual gross salary
+    gross_salary = basic_salary + hra + allowances + bonus
+    
+    # Calculate HRA exemption
+    if rent_paid > 0:
+        hra_exemption = min(
+            hra,
+            rent_paid - 0.1 * basic_salary,
+            0.5 * basic_salary if metro_city else 0.4 * basic_salary
+        )
+        hra_exemption = max(0, hra_exemption)  # Ensure non-negative
+    else:
+        hra_exemption = 0
+    
+    # Ensure investments under 80C don't exceed limit
+    tax_saving_investments = min(investments, 150000)
+    
+    # Calculate NPS deduction (up to 50000 in addition to 80C)
+    nps_deduction = 0  # Can be added later if needed
+    
+    # Apply deductions
+    # Standard deduction is applicable to all salaried individuals
+    if not is_self_employed:
+        deductions = standard_deduction
+    else:
+        deductions = 0
+    
+    deductions += tax_saving_investments + pf_contribution + nps_deduction + professional_tax
+    
+    # Calculate taxable income
+    taxable_income = gross_salary - hra_exemption - deductions
+    taxable_income = max(0, taxable_income)
+    
+    # Calculate tax under old regime
+    def calculate_old_regime_tax(income):
+        tax = 0
+        if income > 1000000:
+            tax += (income - 1000000) * 0.30
+            income = 1000000
+        if income > 500000:
+            tax += (income - 500000) * 0.20
+            income = 500000
+        if income > 250000:
+            tax += (income - 250000) * 0.05
+        
+        # Add 4% cess
+        tax = tax * 1.04
+        
+        return tax
+    
+    # Calculate tax under new regime (2023-24)
+    def calculate_new_regime_tax(income):
+        tax = 0
+        if income > 1500000:
+            tax += (income - 1500000) * 0.30
+            income = 1500000
+        if income > 1200000:
+            tax += (income - 1200000) * 0.20
+            income = 1200000
+        if income > 900000:
+            tax += (income - 900000) * 0.15
+            income = 900000
+        if income > 600000:
+            tax += (income - 600000) * 0.10
+            income = 600000
+        if income > 300000:
+            tax += (income - 300000) * 0.05
+            
+        # Add 4% cess
+        tax = tax * 1.04
+        
+        return tax
+    
+    # Calculate taxes under both regimes
+    old_regime_tax = calculate_old_regime_tax(taxable_income)
+    
+    # For new regime, we need to calculate without standard deduction and 80C
+    new_regime_taxable = gross_salary - hra_exemption - professional_tax
+    new_regime_taxable = max(0, new_regime_taxable)
+    new_regime_tax = calculate_new_regime_tax(new_regime_taxable)
+    
+    # Determine which regime is better
+    if old_regime_tax <= new_regime_tax:
+        optimal_regime = "Old Regime"
+        tax_payable = old_regime_tax
+        optimal_taxable_income = taxable_income
+    else:
+        optimal_regime = "New Regime"
+        tax_payable = new_regime_tax
+        optimal_taxable_income = new_regime_taxable
+    
+    # Calculate take home pay
+    monthly_gross = gross_salary / 12
+    monthly_tax = tax_payable / 12
+    monthly_take_home = monthly_gross - monthly_tax - (professional_tax / 12) - (pf_contribution / 12)
+    
+    # Calculate tax savings if applicable
+    tax_savings = max(0, abs(old_regime_tax - new_regime_tax))
+    
+    # Calculate effective tax rate
+    effective_tax_rate = (tax_payable / gross_salary) * 100 if gross_salary > 0 else 0
+    
+    # Return detailed breakdown
+    return {
+        'gross_annual': gross_salary,
+        'gross_monthly': monthly_gross,
+        'taxable_income': optimal_taxable_income,
+        'hra_exemption': hra_exemption,
+        'tax_saving_investments': tax_saving_investments,
+        'total_deductions': deductions,
+        'tax_payable': tax_payable,
+        'monthly_tax': monthly_tax,
+        'monthly_take_home': monthly_take_home,
+        'annual_take_home': monthly_take_home * 12,
+        'optimal_regime': optimal_regime,
+        'old_regime_tax': old_regime_tax,
+        'new_regime_tax': new_regime_tax,
+        'tax_savings': tax_savings,
+        'effective_tax_rate': effective_tax_rate,
+        'pf_contribution': pf_contribution
+    }
+
+
+def calculate_hra_exemption(basic_salary, rent_paid, hra_received, metro_city=True):
+    """Calculate HRA exemption for tax purposes in India"""
+    # HRA exemption is the minimum of:
+    # 1. Actual HRA received
+    # 2. 50% of basic salary (for metro cities) or 40% (for non-metro)
+    # 3. Rent paid - 10% of basic salary
+    
+    percent_of_basic = 0.5 if metro_city else 0.4
+    exemption_1 = hra_received
+    exemption_2 = basic_salary * percent_of_basic
+    exemption_3 = max(0, rent_paid - (basic_salary * 0.1))
+    
+    # Minimum of the three
+    hra_exemption = min(exemption_1, exemption_2, exemption_3)
+    
+    return hra_exemption, exemption_1, exemption_2, exemption_3
+
+
+def calculate_gratuity(current_salary, years_of_service):
+    """Calculate gratuity amount based on Indian labor laws"""
+    # Gratuity formula: (15 * Last Drawn Salary * Years of Service) / 26
+    # Where Last Drawn Salary typically includes basic + DA
+    # For simplicity, we'll use monthly salary as the base
+    
+    # Gratuity is paid only if employee has served for 5 years or more
+    if years_of_service < 5:
+        return 0
+    
+    # Cap years of service at 20 for calculation purposes (though not a legal requirement)
+    capped_service = min(years_of_service, 20)
+    
+    # Monthly salary is used for the calculation
+    monthly_salary = current_salary
+    
+    # Gratuity calculation
+    gratuity_amount = (15 * monthly_salary * capped_service) / 26
+    
+    return gratuity_amount
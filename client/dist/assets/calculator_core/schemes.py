@@ -0,0 +1,259 @@
+"""
+Government Schemes
+PPF, NPS, Atal Pension Yojana and Sukanya Samriddhi Yojana
+"""
+
+def calculate_ppf(annual_investment, interest_rate, years=15):
+    """Calculate Public Provident Fund (PPF) returns"""
+    balance = 0
+    yearly_details = []
+    
+    for year in range(1, years + 1):
+        opening_balance = balance
+        interest = (opening_balance + annual_investment) * (interest_rate / 100)
+        balance = opening_balance + annual_investment + interest
+        
+        yearly_details.append({
+            'year': year,
+            'opening_balance': opening_balance,
+            'investment': annual_investment,
+            'interest': interest,
+            'closing_balance': balance
+        })
+    
+    total_investment = annual_investment * years
+    total_interest = balance - total_investment
+    
+    return balance, total_investment, total_interest, yearly_details
+
+
+def calculate_post_office_ppf(annual_investment, interest_rate, years=15):
+    """
+    Calculate Post Office Public Provident Fund (PPF) returns
+    
+    Args:
+        annual_investment: Annual investment amount (Min: 500, Max: 150000)
+        interest_rate: Annual interest rate (%)
+        years: Investment period (default 15 years, min: 15, max: 50)
+        
+    Returns:
+        Tuple containing (maturity_amount, total_investment, total_interest, yearly_details)
+    """
+    # Post Office PPF has the same calculation logic as regular PPF
+    # but with specific Post Office rules and features
+    
+    balance = 0
+    yearly_details = []
+    
+    for year in range(1, years + 1):
+        opening_balance = balance
+        interest = (opening_balance + annual_investment) * (interest_rate / 100)
+        balance = opening_balance + annual_investment + interest
+        
+        # Track loan eligibility (from 3rd year onwards, up to 6th year)
+        loan_eligible = year >= 3 and year <= 6
+        
+        # Track partial withdrawal eligibility (from 7th year onwards)
+        withdrawal_eligible = year >= 7
+        
+        # Calculate loan limit if eligible (25% of balance at end of 2nd preceding year)
+        loan_limit = 0
+        if loan_eligible and year > 3:
+            # For year 4, we use balance at end of year 2
+            loan_limit = yearly_details[year-4]['closing_balance'] * 0.25 if year-4 >= 0 else 0
+        
+        # Calculate withdrawal limit if eligible
+        withdrawal_limit = 0
+        if withdrawal_eligible:
+            # 50% of balance at end of 4th preceding year
+            withdrawal_limit = yearly_details[year-5]['closing_balance'] * 0.5 if year-5 >= 0 else 0
+        
+        yearly_details.append({
+            'year': year,
+            'opening_balance': opening_balance,
+            'investment': annual_investment,
+            'interest': interest,
+            'closing_balance': balance,
+            'loan_eligible': loan_eligible,
+            'loan_limit': loan_limit if loan_eligible else 0,
+            'withdrawal_eligible': withdrawal_eligible,
+            'withdrawal_limit': withdrawal_limit if withdrawal_eligible else 0
+        })
+    
+    maturity_amount = balance
+    total_investment = annual_investment * years
+    total_interest = maturity_amount - total_investment
+    
+    return maturity_amount, total_investment, total_interest, yearly_details
+
+
+def calculate_nps(monthly_contribution, expected_return, current_age, retirement_age=60):
+    """Calculate National Pension System (NPS) returns"""
+    years = retirement_age - current_age
+    months = years * 12
+    
+    monthly_rate = expected_return / (12 * 100)
+    
+    # Calculate future value of monthly investments
+    corpus = monthly_contribution * ((1 + monthly_rate) * (((1 + monthly_rate)**months - 1) / monthly_rate))
+    
+    # NPS rules: 60% can be withdrawn as lump sum, 40% must be used for annuity
+    lump_sum = corpus * 0.6
+    annuity = corpus * 0.4
+    
+    total_investment = monthly_contribution * months
+    total_returns = corpus - total_investment
+    
+    return corpus, lump_sum, annuity, total_investment, total_returns
+
+
+def calculate_apy(monthly_contribution, current_age, target_pension=1000):
+    """
+    Calculate Atal Pension Yojana (APY) projections and contributions
+    
+    Parameters:
+    -----------
+    monthly_contribution: float
+        Monthly contribution amount
+    current_age: int
+        Current age of the subscriber
+    target_pension: int
+        Target monthly pension (1000, 2000, 3000, 4000, or 5000)
+        
+    Returns:
+    --------
+    tuple
+        (monthly_pension, yearly_contribution, total_contribution, years_of_contribution, 
+         corpus_at_60, return_on_investment, effective_roi_percentage)
+    """
+    # Validate target pension amount (APY has specific tiers only)
+    valid_pension_tiers = [1000, 2000, 3000, 4000, 5000]
+    if target_pension not in valid_pension_tiers:
+        target_pension = min(valid_pension_tiers, key=lambda x: abs(x - target_pension))
+    
+    # Age-based contribution matrix for APY (approximated values)
+    # Format: {target_pension: {age: yearly_contribution}}
+    contribution_matrix = {
+        1000: {
+            18: 210, 20: 248, 25: 376, 30: 577, 35: 902, 40: 1454
+        },
+        2000: {
+            18: 420, 20: 496, 25: 755, 30: 1155, 35: 1803, 40: 2908
+        },
+        3000: {
+            18: 630, 20: 744, 25: 1132, 30: 1733, 35: 2705, 40: 4361
+        },
+        4000: {
+            18: 840, 20: 992, 25: 1510, 30: 2310, 35: 3607, 40: 5815
+        },
+        5000: {
+            18: 1050, 20: 1240, 25: 1888, 30: 2888, 35: 4509, 40: 7269
+        }
+    }
+    
+    # Interpolate for ages not explicitly in the matrix
+    ages = sorted(list(contribution_matrix[target_pension].keys()))
+    if current_age in ages:
+        yearly_contribution = contribution_matrix[target_pension][current_age]
+    else:
+        # Find the closest age brackets
+        lower_age = max([age for age in ages if age <= current_age], default=ages[0])
+        upper_age = min([age for age in ages if age >= current_age], default=ages[-1])
+        
+        if lower_age == upper_age:
+            yearly_contribution = contribution_matrix[target_pension][lower_age]
+        else:
+            # Linear interpolation for contribution
+            lower_contrib = contribution_matrix[target_pension][lower_age]
+            upper_contrib = contribution_matrix[target_pension][upper_age]
+            
+            # Calculate interpolated contribution
+            age_range = upper_age - lower_age
+            age_position = current_age - lower_age
+            yearly_contribution = lower_contrib + (upper_contrib - lower_contrib) * (age_position / age_range)
+            yearly_contribution = round(yearly_contribution)
+    
+    # Calculate total contribution until age 60
+    years_of_contribution = 60 - current_age
+    total_contribution = yearly_contribution * years_of_contribution
+    
+    # APY guarantees a fixed pension, so calculate corpus based on that
+    # Assuming a 5% return rate for the annuity calculation
+    annuity_rate = 0.05  # 5% p.a.
+    # Corpus needed to provide the target pension indefinitely at 5% withdrawal rate
+    corpus_at_60 = (target_pension * 12) / annuity_rate
+    
+    # Calculate return on investment
+    return_on_investment = corpus_at_60 - total_contribution
+    
+    # Calculate effective ROI percentage
+    effective_roi_percentage = (return_on_investment / total_contribution) * 100 if total_contribution > 0 else 0
+    
+    monthly_contribution = yearly_contribution / 12
+    
+    return (target_pension, yearly_contribution, total_contribution, years_of_contribution,
+            corpus_at_60, return_on_investment, effective_roi_percentage, monthly_contribution)
+
+
+def calculate_ssy_returns(annual_investment, interest_rate, girl_age, maturity_age=21):
+    """
+    Calculate Sukanya Samriddhi Yojana (SSY) returns
+    
+    Args:
+        annual_investment: Annual investment amount (Min: 250, Max: 150000)
+        interest_rate: Annual interest rate (%)
+        girl_age: Current age of the girl child (0-10 years)
+        maturity_age: Maturity age (default 21 years)
+        
+    Returns:
+        Dictionary with SSY calculation results
+    """
+    # Validate inputs
+    if girl_age < 0 or girl_age > 10:
+        return None  # Invalid age
+    
+    # Calculate deposit period (15 years from account opening)
+    deposit_years = min(15, maturity_age - girl_age)
+    
+    # Calculate total investment period
+    total_years = maturity_age - girl_age
+    
+    # SSY calculation with annual compounding
+    balance = 0
+    yearly_details = []
+    total_deposit = 0
+    
+    for year in range(1, total_years + 1):
+        opening_balance = balance
+        
+        # Add deposit for deposit duration (first 15 years)
+        deposit = annual_investment if year <= deposit_years else 0
+        total_deposit += deposit
+        
+        # Calculate interest
+        interest = (opening_balance + deposit) * (interest_rate / 100)
+        
+        # Update balance
+        balance = opening_balance + deposit + interest
+        
+        # Store yearly details
+        yearly_details.append({
+            'Year': year,
+            'Age': girl_age + year,
+            'Opening Balance': opening_balance,
+            'Deposit': deposit,
+            'Interest': interest,
+            'Closing Balance': balance
+        })
+    
+    # Calculate returns
+    total_interest = balance - total_deposit
+    
+    return {
+        'yearly_details': yearly_details,
+        'maturity_amount': balance,
+        'total_deposit': total_deposit,
+        'total_interest': total_interest,
+        'deposit_years': deposit_years,
+        'total_years': total_years
+    }
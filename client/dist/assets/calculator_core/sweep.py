@@ -0,0 +1,154 @@
+"""
+Sweep
+Two-input sensitivity surfaces of the calculators for heatmaps and contour plots
+
+sweep evaluates one output of a calculator over every pair of values of two
+of its inputs ("rate x tenure", "SIP amount x return") in a single call,
+instead of re-running the calculator once per slider position:
+
+- calculators with an array kernel (the goal-seek models, which mirror
+  the closed-form calculators, and SWEEP_KERNELS) are evaluated once with
+  the two value axes broadcast against each other;
+- loop-based calculators get a kernel that runs the loop once for the
+  whole grid, stepping every cell together and reading each cell's result
+  off at its own period count;
+- any other calculator_core function is called once per cell, so every
+  calculator can be swept, just without the speed-up.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .goal_seek import GOAL_SEEK_CALCULATORS
+
+# Cells evaluated one call at a time before sweep refuses a non-vectorized calculator
+MAX_UNVECTORIZED_CELLS = 10000
+
+
+def _swp_kernel(corpus, withdrawal_rate, expected_return, time_period):
+    """calculate_swp_returns for arrays of inputs, with the monthly loop shared by every cell"""
+    corpus, withdrawal_rate, expected_return, time_period = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (corpus, withdrawal_rate, expected_return, time_period)))
+    monthly_withdrawal = corpus * (withdrawal_rate / 100 / 12)
+    growth = 1 + expected_return / 100 / 12
+    months = np.rint(time_period * 12).astype(np.int64)
+
+    # The scalar loop reports the corpus before the last month's withdrawal, i.e. after months - 1 steps
+    steps = np.maximum(months - 1, 0)
+    remaining = corpus.copy()
+    final_corpus = corpus.copy()
+    for step in range(1, int(steps.max(initial=0)) + 1):
+        remaining = (remaining - monthly_withdrawal) * growth
+        np.copyto(final_corpus, remaining, where=steps == step)
+
+    return {
+        'final_corpus': final_corpus,
+        'monthly_withdrawal': monthly_withdrawal,
+        'total_withdrawal': monthly_withdrawal * months
+    }
+
+
+def _compound_interest_kernel(principal, rate, time, frequency=12):
+    return {'amount': principal * (1 + rate / 100 / frequency) ** (frequency * time)}
+
+
+def _simple_interest_kernel(principal, rate, time):
+    interest = principal * rate / 100 * time
+    return {'interest': interest, 'total_amount': principal + interest}
+
+
+# Array kernels by core function name; each returns a dict of output -> array
+SWEEP_KERNELS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    "calculate_swp_returns": _swp_kernel,
+    "calculate_compound_interest": _compound_interest_kernel,
+    "calculate_simple_interest": _simple_interest_kernel,
+}
+
+
+def register_kernel(name: str, kernel: Callable[..., Dict[str, np.ndarray]]) -> None:
+    """Make an array kernel of another calculator available to sweep under `name`"""
+    SWEEP_KERNELS[name] = kernel
+
+
+def _kernel(calculator: str) -> Optional[Callable[..., Dict[str, np.ndarray]]]:
+    if calculator in SWEEP_KERNELS:
+        return SWEEP_KERNELS[calculator]
+    solvable = GOAL_SEEK_CALCULATORS.get(calculator)
+    return solvable.model if solvable is not None else None
+
+
+def _select(result: Any, output: Union[str, int, Callable[[Any], float], None]) -> float:
+    """One number out of a calculator's return value (dict key, tuple index or function of it)"""
+    if callable(output):
+        return float(output(result))
+    if output is None:
+        return float(result)
+    return float(result[output])
+
+
+def sweep(calculator: Union[str, Callable[..., Any]], x: str, x_values: Sequence[float], y: str,
+          y_values: Sequence[float], output: Union[str, int, Callable[[Any], float], None] = None,
+          **inputs: Any) -> Dict[str, Any]:
+    """
+    One output of a calculator over a grid of two of its inputs
+
+    Args:
+        calculator: Core function name (e.g. "calculate_sip_returns") or the function itself
+        x: Input varied along the columns of the surface
+        x_values: Values of x
+        y: Input varied along the rows of the surface
+        y_values: Values of y
+        output: Output to map: a key of the calculator's result dict (for
+            kernels, default the first output), an index into a tuple result,
+            a function of the result, or None for calculators returning a number
+        **inputs: The calculator's other inputs, held fixed
+
+    Returns:
+        Dictionary with x, y, x_values, y_values, output, surface (an array of
+        len(y_values) rows by len(x_values) columns, ready as a heatmap's z)
+        and vectorized (False when the calculator was called once per cell)
+    """
+    if x == y:
+        raise ValueError("Sweep two different inputs")
+    if x in inputs or y in inputs:
+        raise TypeError(f"{x!r} and {y!r} are swept and cannot also be given")
+
+    x_values, y_values = np.asarray(x_values), np.asarray(y_values)
+    if x_values.ndim != 1 or y_values.ndim != 1 or not x_values.size or not y_values.size:
+        raise ValueError("x_values and y_values must be non-empty 1-D sequences")
+
+    name = calculator if isinstance(calculator, str) else calculator.__name__
+    kernel = _kernel(name)
+    if kernel is not None and (output is None or isinstance(output, str)):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            result = kernel(**inputs, **{x: x_values.astype(float)[None, :], y: y_values.astype(float)[:, None]})
+        output = output or next(iter(result))
+        if output not in result:
+            raise ValueError(f"{name} has no output {output!r}; expected one of {', '.join(result)}")
+        surface = np.broadcast_to(np.asarray(result[output], dtype=float), (y_values.size, x_values.size)).copy()
+        vectorized = True
+    else:
+        if isinstance(calculator, str):
+            function = getattr(importlib.import_module(__package__), calculator, None)
+            if not callable(function):
+                raise ValueError(f"Unknown calculator {calculator!r}")
+        else:
+            function = calculator
+        if x_values.size * y_values.size > MAX_UNVECTORIZED_CELLS:
+            raise ValueError(f"{name} has no array kernel; sweep at most {MAX_UNVECTORIZED_CELLS} cells")
+        # tolist() keeps whole-number inputs as ints, which loop-based calculators pass to range()
+        surface = np.array([[_select(function(**inputs, **{x: x_value, y: y_value}), output)
+                             for x_value in x_values.tolist()] for y_value in y_values.tolist()])
+        vectorized = False
+
+    return {
+        'x': x,
+        'y': y,
+        'x_values': x_values,
+        'y_values': y_values,
+        'output': output,
+        'surface': surface,
+        'vectorized': vectorized
+    }
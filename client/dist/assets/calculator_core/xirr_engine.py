@@ -0,0 +1,160 @@
+"""
+XIRR
+Money-weighted annual return of irregular dated cashflows, one series or thousands at once
+
+calculate_cagr needs a single start and end value; a holding bought in lots,
+a SIP with skipped months or a ledger of trades needs the rate at which the
+dated cashflows have zero net present value. xirr_batch solves that for a
+whole batch of series together: each iteration evaluates the NPV and its
+derivative for every series in one array expression and takes a Newton
+step, falling back to bisection of a sign-change bracket whenever Newton
+would leave it. The unknown is the log growth rate log(1 + r), which keeps
+every iterate above -100% and makes Newton well behaved for large gains.
+
+Series of different lengths are padded with zero cashflows. Dates are
+converted to years on an actual/365 basis, as spreadsheet XIRR does.
+
+The server's backtest engine imports this module directly, so it must keep
+depending on NumPy alone.
+"""
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.0
+MAX_ITERATIONS = 60
+# Convergence tolerance on log(1 + rate)
+TOLERANCE = 1e-12
+# Search bracket on log(1 + rate): about -99.75% to +40,000% a year
+LOG_RATE_LIMIT = 6.0
+
+
+def year_fractions(dates: Any, start: Any = None) -> np.ndarray:
+    """
+    Years from `start` (default the earliest date of each series) to each date
+
+    Args:
+        dates: Dates as date/datetime objects, ISO strings or datetime64, one
+            series or a 2-D array of series (one per row)
+        start: Reference date(s); broadcast against the series
+
+    Returns:
+        Array of the same shape as `dates`
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    origin = days.min(axis=-1, keepdims=True) if start is None else np.asarray(start, dtype="datetime64[D]")
+    return (days - origin).astype(float) / DAYS_PER_YEAR
+
+
+def xirr_batch(cashflows: Any, times: Any, guess: Optional[float] = None, max_iterations: int = MAX_ITERATIONS,
+               tolerance: float = TOLERANCE) -> np.ndarray:
+    """
+    Annual XIRR of many cashflow series at once
+
+    Args:
+        cashflows: (series x flows) cashflows, negative for money invested and
+            positive for money received; pad shorter series with zeros
+        times: Time of each flow in years, shared (flows,) or per series (series x flows)
+        guess: Starting annual rate (%); by default each series starts from the
+            rate that grows its outflows into its inflows over the gap between
+            their value-weighted mean times
+        max_iterations: Iteration cap
+        tolerance: Convergence tolerance on log(1 + rate)
+
+    Returns:
+        Annual rate (%) per series; NaN where the cashflows have no root (for
+        example, all of one sign), no unique one (all at the same time) or the
+        iteration did not converge
+    """
+    flows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    times = np.asarray(times, dtype=float)
+    # Shared times stay one row so iterations broadcast instead of copying them per series
+    times = times[None, :] if times.ndim == 1 else np.broadcast_to(times, flows.shape)
+    per_series = times.shape[0] > 1
+
+    count = len(flows)
+    # Flows that all fall at one time (or none at all) have no rate: any rate gives the same NPV
+    present = flows != 0
+    spread = np.where(present, times, -np.inf).max(axis=1) - np.where(present, times, np.inf).min(axis=1)
+    lower = np.full(count, -LOG_RATE_LIMIT)
+    upper = np.full(count, LOG_RATE_LIMIT)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        f_lower = (flows * np.exp(LOG_RATE_LIMIT * times)).sum(axis=1)
+        f_upper = (flows * np.exp(-LOG_RATE_LIMIT * times)).sum(axis=1)
+        bracketed = np.sign(f_lower) * np.sign(f_upper) <= 0
+
+        if guess is None:
+            inflows, outflows = np.maximum(flows, 0), np.maximum(-flows, 0)
+            received, paid = inflows.sum(axis=1), outflows.sum(axis=1)
+            span = (inflows * times).sum(axis=1) / received - (outflows * times).sum(axis=1) / paid
+            log_rate = np.log(received / paid) / span
+            log_rate = np.where(np.isfinite(log_rate), np.clip(log_rate, -LOG_RATE_LIMIT / 2, LOG_RATE_LIMIT / 2), 0.1)
+        else:
+            log_rate = np.full(count, np.log1p(guess / 100))
+        previous_step = upper - lower
+        converged = np.zeros(count, dtype=bool)
+        # Only series still iterating are evaluated
+        active = np.arange(count)
+        for _ in range(max_iterations):
+            x = log_rate[active]
+            series_times = times[active] if per_series else times
+            weighted = flows[active] * np.exp(-x[:, None] * series_times)
+            value = weighted.sum(axis=1)
+            slope = -(weighted * series_times).sum(axis=1)
+
+            # Narrow the bracket around the sign change
+            is_bracketed = bracketed[active]
+            same_as_lower = np.sign(value) == np.sign(f_lower[active])
+            low, high = lower[active], upper[active]
+            low = np.where(is_bracketed & same_as_lower, x, low)
+            high = np.where(is_bracketed & ~same_as_lower, x, high)
+            f_lower[active] = np.where(is_bracketed & same_as_lower, value, f_lower[active])
+            lower[active], upper[active] = low, high
+
+            # Bisect when Newton would leave the bracket or is not halving the step (as in rtsafe)
+            candidate = x - value / slope
+            slow = np.abs(2 * value) > np.abs(previous_step[active] * slope)
+            bisect = is_bracketed & (~np.isfinite(candidate) | (candidate <= low) | (candidate >= high) | slow)
+            candidate = np.where(bisect, (low + high) / 2, candidate)
+
+            step = np.abs(candidate - x)
+            previous_step[active] = step
+            done = (value == 0) | (step <= tolerance * (1 + np.abs(x))) | ~np.isfinite(candidate)
+            log_rate[active] = np.where(done, x, candidate)
+            converged[active] = done & np.isfinite(candidate) & (slope != 0)
+            active = active[~done]
+            if not len(active):
+                break
+
+    solved = converged & (spread > 0) & np.isfinite(log_rate) & (np.abs(log_rate) < LOG_RATE_LIMIT)
+    return np.where(solved, np.expm1(np.where(solved, log_rate, 0)) * 100, np.nan)
+
+
+def xirr(cashflows: Sequence[float], dates: Sequence[Any], guess: Optional[float] = None) -> Optional[float]:
+    """
+    Annual XIRR (%) of one series of dated cashflows
+
+    Args:
+        cashflows: Cashflows, negative for money invested and positive for money received
+        dates: Date of each cashflow (any order)
+        guess: Starting annual rate (%), as for xirr_batch
+
+    Returns:
+        Annual rate in percent, or None if it cannot be determined
+    """
+    if len(cashflows) != len(dates):
+        raise ValueError("Each cashflow needs exactly one date")
+    rate = xirr_batch([cashflows], year_fractions(dates), guess)[0]
+    return float(rate) if np.isfinite(rate) else None
+
+
+def irr(cashflows: Sequence[float], guess: Optional[float] = None) -> Optional[float]:
+    """
+    Per-period IRR (%) of cashflows one period apart, the first at time zero
+
+    Returns:
+        Rate per period in percent, or None if it cannot be determined
+    """
+    rate = xirr_batch([cashflows], np.arange(len(cashflows)), guess)[0]
+    return float(rate) if np.isfinite(rate) else None
@@ -1,8 +1,10 @@
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
+import importlib
 import sys
 import os
 
@@ -11,38 +13,45 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from pages.goal_settings import get_quick_stats
 from utils.navigation import navigate_to
 
-# Import calculator modules
-# We'll define our own implementations if the imports fail
-import plotly.graph_objects as go
-new_calculators_available = True
-
-# Import the vehicle comparison calculators
-try:
-    from utils.calculators.vehicle_comparison_calculator import show_vehicle_comparison_calculator
-except ImportError:
-    def show_vehicle_comparison_calculator():
-        st.error("Vehicle comparison calculator module not found.")
-
-# Import the smart vehicle comparison calculator
-try:
-    from utils.calculators.smart_vehicle_comparison import show_smart_vehicle_comparison
-except ImportError:
-    def show_smart_vehicle_comparison():
-        st.error("Smart vehicle comparison calculator module not found.")
-
-# Import the bike loan calculator
-try:
-    from utils.calculators.bike_loan_calculator import show_bike_loan_calculator
-except ImportError:
-    def show_bike_loan_calculator():
-        st.error("Bike loan calculator module not found.")
-
-# Import the credit card EMI calculator
-try:
-    from utils.calculators.credit_card_emi_calculator import show_credit_card_emi_calculator
-except ImportError:
-    def show_credit_card_emi_calculator():
-        st.error("Credit card EMI calculator module not found.")
+# Calculation functions live in the UI-free calculator_core package; the pages cache them per session
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import calculator_core as core
+
+calculate_compound_interest = st.cache_data(core.calculate_compound_interest)
+calculate_simple_interest = st.cache_data(core.calculate_simple_interest)
+calculate_cagr = st.cache_data(core.calculate_cagr)
+calculate_inflation_effect = st.cache_data(core.calculate_inflation_effect)
+calculate_discount = st.cache_data(core.calculate_discount)
+calculate_gst = st.cache_data(core.calculate_gst)
+calculate_sip_returns = st.cache_data(core.calculate_sip_returns)
+calculate_swp_returns = st.cache_data(core.calculate_swp_returns)
+calculate_stp_returns = core.calculate_stp_returns
+calculate_mutual_fund_comparison = core.calculate_mutual_fund_comparison
+calculate_retirement_needs = st.cache_data(core.calculate_retirement_needs)
+calculate_stock_average = st.cache_data(core.calculate_stock_average)
+calculate_brokerage = st.cache_data(core.calculate_brokerage)
+calculate_loan_emi = st.cache_data(core.calculate_loan_emi)
+calculate_credit_card_emi = st.cache_data(core.calculate_credit_card_emi)
+calculate_fd = st.cache_data(core.calculate_fd)
+calculate_rd = st.cache_data(core.calculate_rd)
+calculate_yes_bank_fd = st.cache_data(core.calculate_yes_bank_fd)
+calculate_kotak_fd = st.cache_data(core.calculate_kotak_fd)
+calculate_axis_fd = st.cache_data(core.calculate_axis_fd)
+calculate_icici_fd = st.cache_data(core.calculate_icici_fd)
+calculate_hdfc_fd = st.cache_data(core.calculate_hdfc_fd)
+calculate_sbi_fd = st.cache_data(core.calculate_sbi_fd)
+calculate_post_office_fd = st.cache_data(core.calculate_post_office_fd)
+calculate_post_office_rd = st.cache_data(core.calculate_post_office_rd)
+calculate_post_office_mis = st.cache_data(core.calculate_post_office_mis)
+calculate_ppf = st.cache_data(core.calculate_ppf)
+calculate_post_office_ppf = core.calculate_post_office_ppf
+calculate_nps = st.cache_data(core.calculate_nps)
+calculate_apy = st.cache_data(core.calculate_apy)
+calculate_ssy_returns = core.calculate_ssy_returns
+calculate_salary_details = st.cache_data(core.calculate_salary_details)
+calculate_hra_exemption = st.cache_data(core.calculate_hra_exemption)
+calculate_gratuity = st.cache_data(core.calculate_gratuity)
+calculate_term_insurance = st.cache_data(core.calculate_term_insurance)
 
 # Define the HRA Exemption calculator function
 def show_hra_calculator():
@@ -156,6 +165,81 @@ def show_hra_calculator():
         fig.update_layout(yaxis_title="Amount (₹)")
         st.plotly_chart(fig, use_container_width=True)
 
+def show_projection_bands(initial, monthly_investment, years, expected_return, volatility, goal=None, inflation_rate=0.0,
+                          compounding="annual"):
+    """Monte Carlo percentile bands of a lumpsum/SIP corpus next to the fixed-return projection"""
+    projection = core.project_corpus(
+        initial, monthly_investment, years, expected_return, volatility,
+        goal=goal or None, inflation_rate=inflation_rate, compounding=compounding
+    )
+    bands = projection['percentiles']
+    years_axis = projection['years']
+
+    st.subheader("🎲 Range of Possible Outcomes")
+    st.caption(
+        f"{projection['paths']:,} simulated markets averaging {expected_return:.1f}% a year with "
+        f"{volatility:.0f}% volatility. The shaded bands hold the middle 50% and 90% of outcomes."
+    )
+
+    fig = go.Figure()
+    for low, high, color in ((5, 95, 'rgba(31,119,180,0.15)'), (25, 75, 'rgba(31,119,180,0.3)')):
+        fig.add_trace(go.Scatter(x=years_axis, y=bands[high], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=years_axis, y=bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor=color, name=f"{low}th-{high}th percentile"))
+    fig.add_trace(go.Scatter(x=years_axis, y=bands[50], mode='lines', name='Median', line=dict(color='#1f77b4', width=3)))
+    fig.add_trace(go.Scatter(x=years_axis, y=projection['deterministic'], mode='lines', name='Fixed-return projection',
+                             line=dict(color='#ff7f0e', dash='dash')))
+    fig.add_trace(go.Scatter(x=years_axis, y=projection['invested'], mode='lines', name='Amount Invested',
+                             line=dict(color='gray', dash='dot')))
+    if goal:
+        fig.add_hline(y=goal, line_dash="dot", line_color="green", annotation_text="Goal")
+    fig.update_layout(xaxis_title="Year", yaxis_title="Amount (₹)", hovermode='x unified')
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Pessimistic (5th percentile)", f"₹{bands[5][-1]:,.0f}")
+    with col2:
+        st.metric("Median Outcome", f"₹{bands[50][-1]:,.0f}")
+    with col3:
+        st.metric("Optimistic (95th percentile)", f"₹{bands[95][-1]:,.0f}")
+
+    if inflation_rate:
+        st.info(f"At {inflation_rate:.1f}% inflation, the median outcome is worth "
+                f"₹{projection['real_percentiles'][50][-1]:,.0f} in today's money.")
+
+    if goal:
+        probability = projection['goal_probability'] * 100
+        message = f"Chance of reaching your goal of ₹{goal:,.0f} in {years} years: **{probability:.0f}%**"
+        if probability >= 75:
+            st.success(message)
+        elif probability >= 40:
+            st.warning(message)
+        else:
+            st.error(message)
+
+
+def show_sensitivity_heatmap(calculator, x, x_values, y, y_values, title, x_title, y_title, output=None,
+                             x_axis=None, y_axis=None, current=None, **inputs):
+    """Heatmap of one calculator output over two inputs, computed as a single core.sweep surface"""
+    surface = core.sweep(calculator, x, x_values, y, y_values, output=output, **inputs)['surface']
+    x_axis = list(x_values if x_axis is None else x_axis)
+    y_axis = list(y_values if y_axis is None else y_axis)
+
+    st.subheader(title)
+    fig = go.Figure(go.Heatmap(
+        z=surface, x=x_axis, y=y_axis, colorscale='Viridis',
+        colorbar=dict(title="₹"),
+        hovertemplate=f"{x_title}: %{{x}}<br>{y_title}: %{{y}}<br>₹%{{z:,.0f}}<extra></extra>"
+    ))
+    if current is not None:
+        fig.add_trace(go.Scatter(x=[current[0]], y=[current[1]], mode='markers', name='Your inputs',
+                                 marker=dict(color='white', size=12, symbol='x', line=dict(color='black', width=1))))
+    fig.update_layout(xaxis_title=x_title, yaxis_title=y_title, showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 # Define the Lumpsum Investment calculator function
 def show_lumpsum_calculator():
     st.header("Lumpsum Investment Calculator")
@@ -198,6 +282,25 @@ def show_lumpsum_calculator():
             step=0.5
         )
     
+    col1, col2 = st.columns(2)
+    with col1:
+        volatility = st.number_input(
+            "Return Volatility (%)",
+            min_value=0.0,
+            max_value=40.0,
+            value=15.0,
+            step=1.0,
+            help="Year-to-year swing in returns: about 15-20% for equity funds, 5% for debt funds"
+        )
+    with col2:
+        goal_amount = st.number_input(
+            "Target Amount (₹, optional)",
+            min_value=0,
+            value=0,
+            step=100000,
+            help="Leave at 0 to skip the goal probability"
+        )
+    
     if st.button("Calculate Returns", use_container_width=True):
         # Calculate future value
         rate = expected_return / 100
@@ -268,6 +371,8 @@ def show_lumpsum_calculator():
             color_discrete_sequence=['#1f77b4', '#ff7f0e']
         )
         st.plotly_chart(fig, use_container_width=True)
+        
+        show_projection_bands(principal, 0, investment_period, expected_return, volatility, goal_amount, inflation_rate)
 
 # Define the PPF calculator function
 def show_ppf_calculator():
@@ -1259,250 +1364,6 @@ def show_income_tax_calculator():
         )
         st.plotly_chart(fig, use_container_width=True)
 
-@st.cache_data
-def calculate_compound_interest(principal, rate, time, frequency=12):
-    """Calculate compound interest with optional monthly contributions"""
-    rate = rate / 100  # Convert percentage to decimal
-    amount = principal * (1 + rate/frequency)**(frequency*time)
-    return amount
-
-@st.cache_data
-def calculate_simple_interest(principal, rate, time):
-    """Calculate simple interest and total amount"""
-    rate = rate / 100  # Convert percentage to decimal
-    interest = principal * rate * time
-    total_amount = principal + interest
-    return interest, total_amount
-
-@st.cache_data
-def calculate_swp_returns(corpus, withdrawal_rate, expected_return, time_period):
-    """Calculate Systematic Withdrawal Plan returns"""
-    monthly_withdrawal = corpus * (withdrawal_rate/100/12)
-    rate = expected_return/100/12  # Monthly rate
-    months = time_period * 12
-
-    # Calculate month-wise corpus and withdrawals
-    corpus_values = []
-    withdrawal_values = []
-    remaining_corpus = corpus
-
-    for month in range(months + 1):
-        corpus_values.append(remaining_corpus)
-        if month > 0:
-            withdrawal_values.append(monthly_withdrawal)
-            remaining_corpus = (remaining_corpus - monthly_withdrawal) * (1 + rate)
-        else:
-            withdrawal_values.append(0)
-
-    total_withdrawal = sum(withdrawal_values)
-    final_corpus = corpus_values[-1]
-
-    return {
-        'corpus_values': corpus_values,
-        'withdrawal_values': withdrawal_values,
-        'monthly_withdrawal': monthly_withdrawal,
-        'total_withdrawal': total_withdrawal,
-        'final_corpus': final_corpus
-    }
-
-@st.cache_data
-def calculate_sip_returns(monthly_investment, expected_return, time_period):
-    """Calculate returns for SIP investments"""
-    rate = expected_return / 100 / 12  # Monthly rate
-    months = time_period * 12
-
-    # Formula for SIP calculation
-    future_value = monthly_investment * ((1 + rate) * (((1 + rate)**months - 1) / rate))
-    total_investment = monthly_investment * months
-    returns = future_value - total_investment
-
-    # Calculate year-wise growth for visualization
-    years = list(range(time_period + 1))
-    invested_amounts = []
-    future_values = []
-
-    for year in years:
-        months = year * 12
-        if months == 0:
-            invested_amounts.append(0)
-            future_values.append(0)
-        else:
-            invested = monthly_investment * months
-            future = monthly_investment * ((1 + rate) * (((1 + rate)**months - 1) / rate))
-            invested_amounts.append(invested)
-            future_values.append(future)
-
-    return future_value, total_investment, returns, years, invested_amounts, future_values
-
-@st.cache_data
-def calculate_retirement_needs(current_age, retirement_age, life_expectancy, 
-                             monthly_expenses, inflation_rate, return_rate):
-    """Calculate retirement needs and required monthly savings"""
-    years_to_retirement = retirement_age - current_age
-    retirement_duration = life_expectancy - retirement_age
-    inflation_rate = inflation_rate / 100
-    return_rate = return_rate / 100
-
-    # Calculate future monthly expenses
-    future_monthly_expenses = monthly_expenses * (1 + inflation_rate)**years_to_retirement
-    total_needed = future_monthly_expenses * 12 * retirement_duration
-
-    # Calculate required monthly savings
-    monthly_payment = total_needed / ((1 + return_rate)**(years_to_retirement) - 1) / (return_rate * 12)
-
-    return total_needed, monthly_payment
-
-@st.cache_data
-def calculate_stock_average(holdings, new_purchase_price, new_purchase_quantity):
-    """Calculate average stock price after a new purchase"""
-    if not holdings:
-        return new_purchase_price, new_purchase_quantity, new_purchase_price * new_purchase_quantity, 0, 0
-    
-    total_quantity = sum(holding['quantity'] for holding in holdings) + new_purchase_quantity
-    total_investment = sum(holding['price'] * holding['quantity'] for holding in holdings) + (new_purchase_price * new_purchase_quantity)
-    average_price = total_investment / total_quantity
-    
-    # Calculate price impact
-    old_average = sum(holding['price'] * holding['quantity'] for holding in holdings) / sum(holding['quantity'] for holding in holdings) if holdings else 0
-    price_change = average_price - old_average
-    percentage_change = (price_change / old_average) * 100 if old_average else 0
-    
-    return average_price, total_quantity, total_investment, price_change, percentage_change
-
-@st.cache_data
-def calculate_cagr(initial_investment, final_value, time_period_years):
-    """Calculate Compound Annual Growth Rate"""
-    if initial_investment <= 0 or time_period_years <= 0:
-        return 0
-    cagr = (final_value / initial_investment) ** (1 / time_period_years) - 1
-    return cagr * 100  # Convert to percentage
-
-@st.cache_data
-def calculate_inflation_effect(current_amount, inflation_rate, years):
-    """Calculate the effect of inflation on purchasing power"""
-    inflation_rate = inflation_rate / 100
-    future_value = current_amount / ((1 + inflation_rate) ** years)
-    return future_value
-
-@st.cache_data
-def calculate_discount(original_price, discount_percentage):
-    """Calculate discount amount and final price"""
-    discount_amount = original_price * (discount_percentage / 100)
-    final_price = original_price - discount_amount
-    return discount_amount, final_price
-
-@st.cache_data
-def calculate_gst(base_amount, gst_rate):
-    """Calculate GST amount and total price"""
-    gst_amount = base_amount * (gst_rate / 100)
-    total_amount = base_amount + gst_amount
-    return gst_amount, total_amount
-
-@st.cache_data
-def calculate_gratuity(current_salary, years_of_service):
-    """Calculate gratuity amount based on Indian labor laws"""
-    # Gratuity formula: (15 * Last Drawn Salary * Years of Service) / 26
-    # Where Last Drawn Salary typically includes basic + DA
-    # For simplicity, we'll use monthly salary as the base
-    
-    # Gratuity is paid only if employee has served for 5 years or more
-    if years_of_service < 5:
-        return 0
-    
-    # Cap years of service at 20 for calculation purposes (though not a legal requirement)
-    capped_service = min(years_of_service, 20)
-    
-    # Monthly salary is used for the calculation
-    monthly_salary = current_salary
-    
-    # Gratuity calculation
-    gratuity_amount = (15 * monthly_salary * capped_service) / 26
-    
-    return gratuity_amount
-
-@st.cache_data
-def calculate_hra_exemption(basic_salary, rent_paid, hra_received, metro_city=True):
-    """Calculate HRA exemption for tax purposes in India"""
-    # HRA exemption is the minimum of:
-    # 1. Actual HRA received
-    # 2. 50% of basic salary (for metro cities) or 40% (for non-metro)
-    # 3. Rent paid - 10% of basic salary
-    
-    percent_of_basic = 0.5 if metro_city else 0.4
-    exemption_1 = hra_received
-    exemption_2 = basic_salary * percent_of_basic
-    exemption_3 = max(0, rent_paid - (basic_salary * 0.1))
-    
-    # Minimum of the three
-    hra_exemption = min(exemption_1, exemption_2, exemption_3)
-    
-    return hra_exemption, exemption_1, exemption_2, exemption_3
-
-@st.cache_data
-def calculate_loan_emi(principal, interest_rate, tenure_months):
-    """Calculate Equated Monthly Installment for a loan"""
-    monthly_rate = interest_rate / (12 * 100)  # Convert annual rate to monthly and percentage to decimal
-    emi = principal * monthly_rate * ((1 + monthly_rate) ** tenure_months) / (((1 + monthly_rate) ** tenure_months) - 1)
-    
-    # Calculate amortization schedule
-    balance = principal
-    amortization_schedule = []
-    total_interest = 0
-    
-    for month in range(1, tenure_months + 1):
-        interest_payment = balance * monthly_rate
-        principal_payment = emi - interest_payment
-        balance = balance - principal_payment
-        total_interest += interest_payment
-        
-        amortization_schedule.append({
-            'month': month,
-            'emi': emi,
-            'principal': principal_payment,
-            'interest': interest_payment,
-            'balance': max(0, balance)
-        })
-    
-    return emi, total_interest, principal + total_interest, amortization_schedule
-
-@st.cache_data
-def calculate_credit_card_emi(purchase_amount, interest_rate, tenure_months, processing_fee_percentage=0):
-    """Calculate EMI for credit card purchases"""
-    processing_fee = purchase_amount * (processing_fee_percentage / 100)
-    loan_amount = purchase_amount + processing_fee
-    
-    monthly_rate = interest_rate / (12 * 100)
-    emi = loan_amount * monthly_rate * ((1 + monthly_rate) ** tenure_months) / (((1 + monthly_rate) ** tenure_months) - 1)
-    
-    total_payment = emi * tenure_months
-    total_interest = total_payment - loan_amount
-    
-    return emi, total_interest, total_payment, processing_fee
-
-@st.cache_data
-def calculate_ppf(annual_investment, interest_rate, years=15):
-    """Calculate Public Provident Fund (PPF) returns"""
-    balance = 0
-    yearly_details = []
-    
-    for year in range(1, years + 1):
-        opening_balance = balance
-        interest = (opening_balance + annual_investment) * (interest_rate / 100)
-        balance = opening_balance + annual_investment + interest
-        
-        yearly_details.append({
-            'year': year,
-            'opening_balance': opening_balance,
-            'investment': annual_investment,
-            'interest': interest,
-            'closing_balance': balance
-        })
-    
-    total_investment = annual_investment * years
-    total_interest = balance - total_investment
-    
-    return balance, total_investment, total_interest, yearly_details
-
 def show_post_office_fd_calculator():
     """Show the Post Office Fixed Deposit (FD) calculator interface"""
     st.header("Post Office Fixed Deposit Calculator 🏤")
@@ -2010,6 +1871,40 @@ def show_post_office_rd_calculator():
             *Note: Rules may change - check with your post office for the latest terms and conditions.*
             """)
 
+def show_fd_offer_ranking(principal, tax_rate, current_bank, top_k=5, **profile):
+    """Best post-tax FD offers across every bank, tenure and payout option for this deposit"""
+    st.markdown("#### 🏆 Best FD Offers Across Banks")
+    st.caption(
+        f"Every bank, tenure from 3 months to 10 years and payout option, ranked by annualised "
+        f"return after {tax_rate:.0f}% tax (rate cards as of {core.RATE_CARD_VERSION})"
+    )
+    offers = core.rank_fd_offers(principal, tax_rate=tax_rate, top_k=top_k, **profile)
+    if not offers:
+        st.info("No bank accepts a deposit of this size.")
+        return
+
+    offers_df = pd.DataFrame([{
+        'Bank': offer['bank'],
+        'Tenure': f"{offer['tenure_days'] // 365}y {offer['tenure_days'] % 365 // 30}m",
+        'Payout': offer['payout_frequency'],
+        'Rate (%)': offer['effective_rate'],
+        'Interest After Tax (₹)': offer['post_tax_interest'],
+        'Post-Tax Yield (%)': offer['post_tax_yield']
+    } for offer in offers])
+
+    def highlight_current(row):
+        return ['background-color: #e6f7e6' if row['Bank'] == current_bank else '' for _ in row]
+
+    st.dataframe(
+        offers_df.style.apply(highlight_current, axis=1).format({
+            'Rate (%)': '{:.2f}%',
+            'Interest After Tax (₹)': '₹{:,.0f}',
+            'Post-Tax Yield (%)': '{:.2f}%'
+        }),
+        use_container_width=True
+    )
+
+
 def show_kotak_fd_calculator():
     """Show the Kotak Mahindra Bank Fixed Deposit (FD) calculator interface"""
     st.header("Kotak Mahindra Bank Fixed Deposit Calculator 🏦")
@@ -2409,40 +2304,36 @@ def show_kotak_fd_calculator():
         # Comparison with other banks
         st.subheader("🏦 How Kotak Mahindra Bank FD Compares")
         
-        # Define approximate competitive rates for comparison
-        comparison_data = {
-            'Bank': ['Kotak Mahindra Bank', 'HDFC Bank', 'ICICI Bank', 'SBI', 'Axis Bank'],
-            'Regular Rate (%)': [interest_rate, interest_rate - 0.1, interest_rate - 0.05, interest_rate - 0.2, interest_rate - 0.15],
-            'Senior Citizen Rate (%)': [
-                interest_rate + 0.5 if senior_citizen else interest_rate + 0.5, 
-                interest_rate + 0.4, 
-                interest_rate + 0.45, 
-                interest_rate + 0.3, 
-                interest_rate + 0.35
-            ],
-            'Unique Features': [
-                'Digital FD bonus, Lower min. amount', 
-                'Super Senior rates, Auto-renewal', 
-                'Higher premature withdrawal rates', 
-                'Widest branch network', 
-                'Woman depositor special rates'
-            ]
-        }
-        
-        comparison_df = pd.DataFrame(comparison_data)
+        # Same deposit and tenure at each bank, from the published rate cards
+        comparison_rows = core.compare_banks(
+            principal, tenure_days, payout_frequency, banks=("kotak", "hdfc", "icici", "sbi", "axis"),
+            senior_citizen=senior_citizen, digital_fd=digital_fd
+        )
+        comparison_df = pd.DataFrame([{
+            'Bank': row['bank'],
+            'Card Rate (%)': row['base_rate'],
+            'Your Rate (%)': row['effective_rate'],
+            'Interest Earned (₹)': row['interest_earned'],
+            'Interest After Tax (₹)': row['interest_earned'] * (1 - tax_rate)
+        } for row in comparison_rows])
         
         # Highlight the current bank
         def highlight_kotak(s):
             is_kotak = s == 'Kotak Mahindra Bank'
             return ['background-color: #e6f7e6' if v else '' for v in is_kotak]
         
-        st.dataframe(
-            comparison_df.style.apply(highlight_kotak, axis=1).format({
-                'Regular Rate (%)': '{:.2f}%',
-                'Senior Citizen Rate (%)': '{:.2f}%'
-            }),
-            use_container_width=True
-        )
+        if not comparison_df.empty:
+            st.dataframe(
+                comparison_df.style.apply(highlight_kotak, axis=1).format({
+                    'Card Rate (%)': '{:.2f}%',
+                    'Your Rate (%)': '{:.2f}%',
+                    'Interest Earned (₹)': '₹{:,.0f}',
+                    'Interest After Tax (₹)': '₹{:,.0f}'
+                }),
+                use_container_width=True
+            )
+        
+        show_fd_offer_ranking(principal, tax_rate * 100, "Kotak Mahindra Bank", senior_citizen=senior_citizen, digital_fd=digital_fd)
         
         # Additional recommendations
         st.subheader("💰 Recommendations Based on Your FD Profile")
@@ -2943,6 +2834,8 @@ def show_axis_fd_calculator():
         comparison_df = pd.DataFrame(comparison_data)
         st.dataframe(comparison_df, use_container_width=True)
         
+        show_fd_offer_ranking(principal, tax_bracket, "Axis Bank", senior_citizen=is_senior, woman_depositor=is_woman, staff=is_staff)
+        
         # Premature withdrawal information
         with st.expander("💰 Premature Withdrawal Rules"):
             st.write("""
@@ -3395,6 +3288,8 @@ def show_icici_fd_calculator():
         comparison_df = pd.DataFrame(comparison_data)
         st.dataframe(comparison_df, use_container_width=True)
         
+        show_fd_offer_ranking(principal, tax_bracket, "ICICI Bank", senior_citizen=is_senior)
+        
         # NRI specific information if applicable
         if is_nre:
             with st.expander("🌎 NRI Banking Information"):
@@ -3861,6 +3756,8 @@ def show_hdfc_fd_calculator():
         comparison_df = pd.DataFrame(comparison_data)
         st.dataframe(comparison_df, use_container_width=True)
         
+        show_fd_offer_ranking(principal, tax_bracket, "HDFC Bank", senior_citizen=is_senior, super_senior=is_super_senior)
+        
         # TDS and taxation information
         with st.expander("📝 TDS & Taxation Details"):
             st.write("""
@@ -4263,6 +4160,8 @@ def show_sbi_fd_calculator():
         comparison_df = pd.DataFrame(comparison_data)
         st.dataframe(comparison_df, use_container_width=True)
         
+        show_fd_offer_ranking(principal, tax_bracket, "SBI", senior_citizen=is_senior)
+        
         # TDS and taxation information
         with st.expander("📝 TDS & Taxation Details"):
             st.write("""
@@ -4624,1623 +4523,101 @@ def show_post_office_mis_calculator():
             *Note: Rules may change - check with your post office for the latest terms and conditions.*
             """)
 
-def calculate_post_office_ppf(annual_investment, interest_rate, years=15):
-    """
-    Calculate Post Office Public Provident Fund (PPF) returns
-    
-    Args:
-        annual_investment: Annual investment amount (Min: 500, Max: 150000)
-        interest_rate: Annual interest rate (%)
-        years: Investment period (default 15 years, min: 15, max: 50)
-        
-    Returns:
-        Tuple containing (maturity_amount, total_investment, total_interest, yearly_details)
-    """
-    # Post Office PPF has the same calculation logic as regular PPF
-    # but with specific Post Office rules and features
-    
-    balance = 0
-    yearly_details = []
-    
-    for year in range(1, years + 1):
-        opening_balance = balance
-        interest = (opening_balance + annual_investment) * (interest_rate / 100)
-        balance = opening_balance + annual_investment + interest
-        
-        # Track loan eligibility (from 3rd year onwards, up to 6th year)
-        loan_eligible = year >= 3 and year <= 6
-        
-        # Track partial withdrawal eligibility (from 7th year onwards)
-        withdrawal_eligible = year >= 7
-        
-        # Calculate loan limit if eligible (25% of balance at end of 2nd preceding year)
-        loan_limit = 0
-        if loan_eligible and year > 3:
-            # For year 4, we use balance at end of year 2
-            loan_limit = yearly_details[year-4]['closing_balance'] * 0.25 if year-4 >= 0 else 0
-        
-        # Calculate withdrawal limit if eligible
-        withdrawal_limit = 0
-        if withdrawal_eligible:
-            # 50% of balance at end of 4th preceding year
-            withdrawal_limit = yearly_details[year-5]['closing_balance'] * 0.5 if year-5 >= 0 else 0
-        
-        yearly_details.append({
-            'year': year,
-            'opening_balance': opening_balance,
-            'investment': annual_investment,
-            'interest': interest,
-            'closing_balance': balance,
-            'loan_eligible': loan_eligible,
-            'loan_limit': loan_limit if loan_eligible else 0,
-            'withdrawal_eligible': withdrawal_eligible,
-            'withdrawal_limit': withdrawal_limit if withdrawal_eligible else 0
-        })
-    
-    maturity_amount = balance
-    total_investment = annual_investment * years
-    total_interest = maturity_amount - total_investment
-    
-    return maturity_amount, total_investment, total_interest, yearly_details
-
-@st.cache_data
-def calculate_fd(principal, interest_rate, tenure_years, compounding_frequency=4):
-    """Calculate Fixed Deposit returns"""
-    # Compounding frequency: 1=annual, 4=quarterly, 12=monthly
-    periods = tenure_years * compounding_frequency
-    rate_per_period = interest_rate / (100 * compounding_frequency)
-    
-    maturity_amount = principal * ((1 + rate_per_period) ** periods)
-    interest_earned = maturity_amount - principal
-    
-    return maturity_amount, interest_earned
-
-@st.cache_data
-def calculate_term_insurance(age, annual_income, liabilities, dependent_years, existing_coverage=0, savings=0, investment_assets=0, income_replacement=0.6, expense_multiple=300, method="income_replacement"):
-    """
-    Calculate adequate term insurance coverage based on different methods
-    
-    Args:
-        age: Current age of the individual
-        annual_income: Annual income before tax
-        liabilities: Outstanding loans and liabilities
-        dependent_years: Number of years dependents will rely on the income
-        existing_coverage: Existing term insurance coverage (if any)
-        savings: Current liquid savings
-        investment_assets: Current investment assets (excluding real estate)
-        income_replacement: Percentage of income to be replaced (0.5 to 0.7 typically)
-        expense_multiple: Multiple of annual expenses for Human Life Value method
-        method: Calculation method ("income_replacement", "income_multiple", "human_life_value")
-        
-    Returns:
-        Dictionary containing coverage recommendations, rationale and detailed breakdown
-    """
-    results = {}
-    
-    # Method 1: Income Replacement Method
-    monthly_income = annual_income / 12
-    years_to_retirement = min(60 - age, dependent_years) if age < 60 else 0
-    if years_to_retirement <= 0:
-        income_replacement_value = 0
-    else:
-        # Calculate present value of future income stream
-        # Assuming 7% interest rate and 5% inflation, net discount rate is ~2%
-        discount_rate = 0.02
-        
-        # Formula for present value of future income stream
-        # PV = PMT * ((1 - (1 + r)^-n) / r)
-        if discount_rate > 0:
-            income_replacement_value = (monthly_income * income_replacement * 12) * (
-                (1 - (1 + discount_rate) ** -years_to_retirement) / discount_rate
-            )
-        else:
-            income_replacement_value = (monthly_income * income_replacement * 12) * years_to_retirement
-            
-    # Add liabilities to the required coverage
-    income_replacement_coverage = income_replacement_value + liabilities
-    
-    # Deduct existing assets
-    income_replacement_coverage = max(0, income_replacement_coverage - savings - investment_assets - existing_coverage)
+def show_stp_calculator():
+    """Show the Systematic Transfer Plan (STP) calculator interface"""
+    st.header("Systematic Transfer Plan (STP) Calculator")
+    st.write("""
+    STP is an investment strategy that involves transferring a fixed amount from one mutual fund to another at regular intervals.
+    This calculator helps compare STP strategy with lumpsum investments and analyze potential benefits.
+    """)
     
-    # Round to nearest lakh
-    income_replacement_coverage = round(income_replacement_coverage / 100000) * 100000
+    st.info("""
+    ### 💡 What is an STP?
+    - **Systematic Transfer Plan (STP)** allows you to transfer money from one mutual fund to another at regular intervals
+    - Typically used to move from low-risk funds (like liquid funds) to higher-risk funds (like equity) in a phased manner
+    - Helps manage volatility and reduce risk through rupee-cost averaging
+    - Allows your money to stay invested while gradually changing your asset allocation
+    """)
     
-    # Method 2: Income Multiple Method (10-15x annual income)
-    income_multiple = 10 if age <= 30 else (
-        15 if age <= 40 else (
-            12 if age <= 50 else 10
+    col1, col2 = st.columns(2)
+    with col1:
+        initial_amount = st.number_input(
+            "Initial Investment in Source Fund (₹)",
+            min_value=10000,
+            value=1000000,
+            step=10000,
+            help="Amount initially invested in the source fund (typically a liquid or debt fund)"
         )
-    )
-    
-    income_multiple_coverage = annual_income * income_multiple
-    income_multiple_coverage = max(0, income_multiple_coverage - existing_coverage)
-    income_multiple_coverage = round(income_multiple_coverage / 100000) * 100000
-    
-    # Method 3: Human Life Value Method
-    annual_expenses = annual_income * 0.7  # Assuming 70% of income goes to expenses
-    hlv_base = annual_expenses * expense_multiple / 100  # Convert expense_multiple from percentage
-    
-    # Adjust for age (younger age means more coverage)
-    age_factor = 1.2 if age < 30 else (
-        1 if age < 40 else (
-            0.8 if age < 50 else 0.6
+        time_period = st.number_input(
+            "STP Duration (Months)",
+            min_value=3,
+            max_value=60,
+            value=12,
+            help="Number of months over which funds will be transferred"
+        )
+        monthly_transfer = st.number_input(
+            "Monthly Transfer Amount (₹)",
+            min_value=1000,
+            max_value=initial_amount,
+            value=min(initial_amount // time_period, 100000),
+            step=1000,
+            help="Amount transferred each month from source to target fund"
         )
-    )
-    
-    hlv_coverage = hlv_base * age_factor
-    hlv_coverage = max(0, hlv_coverage - existing_coverage)
-    hlv_coverage = round(hlv_coverage / 100000) * 100000
-    
-    # Store all method results for comparison
-    results["income_replacement"] = {
-        "coverage": income_replacement_coverage,
-        "description": f"{income_replacement*100:.0f}% income replacement for {years_to_retirement} years + liabilities - assets",
-        "formula": f"({monthly_income:,.0f} × {income_replacement:.1f} × 12 × PV factor for {years_to_retirement} years) + {liabilities:,.0f} - {savings + investment_assets:,.0f} - {existing_coverage:,.0f}",
-        "breakdown": {
-            "future_income_pv": income_replacement_value,
-            "liabilities": liabilities,
-            "assets_deducted": savings + investment_assets + existing_coverage,
-            "years_considered": years_to_retirement,
-            "income_percentage": income_replacement
-        }
-    }
-    
-    results["income_multiple"] = {
-        "coverage": income_multiple_coverage,
-        "description": f"{income_multiple}x annual income - existing coverage",
-        "formula": f"{annual_income:,.0f} × {income_multiple} - {existing_coverage:,.0f}",
-        "breakdown": {
-            "income_multiple_used": income_multiple,
-            "annual_income": annual_income,
-            "existing_coverage": existing_coverage
-        }
-    }
-    
-    results["human_life_value"] = {
-        "coverage": hlv_coverage,
-        "description": f"{expense_multiple}x monthly expenses adjusted for age",
-        "formula": f"({annual_income:,.0f} × 0.7 × {expense_multiple/100:.1f}) × {age_factor:.1f} - {existing_coverage:,.0f}",
-        "breakdown": {
-            "annual_expenses": annual_expenses,
-            "expense_multiple": expense_multiple/100,
-            "age_factor": age_factor,
-            "existing_coverage": existing_coverage
-        }
-    }
-    
-    # Determine recommended coverage based on selected method
-    if method == "income_replacement":
-        recommended_coverage = income_replacement_coverage
-        method_description = "Income Replacement Method"
-    elif method == "income_multiple":
-        recommended_coverage = income_multiple_coverage
-        method_description = "Income Multiple Method"
-    elif method == "human_life_value":
-        recommended_coverage = hlv_coverage
-        method_description = "Human Life Value Method"
-    
-    # Additional insights
-    recommendations = []
-    
-    if age < 30:
-        recommendations.append("Consider longer policy term (up to age 60-65) for cost efficiency")
-    
-    if liabilities > annual_income * 5:
-        recommendations.append("High debt ratio detected. Consider separate mortgage protection insurance")
-    
-    if dependent_years > 0 and dependent_years < 10:
-        recommendations.append("Short-term dependency detected. Consider decreasing term coverage")
-    
-    if annual_income > 2500000:
-        recommendations.append("Higher income detected. Consider critical illness and disability riders")
-    
-    if existing_coverage > 0 and existing_coverage < recommended_coverage * 0.5:
-        recommendations.append("Significant coverage gap detected. Consider increasing coverage")
-    
-    results["recommended"] = {
-        "coverage": recommended_coverage,
-        "method": method_description,
-        "recommendations": recommendations
-    }
-    
-    # Premium estimate (approximation based on average term rates)
-    # These are rough estimates - actual premiums will vary by insurer
-    base_premium_per_lakh = 0
-    
-    if age < 30:
-        base_premium_per_lakh = 600
-    elif age < 35:
-        base_premium_per_lakh = 700
-    elif age < 40:
-        base_premium_per_lakh = 850
-    elif age < 45:
-        base_premium_per_lakh = 1100
-    elif age < 50:
-        base_premium_per_lakh = 1600
-    elif age < 55:
-        base_premium_per_lakh = 2400
-    else:
-        base_premium_per_lakh = 3500
-    
-    # Adjust for policy term
-    policy_term = min(60 - age, dependent_years) if age < 60 else 0
-    term_factor = 1.0
-    
-    if policy_term > 30:
-        term_factor = 1.3
-    elif policy_term > 25:
-        term_factor = 1.2
-    elif policy_term > 20:
-        term_factor = 1.1
-    elif policy_term < 15:
-        term_factor = 0.9
-    
-    coverage_in_lakhs = recommended_coverage / 100000
-    annual_premium_estimate = base_premium_per_lakh * coverage_in_lakhs * term_factor
-    monthly_premium_estimate = annual_premium_estimate / 12
-    
-    results["premium_estimate"] = {
-        "annual": annual_premium_estimate,
-        "monthly": monthly_premium_estimate,
-        "parameters": {
-            "age": age,
-            "coverage_in_lakhs": coverage_in_lakhs,
-            "policy_term": policy_term,
-            "base_premium_per_lakh": base_premium_per_lakh,
-            "term_factor": term_factor
-        }
-    }
-    
-    # Return complete results
-    return results
-
-@st.cache_data
-def calculate_yes_bank_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, yes_premia=False, yes_first=False):
-    """
-    Calculate Yes Bank Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 10000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
-        yes_premia: Whether the investor is a Yes Premia customer (gets 0.1% additional interest)
-        yes_first: Whether the investor is a Yes First customer (gets 0.25% additional interest)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
-    """
-    # Apply special rates based on depositor category
-    effective_rate = interest_rate
-    
-    # Special customer category benefits
-    if yes_first:
-        effective_rate += 0.25  # 0.25% additional for Yes First customers
-    elif yes_premia:
-        effective_rate += 0.1  # 0.1% additional for Yes Premia customers
-    
-    # Senior citizen benefit
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
-    
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
-        
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    # NRE account benefit
-    nre_tax_benefit = 0
-    if nre_account:
-        # Interest income is tax-free for NRE accounts
-        nre_tax_benefit = interest_earned * 0.3  # Assuming 30% tax bracket
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None, nre_tax_benefit if nre_account else None
-
-@st.cache_data
-def calculate_kotak_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, digital_fd=False):
-    """
-    Calculate Kotak Mahindra Bank Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 5000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
-        digital_fd: Whether the FD is booked through digital channels (gets 0.1% additional interest)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
-    """
-    # Apply special rates based on depositor category
-    effective_rate = interest_rate
-    
-    # Digital channel benefit
-    if digital_fd:
-        effective_rate += 0.1  # 0.1% additional for digital bookings
-    
-    # Senior citizen benefit
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
     
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
+    with col2:
+        source_return = st.number_input(
+            "Source Fund Expected Annual Return (%)",
+            min_value=1.0,
+            max_value=15.0,
+            value=6.0,
+            step=0.1,
+            help="Expected return of source fund (typically lower for debt/liquid funds)"
+        )
+        target_return = st.number_input(
+            "Target Fund Expected Annual Return (%)",
+            min_value=1.0,
+            max_value=30.0,
+            value=12.0,
+            step=0.1,
+            help="Expected return of target fund (typically higher for equity funds)"
+        )
         
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    # NRE account benefit
-    nre_tax_benefit = 0
-    if nre_account:
-        # Interest income is tax-free for NRE accounts
-        nre_tax_benefit = interest_earned * 0.3  # Assuming 30% tax bracket
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None, nre_tax_benefit if nre_account else None
-
-@st.cache_data
-def calculate_axis_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False, woman_depositor=False, staff_special_rate=False):
-    """
-    Calculate Axis Bank Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 5000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
-        woman_depositor: Whether the depositor is a woman (gets 0.1% additional interest in some schemes)
-        staff_special_rate: Whether the depositor is a staff member (gets 1% additional interest)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings, nre_tax_benefit)
-    """
-    # Apply special rates based on depositor category
-    effective_rate = interest_rate
-    
-    if staff_special_rate:
-        effective_rate += 1.0  # 1% additional for bank staff
-    elif senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    if woman_depositor and not staff_special_rate:  # Staff rate overrides woman rate
-        effective_rate += 0.1  # 0.1% additional for women depositors
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
+        # Auto-recommend STP duration
+        if st.checkbox("Get Recommended STP Duration"):
+            # Simple logic: Higher volatility (equity) = longer duration
+            # Gap between target and source returns as proxy for volatility
+            return_gap = target_return - source_return
+            if return_gap > 10:
+                recommended_months = 12
+            elif return_gap > 6:
+                recommended_months = 9
+            else:
+                recommended_months = 6
+                
+            st.write(f"Recommended STP Duration: **{recommended_months} months**")
+            st.write("*Based on the return differential between funds*")
     
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
+    if st.button("Calculate STP Strategy", use_container_width=True):
+        # Check if transfer amount is valid
+        if monthly_transfer * time_period > initial_amount:
+            st.error(f"""
+            ⚠️ **Invalid STP Parameters**
+            Your monthly transfer (₹{monthly_transfer:,.2f}) over {time_period} months (total ₹{monthly_transfer*time_period:,.2f}) 
+            exceeds your initial investment (₹{initial_amount:,.2f}).
+            Please adjust your parameters.
+            """)
+            return
+            
+        results = calculate_stp_returns(
+            initial_amount,
+            monthly_transfer,
+            source_return,
+            target_return,
+            time_period
+        )
         
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    # NRE account benefit
-    nre_tax_benefit = 0
-    if nre_account:
-        # Interest income is tax-free for NRE accounts
-        nre_tax_benefit = interest_earned * 0.3  # Assuming 30% tax bracket
-    
-    # Calculate loyalty bonus if applicable (for renewals)
-    loyalty_bonus = 0
-    loyalty_bonus_text = ""
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None, nre_tax_benefit if nre_account else None, loyalty_bonus, loyalty_bonus_text
-
-@st.cache_data
-def calculate_icici_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, nre_account=False):
-    """
-    Calculate ICICI Bank Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 10000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        nre_account: Whether the deposit is in an NRE account (tax-free interest for NRIs)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
-    """
-    # Apply senior citizen additional interest if applicable
-    effective_rate = interest_rate
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
-    
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
-        
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    # NRE account benefit
-    nre_tax_benefit = 0
-    if nre_account:
-        # Interest income is tax-free for NRE accounts
-        nre_tax_benefit = interest_earned * 0.3  # Assuming 30% tax bracket
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None, nre_tax_benefit if nre_account else None
-
-@st.cache_data
-def calculate_hdfc_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False, super_senior=False):
-    """
-    Calculate HDFC Bank Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 5000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        super_senior: Whether the investor is a super senior citizen (80+ years, gets 0.75% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
-    """
-    # Apply senior citizen or super senior additional interest if applicable
-    effective_rate = interest_rate
-    if super_senior:
-        effective_rate += 0.75  # 0.75% additional for super senior citizens (80+ years)
-    elif senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
-    
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
-        
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None
-
-@st.cache_data
-def calculate_sbi_fd(principal, interest_rate, tenure_days, payout_frequency="At Maturity", senior_citizen=False, tax_saving=False):
-    """
-    Calculate SBI Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested (Min: 1000)
-        interest_rate: Annual interest rate (%)
-        tenure_days: Tenure in days
-        payout_frequency: Interest payout frequency ("At Maturity", "Monthly", "Quarterly", "Half-Yearly", "Yearly")
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        tax_saving: Whether it's a tax-saving FD (5-year lock-in with 80C benefits)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details)
-    """
-    # Apply senior citizen additional interest if applicable
-    effective_rate = interest_rate
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert tenure to years for calculations
-    tenure_years = tenure_days / 365.25
-    
-    # Define compounding frequency based on payout frequency
-    compounding_map = {
-        "At Maturity": 1,  # Annual compounding for maturity payout
-        "Yearly": 1,
-        "Half-Yearly": 2,
-        "Quarterly": 4,
-        "Monthly": 12
-    }
-    
-    compounding_frequency = compounding_map[payout_frequency]
-    
-    # For payout options other than at maturity, interest is paid out and not compounded
-    if payout_frequency == "At Maturity":
-        # Calculate with compound interest
-        rate_per_period = effective_rate / (100 * compounding_frequency)
-        periods = tenure_years * compounding_frequency
-        
-        maturity_amount = principal * ((1 + rate_per_period) ** periods)
-        interest_earned = maturity_amount - principal
-        periodic_payout = 0  # No periodic payout
-    else:
-        # Calculate with simple interest for periodic payouts
-        annual_interest = principal * (effective_rate / 100)
-        
-        # Calculate periodic payout based on frequency
-        if payout_frequency == "Monthly":
-            periodic_payout = annual_interest / 12
-        elif payout_frequency == "Quarterly":
-            periodic_payout = annual_interest / 4
-        elif payout_frequency == "Half-Yearly":
-            periodic_payout = annual_interest / 2
-        else:  # Yearly
-            periodic_payout = annual_interest
-        
-        # Total interest earned
-        interest_earned = annual_interest * tenure_years
-        maturity_amount = principal  # Principal is returned at maturity
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    periods_total = int(tenure_years * compounding_frequency)
-    
-    if payout_frequency == "At Maturity":
-        # Compound interest growth
-        for period in range(1, periods_total + 1):
-            opening_balance = current_value
-            interest = opening_balance * rate_per_period
-            current_value = opening_balance + interest
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{12//compounding_frequency} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': 0,
-                'closing_balance': current_value
-            })
-    else:
-        # Simple interest with periodic payouts
-        period_length_months = 12 // compounding_frequency
-        for period in range(1, periods_total + 1):
-            opening_balance = principal  # Balance remains constant
-            interest = periodic_payout
-            
-            growth_details.append({
-                'period': period,
-                'period_type': f"{period_length_months} months",
-                'opening_balance': opening_balance,
-                'interest': interest,
-                'payout': interest,
-                'closing_balance': opening_balance  # Unchanged
-            })
-    
-    # Calculate additional details for tax-saving FD
-    tax_savings = 0
-    if tax_saving:
-        # Assuming 30% tax bracket for maximum savings
-        tax_savings = min(principal, 150000) * 0.3
-    
-    return maturity_amount, interest_earned, effective_rate, periodic_payout, growth_details, tax_savings if tax_saving else None
-
-@st.cache_data
-def calculate_post_office_mis(principal, interest_rate, tenure_years=5, senior_citizen=False):
-    """
-    Calculate Post Office Monthly Income Scheme (MIS) returns
-    
-    Args:
-        principal: Principal amount invested (Min: 1000, Max: 4.5 lakhs for single, 9 lakhs for joint account)
-        interest_rate: Annual interest rate (%)
-        tenure_years: Tenure in years (fixed at 5 years for Post Office MIS)
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        
-    Returns:
-        Tuple containing (monthly_income, total_income, maturity_amount, effective_rate, monthly_details)
-    """
-    # Apply senior citizen additional interest if applicable
-    effective_rate = interest_rate
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Calculate monthly income (principal * annual rate / 12)
-    monthly_income = principal * (effective_rate / 100) / 12
-    
-    # Calculate total income over the tenure
-    total_months = tenure_years * 12
-    total_income = monthly_income * total_months
-    
-    # Maturity amount equals principal (no compound interest, just monthly payouts)
-    maturity_amount = principal
-    
-    # Generate monthly details
-    monthly_details = []
-    for month in range(1, total_months + 1):
-        year = (month - 1) // 12 + 1
-        month_in_year = (month - 1) % 12 + 1
-        
-        monthly_details.append({
-            'month': month,
-            'year': year,
-            'month_in_year': month_in_year,
-            'monthly_income': monthly_income,
-            'cumulative_income': monthly_income * month,
-            'principal_balance': principal  # Constant throughout
-        })
-    
-    return monthly_income, total_income, maturity_amount, effective_rate, monthly_details
-
-@st.cache_data
-def calculate_post_office_rd(monthly_investment, interest_rate, tenure_months, senior_citizen=False):
-    """
-    Calculate Post Office Recurring Deposit (RD) returns
-    
-    Args:
-        monthly_investment: Monthly investment amount (Min: 100)
-        interest_rate: Annual interest rate (%)
-        tenure_months: Tenure in months (must be in multiples of 12, between 12 and 120)
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        
-    Returns:
-        Tuple containing (maturity_amount, total_investment, interest_earned, effective_rate, monthly_details)
-    """
-    # Apply senior citizen additional interest if applicable
-    effective_rate = interest_rate
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Convert annual rate to monthly
-    monthly_rate = effective_rate / (12 * 100)
-    
-    # Initialize tracking variables
-    total_investment = 0
-    monthly_details = []
-    current_value = 0
-    
-    # Calculate month by month growth
-    for month in range(1, tenure_months + 1):
-        # Add this month's deposit
-        total_investment += monthly_investment
-        
-        # Calculate opening balance (previous month's closing balance)
-        opening_balance = current_value
-        
-        # Add monthly deposit
-        balance_after_deposit = opening_balance + monthly_investment
-        
-        # Calculate interest for the month
-        # In Post Office RD, interest is calculated on end-of-month balance
-        # For each completed month
-        if month > 1:
-            interest = opening_balance * monthly_rate
-        else:
-            interest = 0  # No interest in first month on the first deposit
-        
-        # Update current value
-        current_value = balance_after_deposit + interest
-        
-        # Store monthly details
-        monthly_details.append({
-            'month': month,
-            'opening_balance': opening_balance,
-            'deposit': monthly_investment,
-            'interest': interest,
-            'closing_balance': current_value
-        })
-    
-    maturity_amount = current_value
-    interest_earned = maturity_amount - total_investment
-    
-    return maturity_amount, total_investment, interest_earned, effective_rate, monthly_details
-
-@st.cache_data
-def calculate_post_office_fd(principal, interest_rate, tenure_years, senior_citizen=False):
-    """
-    Calculate Post Office Fixed Deposit returns
-    
-    Args:
-        principal: Principal amount invested
-        interest_rate: Annual interest rate (%)
-        tenure_years: Tenure in years (1, 2, 3, or 5 years)
-        senior_citizen: Whether the investor is a senior citizen (gets 0.5% additional interest)
-        
-    Returns:
-        Tuple containing (maturity_amount, interest_earned, effective_rate, quarterly_interest)
-    """
-    # Post Office FD has interest compounded quarterly but paid annually
-    compounding_frequency = 4  # Quarterly compounding
-    
-    # Apply senior citizen additional interest if applicable
-    effective_rate = interest_rate
-    if senior_citizen:
-        effective_rate += 0.5  # 0.5% additional for senior citizens
-    
-    # Periods for quarterly compounding
-    periods = tenure_years * compounding_frequency
-    rate_per_period = effective_rate / (100 * compounding_frequency)
-    
-    # Calculate maturity amount
-    maturity_amount = principal * ((1 + rate_per_period) ** periods)
-    interest_earned = maturity_amount - principal
-    
-    # Calculate quarterly interest (for quarterly payout option)
-    quarterly_interest = principal * (effective_rate / 400)  # Principal * (rate/4)/100
-    
-    # Generate growth details
-    growth_details = []
-    current_value = principal
-    
-    for quarter in range(1, periods + 1):
-        opening_balance = current_value
-        interest = opening_balance * rate_per_period
-        current_value = opening_balance + interest
-        
-        growth_details.append({
-            'quarter': quarter,
-            'opening_balance': opening_balance,
-            'interest': interest,
-            'closing_balance': current_value
-        })
-    
-    return maturity_amount, interest_earned, effective_rate, quarterly_interest, growth_details
-
-@st.cache_data
-def calculate_rd(monthly_investment, interest_rate, tenure_months, compounding_frequency=4):
-    """Calculate Recurring Deposit returns"""
-    # Formula for RD: P * n * (1 + r/q)^(nq) - 1 / (1 + r/q)^(1/q) - 1
-    # Where P = monthly installment, n = tenure in months, r = rate/100, q = compounding frequency
-    
-    r = interest_rate / 100
-    q = compounding_frequency
-    n = tenure_months / 12  # Convert months to years
-    
-    # For quarterly compounding in RD
-    maturity_amount = monthly_investment * tenure_months * (1 + r/q)**(n*q)
-    
-    total_investment = monthly_investment * tenure_months
-    interest_earned = maturity_amount - total_investment
-    
-    return maturity_amount, interest_earned, total_investment
-
-@st.cache_data
-def calculate_nps(monthly_contribution, expected_return, current_age, retirement_age=60):
-    """Calculate National Pension System (NPS) returns"""
-    years = retirement_age - current_age
-    months = years * 12
-    
-    monthly_rate = expected_return / (12 * 100)
-    
-    # Calculate future value of monthly investments
-    corpus = monthly_contribution * ((1 + monthly_rate) * (((1 + monthly_rate)**months - 1) / monthly_rate))
-    
-    # NPS rules: 60% can be withdrawn as lump sum, 40% must be used for annuity
-    lump_sum = corpus * 0.6
-    annuity = corpus * 0.4
-    
-    total_investment = monthly_contribution * months
-    total_returns = corpus - total_investment
-    
-    return corpus, lump_sum, annuity, total_investment, total_returns
-
-@st.cache_data
-def calculate_apy(monthly_contribution, current_age, target_pension=1000):
-    """
-    Calculate Atal Pension Yojana (APY) projections and contributions
-    
-    Parameters:
-    -----------
-    monthly_contribution: float
-        Monthly contribution amount
-    current_age: int
-        Current age of the subscriber
-    target_pension: int
-        Target monthly pension (1000, 2000, 3000, 4000, or 5000)
-        
-    Returns:
-    --------
-    tuple
-        (monthly_pension, yearly_contribution, total_contribution, years_of_contribution, 
-         corpus_at_60, return_on_investment, effective_roi_percentage)
-    """
-    # Validate target pension amount (APY has specific tiers only)
-    valid_pension_tiers = [1000, 2000, 3000, 4000, 5000]
-    if target_pension not in valid_pension_tiers:
-        target_pension = min(valid_pension_tiers, key=lambda x: abs(x - target_pension))
-    
-    # Age-based contribution matrix for APY (approximated values)
-    # Format: {target_pension: {age: yearly_contribution}}
-    contribution_matrix = {
-        1000: {
-            18: 210, 20: 248, 25: 376, 30: 577, 35: 902, 40: 1454
-        },
-        2000: {
-            18: 420, 20: 496, 25: 755, 30: 1155, 35: 1803, 40: 2908
-        },
-        3000: {
-            18: 630, 20: 744, 25: 1132, 30: 1733, 35: 2705, 40: 4361
-        },
-        4000: {
-            18: 840, 20: 992, 25: 1510, 30: 2310, 35: 3607, 40: 5815
-        },
-        5000: {
-            18: 1050, 20: 1240, 25: 1888, 30: 2888, 35: 4509, 40: 7269
-        }
-    }
-    
-    # Interpolate for ages not explicitly in the matrix
-    ages = sorted(list(contribution_matrix[target_pension].keys()))
-    if current_age in ages:
-        yearly_contribution = contribution_matrix[target_pension][current_age]
-    else:
-        # Find the closest age brackets
-        lower_age = max([age for age in ages if age <= current_age], default=ages[0])
-        upper_age = min([age for age in ages if age >= current_age], default=ages[-1])
-        
-        if lower_age == upper_age:
-            yearly_contribution = contribution_matrix[target_pension][lower_age]
-        else:
-            # Linear interpolation for contribution
-            lower_contrib = contribution_matrix[target_pension][lower_age]
-            upper_contrib = contribution_matrix[target_pension][upper_age]
-            
-            # Calculate interpolated contribution
-            age_range = upper_age - lower_age
-            age_position = current_age - lower_age
-            yearly_contribution = lower_contrib + (upper_contrib - lower_contrib) * (age_position / age_range)
-            yearly_contribution = round(yearly_contribution)
-    
-    # Calculate total contribution until age 60
-    years_of_contribution = 60 - current_age
-    total_contribution = yearly_contribution * years_of_contribution
-    
-    # APY guarantees a fixed pension, so calculate corpus based on that
-    # Assuming a 5% return rate for the annuity calculation
-    annuity_rate = 0.05  # 5% p.a.
-    # Corpus needed to provide the target pension indefinitely at 5% withdrawal rate
-    corpus_at_60 = (target_pension * 12) / annuity_rate
-    
-    # Calculate return on investment
-    return_on_investment = corpus_at_60 - total_contribution
-    
-    # Calculate effective ROI percentage
-    effective_roi_percentage = (return_on_investment / total_contribution) * 100 if total_contribution > 0 else 0
-    
-    monthly_contribution = yearly_contribution / 12
-    
-    return (target_pension, yearly_contribution, total_contribution, years_of_contribution,
-            corpus_at_60, return_on_investment, effective_roi_percentage, monthly_contribution)
-
-@st.cache_data
-def calculate_salary_details(basic_salary, hra, allowances, bonus, investments, rent_paid, metro_city, pf_contribution=0, 
-                        professional_tax=2400, is_self_employed=False, standard_deduction=50000):
-    """Calculate salary breakdown and tax details
-    
-    Args:
-        basic_salary: Annual basic salary
-        hra: Annual House Rent Allowance
-        allowances: Annual other allowances (all taxable)
-        bonus: Annual bonus/performance pay
-        investments: Annual tax saving investments (up to 150000 under 80C)
-        rent_paid: Annual rent paid for HRA exemption
-        metro_city: Whether living in a metro city (for HRA exemption)
-        pf_contribution: Annual employee PF contribution (default 0)
-        professional_tax: Annual professional tax (default 2400)
-        is_self_employed: Whether person is self-employed (default False)
-        standard_deduction: Standard deduction amount (default 50000)
-        
-    Returns:
-        Dictionary with salary, tax and take-home pay details
-    """
-    # Calculate annual gross salary
-    gross_salary = basic_salary + hra + allowances + bonus
-    
-    # Calculate HRA exemption
-    if rent_paid > 0:
-        hra_exemption = min(
-            hra,
-            rent_paid - 0.1 * basic_salary,
-            0.5 * basic_salary if metro_city else 0.4 * basic_salary
-        )
-        hra_exemption = max(0, hra_exemption)  # Ensure non-negative
-    else:
-        hra_exemption = 0
-    
-    # Ensure investments under 80C don't exceed limit
-    tax_saving_investments = min(investments, 150000)
-    
-    # Calculate NPS deduction (up to 50000 in addition to 80C)
-    nps_deduction = 0  # Can be added later if needed
-    
-    # Apply deductions
-    # Standard deduction is applicable to all salaried individuals
-    if not is_self_employed:
-        deductions = standard_deduction
-    else:
-        deductions = 0
-    
-    deductions += tax_saving_investments + pf_contribution + nps_deduction + professional_tax
-    
-    # Calculate taxable income
-    taxable_income = gross_salary - hra_exemption - deductions
-    taxable_income = max(0, taxable_income)
-    
-    # Calculate tax under old regime
-    def calculate_old_regime_tax(income):
-        tax = 0
-        if income > 1000000:
-            tax += (income - 1000000) * 0.30
-            income = 1000000
-        if income > 500000:
-            tax += (income - 500000) * 0.20
-            income = 500000
-        if income > 250000:
-            tax += (income - 250000) * 0.05
-        
-        # Add 4% cess
-        tax = tax * 1.04
-        
-        return tax
-    
-    # Calculate tax under new regime (2023-24)
-    def calculate_new_regime_tax(income):
-        tax = 0
-        if income > 1500000:
-            tax += (income - 1500000) * 0.30
-            income = 1500000
-        if income > 1200000:
-            tax += (income - 1200000) * 0.20
-            income = 1200000
-        if income > 900000:
-            tax += (income - 900000) * 0.15
-            income = 900000
-        if income > 600000:
-            tax += (income - 600000) * 0.10
-            income = 600000
-        if income > 300000:
-            tax += (income - 300000) * 0.05
-            
-        # Add 4% cess
-        tax = tax * 1.04
-        
-        return tax
-    
-    # Calculate taxes under both regimes
-    old_regime_tax = calculate_old_regime_tax(taxable_income)
-    
-    # For new regime, we need to calculate without standard deduction and 80C
-    new_regime_taxable = gross_salary - hra_exemption - professional_tax
-    new_regime_taxable = max(0, new_regime_taxable)
-    new_regime_tax = calculate_new_regime_tax(new_regime_taxable)
-    
-    # Determine which regime is better
-    if old_regime_tax <= new_regime_tax:
-        optimal_regime = "Old Regime"
-        tax_payable = old_regime_tax
-        optimal_taxable_income = taxable_income
-    else:
-        optimal_regime = "New Regime"
-        tax_payable = new_regime_tax
-        optimal_taxable_income = new_regime_taxable
-    
-    # Calculate take home pay
-    monthly_gross = gross_salary / 12
-    monthly_tax = tax_payable / 12
-    monthly_take_home = monthly_gross - monthly_tax - (professional_tax / 12) - (pf_contribution / 12)
-    
-    # Calculate tax savings if applicable
-    tax_savings = max(0, abs(old_regime_tax - new_regime_tax))
-    
-    # Calculate effective tax rate
-    effective_tax_rate = (tax_payable / gross_salary) * 100 if gross_salary > 0 else 0
-    
-    # Return detailed breakdown
-    return {
-        'gross_annual': gross_salary,
-        'gross_monthly': monthly_gross,
-        'taxable_income': optimal_taxable_income,
-        'hra_exemption': hra_exemption,
-        'tax_saving_investments': tax_saving_investments,
-        'total_deductions': deductions,
-        'tax_payable': tax_payable,
-        'monthly_tax': monthly_tax,
-        'monthly_take_home': monthly_take_home,
-        'annual_take_home': monthly_take_home * 12,
-        'optimal_regime': optimal_regime,
-        'old_regime_tax': old_regime_tax,
-        'new_regime_tax': new_regime_tax,
-        'tax_savings': tax_savings,
-        'effective_tax_rate': effective_tax_rate,
-        'pf_contribution': pf_contribution
-    }
-
-def calculate_stp_returns(initial_amount, monthly_transfer, source_return, target_return, time_period_months):
-    """Calculate Systematic Transfer Plan (STP) returns
-    
-    Args:
-        initial_amount: Initial investment in source fund
-        monthly_transfer: Amount to transfer monthly from source to target
-        source_return: Expected annual return of source fund (%)
-        target_return: Expected annual return of target fund (%)
-        time_period_months: Duration of STP in months
-        
-    Returns:
-        Dictionary with STP analysis results
-    """
-    # Convert annual returns to monthly
-    source_monthly_return = (1 + source_return/100) ** (1/12) - 1
-    target_monthly_return = (1 + target_return/100) ** (1/12) - 1
-    
-    # Initialize values
-    source_fund = [initial_amount]
-    target_fund = [0]
-    total_value = [initial_amount]
-    lumpsum_target = [initial_amount]  # For comparison: direct lumpsum in target fund
-    
-    # Run calculation for each month
-    for month in range(1, time_period_months + 1):
-        # Calculate source fund value after growth and transfer
-        prev_source = source_fund[-1]
-        source_growth = prev_source * source_monthly_return
-        new_source = prev_source + source_growth - monthly_transfer
-        
-        # Ensure source fund doesn't go negative
-        if new_source < 0:
-            # Adjust final transfer if not enough funds
-            monthly_transfer = prev_source + source_growth
-            new_source = 0
-        
-        source_fund.append(max(0, new_source))
-        
-        # Calculate target fund value after transfer and growth
-        prev_target = target_fund[-1]
-        new_target = prev_target * (1 + target_monthly_return) + monthly_transfer
-        target_fund.append(new_target)
-        
-        # Calculate total portfolio value
-        total_value.append(new_source + new_target)
-        
-        # Calculate lumpsum alternative (if had invested all at once in target fund)
-        lumpsum_target.append(initial_amount * (1 + target_monthly_return) ** month)
-    
-    # Calculate returns and other metrics
-    total_transferred = monthly_transfer * time_period_months
-    if total_transferred > initial_amount:
-        total_transferred = initial_amount
-        
-    final_value = total_value[-1]
-    absolute_return = final_value - initial_amount
-    return_percentage = (absolute_return / initial_amount) * 100
-    
-    # Calculate CAGR
-    time_years = time_period_months / 12
-    cagr = ((final_value / initial_amount) ** (1 / time_years) - 1) * 100
-    
-    # Calculate lumpsum comparison
-    lumpsum_final = lumpsum_target[-1]
-    lumpsum_diff = final_value - lumpsum_final
-    lumpsum_diff_percentage = (lumpsum_diff / lumpsum_final) * 100
-    
-    # Generate x-axis labels (months)
-    months = list(range(time_period_months + 1))
-    
-    return {
-        'source_fund': source_fund,
-        'target_fund': target_fund,
-        'total_value': total_value,
-        'lumpsum_target': lumpsum_target,
-        'months': months,
-        'final_value': final_value,
-        'absolute_return': absolute_return,
-        'return_percentage': return_percentage,
-        'cagr': cagr,
-        'lumpsum_comparison': {
-            'final_value': lumpsum_final,
-            'difference': lumpsum_diff,
-            'difference_percentage': lumpsum_diff_percentage
-        }
-    }
-
-def calculate_mutual_fund_comparison(investment_amount, regular_expense_ratio, direct_expense_ratio, expected_return, time_period):
-    """Compare regular and direct mutual fund returns"""
-    # Convert percentages to decimals
-    regular_expense = regular_expense_ratio / 100
-    direct_expense = direct_expense_ratio / 100
-    expected_return_decimal = expected_return / 100
-    
-    # Calculate net returns after expenses
-    regular_net_return = expected_return_decimal - regular_expense
-    direct_net_return = expected_return_decimal - direct_expense
-    
-    # Calculate future values
-    regular_future_value = investment_amount * ((1 + regular_net_return) ** time_period)
-    direct_future_value = investment_amount * ((1 + direct_net_return) ** time_period)
-    
-    # Calculate total returns
-    regular_total_return = regular_future_value - investment_amount
-    direct_total_return = direct_future_value - investment_amount
-    
-    # Calculate expense impact
-    expense_impact = direct_future_value - regular_future_value
-    expense_impact_percentage = (expense_impact / investment_amount) * 100
-    
-    # Generate yearly data for plotting
-    years = list(range(time_period + 1))
-    regular_values = [investment_amount * ((1 + regular_net_return) ** year) for year in years]
-    direct_values = [investment_amount * ((1 + direct_net_return) ** year) for year in years]
-    
-    return {
-        'regular_future_value': regular_future_value,
-        'direct_future_value': direct_future_value,
-        'regular_total_return': regular_total_return,
-        'direct_total_return': direct_total_return,
-        'expense_impact': expense_impact,
-        'expense_impact_percentage': expense_impact_percentage,
-        'years': years,
-        'regular_values': regular_values,
-        'direct_values': direct_values
-    }
-
-def show_stp_calculator():
-    """Show the Systematic Transfer Plan (STP) calculator interface"""
-    st.header("Systematic Transfer Plan (STP) Calculator")
-    st.write("""
-    STP is an investment strategy that involves transferring a fixed amount from one mutual fund to another at regular intervals.
-    This calculator helps compare STP strategy with lumpsum investments and analyze potential benefits.
-    """)
-    
-    st.info("""
-    ### 💡 What is an STP?
-    - **Systematic Transfer Plan (STP)** allows you to transfer money from one mutual fund to another at regular intervals
-    - Typically used to move from low-risk funds (like liquid funds) to higher-risk funds (like equity) in a phased manner
-    - Helps manage volatility and reduce risk through rupee-cost averaging
-    - Allows your money to stay invested while gradually changing your asset allocation
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        initial_amount = st.number_input(
-            "Initial Investment in Source Fund (₹)",
-            min_value=10000,
-            value=1000000,
-            step=10000,
-            help="Amount initially invested in the source fund (typically a liquid or debt fund)"
-        )
-        time_period = st.number_input(
-            "STP Duration (Months)",
-            min_value=3,
-            max_value=60,
-            value=12,
-            help="Number of months over which funds will be transferred"
-        )
-        monthly_transfer = st.number_input(
-            "Monthly Transfer Amount (₹)",
-            min_value=1000,
-            max_value=initial_amount,
-            value=min(initial_amount // time_period, 100000),
-            step=1000,
-            help="Amount transferred each month from source to target fund"
-        )
-    
-    with col2:
-        source_return = st.number_input(
-            "Source Fund Expected Annual Return (%)",
-            min_value=1.0,
-            max_value=15.0,
-            value=6.0,
-            step=0.1,
-            help="Expected return of source fund (typically lower for debt/liquid funds)"
-        )
-        target_return = st.number_input(
-            "Target Fund Expected Annual Return (%)",
-            min_value=1.0,
-            max_value=30.0,
-            value=12.0,
-            step=0.1,
-            help="Expected return of target fund (typically higher for equity funds)"
-        )
-        
-        # Auto-recommend STP duration
-        if st.checkbox("Get Recommended STP Duration"):
-            # Simple logic: Higher volatility (equity) = longer duration
-            # Gap between target and source returns as proxy for volatility
-            return_gap = target_return - source_return
-            if return_gap > 10:
-                recommended_months = 12
-            elif return_gap > 6:
-                recommended_months = 9
-            else:
-                recommended_months = 6
-                
-            st.write(f"Recommended STP Duration: **{recommended_months} months**")
-            st.write("*Based on the return differential between funds*")
-    
-    if st.button("Calculate STP Strategy", use_container_width=True):
-        # Check if transfer amount is valid
-        if monthly_transfer * time_period > initial_amount:
-            st.error(f"""
-            ⚠️ **Invalid STP Parameters**
-            Your monthly transfer (₹{monthly_transfer:,.2f}) over {time_period} months (total ₹{monthly_transfer*time_period:,.2f}) 
-            exceeds your initial investment (₹{initial_amount:,.2f}).
-            Please adjust your parameters.
-            """)
-            return
-            
-        results = calculate_stp_returns(
-            initial_amount,
-            monthly_transfer,
-            source_return,
-            target_return,
-            time_period
-        )
-        
-        # Display key metrics
-        st.subheader("📊 STP Strategy Analysis")
+        # Display key metrics
+        st.subheader("📊 STP Strategy Analysis")
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -7085,73 +5462,6 @@ def show_regular_vs_direct_calculator():
                 # Process goal creation logic here
                 st.success("Goal information prepared! You can visit the Goal Settings page to track your progress.")
 
-@st.cache_data
-def calculate_brokerage(transaction_type, exchange, delivery, quantity, price, turnover=None):
-    """Calculate brokerage charges for stock transactions"""
-    if not turnover:
-        turnover = quantity * price
-    
-    # Default charges (illustrative)
-    brokerage = 0  # Many discount brokers offer zero brokerage
-    
-    # Exchange Transaction Charges
-    if exchange == "NSE":
-        transaction_charges = turnover * 0.00325 / 100
-    elif exchange == "BSE":
-        transaction_charges = turnover * 0.00375 / 100
-    else:  # For others like MCX, etc.
-        transaction_charges = turnover * 0.005 / 100
-    
-    # SEBI Charges
-    sebi_charges = turnover * 0.0001 / 100
-    
-    # Securities Transaction Tax (STT)
-    if delivery:
-        if transaction_type == "Buy":
-            stt = turnover * 0.1 / 100
-        else:  # Sell
-            stt = turnover * 0.1 / 100
-    else:  # Intraday
-        if transaction_type == "Buy":
-            stt = 0
-        else:  # Sell
-            stt = turnover * 0.025 / 100
-    
-    # GST (18% on brokerage and transaction charges)
-    gst = (brokerage + transaction_charges) * 18 / 100
-    
-    # Stamp Duty (on buy side only)
-    if transaction_type == "Buy":
-        if delivery:
-            stamp_duty = turnover * 0.015 / 100
-        else:  # Intraday
-            stamp_duty = turnover * 0.003 / 100
-    else:  # Sell
-        stamp_duty = 0
-    
-    # Total charges
-    total_charges = brokerage + transaction_charges + sebi_charges + stt + gst + stamp_duty
-    
-    # Net amount
-    if transaction_type == "Buy":
-        net_amount = turnover + total_charges
-    else:  # Sell
-        net_amount = turnover - total_charges
-        
-    # Return a dictionary with all the details
-    return {
-        'turnover': turnover,
-        'brokerage': brokerage,
-        'transaction_charges': transaction_charges,
-        'sebi_charges': sebi_charges,
-        'stt': stt,
-        'gst': gst,
-        'stamp_duty': stamp_duty,
-        'total_charges': total_charges,
-        'net_amount': net_amount,
-        'percentage_impact': (total_charges / turnover) * 100
-    }
-
 def show_apy_calculator():
     """Show the Atal Pension Yojana (APY) calculator interface"""
     st.header("Atal Pension Yojana (APY) Calculator 👴")
@@ -8134,6 +6444,23 @@ def show_celebration_animation(value, message):
     """
     st.markdown(celebration_html, unsafe_allow_html=True)
 
+# UI functions of the calculators selected so far, by registry key
+_calculator_ui = {}
+
+
+def load_calculator_ui(calculator):
+    """UI function of a registry entry, importing its page module the first time it is selected"""
+    show_calculator = _calculator_ui.get(calculator.key)
+    if show_calculator is None:
+        module, _, function = calculator.ui.rpartition(":")
+        try:
+            show_calculator = getattr(importlib.import_module(module), function) if module else globals()[function]
+        except ImportError:
+            return lambda: st.error(f"{calculator.label} module not found.")
+        _calculator_ui[calculator.key] = show_calculator
+    return show_calculator
+
+
 def show():
     st.title("💰 Smart Financial Calculators")
     st.write("""
@@ -8204,2017 +6531,1542 @@ def show():
     investment decisions.
     """)
 
-    calculators = [
-        # Interest & General Calculators
-        "Simple Interest 💹",
-        "Compound Interest 📊",
-        "CAGR Calculator 📊",
-        "Interest Rate Calculator 📊",
-        "Inflation Calculator 💸",
-        "Discount Calculator 💰",
-        "GST Calculator 🧾",
-        "Gratuity Calculator 💼",
-        
-        # Salary & Tax Calculators
-        "Salary Calculator 💵",
-        "HRA Calculator 🏠",
-        "Income Tax Calculator 💰",
-        
-        # Investment Calculators
-        "SIP Calculator 📈",
-        "Lumpsum Calculator 📈",
-        "SWP Calculator 💸",
-        "STP Calculator 📊",
-        "Stock Average Calculator 📈",
-        "Brokerage Calculator 💹",
-        "Regular vs Direct Mutual Fund Calculator 📊",
-        
-        # Retirement & Pension Calculators
-        "Retirement Planning 👴",
-        "NPS Calculator 👵",
-        "APY Calculator 👴",
-        
-        # Fixed Income & Savings Calculators
-        "PPF Calculator 💰",
-        "SSY Calculator 👧",
-        "NSC Calculator 📃",
-        "FD Calculator 🏦",
-        "RD Calculator 💹",
-        "Post Office PPF Calculator 🏤",
-        "Post Office FD Calculator 🏤",
-        "Post Office RD Calculator 🏤",
-        "Post Office MIS Calculator 🏤",
-        "HDFC FD Calculator 🏦",
-        "SBI FD Calculator 🏦",
-        "ICICI FD Calculator 🏦",
-        "Axis Bank FD Calculator 🏦",
-        
-        # Loan Calculators
-        "Loan EMI 💳",
-        "Home Loan EMI Calculator 🏠",
-        "Personal Loan EMI Calculator 💵",
-        "Car Loan EMI Calculator 🚗",
-        "Bike Loan EMI Calculator 🏍️",
-        "Education Loan EMI Calculator 🎓",
-        "Credit Card EMI Calculator 💳",
-        "SBI Home Loan EMI Calculator 🏦",
-        "HDFC Home Loan EMI Calculator 🏦",
-        "SBI Personal Loan EMI Calculator 🏦",
-        "HDFC Personal Loan EMI Calculator 🏦",
-        "ICICI Personal Loan EMI Calculator 🏦",
-        "Axis Personal Loan EMI Calculator 🏦",
-        
-        # Other Financial Calculators
-        "Term Insurance Calculator 🛡️",
-        "Education Savings 🎓",
-        "Emergency Fund 🏦",
-        "Home Down Payment 🏠",
-        "Net Worth Tracker 💎",
-        "Investment Returns 📊"
-    ]
-
-    # Add checkmarks to implemented calculators to make them more visible
-    implemented_calculators = [
-        "Simple Interest 💹",
-        "Compound Interest 📊", 
-        "SIP Calculator 📈",
-        "SWP Calculator 💸",
-        "STP Calculator 📊",
-        "Retirement Planning 👴",
-        "NPS Calculator 👵",
-        "APY Calculator 👴",
-        "Term Insurance Calculator 🛡️",
-        "Education Savings 🎓",
-        "Emergency Fund 🏦",
-        "Home Down Payment 🏠",
-        "Net Worth Tracker 💎",
-        "Gratuity Calculator 💼",
-        "Investment Returns 📊",
-        "Loan EMI 💳",
-        "Home Loan EMI Calculator 🏠",
-        "Personal Loan EMI Calculator 💵",
-        "Car Loan EMI Calculator 🚗",
-        "Bike Loan EMI Calculator 🏍️",
-        "Credit Card EMI Calculator 💳",
-        "Education Loan EMI Calculator 🎓",
-        "Health Insurance Premium Calculator 🏥",
-        "Gold Investment Calculator 💍",
-        "Regular vs Direct Mutual Fund Calculator 📊",
-        "CAGR Calculator 📊",
-        "HRA Calculator 🏠",
-        "Lumpsum Calculator 📈",
-        "PPF Calculator 💰",
-        "FD Calculator 🏦",
-        "RD Calculator 💹",
-        "Income Tax Calculator 💰",
-        "Interest Rate Calculator 📊",
-        "Inflation Calculator 💸",
-        "Discount Calculator 💰",
-        "GST Calculator 🧾",
-        "Stock Average Calculator 📈",
-        "Salary Calculator 💼",
-        "Brokerage Calculator 💹",
-        "SSY Calculator 👧",
-        "NSC Calculator 📃",
-        "Post Office PPF Calculator 🏤",
-        "Post Office FD Calculator 🏤",
-        "Post Office RD Calculator 🏤",
-        "Post Office MIS Calculator 🏤",
-        "SBI FD Calculator 🏦",
-        "HDFC FD Calculator 🏦",
-        "ICICI FD Calculator 🏦",
-        "Axis Bank FD Calculator 🏦",
-        "Kotak Mahindra Bank FD Calculator 🏦",
-        "Yes Bank FD Calculator 🏦",
-        "SBI Home Loan EMI Calculator 🏦",
-        "HDFC Home Loan EMI Calculator 🏦",
-        "SBI Personal Loan EMI Calculator 🏦",
-        "HDFC Personal Loan EMI Calculator 🏦",
-        "ICICI Personal Loan EMI Calculator 🏦",
-        "Axis Personal Loan EMI Calculator 🏦"
-    ]
-    
-    calculator_options = []
-    for calc in calculators:
-        if calc in implemented_calculators:
-            calculator_options.append(f"{calc} ✅")
-        else:
-            calculator_options.append(calc)
-    
-    selected_option = st.selectbox("Select Calculator", calculator_options)
-    
-    # Remove the checkmark for processing
-    calculator = selected_option.replace(" ✅", "")
-    
-    # Try new calculators first
-    if calculator == "Lumpsum Calculator 📈":
-        show_lumpsum_calculator()
-        return
-    elif calculator == "HRA Calculator 🏠":
-        show_hra_calculator()
-        return
-    elif calculator == "PPF Calculator 💰":
-        show_ppf_calculator()
-        return
-    elif calculator == "FD Calculator 🏦":
-        show_fd_calculator()
-        return
-    elif calculator == "RD Calculator 💹":
-        show_rd_calculator()
-        return
-    elif calculator == "Income Tax Calculator 💰":
-        show_income_tax_calculator()
-        return
-    elif calculator == "Home Loan EMI Calculator 🏠":
-        show_home_loan_calculator()
-        return
-    elif calculator == "Personal Loan EMI Calculator 💵":
-        show_personal_loan_calculator()
-        return
-    elif calculator == "Car Loan EMI Calculator 🚗":
-        show_car_loan_calculator()
-        return
-    elif calculator == "Bike Loan EMI Calculator 🏍️":
-        show_bike_loan_calculator()
-        return
-    elif calculator == "Credit Card EMI Calculator 💳":
-        show_credit_card_emi_calculator()
-        return
-    elif calculator == "Education Loan EMI Calculator 🎓":
-        show_education_loan_calculator()
-        return
-    elif calculator == "Health Insurance Premium Calculator 🏥":
-        show_health_insurance_calculator()
-        return
-    elif calculator == "Gold Investment Calculator 💍":
-        show_gold_investment_calculator()
-        return
-    elif calculator == "Stock Average Calculator 📈":
-        show_stock_average_calculator()
-        return
-    elif calculator == "Regular vs Direct Mutual Fund Calculator 📊":
-        show_regular_vs_direct_calculator()
-        return
-    elif calculator == "STP Calculator 📊":
-        show_stp_calculator()
-        return
-    elif calculator == "Salary Calculator 💼":
-        show_salary_calculator()
-        return
-    elif calculator == "Brokerage Calculator 💹":
-        show_brokerage_calculator()
-        return
-    elif calculator == "NPS Calculator 👵":
-        show_nps_calculator()
-        return
-    elif calculator == "APY Calculator 👴":
-        show_apy_calculator()
-        return
-    elif calculator == "Term Insurance Calculator 🛡️":
-        from pages.term_insurance_calculator import show_term_insurance_calculator
-        show_term_insurance_calculator()
-        return
-    elif calculator == "SSY Calculator 👧":
-        show_ssy_calculator()
-        return
-        
-    elif calculator == "NSC Calculator 📃":
-        show_nsc_calculator()
-        return
-        
-    elif calculator == "Post Office PPF Calculator 🏤":
-        show_post_office_ppf_calculator()
-        return
-        
-    elif calculator == "Post Office FD Calculator 🏤":
-        show_post_office_fd_calculator()
-        return
-        
-    elif calculator == "Post Office RD Calculator 🏤":
-        show_post_office_rd_calculator()
-        return
-        
-    elif calculator == "Post Office MIS Calculator 🏤":
-        show_post_office_mis_calculator()
-        return
-        
-    elif calculator == "SBI FD Calculator 🏦":
-        show_sbi_fd_calculator()
-        return
-        
-    elif calculator == "HDFC FD Calculator 🏦":
-        show_hdfc_fd_calculator()
-        return
-        
-    elif calculator == "ICICI FD Calculator 🏦":
-        show_icici_fd_calculator()
-        return
-        
-    elif calculator == "Axis Bank FD Calculator 🏦":
-        show_axis_fd_calculator()
-        return
-        
-    elif calculator == "Kotak Mahindra Bank FD Calculator 🏦":
-        show_kotak_fd_calculator()
-        return
-    
-    elif calculator == "Yes Bank FD Calculator 🏦":
-        from pages.yes_bank_fd_calculator import show_yes_bank_fd_calculator
-        show_yes_bank_fd_calculator()
-        return
-        
-    elif calculator == "SBI Home Loan EMI Calculator 🏦":
-        from utils.calculators import show_sbi_home_loan_calculator
-        show_sbi_home_loan_calculator()
-        return
-        
-    elif calculator == "HDFC Home Loan EMI Calculator 🏦":
-        from utils.calculators import show_hdfc_home_loan_calculator
-        show_hdfc_home_loan_calculator()
-        return
-        
-    elif calculator == "SBI Personal Loan EMI Calculator 🏦":
-        from utils.calculators import show_sbi_personal_loan_calculator
-        show_sbi_personal_loan_calculator()
-        return
-        
-    elif calculator == "HDFC Personal Loan EMI Calculator 🏦":
-        from utils.calculators import show_hdfc_personal_loan_calculator
-        show_hdfc_personal_loan_calculator()
-        return
-        
-    elif calculator == "ICICI Personal Loan EMI Calculator 🏦":
-        from utils.calculators import show_icici_personal_loan_calculator
-        show_icici_personal_loan_calculator()
-        return
-        
-    elif calculator == "Axis Personal Loan EMI Calculator 🏦":
-        from utils.calculators import show_axis_personal_loan_calculator
-        show_axis_personal_loan_calculator()
-        return
-    
-    # Fall back to the general function if needed
-    if new_calculators_available and add_new_calculators(calculator):
-        st.session_state.used_new_calculator = True
-        return
-    
-    # Simple Interest Calculator
-    if calculator == "Simple Interest 💹":
-        st.header("Simple Interest Calculator")
-        st.write("""
-        Calculate simple interest on your investments or loans. 
-        Simple interest is calculated only on the principal amount, unlike compound interest.
-        """)
+    # Links to the page can preselect a calculator with ?calculator=<key or label>
+    linked = core.get_calculator(st.query_params.get("calculator", ""))
+    keys = list(core.CALCULATORS)
+    key = st.selectbox(
+        "Select Calculator",
+        keys,
+        index=keys.index(linked.key) if linked else 0,
+        format_func=lambda key: core.CALCULATORS[key].label
+    )
+    load_calculator_ui(core.CALCULATORS[key])()
 
-        col1, col2 = st.columns(2)
+
+# Simple Interest Calculator
+def show_simple_interest_calculator():
+    st.header("Simple Interest Calculator")
+    st.write("""
+    Calculate simple interest on your investments or loans. 
+    Simple interest is calculated only on the principal amount, unlike compound interest.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        principal = st.number_input(
+            "Principal Amount (₹)",
+            min_value=0,
+            value=10000,
+            step=1000
+        )
+        interest_rate = st.number_input(
+            "Annual Interest Rate (%)",
+            min_value=0.0,
+            max_value=30.0,
+            value=5.0,
+            step=0.1
+        )
+
+    with col2:
+        time_period = st.number_input(
+            "Time Period (Years)",
+            min_value=1,
+            max_value=30,
+            value=5
+        )
+
+    if st.button("Calculate Interest", use_container_width=True):
+        interest, total_amount = calculate_simple_interest(principal, interest_rate, time_period)
+
+        # Display detailed results
+        st.subheader("📊 Detailed Calculation Results")
+
+        col1, col2, col3 = st.columns(3)
         with col1:
-            principal = st.number_input(
-                "Principal Amount (₹)",
-                min_value=0,
-                value=10000,
-                step=1000
-            )
-            interest_rate = st.number_input(
-                "Annual Interest Rate (%)",
-                min_value=0.0,
-                max_value=30.0,
-                value=5.0,
-                step=0.1
+            st.metric(
+                "Principal Amount",
+                f"₹{principal:,.2f}"
             )
-
         with col2:
-            time_period = st.number_input(
-                "Time Period (Years)",
-                min_value=1,
-                max_value=30,
-                value=5
+            st.metric(
+                "Interest Earned",
+                f"₹{interest:,.2f}"
+            )
+        with col3:
+            st.metric(
+                "Total Amount",
+                f"₹{total_amount:,.2f}"
             )
 
-        if st.button("Calculate Interest", use_container_width=True):
-            interest, total_amount = calculate_simple_interest(principal, interest_rate, time_period)
+        # Create year-wise breakdown
+        years = list(range(time_period + 1))
+        amounts = [principal + (interest/time_period * year) for year in years]
 
-            # Display detailed results
-            st.subheader("📊 Detailed Calculation Results")
+        df = pd.DataFrame({
+            'Year': years,
+            'Amount': amounts
+        })
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Principal Amount",
-                    f"₹{principal:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Interest Earned",
-                    f"₹{interest:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Total Amount",
-                    f"₹{total_amount:,.2f}"
-                )
+        fig = px.line(
+            df,
+            x='Year',
+            y='Amount',
+            title='Simple Interest Growth Over Time',
+            labels={'Amount': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            # Create year-wise breakdown
-            years = list(range(time_period + 1))
-            amounts = [principal + (interest/time_period * year) for year in years]
+        # Additional insights
+        st.info("""
+        ### 💡 Key Insights
+        1. In simple interest, interest is calculated only on the principal amount
+        2. Total interest remains constant throughout the period
+        3. Growth is linear unlike compound interest
+        4. Suitable for short-term loans or investments
+        """)
 
-            df = pd.DataFrame({
-                'Year': years,
-                'Amount': amounts
-            })
+        # Comparison with Compound Interest
+        compound_amount = calculate_compound_interest(principal, interest_rate, time_period)
+        st.warning(f"""
+        ### 📈 Comparison with Compound Interest
+        - Simple Interest Total: ₹{total_amount:,.2f}
+        - Compound Interest Total: ₹{compound_amount:,.2f}
+        - Difference: ₹{(compound_amount - total_amount):,.2f}
+        """)
 
-            fig = px.line(
-                df,
-                x='Year',
-                y='Amount',
-                title='Simple Interest Growth Over Time',
-                labels={'Amount': 'Amount (₹)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+# SWP Calculator
+def show_swp_calculator():
+    st.header("Systematic Withdrawal Plan Calculator")
+    st.write("""
+    Plan your regular withdrawals from a lump sum investment while maintaining growth.
+    SWP helps in creating a steady income stream from your investments.
+    """)
+    st.warning("""
+    **Disclaimer:** SWP calculations are based on projected returns. Actual returns may vary.  Consult a financial advisor before making investment decisions.
+    """)
 
-            # Additional insights
-            st.info("""
-            ### 💡 Key Insights
-            1. In simple interest, interest is calculated only on the principal amount
-            2. Total interest remains constant throughout the period
-            3. Growth is linear unlike compound interest
-            4. Suitable for short-term loans or investments
-            """)
+    col1, col2 = st.columns(2)
+    with col1:
+        initial_corpus = st.number_input(
+            "Initial Investment Corpus (₹)",
+            min_value=100000,
+            value=1000000,
+            step=100000
+        )
+        withdrawal_rate = st.number_input(
+            "Annual Withdrawal Rate (%)",
+            min_value=1.0,
+            max_value=20.0,
+            value=6.0,
+            step=0.1
+        )
 
-            # Comparison with Compound Interest
-            compound_amount = calculate_compound_interest(principal, interest_rate, time_period)
-            st.warning(f"""
-            ### 📈 Comparison with Compound Interest
-            - Simple Interest Total: ₹{total_amount:,.2f}
-            - Compound Interest Total: ₹{compound_amount:,.2f}
-            - Difference: ₹{(compound_amount - total_amount):,.2f}
-            """)
+    with col2:
+        expected_return = st.number_input(
+            "Expected Annual Return (%)",
+            min_value=0.0,
+            max_value=30.0,
+            value=10.0,
+            step=0.1
+        )
+        time_period = st.number_input(
+            "Time Period (Years)",
+            min_value=1,
+            max_value=30,
+            value=10
+        )
 
-    # SWP Calculator
-    elif calculator == "SWP Calculator 💸":
-        st.header("Systematic Withdrawal Plan Calculator")
-        st.write("""
-        Plan your regular withdrawals from a lump sum investment while maintaining growth.
-        SWP helps in creating a steady income stream from your investments.
-        """)
-        st.warning("""
-        **Disclaimer:** SWP calculations are based on projected returns. Actual returns may vary.  Consult a financial advisor before making investment decisions.
-        """)
+    if st.button("Calculate SWP", use_container_width=True):
+        results = calculate_swp_returns(
+            initial_corpus,
+            withdrawal_rate,
+            expected_return,
+            time_period
+        )
 
-        col1, col2 = st.columns(2)
+        # Display key metrics
+        st.subheader("📊 SWP Analysis")
+
+        col1, col2, col3 = st.columns(3)
         with col1:
-            initial_corpus = st.number_input(
-                "Initial Investment Corpus (₹)",
-                min_value=100000,
-                value=1000000,
-                step=100000
-            )
-            withdrawal_rate = st.number_input(
-                "Annual Withdrawal Rate (%)",
-                min_value=1.0,
-                max_value=20.0,
-                value=6.0,
-                step=0.1
+            st.metric(
+                "Monthly Withdrawal",
+                f"₹{results['monthly_withdrawal']:,.2f}"
             )
-
         with col2:
-            expected_return = st.number_input(
-                "Expected Annual Return (%)",
-                min_value=0.0,
-                max_value=30.0,
-                value=10.0,
-                step=0.1
+            st.metric(
+                "Total Withdrawal",
+                f"₹{results['total_withdrawal']:,.2f}"
             )
-            time_period = st.number_input(
-                "Time Period (Years)",
-                min_value=1,
-                max_value=30,
-                value=10
+        with col3:
+            st.metric(
+                "Final Corpus",
+                f"₹{results['final_corpus']:,.2f}",
+                f"{((results['final_corpus']/initial_corpus - 1) * 100):,.1f}%"
             )
 
-        if st.button("Calculate SWP", use_container_width=True):
-            results = calculate_swp_returns(
-                initial_corpus,
-                withdrawal_rate,
-                expected_return,
-                time_period
-            )
+        # Create visualization
+        months = list(range(time_period * 12 + 1))
+        df = pd.DataFrame({
+            'Month': months,
+            'Corpus': results['corpus_values'],
+            'Cumulative Withdrawal': np.cumsum(results['withdrawal_values'])
+        })
 
-            # Display key metrics
-            st.subheader("📊 SWP Analysis")
+        fig = px.line(
+            df,
+            x='Month',
+            y=['Corpus', 'Cumulative Withdrawal'],
+            title='SWP Performance Over Time',
+            labels={'value': 'Amount (₹)', 'variable': 'Type'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Monthly Withdrawal",
-                    f"₹{results['monthly_withdrawal']:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Total Withdrawal",
-                    f"₹{results['total_withdrawal']:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Final Corpus",
-                    f"₹{results['final_corpus']:,.2f}",
-                    f"{((results['final_corpus']/initial_corpus - 1) * 100):,.1f}%"
-                )
+        # Detailed insights
+        st.info("""
+        ### 💡 Key Insights
+        1. Higher withdrawal rates may deplete corpus faster
+        2. Regular returns help sustain withdrawals
+        3. Consider inflation impact on withdrawals
+        4. Monitor corpus regularly
+        """)
 
-            # Create visualization
-            months = list(range(time_period * 12 + 1))
-            df = pd.DataFrame({
-                'Month': months,
-                'Corpus': results['corpus_values'],
-                'Cumulative Withdrawal': np.cumsum(results['withdrawal_values'])
-            })
+        # Sustainability analysis
+        sustainability_ratio = results['final_corpus'] / initial_corpus
+        if sustainability_ratio >= 1:
+            st.success("""
+            ✅ **Sustainable Withdrawal Plan**
+            Your corpus is growing despite withdrawals
+            """)
+        elif sustainability_ratio >= 0.5:
+            st.warning("""
+            ⚠️ **Moderate Depletion**
+            Consider reducing withdrawal rate for longer sustainability
+            """)
+        else:
+            st.error("""
+            🚨 **High Depletion Risk**
+            Current withdrawal rate may not be sustainable
+            """)
 
-            fig = px.line(
-                df,
-                x='Month',
-                y=['Corpus', 'Cumulative Withdrawal'],
-                title='SWP Performance Over Time',
-                labels={'value': 'Amount (₹)', 'variable': 'Type'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        show_sensitivity_heatmap(
+            "calculate_swp_returns", "withdrawal_rate", np.round(np.linspace(1, 20, 39), 1),
+            "time_period", np.arange(1, 31), "🔥 Final Corpus by Withdrawal Rate and Period",
+            "Annual Withdrawal Rate (%)", "Time Period (Years)", output='final_corpus',
+            current=(withdrawal_rate, time_period), corpus=initial_corpus, expected_return=expected_return
+        )
 
-            # Detailed insights
-            st.info("""
-            ### 💡 Key Insights
-            1. Higher withdrawal rates may deplete corpus faster
-            2. Regular returns help sustain withdrawals
-            3. Consider inflation impact on withdrawals
-            4. Monitor corpus regularly
-            """)
+# SIP Calculator
+def show_sip_calculator():
+    st.header("SIP Calculator")
+    st.write("""
+    Calculate the power of systematic investing and see how your monthly investments can grow over time.
+    """)
+    st.warning("""
+    **Disclaimer:** SIP calculations are based on projected returns. Actual returns may vary significantly due to market fluctuations. This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized guidance.
+    """)
 
-            # Sustainability analysis
-            sustainability_ratio = results['final_corpus'] / initial_corpus
-            if sustainability_ratio >= 1:
-                st.success("""
-                ✅ **Sustainable Withdrawal Plan**
-                Your corpus is growing despite withdrawals
-                """)
-            elif sustainability_ratio >= 0.5:
-                st.warning("""
-                ⚠️ **Moderate Depletion**
-                Consider reducing withdrawal rate for longer sustainability
-                """)
-            else:
-                st.error("""
-                🚨 **High Depletion Risk**
-                Current withdrawal rate may not be sustainable
-                """)
+    col1, col2 = st.columns(2)
+    with col1:
+        monthly_sip = st.number_input(
+            "Monthly SIP Amount (₹)",
+            min_value=500,
+            value=5000,
+            step=500
+        )
+        investment_period = st.number_input(
+            "Investment Period (Years)",
+            min_value=1,
+            max_value=40,
+            value=10
+        )
 
-    # SIP Calculator
-    elif calculator == "SIP Calculator 📈":
-        st.header("SIP Calculator")
-        st.write("""
-        Calculate the power of systematic investing and see how your monthly investments can grow over time.
-        """)
-        st.warning("""
-        **Disclaimer:** SIP calculations are based on projected returns. Actual returns may vary significantly due to market fluctuations. This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized guidance.
-        """)
+    with col2:
+        expected_return = st.number_input(
+            "Expected Annual Return (%)",
+            min_value=1.0,
+            max_value=30.0,
+            value=12.0,
+            step=0.1
+        )
+        volatility = st.number_input(
+            "Return Volatility (%)",
+            min_value=0.0,
+            max_value=40.0,
+            value=15.0,
+            step=1.0,
+            help="Year-to-year swing in returns: about 15-20% for equity funds, 5% for debt funds"
+        )
+        goal_amount = st.number_input(
+            "Target Corpus (₹, optional)",
+            min_value=0,
+            value=0,
+            step=100000,
+            help="Leave at 0 to skip the goal probability"
+        )
 
-        col1, col2 = st.columns(2)
+    if st.button("Calculate SIP Returns", use_container_width=True):
+        future_value, total_investment, returns, years, invested_amounts, future_values = calculate_sip_returns(
+            monthly_sip, expected_return, investment_period
+        )
+
+        # Display key metrics
+        col1, col2, col3 = st.columns(3)
         with col1:
-            monthly_sip = st.number_input(
-                "Monthly SIP Amount (₹)",
-                min_value=500,
-                value=5000,
-                step=500
-            )
-            investment_period = st.number_input(
-                "Investment Period (Years)",
-                min_value=1,
-                max_value=40,
-                value=10
+            st.metric(
+                "Total Investment",
+                f"₹{total_investment:,.2f}"
             )
-
         with col2:
-            expected_return = st.number_input(
-                "Expected Annual Return (%)",
-                min_value=1.0,
-                max_value=30.0,
-                value=12.0,
-                step=0.1
+            st.metric(
+                "Expected Returns",
+                f"₹{returns:,.2f}"
             )
-
-        if st.button("Calculate SIP Returns", use_container_width=True):
-            future_value, total_investment, returns, years, invested_amounts, future_values = calculate_sip_returns(
-                monthly_sip, expected_return, investment_period
+        with col3:
+            st.metric(
+                "Future Value",
+                f"₹{future_value:,.2f}"
             )
 
-            # Display key metrics
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Total Investment",
-                    f"₹{total_investment:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Expected Returns",
-                    f"₹{returns:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Future Value",
-                    f"₹{future_value:,.2f}"
-                )
-
-            # Show celebration for significant returns
-            if returns > total_investment:
-                show_celebration_animation(
-                    returns,
-                    "🎉 Excellent Returns Generated! 🎉"
-                )
-
-            # Additional Analysis
-            st.subheader("📊 Detailed Investment Analysis")
+        # Show celebration for significant returns
+        if returns > total_investment:
+            show_celebration_animation(
+                returns,
+                "🎉 Excellent Returns Generated! 🎉"
+            )
 
-            # Yearly Breakdown
-            st.write("### Year-wise Investment Growth")
-            yearly_breakdown = pd.DataFrame({
-                'Year': years,
-                'Invested Amount': invested_amounts,
-                'Future Value': future_values,
-                'Returns': [fv - inv for fv, inv in zip(future_values, invested_amounts)],
-                'Returns %': [(fv - inv)/inv * 100 if inv > 0 else 0 
-                            for fv, inv in zip(future_values, invested_amounts)]
-            })
+        # Additional Analysis
+        st.subheader("📊 Detailed Investment Analysis")
 
-            st.dataframe(yearly_breakdown.style.format({
-                'Invested Amount': '₹{:,.2f}',
-                'Future Value': '₹{:,.2f}',
-                'Returns': '₹{:,.2f}',
-                'Returns %': '{:.1f}%'
-            }))
+        # Yearly Breakdown
+        st.write("### Year-wise Investment Growth")
+        yearly_breakdown = pd.DataFrame({
+            'Year': years,
+            'Invested Amount': invested_amounts,
+            'Future Value': future_values,
+            'Returns': [fv - inv for fv, inv in zip(future_values, invested_amounts)],
+            'Returns %': [(fv - inv)/inv * 100 if inv > 0 else 0 
+                        for fv, inv in zip(future_values, invested_amounts)]
+        })
 
-            st.info("""
-            ### 💡 Investment Strategy Analysis
-            1. **Risk Analysis**: 
-               - Long-term investment reduces market timing risk
-               - Regular investments help average out market volatility
-            
-            2. **Return Analysis**:
-               - CAGR (Compound Annual Growth Rate): {:.1f}%
-               - Total Returns: {:.1f}% of invested amount
-               - Monthly Investment Required: ₹{:,.2f}
-            
-            3. **Time Horizon Impact**:
-               - Investment Duration: {} years
-               - Power of Compounding: ₹{:,.2f} extra earned through compounding
-               - Time contribution to wealth: {:.1f}%
-            """.format(
-                expected_return,
-                (returns/total_investment) * 100,
-                monthly_sip,
-                investment_period,
-                future_value - total_investment - returns,
-                (future_value - total_investment - returns)/future_value * 100
-            ))
+        st.dataframe(yearly_breakdown.style.format({
+            'Invested Amount': '₹{:,.2f}',
+            'Future Value': '₹{:,.2f}',
+            'Returns': '₹{:,.2f}',
+            'Returns %': '{:.1f}%'
+        }))
 
-            st.warning("""
-            **Investment Disclaimer:** 
-            1. The projections shown are based on assumed constant returns
-            2. Actual returns will vary based on market conditions
-            3. Past performance does not guarantee future results
-            4. Consider consulting a financial advisor for personalized advice
-            """)
+        # calculate_sip_returns credits expected_return / 12 a month; the bands must grow the same way
+        show_projection_bands(0, monthly_sip, investment_period, expected_return, volatility, goal_amount,
+                              compounding="monthly")
 
-            # Investment Type Descriptions
-            st.subheader("Investment Type Details")
-            st.info("""
-            **Note:** Investment characteristics and returns shown here are based on historical data 
-            and general market behavior. Actual returns may vary significantly. Different market 
-            conditions can affect both risk and return levels.
-            """)
-            
-            # Goal integration section
-            with st.expander("💡 Create a Goal for This Investment"):
-                st.markdown("""
-                Want to track this investment as a financial goal? Create a goal to monitor your progress!
-                """)
-                
-                goal_name = st.text_input("Goal Name", value=f"SIP Investment ({monthly_sip}/month)")
-                
-                # Determine goal type based on investment period
-                goal_type = "Short-Term" if investment_period <= 3 else "Mid-Term" if investment_period <= 7 else "Long-Term"
-                st.write(f"Goal Type: **{goal_type}**")
-                
-                # Auto-fill values from calculator
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"Target Amount: **₹{future_value:,.2f}**")
-                with col2:
-                    st.write(f"Monthly Savings: **₹{monthly_sip:,.2f}**")
-                
-                current_savings = st.number_input(
-                    "Current Savings (Initial Investment)",
-                    min_value=0,
-                    value=0,
-                    step=1000,
-                    help="Enter any amount you've already saved towards this goal"
-                )
-                
-                if st.button("Create Goal", use_container_width=True):
-                    
-                    # Store goal data in session state for transfer to goal_settings
-                    if "temp_goal_data" not in st.session_state:
-                        st.session_state.temp_goal_data = {}
-                    
-                    st.session_state.temp_goal_data = {
-                        "name": goal_name,
-                        "category": goal_type,
-                        "target_amount": float(future_value),
-                        "current_savings": float(current_savings),
-                        "monthly_savings": float(monthly_sip),
-                        "time_period": int(investment_period),
-                        "expected_return": float(expected_return)
-                    }
-                    
-                    # Success message
-                    st.success("Goal information prepared! Redirecting to goal settings...")
-                    
-                    # Use JavaScript to redirect to goal_settings
-                    js = """
-                    <script>
-                    setTimeout(function() {
-                        window.parent.location.href = "/goal_settings";
-                    }, 1500);
-                    </script>
-                    """
-                    st.components.v1.html(js)
+        # Goal planner: the inputs that would reach the target, solved directly instead of by trial
+        st.write("### 🎯 Goal Planner")
+        target_corpus = goal_amount or 10000000
+        required_sip = core.goal_seek(
+            "calculate_sip_returns", "monthly_investment", target_corpus,
+            expected_return=expected_return, time_period=investment_period
+        )
+        required_return = core.goal_seek(
+            "calculate_sip_returns", "expected_return", target_corpus,
+            monthly_investment=monthly_sip, time_period=investment_period
+        )
+        required_years = core.goal_seek(
+            "calculate_sip_returns", "time_period", target_corpus,
+            monthly_investment=monthly_sip, expected_return=expected_return
+        )
+        st.write(f"To reach **₹{target_corpus:,.0f}**" + ("" if goal_amount else " (set a target corpus above to plan for your own goal)"))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Monthly SIP Needed", f"₹{required_sip:,.0f}", help=f"At {expected_return}% over {investment_period} years")
+        with col2:
+            st.metric("Return Needed", f"{required_return:.1f}%" if np.isfinite(required_return) else "Not reachable",
+                      help=f"With ₹{monthly_sip:,} a month over {investment_period} years")
+        with col3:
+            st.metric("Years Needed", f"{required_years:.0f}" if np.isfinite(required_years) else "Not reachable",
+                      help=f"With ₹{monthly_sip:,} a month at {expected_return}%")
 
+        # Monthly SIP for a grid of targets and horizons in one vectorized solve
+        plan_targets = np.array([1000000, 2500000, 5000000, 10000000, 20000000, 50000000])
+        plan_years = np.array([5, 10, 15, 20, 25, 30])
+        plan_grid = core.goal_seek(
+            "calculate_sip_returns", "monthly_investment", plan_targets[:, None],
+            expected_return=expected_return, time_period=plan_years[None, :]
+        )
+        plan_df = pd.DataFrame(
+            plan_grid,
+            index=[f"₹{target / 100000:,.0f} Lakh" if target < 10000000 else f"₹{target / 10000000:,.0f} Crore" for target in plan_targets],
+            columns=[f"{years} Years" for years in plan_years]
+        )
+        st.write(f"Monthly SIP needed at {expected_return}% expected return:")
+        st.dataframe(plan_df.style.format('₹{:,.0f}'), use_container_width=True)
 
-            # Recommendations
-            if investment_period < 5:
-                st.warning("""
-                ⚠️ **Short-term Investment Alert**
-                - Consider longer investment horizon for better returns
-                - Short-term market volatility can affect returns
-                - Review risk-return expectations
-                """)
-            elif investment_period > 15:
-                st.success("""
-                ✅ **Long-term Wealth Creation Strategy**
-                - Excellent long-term commitment
-                - Consider increasing monthly investment with income growth
-                - Review and rebalance portfolio periodically
-                """)
+        show_sensitivity_heatmap(
+            "calculate_sip_returns", "monthly_investment", np.linspace(1000, 100000, 50),
+            "expected_return", np.round(np.linspace(4, 20, 33), 1), "🔥 Future Value by SIP Amount and Return",
+            "Monthly SIP (₹)", "Expected Annual Return (%)", output='future_value',
+            current=(monthly_sip, expected_return), time_period=investment_period
+        )
 
-            # Create growth visualization
-            df = pd.DataFrame({
-                'Year': years,
-                'Invested Amount': invested_amounts,
-                'Future Value': future_values
-            })
+        st.info("""
+        ### 💡 Investment Strategy Analysis
+        1. **Risk Analysis**: 
+           - Long-term investment reduces market timing risk
+           - Regular investments help average out market volatility
+
+        2. **Return Analysis**:
+           - CAGR (Compound Annual Growth Rate): {:.1f}%
+           - Total Returns: {:.1f}% of invested amount
+           - Monthly Investment Required: ₹{:,.2f}
+
+        3. **Time Horizon Impact**:
+           - Investment Duration: {} years
+           - Power of Compounding: ₹{:,.2f} extra earned through compounding
+           - Time contribution to wealth: {:.1f}%
+        """.format(
+            expected_return,
+            (returns/total_investment) * 100,
+            monthly_sip,
+            investment_period,
+            future_value - total_investment - returns,
+            (future_value - total_investment - returns)/future_value * 100
+        ))
 
-            fig = px.line(
-                df,
-                x='Year',
-                y=['Invested Amount', 'Future Value'],
-                title='SIP Growth Over Time',
-                labels={'value': 'Amount (₹)', 'variable': 'Type'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        st.warning("""
+        **Investment Disclaimer:** 
+        1. The projections shown are based on assumed constant returns
+        2. Actual returns will vary based on market conditions
+        3. Past performance does not guarantee future results
+        4. Consider consulting a financial advisor for personalized advice
+        """)
 
-            # Compare with lump sum
-            st.subheader("💡 SIP vs Lump Sum Comparison")
-            lump_sum = monthly_sip * 12 * investment_period
-            lump_sum_future = lump_sum * (1 + expected_return/100)**investment_period
+        # Investment Type Descriptions
+        st.subheader("Investment Type Details")
+        st.info("""
+        **Note:** Investment characteristics and returns shown here are based on historical data 
+        and general market behavior. Actual returns may vary significantly. Different market 
+        conditions can affect both risk and return levels.
+        """)
 
-            comparison_df = pd.DataFrame({
-                'Investment Type': ['SIP', 'Lump Sum'],
-                'Investment Amount': [total_investment, lump_sum],
-                'Future Value': [future_value, lump_sum_future],
-                'Returns': [returns, lump_sum_future - lump_sum]
-            })
+        # Goal integration section
+        with st.expander("💡 Create a Goal for This Investment"):
+            st.markdown("""
+            Want to track this investment as a financial goal? Create a goal to monitor your progress!
+            """)
 
-            st.table(comparison_df.set_index('Investment Type').style.format({
-                'Investment Amount': '₹{:,.2f}',
-                'Future Value': '₹{:,.2f}',
-                'Returns': '₹{:,.2f}'
-            }))
+            goal_name = st.text_input("Goal Name", value=f"SIP Investment ({monthly_sip}/month)")
 
-            st.info("""
-            ### 💡 Key Benefits of SIP
-            1. **Rupee Cost Averaging**: Buy more units when prices are low
-            2. **Power of Compounding**: Returns on returns
-            3. **Disciplined Investing**: Regular savings habit
-            4. **Flexibility**: Start with small amounts
-            """)
+            # Determine goal type based on investment period
+            goal_type = "Short-Term" if investment_period <= 3 else "Mid-Term" if investment_period <= 7 else "Long-Term"
+            st.write(f"Goal Type: **{goal_type}**")
 
-    # Compound Interest Calculator
-    elif calculator == "Compound Interest 📊":
-        st.header("Compound Interest Calculator")
-        st.write("""
-        Calculate how your investments grow over time with the power of compound interest.
-        Include regular contributions to see your wealth build faster!
-        """)
-        st.warning("""
-        **Disclaimer:** Compound interest calculations assume a constant interest rate.  Actual returns may vary due to market conditions and other factors.  This tool is for educational purposes only and does not constitute financial advice.
-        """)
+            # Auto-fill values from calculator
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"Target Amount: **₹{future_value:,.2f}**")
+            with col2:
+                st.write(f"Monthly Savings: **₹{monthly_sip:,.2f}**")
 
-        col1, col2 = st.columns(2)
-        with col1:
-            principal = st.number_input(
-                "Initial Investment (₹)",
+            current_savings = st.number_input(
+                "Current Savings (Initial Investment)",
                 min_value=0,
-                value=10000,
-                step=1000
-            )
-            interest_rate = st.number_input(
-                "Annual Interest Rate (%)",
-                min_value=0.0,
-                max_value=30.0,
-                value=8.0,
-                step=0.1
+                value=0,
+                step=1000,
+                help="Enter any amount you've already saved towards this goal"
             )
 
-        with col2:
-            time_period = st.number_input(
-                "Time Period (Years)",
-                min_value=1,
-                max_value=50,
-                value=10
-            )
-            monthly_contribution = st.number_input(
-                "Monthly Contribution (₹)",
-                min_value=0,
-                value=1000,
-                step=100
-            )
+            if st.button("Create Goal", use_container_width=True):
 
-        if st.button("Calculate Growth", use_container_width=True):
-            # Calculate year-by-year growth
-            years = list(range(time_period + 1))
-            amounts = []
-            amount = principal
+                # Store goal data in session state for transfer to goal_settings
+                if "temp_goal_data" not in st.session_state:
+                    st.session_state.temp_goal_data = {}
 
-            for year in years:
-                amounts.append(amount)
-                contribution = monthly_contribution * 12
-                amount = (amount + contribution) * (1 + interest_rate/100)
+                st.session_state.temp_goal_data = {
+                    "name": goal_name,
+                    "category": goal_type,
+                    "target_amount": float(future_value),
+                    "current_savings": float(current_savings),
+                    "monthly_savings": float(monthly_sip),
+                    "time_period": int(investment_period),
+                    "expected_return": float(expected_return)
+                }
 
-            # Create DataFrame for visualization
-            df = pd.DataFrame({
-                'Year': years,
-                'Amount': amounts
-            })
+                # Success message
+                st.success("Goal information prepared! Redirecting to goal settings...")
 
-            # Display results
-            final_amount = amounts[-1]
-            total_investment = principal + monthly_contribution * 12 * time_period
-            total_interest = final_amount - total_investment
+                # Use JavaScript to redirect to goal_settings
+                js = """
+                <script>
+                setTimeout(function() {
+                    window.parent.location.href = "/goal_settings";
+                }, 1500);
+                </script>
+                """
+                st.components.v1.html(js)
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Final Amount",
-                    f"₹{final_amount:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Total Investment",
-                    f"₹{total_investment:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Interest Earned",
-                    f"₹{total_interest:,.2f}"
-                )
 
-            # Plot growth
-            fig = px.line(
-                df,
-                x='Year',
-                y='Amount',
-                title='Investment Growth Over Time',
-                labels={'Amount': 'Amount (₹)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        # Recommendations
+        if investment_period < 5:
+            st.warning("""
+            ⚠️ **Short-term Investment Alert**
+            - Consider longer investment horizon for better returns
+            - Short-term market volatility can affect returns
+            - Review risk-return expectations
+            """)
+        elif investment_period > 15:
+            st.success("""
+            ✅ **Long-term Wealth Creation Strategy**
+            - Excellent long-term commitment
+            - Consider increasing monthly investment with income growth
+            - Review and rebalance portfolio periodically
+            """)
+
+        # Create growth visualization
+        df = pd.DataFrame({
+            'Year': years,
+            'Invested Amount': invested_amounts,
+            'Future Value': future_values
+        })
 
+        fig = px.line(
+            df,
+            x='Year',
+            y=['Invested Amount', 'Future Value'],
+            title='SIP Growth Over Time',
+            labels={'value': 'Amount (₹)', 'variable': 'Type'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-    elif calculator == "Retirement Planning 👴":
-        st.header("Retirement Planning Calculator")
-        st.write("""
-        Plan your retirement by calculating how much you need to save monthly to 
-        achieve your retirement goals.
-        """)
-        st.warning("""
-        **Disclaimer:** Retirement planning calculations are estimates based on assumptions about inflation, investment returns, and expenses.  Actual results may vary. Consult a financial advisor for personalized retirement planning.
-        """)
+        # Compare with lump sum
+        st.subheader("💡 SIP vs Lump Sum Comparison")
+        lump_sum = monthly_sip * 12 * investment_period
+        lump_sum_future = lump_sum * (1 + expected_return/100)**investment_period
 
-        col1, col2 = st.columns(2)
-        with col1:
-            current_age = st.number_input(
-                "Current Age",
-                min_value=18,
-                max_value=70,
-                value=30
-            )
-            retirement_age = st.number_input(
-                "Retirement Age",
-                min_value=current_age + 1,
-                max_value=80,
-                value=60
-            )
-            life_expectancy = st.number_input(
-                "Life Expectancy",
-                min_value=retirement_age + 1,
-                max_value=100,
-                value=85
-            )
+        comparison_df = pd.DataFrame({
+            'Investment Type': ['SIP', 'Lump Sum'],
+            'Investment Amount': [total_investment, lump_sum],
+            'Future Value': [future_value, lump_sum_future],
+            'Returns': [returns, lump_sum_future - lump_sum]
+        })
 
-        with col2:
-            monthly_expenses = st.number_input(
-                "Current Monthly Expenses (₹)",
-                min_value=0,
-                value=50000,
-                step=1000
-            )
-            inflation_rate = st.number_input(
-                "Expected Inflation Rate (%)",
-                min_value=0.0,
-                max_value=15.0,
-                value=6.0,
-                step=0.1
-            )
-            return_rate = st.number_input(
-                "Expected Return Rate (%)",
-                min_value=0.0,
-                max_value=20.0,
-                value=8.0,
-                step=0.1
-            )
+        st.table(comparison_df.set_index('Investment Type').style.format({
+            'Investment Amount': '₹{:,.2f}',
+            'Future Value': '₹{:,.2f}',
+            'Returns': '₹{:,.2f}'
+        }))
 
-        if st.button("Calculate Retirement Plan", use_container_width=True):
-            total_needed, monthly_savings = calculate_retirement_needs(
-                current_age, retirement_age, life_expectancy,
-                monthly_expenses, inflation_rate, return_rate
-            )
+        st.info("""
+        ### 💡 Key Benefits of SIP
+        1. **Rupee Cost Averaging**: Buy more units when prices are low
+        2. **Power of Compounding**: Returns on returns
+        3. **Disciplined Investing**: Regular savings habit
+        4. **Flexibility**: Start with small amounts
+        """)
 
-            years_to_retirement = retirement_age - current_age
-            retirement_duration = life_expectancy - retirement_age
+# Compound Interest Calculator
+def show_compound_interest_calculator():
+    st.header("Compound Interest Calculator")
+    st.write("""
+    Calculate how your investments grow over time with the power of compound interest.
+    Include regular contributions to see your wealth build faster!
+    """)
+    st.warning("""
+    **Disclaimer:** Compound interest calculations assume a constant interest rate.  Actual returns may vary due to market conditions and other factors.  This tool is for educational purposes only and does not constitute financial advice.
+    """)
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Total Amount Needed",
-                    f"₹{total_needed:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Monthly Savings Required",
-                    f"₹{monthly_savings:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Years to Retirement",
-                    f"{years_to_retirement} years"
-                )
+    col1, col2 = st.columns(2)
+    with col1:
+        principal = st.number_input(
+            "Initial Investment (₹)",
+            min_value=0,
+            value=10000,
+            step=1000
+        )
+        interest_rate = st.number_input(
+            "Annual Interest Rate (%)",
+            min_value=0.0,
+            max_value=30.0,
+            value=8.0,
+            step=0.1
+        )
 
-            # Create visualization of savings growth
-            years = list(range(years_to_retirement + 1))
-            savings = []
-            amount = 0
+    with col2:
+        time_period = st.number_input(
+            "Time Period (Years)",
+            min_value=1,
+            max_value=50,
+            value=10
+        )
+        monthly_contribution = st.number_input(
+            "Monthly Contribution (₹)",
+            min_value=0,
+            value=1000,
+            step=100
+        )
 
-            for year in years:
-                savings.append(amount)
-                amount = (amount + monthly_savings * 12) * (1 + return_rate/100)
+    if st.button("Calculate Growth", use_container_width=True):
+        # Calculate year-by-year growth
+        years = list(range(time_period + 1))
+        amounts = []
+        amount = principal
 
-            df = pd.DataFrame({
-                'Year': years,
-                'Savings': savings
-            })
+        for year in years:
+            amounts.append(amount)
+            contribution = monthly_contribution * 12
+            amount = (amount + contribution) * (1 + interest_rate/100)
 
-            fig = px.line(
-                df,
-                x='Year',
-                y='Savings',
-                title='Retirement Savings Growth',
-                labels={'Savings': 'Amount (₹)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        # Create DataFrame for visualization
+        df = pd.DataFrame({
+            'Year': years,
+            'Amount': amounts
+        })
 
-    elif calculator == "Education Savings 🎓":
-        st.header("Education Savings Calculator")
-        st.write("""
-        Plan for your children's education by calculating how much you need to save
-        considering education inflation and investment returns.
-        """)
-        st.warning("""
-        **Disclaimer:** Education savings calculations are estimates based on projected education costs and investment returns.  Actual costs and returns may vary.  This tool is for planning purposes and should not be considered financial advice.
-        """)
+        # Display results
+        final_amount = amounts[-1]
+        total_investment = principal + monthly_contribution * 12 * time_period
+        total_interest = final_amount - total_investment
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            current_cost = st.number_input(
-                "Current Annual Education Cost (₹)",
-                min_value=0,
-                value=200000,
-                step=10000
-            )
-            years_to_start = st.number_input(
-                "Years until Education Starts",
-                min_value=1,
-                max_value=20,
-                value=10
+            st.metric(
+                "Final Amount",
+                f"₹{final_amount:,.2f}"
             )
-
         with col2:
-            education_duration = st.number_input(
-                "Duration of Education (Years)",
-                min_value=1,
-                max_value=10,
-                value=4
-            )
-            education_inflation = st.number_input(
-                "Education Inflation Rate (%)",
-                min_value=0.0,
-                max_value=15.0,
-                value=10.0,
-                step=0.1
+            st.metric(
+                "Total Investment",
+                f"₹{total_investment:,.2f}"
             )
-            expected_return = st.number_input(
-                "Expected Investment Return (%)",
-                min_value=0.0,
-                max_value=20.0,
-                value=8.0,
-                step=0.1
+        with col3:
+            st.metric(
+                "Interest Earned",
+                f"₹{total_interest:,.2f}"
             )
 
-        if st.button("Calculate Education Plan", use_container_width=True):
-            # Calculate future education cost
-            future_annual_cost = current_cost * (1 + education_inflation/100)**years_to_start
-            total_education_cost = future_annual_cost * education_duration
-
-            # Calculate required monthly savings
-            monthly_savings = total_education_cost / ((1 + expected_return/100)**years_to_start - 1) / (expected_return/100 * 12)
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Future Annual Cost",
-                    f"₹{future_annual_cost:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Total Education Cost",
-                    f"₹{total_education_cost:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Monthly Savings Needed",
-                    f"₹{monthly_savings:,.2f}"
-                )
+        # Plot growth
+        fig = px.line(
+            df,
+            x='Year',
+            y='Amount',
+            title='Investment Growth Over Time',
+            labels={'Amount': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            # Show savings growth visualization
-            years = list(range(years_to_start + 1))
-            savings = []
-            amount = 0
+# Retirement Planning Calculator
+def show_retirement_calculator():
+    st.header("Retirement Planning Calculator")
+    st.write("""
+    Plan your retirement by calculating how much you need to save monthly to 
+    achieve your retirement goals.
+    """)
+    st.warning("""
+    **Disclaimer:** Retirement planning calculations are estimates based on assumptions about inflation, investment returns, and expenses.  Actual results may vary. Consult a financial advisor for personalized retirement planning.
+    """)
 
-            for year in years:
-                savings.append(amount)
-                amount = (amount + monthly_savings * 12) * (1 + expected_return/100)
+    col1, col2 = st.columns(2)
+    with col1:
+        current_age = st.number_input(
+            "Current Age",
+            min_value=18,
+            max_value=70,
+            value=30
+        )
+        retirement_age = st.number_input(
+            "Retirement Age",
+            min_value=current_age + 1,
+            max_value=80,
+            value=60
+        )
+        life_expectancy = st.number_input(
+            "Life Expectancy",
+            min_value=retirement_age + 1,
+            max_value=100,
+            value=85
+        )
 
-            df = pd.DataFrame({
-                'Year': years,
-                'Savings': savings
-            })
+    with col2:
+        monthly_expenses = st.number_input(
+            "Current Monthly Expenses (₹)",
+            min_value=0,
+            value=50000,
+            step=1000
+        )
+        inflation_rate = st.number_input(
+            "Expected Inflation Rate (%)",
+            min_value=0.0,
+            max_value=15.0,
+            value=6.0,
+            step=0.1
+        )
+        return_rate = st.number_input(
+            "Expected Return Rate (%)",
+            min_value=0.0,
+            max_value=20.0,
+            value=8.0,
+            step=0.1
+        )
 
-            fig = px.line(
-                df,
-                x='Year',
-                y='Savings',
-                title='Education Fund Growth',
-                labels={'Savings': 'Amount (₹)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    if st.button("Calculate Retirement Plan", use_container_width=True):
+        total_needed, monthly_savings = calculate_retirement_needs(
+            current_age, retirement_age, life_expectancy,
+            monthly_expenses, inflation_rate, return_rate
+        )
 
-    elif calculator == "Emergency Fund 🏦":
-        st.header("Emergency Fund Calculator")
-        st.write("""
-        Calculate how much you should have in your emergency fund based on your
-        monthly expenses and risk factors.
-        """)
+        years_to_retirement = retirement_age - current_age
+        retirement_duration = life_expectancy - retirement_age
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            monthly_expenses = st.number_input(
-                "Monthly Expenses (₹)",
-                min_value=0,
-                value=50000,
-                step=1000
-            )
-            dependents = st.number_input(
-                "Number of Dependents",
-                min_value=0,
-                max_value=10,
-                value=0
+            st.metric(
+                "Total Amount Needed",
+                f"₹{total_needed:,.2f}"
             )
-
         with col2:
-            employment_stability = st.selectbox(
-                "Employment Stability",
-                ["Very Stable", "Stable", "Moderate", "Unstable"]
+            st.metric(
+                "Monthly Savings Required",
+                f"₹{monthly_savings:,.2f}"
             )
-            health_insurance = st.selectbox(
-                "Health Insurance Coverage",
-                ["Comprehensive", "Basic", "None"]
+        with col3:
+            st.metric(
+                "Years to Retirement",
+                f"{years_to_retirement} years"
             )
 
-        if st.button("Calculate Emergency Fund", use_container_width=True):
-            # Calculate recommended months of expenses
-            base_months = 3
+        # Create visualization of savings growth
+        years = list(range(years_to_retirement + 1))
+        savings = []
+        amount = 0
 
-            # Add months based on risk factors
-            if employment_stability == "Unstable":
-                base_months += 3
-            elif employment_stability == "Moderate":
-                base_months += 2
-            elif employment_stability == "Stable":
-                base_months += 1
+        for year in years:
+            savings.append(amount)
+            amount = (amount + monthly_savings * 12) * (1 + return_rate/100)
 
-            if health_insurance == "None":
-                base_months += 2
-            elif health_insurance == "Basic":
-                base_months += 1
+        df = pd.DataFrame({
+            'Year': years,
+            'Savings': savings
+        })
 
-            base_months += min(dependents, 3)  # Add up to 3 months for dependents
+        fig = px.line(
+            df,
+            x='Year',
+            y='Savings',
+            title='Retirement Savings Growth',
+            labels={'Savings': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            recommended_fund = monthly_expenses * base_months
-            minimum_fund = monthly_expenses * 3
-            maximum_fund = monthly_expenses * 12
+# Education Savings Calculator
+def show_education_savings_calculator():
+    st.header("Education Savings Calculator")
+    st.write("""
+    Plan for your children's education by calculating how much you need to save
+    considering education inflation and investment returns.
+    """)
+    st.warning("""
+    **Disclaimer:** Education savings calculations are estimates based on projected education costs and investment returns.  Actual costs and returns may vary.  This tool is for planning purposes and should not be considered financial advice.
+    """)
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Recommended Fund",
-                    f"₹{recommended_fund:,.2f}",
-                    f"{base_months} months of expenses"
-                )
-            with col2:
-                st.metric(
-                    "Minimum Target",
-                    f"₹{minimum_fund:,.2f}",
-                    "3 months of expenses"
-                )
-            with col3:
-                st.metric(
-                    "Maximum Target",
-                    f"₹{maximum_fund:,.2f}",
-                    "12 months of expenses"
-                )
+    col1, col2 = st.columns(2)
+    with col1:
+        current_cost = st.number_input(
+            "Current Annual Education Cost (₹)",
+            min_value=0,
+            value=200000,
+            step=10000
+        )
+        years_to_start = st.number_input(
+            "Years until Education Starts",
+            min_value=1,
+            max_value=20,
+            value=10
+        )
 
-            # Create visualization
-            fund_levels = pd.DataFrame({
-                'Level': ['Minimum', 'Recommended', 'Maximum'],
-                'Amount': [minimum_fund, recommended_fund, maximum_fund],
-                'Months': [3, base_months, 12]
-            })
+    with col2:
+        education_duration = st.number_input(
+            "Duration of Education (Years)",
+            min_value=1,
+            max_value=10,
+            value=4
+        )
+        education_inflation = st.number_input(
+            "Education Inflation Rate (%)",
+            min_value=0.0,
+            max_value=15.0,
+            value=10.0,
+            step=0.1
+        )
+        expected_return = st.number_input(
+            "Expected Investment Return (%)",
+            min_value=0.0,
+            max_value=20.0,
+            value=8.0,
+            step=0.1
+        )
 
-            fig = px.bar(
-                fund_levels,
-                x='Level',
-                y='Amount',
-                title='Emergency Fund Targets',
-                text=fund_levels['Months'].apply(lambda x: f'{x} months'),
-                labels={'Amount': 'Amount (₹)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    if st.button("Calculate Education Plan", use_container_width=True):
+        # Calculate future education cost
+        future_annual_cost = current_cost * (1 + education_inflation/100)**years_to_start
+        total_education_cost = future_annual_cost * education_duration
 
-    elif calculator == "Home Down Payment 🏠":
-        st.header("Home Down Payment Calculator")
-        st.write("""
-        Calculate how much you need to save for a home down payment and create a
-        savings plan to reach your goal.
-        """)
-        st.warning("""
-        **Disclaimer:** Home down payment calculations are estimates based on projected investment returns.  Actual returns may vary. This tool is for planning purposes only and does not constitute financial advice.
-        """)
+        # Calculate required monthly savings
+        monthly_savings = total_education_cost / ((1 + expected_return/100)**years_to_start - 1) / (expected_return/100 * 12)
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            property_value = st.number_input(
-                "Expected Property Value (₹)",
-                min_value=0,
-                value=5000000,
-                step=100000
-            )
-            down_payment_percent = st.slider(
-                "Down Payment Percentage",
-                min_value=10,
-                max_value=40,
-                value=20
-            )
-
-        with col2:
-            years_to_purchase = st.number_input(
-                "Years to Purchase",
-                min_value=1,
-                max_value=20,
-                value=5
-            )
-            expected_return = st.number_input(
-                "Expected Investment Return (%)",
-                min_value=0.0,
-                max_value=20.0,
-                value=8.0,
-                step=0.1
-            )
-
-        if st.button("Calculate Down Payment Plan", use_container_width=True):
-            down_payment_amount = property_value * (down_payment_percent/100)
-            monthly_savings = down_payment_amount / ((1 + expected_return/100)**years_to_purchase - 1) / (expected_return/100 * 12)
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Down Payment Required",
-                    f"₹{down_payment_amount:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Monthly Savings Needed",
-                    f"₹{monthly_savings:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Years to Goal",
-                    f"{years_to_purchase} years"
-                )
+            st.metric(
+                "Future Annual Cost",
+                f"₹{future_annual_cost:,.2f}"
+            )
+        with col2:
+            st.metric(
+                "Total Education Cost",
+                f"₹{total_education_cost:,.2f}"
+            )
+        with col3:
+            st.metric(
+                "Monthly Savings Needed",
+                f"₹{monthly_savings:,.2f}"
+            )
 
-            # Show savings growth visualization
-            years = list(range(years_to_purchase + 1))
-            savings = []
-            amount = 0
+        # Show savings growth visualization
+        years = list(range(years_to_start + 1))
+        savings = []
+        amount = 0
 
-            for year in years:
-                savings.append(amount)
-                amount = (amount + monthly_savings * 12) * (1 + expected_return/100)
+        for year in years:
+            savings.append(amount)
+            amount = (amount + monthly_savings * 12) * (1 + expected_return/100)
 
-            df = pd.DataFrame({
-                'Year': years,
-                'Savings': savings
-            })
+        df = pd.DataFrame({
+            'Year': years,
+            'Savings': savings
+        })
 
-            fig = px.line(
-                df,
-                x='Year',
-                y='Savings',
-                title='Down Payment Savings Growth',
-                labels={'Savings': 'Amount (₹)'}
-            )
+        fig = px.line(
+            df,
+            x='Year',
+            y='Savings',
+            title='Education Fund Growth',
+            labels={'Savings': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            # Add target line
-            fig.add_hline(
-                y=down_payment_amount,
-                line_dash="dash",
-                line_color="red",
-                annotation_text="Target Down Payment"
-            )
+# Emergency Fund Calculator
+def show_emergency_fund_calculator():
+    st.header("Emergency Fund Calculator")
+    st.write("""
+    Calculate how much you should have in your emergency fund based on your
+    monthly expenses and risk factors.
+    """)
 
-            st.plotly_chart(fig, use_container_width=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        monthly_expenses = st.number_input(
+            "Monthly Expenses (₹)",
+            min_value=0,
+            value=50000,
+            step=1000
+        )
+        dependents = st.number_input(
+            "Number of Dependents",
+            min_value=0,
+            max_value=10,
+            value=0
+        )
 
-    elif calculator == "Net Worth Tracker 💎":
-        st.header("Net Worth Tracker")
-        st.write("""
-        Track your net worth by listing your assets and liabilities.
-        This helps you understand your overall financial position and make better financial decisions.
-        """)
+    with col2:
+        employment_stability = st.selectbox(
+            "Employment Stability",
+            ["Very Stable", "Stable", "Moderate", "Unstable"]
+        )
+        health_insurance = st.selectbox(
+            "Health Insurance Coverage",
+            ["Comprehensive", "Basic", "None"]
+        )
 
-        # Assets Section
-        st.subheader("🏦 Assets")
+    if st.button("Calculate Emergency Fund", use_container_width=True):
+        # Calculate recommended months of expenses
+        base_months = 3
 
-        with st.expander("💡 Understanding Assets", expanded=True):
-            st.info("""
-            Assets are anything you own that has monetary value. They can be:
-            - Liquid assets (easily converted to cash)
-            - Fixed assets (long-term holdings)
-            - Investment assets (potentially appreciating assets)
-            """)
+        # Add months based on risk factors
+        if employment_stability == "Unstable":
+            base_months += 3
+        elif employment_stability == "Moderate":
+            base_months += 2
+        elif employment_stability == "Stable":
+            base_months += 1
 
-        col1, col2 = st.columns(2)
+        if health_insurance == "None":
+            base_months += 2
+        elif health_insurance == "Basic":
+            base_months += 1
 
-        with col1:
-            cash = st.number_input("Cash and Bank Balances (₹)", min_value=0, value=0)
-            investments = st.number_input("Investments (Stocks, Mutual Funds) (₹)", min_value=0, value=0)
-            real_estate = st.number_input("Real Estate Value (₹)", min_value=0, value=0)
+        base_months += min(dependents, 3)  # Add up to 3 months for dependents
 
+        recommended_fund = monthly_expenses * base_months
+        minimum_fund = monthly_expenses * 3
+        maximum_fund = monthly_expenses * 12
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(
+                "Recommended Fund",
+                f"₹{recommended_fund:,.2f}",
+                f"{base_months} months of expenses"
+            )
         with col2:
-            vehicles = st.number_input("Vehicles Value (₹)", min_value=0, value=0)
-            other_assets = st.number_input("Other Assets (₹)", min_value=0, value=0)
+            st.metric(
+                "Minimum Target",
+                f"₹{minimum_fund:,.2f}",
+                "3 months of expenses"
+            )
+        with col3:
+            st.metric(
+                "Maximum Target",
+                f"₹{maximum_fund:,.2f}",
+                "12 months of expenses"
+            )
+
+        # Create visualization
+        fund_levels = pd.DataFrame({
+            'Level': ['Minimum', 'Recommended', 'Maximum'],
+            'Amount': [minimum_fund, recommended_fund, maximum_fund],
+            'Months': [3, base_months, 12]
+        })
+
+        fig = px.bar(
+            fund_levels,
+            x='Level',
+            y='Amount',
+            title='Emergency Fund Targets',
+            text=fund_levels['Months'].apply(lambda x: f'{x} months'),
+            labels={'Amount': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-        total_assets = cash + investments + real_estate + vehicles + other_assets
+# Home Down Payment Calculator
+def show_home_down_payment_calculator():
+    st.header("Home Down Payment Calculator")
+    st.write("""
+    Calculate how much you need to save for a home down payment and create a
+    savings plan to reach your goal.
+    """)
+    st.warning("""
+    **Disclaimer:** Home down payment calculations are estimates based on projected investment returns.  Actual returns may vary. This tool is for planning purposes only and does not constitute financial advice.
+    """)
 
-        # Liabilities Section
-        st.subheader("💫 Liabilities")
+    col1, col2 = st.columns(2)
+    with col1:
+        property_value = st.number_input(
+            "Expected Property Value (₹)",
+            min_value=0,
+            value=5000000,
+            step=100000
+        )
+        down_payment_percent = st.slider(
+            "Down Payment Percentage",
+            min_value=10,
+            max_value=40,
+            value=20
+        )
 
-        with st.expander("💡 Understanding Liabilities", expanded=True):
-            st.info("""
-            Liabilities are your financial obligations or debts:
-            - Short-term liabilities (credit cards, short-term loans)
-            - Long-term liabilities (mortgages, long-term loans)
-            - Recurring liabilities (regular payment obligations)
-            """)
+    with col2:
+        years_to_purchase = st.number_input(
+            "Years to Purchase",
+            min_value=1,
+            max_value=20,
+            value=5
+        )
+        expected_return = st.number_input(
+            "Expected Investment Return (%)",
+            min_value=0.0,
+            max_value=20.0,
+            value=8.0,
+            step=0.1
+        )
 
-        col1, col2 = st.columns(2)
+    if st.button("Calculate Down Payment Plan", use_container_width=True):
+        down_payment_amount = property_value * (down_payment_percent/100)
+        monthly_savings = down_payment_amount / ((1 + expected_return/100)**years_to_purchase - 1) / (expected_return/100 * 12)
 
+        col1, col2, col3 = st.columns(3)
         with col1:
-            home_loan = st.number_input("Home Loan Balance (₹)", min_value=0, value=0)
-            car_loan = st.number_input("Car Loan Balance (₹)", min_value=0, value=0)
-
+            st.metric(
+                "Down Payment Required",
+                f"₹{down_payment_amount:,.2f}"
+            )
         with col2:
-            credit_card = st.number_input("Credit Card Debt (₹)", min_value=0, value=0)
-            other_loans = st.number_input("Other Loans (₹)", min_value=0, value=0)
-
-        total_liabilities = home_loan + car_loan + credit_card + other_loans
+            st.metric(
+                "Monthly Savings Needed",
+                f"₹{monthly_savings:,.2f}"
+            )
+        with col3:
+            st.metric(
+                "Years to Goal",
+                f"{years_to_purchase} years"
+            )
 
-        if st.button("Calculate Net Worth", use_container_width=True):
-            net_worth = total_assets - total_liabilities
+        # Show savings growth visualization
+        years = list(range(years_to_purchase + 1))
+        savings = []
+        amount = 0
 
-            # Display key metrics with detailed analysis
-            st.subheader("📊 Financial Position Analysis")
+        for year in years:
+            savings.append(amount)
+            amount = (amount + monthly_savings * 12) * (1 + expected_return/100)
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Total Assets",
-                    f"₹{total_assets:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Total Liabilities",
-                    f"₹{total_liabilities:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Net Worth",
-                    f"₹{net_worth:,.2f}",
-                    f"{'Positive' if net_worth >= 0 else 'Negative'} Net Worth"
-                )
+        df = pd.DataFrame({
+            'Year': years,
+            'Savings': savings
+        })
 
-            # Show celebration for positive net worth
-            if net_worth > 0:
-                show_celebration_animation(
-                    net_worth,
-                    "🎉 Positive Net Worth! 🎉"
-                )
+        fig = px.line(
+            df,
+            x='Year',
+            y='Savings',
+            title='Down Payment Savings Growth',
+            labels={'Savings': 'Amount (₹)'}
+        )
 
-            # Detailed Breakdown Analysis
-            st.subheader("📈 Detailed Breakdown")
+        # Add target line
+        fig.add_hline(
+            y=down_payment_amount,
+            line_dash="dash",
+            line_color="red",
+            annotation_text="Target Down Payment"
+        )
 
-            # Assets breakdown
-            assets_data = {
-                'Category': ['Cash', 'Investments', 'Real Estate', 'Vehicles', 'Other'],
-                'Amount': [cash, investments, real_estate, vehicles, other_assets],
-                'Percentage': [x/total_assets*100 if total_assets > 0 else 0 for x in 
-                             [cash, investments, real_estate, vehicles, other_assets]]
-            }
-            assets_df = pd.DataFrame(assets_data)
-
-            # Liabilities breakdown
-            liabilities_data = {
-                'Category': ['Home Loan', 'Car Loan', 'Credit Card', 'Other Loans'],
-                'Amount': [home_loan, car_loan, credit_card, other_loans],
-                'Percentage': [x/total_liabilities*100 if total_liabilities > 0 else 0 for x in 
-                             [home_loan, car_loan, credit_card, other_loans]]
-            }
-            liabilities_df = pd.DataFrame(liabilities_data)
+        st.plotly_chart(fig, use_container_width=True)
 
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write("### Assets Distribution")
-                st.dataframe(assets_df.style.format({
-                    'Amount': '₹{:,.2f}',
-                    'Percentage': '{:.1f}%'
-                }))
-
-                # Assets Pie Chart
-                fig_assets = px.pie(
-                    assets_df,
-                    values='Amount',
-                    names='Category',
-                    title='Assets Distribution'
-                )
-                st.plotly_chart(fig_assets)
+# Net Worth Tracker
+def show_net_worth_tracker():
+    st.header("Net Worth Tracker")
+    st.write("""
+    Track your net worth by listing your assets and liabilities.
+    This helps you understand your overall financial position and make better financial decisions.
+    """)
 
-            with col2:
-                st.write("### Liabilities Distribution")
-                st.dataframe(liabilities_df.style.format({
-                    'Amount': '₹{:,.2f}',
-                    'Percentage': '{:.1f}%'
-                }))
-
-                # Liabilities Pie Chart
-                fig_liabilities = px.pie(
-                    liabilities_df,
-                    values='Amount',
-                    names='Category',
-                    title='Liabilities Distribution'
-                )
-                st.plotly_chart(fig_liabilities)
+    # Assets Section
+    st.subheader("🏦 Assets")
 
-            # Financial Health Indicators
-            st.subheader("🏥 Financial Health Indicators")
+    with st.expander("💡 Understanding Assets", expanded=True):
+        st.info("""
+        Assets are anything you own that has monetary value. They can be:
+        - Liquid assets (easily converted to cash)
+        - Fixed assets (long-term holdings)
+        - Investment assets (potentially appreciating assets)
+        """)
 
-            # Calculate key ratios
-            debt_to_asset_ratio = total_liabilities/total_assets if total_assets > 0 else float('inf')
-            liquid_assets = cash + investments
-            liquid_ratio = liquid_assets/total_liabilities if total_liabilities > 0 else float('inf')
+    col1, col2 = st.columns(2)
 
-            # Display ratios and their interpretations
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(
-                    "Debt to Asset Ratio",
-                    f"{debt_to_asset_ratio:.2f}",
-                    "Lower is better"
-                )
+    with col1:
+        cash = st.number_input("Cash and Bank Balances (₹)", min_value=0, value=0)
+        investments = st.number_input("Investments (Stocks, Mutual Funds) (₹)", min_value=0, value=0)
+        real_estate = st.number_input("Real Estate Value (₹)", min_value=0, value=0)
 
-                if debt_to_asset_ratio < 0.4:
-                    st.success("✅ Healthy debt level")
-                elif debt_to_asset_ratio < 0.6:
-                    st.warning("⚠️ Moderate debt level")
-                else:
-                    st.error("🚨 High debt level")
+    with col2:
+        vehicles = st.number_input("Vehicles Value (₹)", min_value=0, value=0)
+        other_assets = st.number_input("Other Assets (₹)", min_value=0, value=0)
 
-            with col2:
-                st.metric(
-                    "Liquid Assets Ratio",
-                    f"{liquid_ratio:.2f}",
-                    "Higher is better"
-                )
+    total_assets = cash + investments + real_estate + vehicles + other_assets
 
-                if liquid_ratio > 1:
-                    st.success("✅ Strong liquidity position")
-                elif liquid_ratio > 0.5:
-                    st.warning("⚠️ Moderate liquidity")
-                else:
-                    st.error("🚨 Low liquidity")
+    # Liabilities Section
+    st.subheader("💫 Liabilities")
 
-            # Recommendations based on analysis
-            st.subheader("💡 Financial Recommendations")
+    with st.expander("💡 Understanding Liabilities", expanded=True):
+        st.info("""
+        Liabilities are your financial obligations or debts:
+        - Short-term liabilities (credit cards, short-term loans)
+        - Long-term liabilities (mortgages, long-term loans)
+        - Recurring liabilities (regular payment obligations)
+        """)
 
-            recommendations = []
+    col1, col2 = st.columns(2)
 
-            if debt_to_asset_ratio > 0.5:
-                recommendations.append("Consider debt reduction strategies")
-            if liquid_ratio < 1:
-                recommendations.append("Build emergency fund and liquid assets")
-            if credit_card > 0:
-                recommendations.append("Prioritize paying off high-interest credit card debt")
-            if total_assets > 0 and investments/total_assets < 0.2:
-                recommendations.append("Consider increasing investment allocation")
-            if net_worth < 0:
-                recommendations.append("Focus on building positive net worth through savings and debt reduction")
+    with col1:
+        home_loan = st.number_input("Home Loan Balance (₹)", min_value=0, value=0)
+        car_loan = st.number_input("Car Loan Balance (₹)", min_value=0, value=0)
 
-            for rec in recommendations:
-                st.warning(f"• {rec}")
+    with col2:
+        credit_card = st.number_input("Credit Card Debt (₹)", min_value=0, value=0)
+        other_loans = st.number_input("Other Loans (₹)", min_value=0, value=0)
 
-            if not recommendations:
-                st.success("✅ Your financial position looks healthy! Continue maintaining good financial habits.")
+    total_liabilities = home_loan + car_loan + credit_card + other_loans
 
-    elif calculator == "Investment Returns 📊":
-        st.header("Investment Returns Calculator")
-        st.write("""
-        Calculate potential returns on your investments considering different
-        scenarios and risk levels. This helps you make informed investment decisions.
-        """)
-        st.warning("""
-        **Disclaimer:** Investment return calculations are projections based on assumed rates of return. Actual returns may vary significantly due to market conditions and other factors.  This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized investment guidance.
-        """)
+    if st.button("Calculate Net Worth", use_container_width=True):
+        net_worth = total_assets - total_liabilities
 
-        with st.expander("💡 Understanding Risk Levels", expanded=True):
-            st.info("""
-            **Risk Levels Explained:**
-            1. **Conservative**: Lower risk, stable returns (6-8%)
-               - Suitable for short-term goals
-               - Focus on capital preservation
-               - Mainly debt instruments
-            
-            2. **Moderate**: Balanced risk-return (8-12%)
-               - Mix of equity and debt
-               - Medium-term investment horizon
-               - Moderate volatility
-            
-            3. **Aggressive**: Higher risk, potentially higher returns (12-15%)
-               - Mainly equity focused
-               - Long-term investment horizon
-               - Higher volatility
-            """)
+        # Display key metrics with detailed analysis
+        st.subheader("📊 Financial Position Analysis")
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
-            investment_amount = st.number_input(
-                "Investment Amount (₹)",
-                min_value=0,
-                value=100000,
-                step=1000
-            )
-            investment_period = st.number_input(
-                "Investment Period (Years)",
-                min_value=1,
-                max_value=30,
-                value=5
+            st.metric(
+                "Total Assets",
+                f"₹{total_assets:,.2f}"
             )
-
         with col2:
-            risk_level = st.selectbox(
-                "Risk Level",
-                ["Conservative", "Moderate", "Aggressive"]
+            st.metric(
+                "Total Liabilities",
+                f"₹{total_liabilities:,.2f}"
             )
-
-            # Set return ranges based on risk level
-            if risk_level == "Conservative":
-                return_range = (6.0, 8.0)
-            elif risk_level == "Moderate":
-                return_range = (8.0, 12.0)
-            else:
-                return_range = (12.0, 15.0)
-
-            expected_return = st.slider(
-                "Expected Annual Return (%)",
-                min_value=float(return_range[0]),
-                max_value=float(return_range[1]),
-                value=float(return_range[0]),
-                step=0.1
+        with col3:
+            st.metric(
+                "Net Worth",
+                f"₹{net_worth:,.2f}",
+                f"{'Positive' if net_worth >= 0 else 'Negative'} Net Worth"
             )
 
-        if st.button("Calculate Investment Returns", use_container_width=True):
-            # Calculate returns for different scenarios
-            conservative_return = investment_amount * (1 + return_range[0]/100)**investment_period
-            expected_return_amount = investment_amount * (1 + expected_return/100)**investment_period
-            aggressive_return = investment_amount * (1 + return_range[1]/100)**investment_period
+        # Show celebration for positive net worth
+        if net_worth > 0:
+            show_celebration_animation(
+                net_worth,
+                "🎉 Positive Net Worth! 🎉"
+            )
 
-            # Show key metrics
-            st.subheader("📊 Investment Scenarios Analysis")
+        # Detailed Breakdown Analysis
+        st.subheader("📈 Detailed Breakdown")
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Conservative Scenario",
-                    f"₹{conservative_return:,.2f}",
-                    f"{return_range[0]}% return"
-                )
-            with col2:
-                st.metric(
-                    "Expected Return",
-                    f"₹{expected_return_amount:,.2f}",
-                    f"{expected_return}% return"
-                )
-            with col3:
-                st.metric(
-                    "Aggressive Scenario",
-                    f"₹{aggressive_return:,.2f}",
-                    f"{return_range[1]}% return"
-                )
+        # Assets breakdown
+        assets_data = {
+            'Category': ['Cash', 'Investments', 'Real Estate', 'Vehicles', 'Other'],
+            'Amount': [cash, investments, real_estate, vehicles, other_assets],
+            'Percentage': [x/total_assets*100 if total_assets > 0 else 0 for x in 
+                         [cash, investments, real_estate, vehicles, other_assets]]
+        }
+        assets_df = pd.DataFrame(assets_data)
+
+        # Liabilities breakdown
+        liabilities_data = {
+            'Category': ['Home Loan', 'Car Loan', 'Credit Card', 'Other Loans'],
+            'Amount': [home_loan, car_loan, credit_card, other_loans],
+            'Percentage': [x/total_liabilities*100 if total_liabilities > 0 else 0 for x in 
+                         [home_loan, car_loan, credit_card, other_loans]]
+        }
+        liabilities_df = pd.DataFrame(liabilities_data)
 
-            # Show celebration for good returns
-            if expected_return_amount > investment_amount * 1.5:
-                show_celebration_animation(
-                    expected_return_amount - investment_amount,
-                    "🎉 Excellent Growth Potential! 🎉"
-                )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("### Assets Distribution")
+            st.dataframe(assets_df.style.format({
+                'Amount': '₹{:,.2f}',
+                'Percentage': '{:.1f}%'
+            }))
 
-            # Detailed Scenario Analysis
-            st.subheader("📈 Investment Growth Analysis")
+            # Assets Pie Chart
+            fig_assets = px.pie(
+                assets_df,
+                values='Amount',
+                names='Category',
+                title='Assets Distribution'
+            )
+            st.plotly_chart(fig_assets)
 
-            # Create visualization of growth scenarios
-            years = list(range(investment_period + 1))
-            conservative = [investment_amount * (1 + return_range[0]/100)**year for year in years]
-            expected = [investment_amount * (1 + expected_return/100)**year for year in years]
-            aggressive = [investment_amount * (1 + return_range[1]/100)**year for year in years]
+        with col2:
+            st.write("### Liabilities Distribution")
+            st.dataframe(liabilities_df.style.format({
+                'Amount': '₹{:,.2f}',
+                'Percentage': '{:.1f}%'
+            }))
 
-            # Year-wise breakdown
-            analysis_df = pd.DataFrame({
-                'Year': years,
-                'Conservative': conservative,
-                'Expected': expected,
-                'Aggressive': aggressive,
-                'Conservative Returns': [x - investment_amount for x in conservative],
-                'Expected Returns': [x - investment_amount for x in expected],
-                'Aggressive Returns': [x - investment_amount for x in aggressive]
-            })
+            # Liabilities Pie Chart
+            fig_liabilities = px.pie(
+                liabilities_df,
+                values='Amount',
+                names='Category',
+                title='Liabilities Distribution'
+            )
+            st.plotly_chart(fig_liabilities)
 
-            st.dataframe(analysis_df.style.format({
-                'Conservative': '₹{:,.2f}',
-                'Expected': '₹{:,.2f}',
-                'Aggressive': '₹{:,.2f}',
-                'Conservative Returns': '₹{:,.2f}',
-                'Expected Returns': '₹{:,.2f}',
-                'Aggressive Returns': '₹{:,.2f}'
-            }))
+        # Financial Health Indicators
+        st.subheader("🏥 Financial Health Indicators")
 
-            # Growth visualization
-            df = pd.DataFrame({
-                'Year': years * 3,
-                'Amount': conservative + expected + aggressive,
-                'Scenario': ['Conservative'] * len(years) + ['Expected'] * len(years) + ['Aggressive'] * len(years)
-            })
+        # Calculate key ratios
+        debt_to_asset_ratio = total_liabilities/total_assets if total_assets > 0 else float('inf')
+        liquid_assets = cash + investments
+        liquid_ratio = liquid_assets/total_liabilities if total_liabilities > 0 else float('inf')
 
-            fig = px.line(
-                df,
-                x='Year',
-                y='Amount',
-                color='Scenario',
-                title='Investment Growth Scenarios',
-                labels={'Amount': 'Amount (₹)'}
+        # Display ratios and their interpretations
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                "Debt to Asset Ratio",
+                f"{debt_to_asset_ratio:.2f}",
+                "Lower is better"
             )
-            st.plotly_chart(fig, use_container_width=True)
 
-            # Risk Analysis
-            st.subheader("🎯 Risk-Return Analysis")
+            if debt_to_asset_ratio < 0.4:
+                st.success("✅ Healthy debt level")
+            elif debt_to_asset_ratio < 0.6:
+                st.warning("⚠️ Moderate debt level")
+            else:
+                st.error("🚨 High debt level")
 
-            # Calculate key metrics
-            total_return_percent = (expected_return_amount/investment_amount - 1) * 100
-            annual_return = (1 + total_return_percent/100)**(1/investment_period) - 1
-            risk_level_str = "Low" if risk_level == "Conservative" else "Medium" if risk_level == "Moderate" else "High"
+        with col2:
+            st.metric(
+                "Liquid Assets Ratio",
+                f"{liquid_ratio:.2f}",
+                "Higher is better"
+            )
 
-            col1, col2 = st.columns(2)
-            with col1:
-                st.info(f"""
-                ### 📊 Return Metrics
-                - Total Return: {total_return_percent:.1f}%
-                - Annual Return: {annual_return*100:.1f}%
-                - Investment Horizon: {investment_period} years
-                - Risk Level: {risk_level_str}
-                """)
+            if liquid_ratio > 1:
+                st.success("✅ Strong liquidity position")
+            elif liquid_ratio > 0.5:
+                st.warning("⚠️ Moderate liquidity")
+            else:
+                st.error("🚨 Low liquidity")
 
-            with col2:
-                st.info(f"""
-                ### 💡 Portfolio Characteristics
-                - Investment Style: {risk_level}
-                - Return Range: {return_range[0]}% - {return_range[1]}%
-                - Capital Growth: ₹{expected_return_amount - investment_amount:,.2f}
-                - Risk Category: {risk_level_str}
-                """)
+        # Recommendations based on analysis
+        st.subheader("💡 Financial Recommendations")
 
-            # Investment Recommendations
-            st.subheader("💡 Investment Recommendations")
+        recommendations = []
 
-            if investment_period < 3:
-                st.warning("""
-                **Short-term Investment Strategy:**
-                - Consider more conservative allocation
-                - Focus on capital preservation
-                - Review investment horizon
-                - Consider fixed income options
-                """)
-            elif investment_period < 7:
-                st.info("""
-                **Medium-term Investment Strategy:**
-                - Balance between growth and stability
-                - Regular portfolio rebalancing
-                - Consider increasing equity exposure
-                - Monitor market conditions
-                """)
-            else:
-                st.success("""
-                **Long-term Investment Strategy:**
-                - Focus on equity for growth
-                - Use rupee cost averaging
-                - Regular portfolio review
-                - Stay invested through market cycles
-                """)
+        if debt_to_asset_ratio > 0.5:
+            recommendations.append("Consider debt reduction strategies")
+        if liquid_ratio < 1:
+            recommendations.append("Build emergency fund and liquid assets")
+        if credit_card > 0:
+            recommendations.append("Prioritize paying off high-interest credit card debt")
+        if total_assets > 0 and investments/total_assets < 0.2:
+            recommendations.append("Consider increasing investment allocation")
+        if net_worth < 0:
+            recommendations.append("Focus on building positive net worth through savings and debt reduction")
+
+        for rec in recommendations:
+            st.warning(f"• {rec}")
+
+        if not recommendations:
+            st.success("✅ Your financial position looks healthy! Continue maintaining good financial habits.")
+
+# Investment Returns Calculator
+def show_investment_returns_calculator():
+    st.header("Investment Returns Calculator")
+    st.write("""
+    Calculate potential returns on your investments considering different
+    scenarios and risk levels. This helps you make informed investment decisions.
+    """)
+    st.warning("""
+    **Disclaimer:** Investment return calculations are projections based on assumed rates of return. Actual returns may vary significantly due to market conditions and other factors.  This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized investment guidance.
+    """)
 
-    elif calculator == "Stock Average Calculator 📈":
-        show_stock_average_calculator()
-        
-    elif calculator == "CAGR Calculator 📊":
-        show_cagr_calculator()
-        
-    elif calculator == "Interest Rate Calculator 📊":
-        show_interest_rate_calculator()
-        
-    elif calculator == "Inflation Calculator 💸":
-        show_inflation_calculator()
-        
-    elif calculator == "Discount Calculator 💰":
-        show_discount_calculator()
-        
-    elif calculator == "GST Calculator 🧾":
-        show_gst_calculator()
-        
-    elif calculator == "Gratuity Calculator 💼":
-        from utils.calculators import show_gratuity_calculator
-        show_gratuity_calculator()
-        return
-    elif calculator == "Loan EMI 💳":
-        st.header("Loan EMI Calculator")
-        st.write("""
-        Calculate your loan EMI and understand the total cost of borrowing
-        including interest payments.  This calculator provides a detailed breakdown of your loan repayment schedule, allowing you to visualize the impact of interest payments over time.  It also offers insights into the total cost of borrowing, helping you make informed financial decisions about your loan.
-        """)
-        st.warning("""
-        **Disclaimer:** Loan EMI calculations are based on a fixed interest rate.  Actual EMI amounts may vary based on lender policies and other factors. This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized loan guidance.
+    with st.expander("💡 Understanding Risk Levels", expanded=True):
+        st.info("""
+        **Risk Levels Explained:**
+        1. **Conservative**: Lower risk, stable returns (6-8%)
+           - Suitable for short-term goals
+           - Focus on capital preservation
+           - Mainly debt instruments
+
+        2. **Moderate**: Balanced risk-return (8-12%)
+           - Mix of equity and debt
+           - Medium-term investment horizon
+           - Moderate volatility
+
+        3. **Aggressive**: Higher risk, potentially higher returns (12-15%)
+           - Mainly equity focused
+           - Long-term investment horizon
+           - Higher volatility
         """)
 
-        col1, col2 = st.columns(2)
+    col1, col2 = st.columns(2)
+    with col1:
+        investment_amount = st.number_input(
+            "Investment Amount (₹)",
+            min_value=0,
+            value=100000,
+            step=1000
+        )
+        investment_period = st.number_input(
+            "Investment Period (Years)",
+            min_value=1,
+            max_value=30,
+            value=5
+        )
+
+    with col2:
+        risk_level = st.selectbox(
+            "Risk Level",
+            ["Conservative", "Moderate", "Aggressive"]
+        )
+
+        # Set return ranges based on risk level
+        if risk_level == "Conservative":
+            return_range = (6.0, 8.0)
+        elif risk_level == "Moderate":
+            return_range = (8.0, 12.0)
+        else:
+            return_range = (12.0, 15.0)
+
+        expected_return = st.slider(
+            "Expected Annual Return (%)",
+            min_value=float(return_range[0]),
+            max_value=float(return_range[1]),
+            value=float(return_range[0]),
+            step=0.1
+        )
+
+    if st.button("Calculate Investment Returns", use_container_width=True):
+        # Calculate returns for different scenarios
+        conservative_return = investment_amount * (1 + return_range[0]/100)**investment_period
+        expected_return_amount = investment_amount * (1 + expected_return/100)**investment_period
+        aggressive_return = investment_amount * (1 + return_range[1]/100)**investment_period
+
+        # Show key metrics
+        st.subheader("📊 Investment Scenarios Analysis")
+
+        col1, col2, col3 = st.columns(3)
         with col1:
-            loan_amount = st.number_input(
-                "Loan Amount (₹)",
-                min_value=0,
-                value=1000000,
-                step=10000
-            )
-            interest_rate = st.number_input(
-                "Annual Interest Rate (%)",
-                min_value=0.0,
-                max_value=30.0,
-                value=10.0,
-                step=0.1
+            st.metric(
+                "Conservative Scenario",
+                f"₹{conservative_return:,.2f}",
+                f"{return_range[0]}% return"
             )
-
         with col2:
-            loan_tenure = st.number_input(
-                "Loan Tenure (Years)",
-                min_value=1,
-                max_value=30,
-                value=20
+            st.metric(
+                "Expected Return",
+                f"₹{expected_return_amount:,.2f}",
+                f"{expected_return}% return"
+            )
+        with col3:
+            st.metric(
+                "Aggressive Scenario",
+                f"₹{aggressive_return:,.2f}",
+                f"{return_range[1]}% return"
             )
 
-        if st.button("Calculate EMI", use_container_width=True):
-            # Calculate EMI
-            monthly_rate = interest_rate/(12*100)
-            tenure_months = loan_tenure * 12
-
-            emi = loan_amount * monthly_rate * (1 + monthly_rate)**tenure_months / ((1 + monthly_rate)**tenure_months - 1)
-            total_payment = emi * tenure_months
-            total_interest = total_payment - loan_amount
+        # Show celebration for good returns
+        if expected_return_amount > investment_amount * 1.5:
+            show_celebration_animation(
+                expected_return_amount - investment_amount,
+                "🎉 Excellent Growth Potential! 🎉"
+            )
 
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(
-                    "Monthly EMI",
-                    f"₹{emi:,.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Total Interest",
-                    f"₹{total_interest:,.2f}"
-                )
-            with col3:
-                st.metric(
-                    "Total Payment",
-                    f"₹{total_payment:,.2f}"
-                )
+        # Detailed Scenario Analysis
+        st.subheader("📈 Investment Growth Analysis")
 
-            # Create amortization schedule
-            remaining_loan = loan_amount
-            interest_paid = 0
-            principal_paid = 0
+        # Create visualization of growth scenarios
+        years = list(range(investment_period + 1))
+        conservative = [investment_amount * (1 + return_range[0]/100)**year for year in years]
+        expected = [investment_amount * (1 + expected_return/100)**year for year in years]
+        aggressive = [investment_amount * (1 + return_range[1]/100)**year for year in years]
 
-            years = list(range(loan_tenure + 1))
-            loan_balance = []
-            interest_component = []
-            principal_component = []
+        # Year-wise breakdown
+        analysis_df = pd.DataFrame({
+            'Year': years,
+            'Conservative': conservative,
+            'Expected': expected,
+            'Aggressive': aggressive,
+            'Conservative Returns': [x - investment_amount for x in conservative],
+            'Expected Returns': [x - investment_amount for x in expected],
+            'Aggressive Returns': [x - investment_amount for x in aggressive]
+        })
 
-            for year in years:
-                loan_balance.append(remaining_loan)
-                if year > 0:
-                    year_interest = remaining_loan * interest_rate/100
-                    year_principal = emi * 12 - year_interest
+        st.dataframe(analysis_df.style.format({
+            'Conservative': '₹{:,.2f}',
+            'Expected': '₹{:,.2f}',
+            'Aggressive': '₹{:,.2f}',
+            'Conservative Returns': '₹{:,.2f}',
+            'Expected Returns': '₹{:,.2f}',
+            'Aggressive Returns': '₹{:,.2f}'
+        }))
 
-                    interest_component.append(year_interest)
-                    principal_component.append(year_principal)
+        # Growth visualization
+        df = pd.DataFrame({
+            'Year': years * 3,
+            'Amount': conservative + expected + aggressive,
+            'Scenario': ['Conservative'] * len(years) + ['Expected'] * len(years) + ['Aggressive'] * len(years)
+        })
 
-                    remaining_loan -= year_principal
-                else:
-                    interest_component.append(0)
-                    principal_component.append(0)
+        fig = px.line(
+            df,
+            x='Year',
+            y='Amount',
+            color='Scenario',
+            title='Investment Growth Scenarios',
+            labels={'Amount': 'Amount (₹)'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
-            #Detailed Cost Breakdown
-            st.subheader("📊 Detailed Cost Breakdown")
-            cost_breakdown = pd.DataFrame({
-                'Year': years,
-                'Loan Balance': loan_balance,
-                'Interest Paid': interest_component,
-                'Principal Paid': principal_component
-            })
-            st.dataframe(cost_breakdown.style.format({
-                'Loan Balance': '₹{:,.2f}',
-                'Interest Paid': '₹{:,.2f}',
-                'Principal Paid': '₹{:,.2f}'
-            }))
+        # Risk Analysis
+        st.subheader("🎯 Risk-Return Analysis")
 
-            # Create visualization
-            fig = px.area(
-                data_frame=pd.DataFrame({
-                    'Year': years * 3,
-                    'Amount': loan_balance + interest_component + principal_component,
-                    'Type': ['Remaining Loan'] * len(years) + 
-                           ['Interest'] * len(years) + 
-                           ['Principal'] * len(years)
-                }),
-                x='Year',
-                y='Amount',
-                color='Type',
-                title='Loan Amortization Schedule',
-                labels={'Amount': 'Amount (₹)'},
-                # Remove 'names' parameter as it's causing an error
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        # Calculate key metrics
+        total_return_percent = (expected_return_amount/investment_amount - 1) * 100
+        annual_return = (1 + total_return_percent/100)**(1/investment_period) - 1
+        risk_level_str = "Low" if risk_level == "Conservative" else "Medium" if risk_level == "Moderate" else "High"
 
-def calculate_retirement_needs(current_age, retirement_age, life_expectancy, 
-                             monthly_expenses, inflation_rate, return_rate):
-    """Calculate retirement needs and required monthly savings"""
-    years_to_retirement = retirement_age - current_age
-    retirement_duration = life_expectancy - retirement_age
-    inflation_rate = inflation_rate / 100
-    return_rate = return_rate / 100
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"""
+            ### 📊 Return Metrics
+            - Total Return: {total_return_percent:.1f}%
+            - Annual Return: {annual_return*100:.1f}%
+            - Investment Horizon: {investment_period} years
+            - Risk Level: {risk_level_str}
+            """)
 
-    # Calculate future monthly expenses
-    future_monthly_expenses = monthly_expenses * (1 + inflation_rate)**years_to_retirement
-    total_needed = future_monthly_expenses * 12 * retirement_duration
+        with col2:
+            st.info(f"""
+            ### 💡 Portfolio Characteristics
+            - Investment Style: {risk_level}
+            - Return Range: {return_range[0]}% - {return_range[1]}%
+            - Capital Growth: ₹{expected_return_amount - investment_amount:,.2f}
+            - Risk Category: {risk_level_str}
+            """)
 
-    # Calculate required monthly savings
-    monthly_payment = total_needed / ((1 + return_rate)**(years_to_retirement) - 1) / (return_rate * 12)
+        # Investment Recommendations
+        st.subheader("💡 Investment Recommendations")
 
-    return total_needed, monthly_payment
+        if investment_period < 3:
+            st.warning("""
+            **Short-term Investment Strategy:**
+            - Consider more conservative allocation
+            - Focus on capital preservation
+            - Review investment horizon
+            - Consider fixed income options
+            """)
+        elif investment_period < 7:
+            st.info("""
+            **Medium-term Investment Strategy:**
+            - Balance between growth and stability
+            - Regular portfolio rebalancing
+            - Consider increasing equity exposure
+            - Monitor market conditions
+            """)
+        else:
+            st.success("""
+            **Long-term Investment Strategy:**
+            - Focus on equity for growth
+            - Use rupee cost averaging
+            - Regular portfolio review
+            - Stay invested through market cycles
+            """)
 
-# Stock Average Calculator
-def show_stock_average_calculator():
-    st.header("Stock Average Calculator")
+# Loan EMI Calculator
+def show_loan_emi_calculator():
+    st.header("Loan EMI Calculator")
     st.write("""
-    Calculate your average purchase price when buying additional shares of a stock.
-    This helps you track your investment cost basis and make informed decisions.
+    Calculate your loan EMI and understand the total cost of borrowing
+    including interest payments.  This calculator provides a detailed breakdown of your loan repayment schedule, allowing you to visualize the impact of interest payments over time.  It also offers insights into the total cost of borrowing, helping you make informed financial decisions about your loan.
     """)
-    
-    # Initialize session state for holding stock entries
-    if 'stock_holdings' not in st.session_state:
-        st.session_state.stock_holdings = []
-    
-    # Input for existing holdings
-    st.subheader("Current Holdings")
-    
-    if len(st.session_state.stock_holdings) > 0:
-        holdings_df = pd.DataFrame(st.session_state.stock_holdings)
-        holdings_df["total_value"] = holdings_df["price"] * holdings_df["quantity"]
-        
-        st.dataframe(
-            holdings_df.style.format({
-                "price": "₹{:,.2f}",
-                "quantity": "{:,}",
-                "total_value": "₹{:,.2f}"
-            })
-        )
-        
-        # Calculate current average
-        total_quantity = holdings_df["quantity"].sum()
-        total_investment = holdings_df["total_value"].sum()
-        current_average = total_investment / total_quantity if total_quantity > 0 else 0
-        
-        st.metric(
-            "Current Average Price",
-            f"₹{current_average:,.2f}"
-        )
-        
-        if st.button("Reset Holdings", key="reset_holdings"):
-            st.session_state.stock_holdings = []
-            st.rerun()
-    else:
-        st.info("No existing holdings. Add your first purchase below.")
-    
-    # Form for adding new holdings
-    with st.expander("Add Existing Purchase", expanded=len(st.session_state.stock_holdings) == 0):
-        with st.form("add_holding_form"):
-            col1, col2 = st.columns(2)
-            with col1:
-                purchase_price = st.number_input(
-                    "Purchase Price per Share (₹)",
-                    min_value=0.01,
-                    value=100.0,
-                    step=0.01,
-                    key="existing_price"
-                )
-            with col2:
-                purchase_quantity = st.number_input(
-                    "Number of Shares",
-                    min_value=1,
-                    value=10,
-                    step=1,
-                    key="existing_quantity"
-                )
-            
-            purchase_date = st.date_input(
-                "Purchase Date",
-                value=None,
-                key="existing_date"
-            )
-            
-            submit_button = st.form_submit_button("Add to Holdings", use_container_width=True)
-            
-            if submit_button:
-                st.session_state.stock_holdings.append({
-                    "price": purchase_price,
-                    "quantity": purchase_quantity,
-                    "date": purchase_date.strftime("%Y-%m-%d") if purchase_date else None
-                })
-                st.rerun()
-    
-    # New purchase calculation
-    st.subheader("New Purchase")
-    st.write("Enter details of the new shares you plan to purchase")
-    
+    st.warning("""
+    **Disclaimer:** Loan EMI calculations are based on a fixed interest rate.  Actual EMI amounts may vary based on lender policies and other factors. This calculator is for illustrative purposes only and should not be considered financial advice. Consult a financial advisor for personalized loan guidance.
+    """)
+
     col1, col2 = st.columns(2)
     with col1:
-        new_price = st.number_input(
-            "New Purchase Price per Share (₹)",
-            min_value=0.01,
-            value=90.0,
-            step=0.01
+        loan_amount = st.number_input(
+            "Loan Amount (₹)",
+            min_value=0,
+            value=1000000,
+            step=10000
+        )
+        interest_rate = st.number_input(
+            "Annual Interest Rate (%)",
+            min_value=0.0,
+            max_value=30.0,
+            value=10.0,
+            step=0.1
         )
+
     with col2:
-        new_quantity = st.number_input(
-            "Number of New Shares",
+        loan_tenure = st.number_input(
+            "Loan Tenure (Years)",
             min_value=1,
-            value=5,
-            step=1
+            max_value=30,
+            value=20
         )
-    
-    if st.button("Calculate New Average", use_container_width=True):
-        # Calculate new average
-        if len(st.session_state.stock_holdings) > 0:
-            holdings_df = pd.DataFrame(st.session_state.stock_holdings)
-            previous_qty = holdings_df["quantity"].sum()
-            previous_value = (holdings_df["price"] * holdings_df["quantity"]).sum()
-            previous_avg = previous_value / previous_qty if previous_qty > 0 else 0
-            
-            # Calculate new values
-            total_qty = previous_qty + new_quantity
-            total_inv = previous_value + (new_price * new_quantity)
-            avg_price = total_inv / total_qty
-            
-            # Calculate change
-            price_change = avg_price - previous_avg
-            pct_change = (price_change / previous_avg) * 100 if previous_avg > 0 else 0
-        else:
-            # First purchase
-            avg_price = new_price
-            total_qty = new_quantity
-            total_inv = new_price * new_quantity
-            price_change = 0
-            pct_change = 0
-        
-        # Display results
-        st.subheader("📊 New Average Calculation")
-        
+
+    if st.button("Calculate EMI", use_container_width=True):
+        # Calculate EMI
+        monthly_rate = interest_rate/(12*100)
+        tenure_months = loan_tenure * 12
+
+        emi = loan_amount * monthly_rate * (1 + monthly_rate)**tenure_months / ((1 + monthly_rate)**tenure_months - 1)
+        total_payment = emi * tenure_months
+        total_interest = total_payment - loan_amount
+
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric(
-                "New Average Price",
-                f"₹{avg_price:,.2f}",
-                f"{price_change:,.2f} ({pct_change:.2f}%)" if price_change != 0 else None,
-                delta_color="inverse"  # Lower average is better
+                "Monthly EMI",
+                f"₹{emi:,.2f}"
             )
         with col2:
             st.metric(
-                "Total Shares",
-                f"{total_qty:,}",
-                f"+{new_quantity:,}"
+                "Total Interest",
+                f"₹{total_interest:,.2f}"
             )
         with col3:
             st.metric(
-                "Total Investment",
-                f"₹{total_inv:,.2f}",
-                f"+₹{new_price * new_quantity:,.2f}"
-            )
-        
-        # Visualization of impact
-        if len(st.session_state.stock_holdings) > 0:
-            st.subheader("Purchase History Impact")
-            
-            # Prepare data for visualization
-            history = st.session_state.stock_holdings.copy()
-            history.append({
-                "price": new_price,
-                "quantity": new_quantity,
-                "date": "New Purchase"
-            })
-            
-            # Calculate running average
-            running_qty = 0
-            running_value = 0
-            running_avg = []
-            
-            for i, entry in enumerate(history):
-                running_qty += entry["quantity"]
-                running_value += entry["price"] * entry["quantity"]
-                running_avg.append({
-                    "purchase": i + 1,
-                    "price": entry["price"],
-                    "average": running_value / running_qty
-                })
-            
-            # Create dataframe for visualization
-            avg_df = pd.DataFrame(running_avg)
-            
-            # Plot
-            fig = px.line(
-                avg_df,
-                x="purchase",
-                y=["price", "average"],
-                title="Purchase Prices and Running Average",
-                labels={"value": "Price (₹)", "variable": "Type"},
-                color_discrete_map={
-                    "price": "#EF553B",
-                    "average": "#00CC96"
-                }
+                "Total Payment",
+                f"₹{total_payment:,.2f}"
             )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        # Add new purchase to holdings option
-        if st.button("Add This Purchase to Holdings"):
-            st.session_state.stock_holdings.append({
-                "price": new_price,
-                "quantity": new_quantity,
-                "date": date.today().strftime("%Y-%m-%d")
-            })
-            st.success("New purchase added to your holdings!")
-            st.rerun()
-        
-        # Investment insights
-        st.subheader("💡 Investment Insights")
-        
-        # Dollar-cost averaging analysis
-        if len(st.session_state.stock_holdings) > 0:
-            highest_price = max([h["price"] for h in st.session_state.stock_holdings] + [new_price])
-            lowest_price = min([h["price"] for h in st.session_state.stock_holdings] + [new_price])
-            price_range_pct = ((highest_price - lowest_price) / lowest_price) * 100
-            
-            st.info(f"""
-            **Dollar-Cost Averaging Analysis:**
-            - Price range of your purchases: ₹{lowest_price:,.2f} to ₹{highest_price:,.2f} ({price_range_pct:.2f}% variation)
-            - By buying at different price points, you've averaged out market volatility
-            - This strategy helps reduce timing risk in volatile markets
-            """)
-        
-        # Strategy recommendations based on new price vs. average
-        if price_change < 0:
-            st.success(f"""
-            **Averaging Down:** Your new purchase is at a lower price (₹{new_price:,.2f}) than your previous average (₹{(avg_price - price_change):,.2f})
-            - This reduces your average cost basis by ₹{-price_change:,.2f} per share
-            - If you believe in the long-term value, this can be a good strategy
-            - Consider the reasons for the price decline to ensure your investment thesis remains valid
-            """)
-        elif price_change > 0:
-            st.warning(f"""
-            **Averaging Up:** Your new purchase is at a higher price (₹{new_price:,.2f}) than your previous average (₹{(avg_price - price_change):,.2f})
-            - This increases your average cost basis by ₹{price_change:,.2f} per share
-            - This can be a good strategy if it's a performing stock with continued growth potential
-            - Ensure your conviction in the stock has increased to justify buying at higher prices
-            """)
-        
-        # Tax implications (for Indian investors)
-        st.write("""
-        **Tax Considerations:**
-        - Short-term capital gains (held < 1 year) are taxed at your income tax slab rate
-        - Long-term capital gains (held > 1 year) are taxed at 10% for gains above ₹1 lakh
-        - Each purchase lot is tracked separately for tax calculation using FIFO (First In, First Out) method
-        *Note: Tax rules may change. Consult a tax professional for personalized advice.*
-        """)
+
+        # Create amortization schedule
+        remaining_loan = loan_amount
+        interest_paid = 0
+        principal_paid = 0
+
+        years = list(range(loan_tenure + 1))
+        loan_balance = []
+        interest_component = []
+        principal_component = []
+
+        for year in years:
+            loan_balance.append(remaining_loan)
+            if year > 0:
+                year_interest = remaining_loan * interest_rate/100
+                year_principal = emi * 12 - year_interest
+
+                interest_component.append(year_interest)
+                principal_component.append(year_principal)
+
+                remaining_loan -= year_principal
+            else:
+                interest_component.append(0)
+                principal_component.append(0)
+
+        #Detailed Cost Breakdown
+        st.subheader("📊 Detailed Cost Breakdown")
+        cost_breakdown = pd.DataFrame({
+            'Year': years,
+            'Loan Balance': loan_balance,
+            'Interest Paid': interest_component,
+            'Principal Paid': principal_component
+        })
+        st.dataframe(cost_breakdown.style.format({
+            'Loan Balance': '₹{:,.2f}',
+            'Interest Paid': '₹{:,.2f}',
+            'Principal Paid': '₹{:,.2f}'
+        }))
+
+        # Create visualization
+        fig = px.area(
+            data_frame=pd.DataFrame({
+                'Year': years * 3,
+                'Amount': loan_balance + interest_component + principal_component,
+                'Type': ['Remaining Loan'] * len(years) + 
+                       ['Interest'] * len(years) + 
+                       ['Principal'] * len(years)
+            }),
+            x='Year',
+            y='Amount',
+            color='Type',
+            title='Loan Amortization Schedule',
+            labels={'Amount': 'Amount (₹)'},
+            # Remove 'names' parameter as it's causing an error
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+        tenure_years = np.arange(1, 31)
+        show_sensitivity_heatmap(
+            "calculate_loan_emi", "interest_rate", np.round(np.linspace(6, 18, 49), 2),
+            "tenure_months", tenure_years * 12, "🔥 EMI by Interest Rate and Tenure",
+            "Annual Interest Rate (%)", "Loan Tenure (Years)", output='emi', y_axis=tenure_years,
+            current=(interest_rate, loan_tenure), principal=loan_amount
+        )
 
 # Home Loan EMI Calculator
 def show_home_loan_calculator():
@@ -10956,6 +8808,35 @@ def show_home_loan_calculator():
             * Reduce your total interest cost by **{interest_saved/regular_interest*100:.1f}%**
             """)
         
+        # Lifetime cost of common prepayment strategies (segment-wise simulation, no monthly loop)
+        with st.expander("🔀 Prepayment Strategy Comparison"):
+            annual_lump = prepayment_amount if prepayment_amount > 0 else 100000
+            monthly_extra = monthly_prepayment if monthly_prepayment > 0 else 5000
+            strategies = {
+                "No prepayment": [],
+                f"₹{annual_lump:,.0f} every year": [core.Prepayment(12, annual_lump, every=12)],
+                f"₹{monthly_extra:,.0f} every month": [core.Prepayment(1, monthly_extra, every=1)],
+                "EMI step-up 5% a year": [core.EmiStepUp(12, percent=5, every=12)],
+                "Step-up 5% + yearly lump sum": [
+                    core.EmiStepUp(12, percent=5, every=12), core.Prepayment(12, annual_lump, every=12)
+                ],
+                "Rate rises 1% after 2 years": [core.RateReset(24, interest_rate + 1)],
+                "Rate rises 1% after 2 years + yearly lump sum": [
+                    core.RateReset(24, interest_rate + 1), core.Prepayment(12, annual_lump, every=12)
+                ],
+            }
+            for mode, label in ((core.REDUCE_TENURE, "Keep EMI, reduce tenure"), (core.REDUCE_EMI, "Keep tenure, reduce EMI")):
+                st.markdown(f"**{label}**")
+                rows = core.compare_strategies(loan_amount, interest_rate, tenure_months, strategies, mode)
+                st.dataframe(pd.DataFrame([{
+                    "Strategy": row['strategy'],
+                    "Tenure": f"{row['months'] // 12}y {row['months'] % 12}m",
+                    "Final EMI (₹)": f"{row['final_emi']:,.0f}",
+                    "Total Interest (₹)": f"{row['total_interest']:,.0f}",
+                    "Prepaid (₹)": f"{row['total_prepaid']:,.0f}",
+                    "Interest Saved (₹)": f"{row['interest_saved']:,.0f}"
+                } for row in rows]), use_container_width=True)
+        
         # Tax benefit analysis
         st.subheader("💸 Tax Benefits (First Year)")
         
@@ -11145,25 +9026,21 @@ def show_personal_loan_calculator():
         processing_fee = loan_amount * (processing_fee_percent / 100)
         loan_amount_disbursed = loan_amount - processing_fee
         
-        # Calculate amortization schedule
-        remaining_principal = loan_amount
-        total_interest = 0
-        amortization_schedule = []
-        
-        for month in range(1, tenure_months + 1):
-            interest_payment = remaining_principal * monthly_rate
-            principal_payment = emi - interest_payment
-            remaining_principal -= principal_payment
-            total_interest += interest_payment
-            
-            if month <= 12 or month % 12 == 0 or month == tenure_months:  # Show first year, yearly, and last payment
-                amortization_schedule.append({
-                    'Month': month,
-                    'EMI': emi,
-                    'Principal': principal_payment,
-                    'Interest': interest_payment,
-                    'Balance': max(0, remaining_principal)
-                })
+        # Calculate amortization schedule (closed form, every month at once)
+        schedule = core.batch_amortization(loan_amount, interest_rate, tenure_months)
+        total_interest = float(schedule.total_interest[0])
+        amortization_schedule = [
+            {
+                'Month': row['month'],
+                'EMI': row['emi'],
+                'Principal': row['principal'],
+                'Interest': row['interest'],
+                'Balance': row['balance']
+            }
+            for row in schedule.schedule(0)
+            # Show first year, yearly, and last payment
+            if row['month'] <= 12 or row['month'] % 12 == 0 or row['month'] == tenure_months
+        ]
         
         total_payment = emi * tenure_months
         interest_percentage = (total_interest / loan_amount) * 100
@@ -11240,28 +9117,11 @@ def show_personal_loan_calculator():
         st.subheader("Payment Breakdown Over Time")
         
         # Generate data for all months for the chart
-        all_months = list(range(1, tenure_months + 1))
-        principal_payments = []
-        interest_payments = []
-        balance_amounts = []
-        
-        # Reset for full calculation
-        remaining_principal = loan_amount
-        
-        for month in range(1, tenure_months + 1):
-            interest_payment = remaining_principal * monthly_rate
-            principal_payment = emi - interest_payment
-            remaining_principal -= principal_payment
-            
-            principal_payments.append(principal_payment)
-            interest_payments.append(interest_payment)
-            balance_amounts.append(max(0, remaining_principal))
-        
         chart_data = pd.DataFrame({
-            'Month': all_months,
-            'Principal Payment': principal_payments,
-            'Interest Payment': interest_payments,
-            'Remaining Balance': balance_amounts
+            'Month': np.arange(1, tenure_months + 1),
+            'Principal Payment': schedule.principal[0],
+            'Interest Payment': schedule.interest[0],
+            'Remaining Balance': schedule.balance[0]
         })
         
         # Create the stacked bar chart
@@ -14522,6 +12382,42 @@ def show_stock_average_calculator():
                         help="Percentage buffer before reaching breakeven point"
                     )
             
+            # Money-weighted return: every purchase is an outflow on its date, today's value an inflow
+            today = date.today().strftime("%Y-%m-%d")
+            purchase_dates = [entry["Date"] for entry in purchase_data]
+            holding_xirr = core.xirr(
+                [-entry["Investment"] for entry in purchase_data] + [current_value],
+                purchase_dates + [today]
+            )
+            # Each lot on its own, solved together: outflow at purchase, value at today's price
+            lot_flows = np.array([[-entry["Investment"], entry["Quantity"] * current_price] for entry in purchase_data])
+            lot_times = core.year_fractions([[purchase_date, today] for purchase_date in purchase_dates])
+            lot_xirr = core.xirr_batch(lot_flows, lot_times)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(
+                    "Annualised Return (XIRR)",
+                    f"{holding_xirr:.2f}%" if holding_xirr is not None else "N/A",
+                    help="Money-weighted annual return, accounting for when each purchase was made"
+                )
+            with col2:
+                holding_days = (date.today() - datetime.strptime(min(purchase_dates), "%Y-%m-%d").date()).days
+                st.metric("Holding Period", f"{holding_days / 365:.1f} years", help="Since the first purchase")
+            
+            lot_df = pd.DataFrame({
+                "Purchase Date": purchase_dates,
+                "Quantity": [entry["Quantity"] for entry in purchase_data],
+                "Price (₹)": [entry["Price"] for entry in purchase_data],
+                "Gain/Loss (₹)": lot_flows.sum(axis=1),
+                "XIRR (%)": lot_xirr
+            })
+            st.dataframe(lot_df.style.format({
+                "Price (₹)": "₹{:,.2f}",
+                "Gain/Loss (₹)": "₹{:,.2f}",
+                "XIRR (%)": "{:.2f}%"
+            }, na_rep="N/A"), use_container_width=True)
+            
             # Create visualization - Purchase history
             st.subheader("Purchase History")
             
@@ -15268,128 +13164,6 @@ def show_cagr_calculator():
             doubling_time = 72 / cagr  # Rule of 72 approximation
             st.write(f"**Time to Double:** Approximately {doubling_time:.1f} years at the current CAGR of {cagr:.2f}%")
 
-# Functions for new calculators
-def add_new_calculators(calculator):
-    """Add new calculators from the utils/calculators module"""
-    if not new_calculators_available:
-        return False
-        
-    # New Calculators 
-    if calculator == "PPF Calculator 💰":
-        show_ppf_calculator()
-        return True
-        
-    elif calculator == "FD Calculator 🏦":
-        show_fd_calculator()
-        return True
-        
-    elif calculator == "Income Tax Calculator 💰":
-        show_income_tax_calculator()
-        return True
-        
-    elif calculator == "HRA Calculator 🏠":
-        show_hra_calculator()
-        return True
-        
-    elif calculator == "Sukanya Samriddhi Yojana Calculator 👧":
-        show_ssy_calculator()
-        return True
-        
-    elif calculator == "Lumpsum Calculator 📈":
-        show_lumpsum_calculator()
-        return True
-        
-    elif calculator == "Vehicle Comparison Calculator 🚗":
-        show_vehicle_comparison_calculator()
-        return True
-        
-    return False
-
-# Modify the show function to include new calculators
-original_show = show
-
-def show_with_new_calculators():
-    """Enhanced show function that includes new calculators"""
-    st.session_state.used_new_calculator = False
-    original_show()
-    
-    # If the selected calculator is one of our new ones and not yet displayed
-    if not st.session_state.get("used_new_calculator", False):
-        # Extract the calculator name from the URL query parameters
-        query_params = st.query_params
-        calculator = query_params.get("calculator", "")
-        
-        # If we have a calculator specified, try to show it
-        if calculator and add_new_calculators(calculator):
-            st.session_state.used_new_calculator = True
-
-# Replace the original show function
-show = show_with_new_calculators
-
-# Calculate Sukanya Samriddhi Yojana (SSY) returns
-def calculate_ssy_returns(annual_investment, interest_rate, girl_age, maturity_age=21):
-    """
-    Calculate Sukanya Samriddhi Yojana (SSY) returns
-    
-    Args:
-        annual_investment: Annual investment amount (Min: 250, Max: 150000)
-        interest_rate: Annual interest rate (%)
-        girl_age: Current age of the girl child (0-10 years)
-        maturity_age: Maturity age (default 21 years)
-        
-    Returns:
-        Dictionary with SSY calculation results
-    """
-    # Validate inputs
-    if girl_age < 0 or girl_age > 10:
-        return None  # Invalid age
-    
-    # Calculate deposit period (15 years from account opening)
-    deposit_years = min(15, maturity_age - girl_age)
-    
-    # Calculate total investment period
-    total_years = maturity_age - girl_age
-    
-    # SSY calculation with annual compounding
-    balance = 0
-    yearly_details = []
-    total_deposit = 0
-    
-    for year in range(1, total_years + 1):
-        opening_balance = balance
-        
-        # Add deposit for deposit duration (first 15 years)
-        deposit = annual_investment if year <= deposit_years else 0
-        total_deposit += deposit
-        
-        # Calculate interest
-        interest = (opening_balance + deposit) * (interest_rate / 100)
-        
-        # Update balance
-        balance = opening_balance + deposit + interest
-        
-        # Store yearly details
-        yearly_details.append({
-            'Year': year,
-            'Age': girl_age + year,
-            'Opening Balance': opening_balance,
-            'Deposit': deposit,
-            'Interest': interest,
-            'Closing Balance': balance
-        })
-    
-    # Calculate returns
-    total_interest = balance - total_deposit
-    
-    return {
-        'yearly_details': yearly_details,
-        'maturity_amount': balance,
-        'total_deposit': total_deposit,
-        'total_interest': total_interest,
-        'deposit_years': deposit_years,
-        'total_years': total_years
-    }
-
 # Function to show SSY Calculator
 def show_nsc_calculator():
     """Show the National Savings Certificate (NSC) calculator interface"""
@@ -6,12 +6,16 @@ from datetime import datetime, timedelta
 import random
 import json
 import os
+import sys
 from utils.navigation import create_breadcrumb
 from utils.budget_data_manager import BudgetDataManager
 from utils.tax_data_manager import TaxDataManager
 from utils.investment_data_manager import InvestmentDataManager
 from utils.data_persistence import load_data, save_data
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import calculator_core as core
+
 # Function to save journey data when it changes
 def save_journey_data():
     try:
@@ -1012,6 +1016,15 @@ def show_future_projection():
                 value=st.session_state.projection_data['time_horizon_years']
             )
             
+            return_volatility = st.slider(
+                "Return Volatility (%)",
+                min_value=0.0,
+                max_value=30.0,
+                value=st.session_state.projection_data.get('return_volatility', 15.0),
+                step=1.0,
+                help="Year-to-year swing in returns, used for the range of outcomes"
+            )
+            
             submitted = st.form_submit_button("Update Projection")
             
             if submitted:
@@ -1023,7 +1036,8 @@ def show_future_projection():
                     'expected_return_moderate': expected_return_moderate,
                     'expected_return_aggressive': expected_return_aggressive,
                     'inflation_rate': inflation_rate,
-                    'time_horizon_years': time_horizon_years
+                    'time_horizon_years': time_horizon_years,
+                    'return_volatility': return_volatility
                 })
                 st.success("Projection updated!")
                 st.rerun()
@@ -1124,6 +1138,42 @@ def show_future_projection():
         
         st.plotly_chart(fig, use_container_width=True)
         
+        # Range of outcomes around the moderate scenario
+        projection_data = st.session_state.projection_data
+        if projection_data['current_savings'] + projection_data['monthly_contribution'] > 0:
+            projection = core.project_corpus(
+                projection_data['current_savings'],
+                projection_data['monthly_contribution'],
+                projection_data['time_horizon_years'],
+                projection_data['expected_return_moderate'],
+                projection_data.get('return_volatility', 15.0),
+                inflation_rate=projection_data['inflation_rate']
+            )
+            bands = projection['real_percentiles']
+            
+            st.write("### Range of Outcomes (Moderate, Inflation-Adjusted)")
+            band_fig = go.Figure()
+            for low, high, color in ((5, 95, 'rgba(255,127,80,0.15)'), (25, 75, 'rgba(255,127,80,0.35)')):
+                band_fig.add_trace(go.Scatter(x=projection['years'], y=bands[high], mode='lines', line=dict(width=0),
+                                              showlegend=False, hoverinfo='skip'))
+                band_fig.add_trace(go.Scatter(x=projection['years'], y=bands[low], mode='lines', line=dict(width=0),
+                                              fill='tonexty', fillcolor=color, name=f"{low}th-{high}th percentile"))
+            band_fig.add_trace(go.Scatter(x=projection['years'], y=bands[50], mode='lines', name='Median',
+                                          line=dict(color='#FF7F50', width=3)))
+            band_fig.update_layout(
+                xaxis_title='Years',
+                yaxis_title="Amount in Today's ₹",
+                template='plotly_dark',
+                height=400,
+                hovermode='x unified'
+            )
+            band_fig.update_yaxes(tickformat=',')
+            st.plotly_chart(band_fig, use_container_width=True)
+            st.caption(
+                f"In 9 of 10 of {projection['paths']:,} simulated markets your savings end between "
+                f"₹{bands[5][-1]:,.0f} and ₹{bands[95][-1]:,.0f} in today's money (median ₹{bands[50][-1]:,.0f})."
+            )
+        
         # Create milestone markers
         st.write("### Financial Milestones")
         st.write("Based on the moderate growth projection, you could reach these milestones:")
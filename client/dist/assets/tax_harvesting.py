@@ -1,9 +1,28 @@
+import os
+import sys
+from datetime import date, timedelta
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from utils.navigation import create_breadcrumb
 from utils.data_persistence import FinancialDataManager
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import calculator_core as core
+
+
+def annualised_returns(entries):
+    """XIRR (%) of each saved entry held from its purchase date to today; NaN without a purchase date"""
+    today = date.today().isoformat()
+    purchase_dates = [entry.get("purchase_date") or today for entry in entries]
+    flows = [[-entry["purchase_price"], entry["current_price"]] for entry in entries]
+    times = core.year_fractions([[purchase_date, today] for purchase_date in purchase_dates])
+    dated = np.array([bool(entry.get("purchase_date")) for entry in entries], dtype=bool)
+    return np.where(dated, core.xirr_batch(flows, times), np.nan)
+
+
 def show():
     # Initialize data manager
     data_manager = FinancialDataManager()
@@ -192,6 +211,14 @@ def show():
                 key="stcg_current_price"
             )
 
+        purchase_date = st.date_input(
+            "Purchase Date",
+            value=date.today() - timedelta(days=180),
+            max_value=date.today(),
+            key="stcg_purchase_date",
+            help="Used for the annualised return (XIRR) of the holding"
+        )
+
         # Calculate gain/loss
         difference = current_price - purchase_price
         if difference != 0:
@@ -212,6 +239,7 @@ def show():
                 "purchase_price": purchase_price,
                 "current_price": current_price,
                 "difference": difference,
+                "purchase_date": purchase_date.isoformat(),
                 "date_added": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             st.session_state.stcg_entries.append(entry)
@@ -221,19 +249,21 @@ def show():
         if st.session_state.stcg_entries:
             st.markdown("#### 📋 Saved Short-term Entries")
             stcg_df = pd.DataFrame(st.session_state.stcg_entries)
+            stcg_df['xirr'] = annualised_returns(st.session_state.stcg_entries)
             stcg_df['date_added'] = pd.to_datetime(stcg_df['date_added'])
             stcg_df = stcg_df.sort_values('date_added', ascending=False)
 
             st.dataframe(
                 stcg_df[[
                     'name', 'type', 'purchase_price', 'current_price', 
-                    'difference', 'date_added'
+                    'difference', 'xirr', 'date_added'
                 ]].style.format({
                     'purchase_price': '₹{:,.2f}',
                     'current_price': '₹{:,.2f}',
                     'difference': '₹{:,.2f}',
+                    'xirr': '{:.2f}%',
                     'date_added': lambda x: x.strftime("%Y-%m-%d %H:%M")
-                }),
+                }, na_rep="N/A"),
                 use_container_width=True
             )
 
@@ -303,6 +333,14 @@ def show():
                 key="ltcg_current_price"
             )
 
+        purchase_date = st.date_input(
+            "Purchase Date",
+            value=date.today() - timedelta(days=730),
+            max_value=date.today(),
+            key="ltcg_purchase_date",
+            help="Used for the annualised return (XIRR) of the holding"
+        )
+
         # Calculate gain/loss
         difference = current_price - purchase_price
         if difference != 0:
@@ -323,6 +361,7 @@ def show():
                 "purchase_price": purchase_price,
                 "current_price": current_price,
                 "difference": difference,
+                "purchase_date": purchase_date.isoformat(),
                 "date_added": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             st.session_state.ltcg_entries.append(entry)
@@ -332,19 +371,21 @@ def show():
         if st.session_state.ltcg_entries:
             st.markdown("#### 📋 Saved Long-term Entries")
             ltcg_df = pd.DataFrame(st.session_state.ltcg_entries)
+            ltcg_df['xirr'] = annualised_returns(st.session_state.ltcg_entries)
             ltcg_df['date_added'] = pd.to_datetime(ltcg_df['date_added'])
             ltcg_df = ltcg_df.sort_values('date_added', ascending=False)
 
             st.dataframe(
                 ltcg_df[[
                     'name', 'type', 'purchase_price', 'current_price', 
-                    'difference', 'date_added'
+                    'difference', 'xirr', 'date_added'
                 ]].style.format({
                     'purchase_price': '₹{:,.2f}',
                     'current_price': '₹{:,.2f}',
                     'difference': '₹{:,.2f}',
+                    'xirr': '{:.2f}%',
                     'date_added': lambda x: x.strftime("%Y-%m-%d %H:%M")
-                }),
+                }, na_rep="N/A"),
                 use_container_width=True
             )
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Analytics Process Pool
+Runs the CPU-bound historical analytics in worker processes, away from the I/O threads
+
+OHLCV bars are handed to workers through memory-mapped .npy files (RAM-backed
+under /dev/shm where available) instead of pickled DataFrames, and the number
+of in-flight jobs is capped so producers block once the pool is saturated.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Any
+
+import numpy as np
+import pandas as pd
+
+from historicalAnalytics import calculate_historical_analytics
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+OHLCV_DTYPE = np.dtype([
+    ("date", "<i8"),
+    ("Open", "<f8"),
+    ("High", "<f8"),
+    ("Low", "<f8"),
+    ("Close", "<f8"),
+    ("Volume", "<f8")
+])
+
+class AnalyticsPoolBusy(RuntimeError):
+    """Raised when the pool stays saturated for longer than the submit timeout"""
+
+
+def _shared_dir() -> str:
+    """Directory for hand-off files; RAM-backed when the platform offers it"""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def write_ohlcv(hist: pd.DataFrame, path: str) -> str:
+    """
+    Write the OHLCV columns of a history frame to a memory-mappable .npy file
+
+    Args:
+        hist: yfinance history DataFrame
+        path: Destination file path
+
+    Returns:
+        The timezone name of the index (empty string for naive indexes)
+    """
+    index = pd.DatetimeIndex(hist.index)
+    tz = str(index.tz) if index.tz is not None else ""
+
+    bars = np.empty(len(hist), dtype=OHLCV_DTYPE)
+    # .values is UTC for tz-aware indexes; normalise the resolution to nanoseconds
+    bars["date"] = index.values.astype("datetime64[ns]").view("i8")
+    for column in OHLCV_DTYPE.names[1:]:
+        bars[column] = hist[column].to_numpy(dtype="f8")
+
+    np.save(path, bars, allow_pickle=False)
+    return tz
+
+
+def read_ohlcv(path: str, tz: str = "") -> pd.DataFrame:
+    """
+    Rebuild a history frame from a file written by write_ohlcv
+
+    Args:
+        path: File path
+        tz: Timezone name returned by write_ohlcv
+
+    Returns:
+        DataFrame indexed by date with Open, High, Low, Close and Volume columns
+    """
+    bars = np.load(path, mmap_mode="r", allow_pickle=False)
+    index = pd.to_datetime(np.asarray(bars["date"]), unit="ns", utc=bool(tz))
+    if tz:
+        index = index.tz_convert(tz)
+
+    return pd.DataFrame({column: np.array(bars[column]) for column in OHLCV_DTYPE.names[1:]}, index=index)
+
+
+def _run_analytics(path: str, tz: str, symbol: str) -> Dict[str, Any]:
+    """Worker entry point: map the bars and run the analytics on them"""
+    return calculate_historical_analytics(read_ohlcv(path, tz), symbol)
+
+
+class AnalyticsPool:
+    """Bounded process pool for calculate_historical_analytics"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue_depth: int = 32,
+                 submit_timeout: float = 30.0):
+        """
+        Args:
+            max_workers: Worker processes (defaults to CPU count minus one)
+            max_queue_depth: Maximum queued plus running jobs before submit blocks
+            submit_timeout: Seconds submit waits for a free slot before raising AnalyticsPoolBusy
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_queue_depth = max_queue_depth
+        self.submit_timeout = submit_timeout
+
+        self._slots = threading.BoundedSemaphore(max_queue_depth)
+        self._depth_lock = threading.Lock()
+        self._in_flight = 0
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(self, hist: pd.DataFrame, symbol: str) -> "Future[Dict[str, Any]]":
+        """
+        Queue analytics for one history frame, blocking while the queue is full
+
+        Args:
+            hist: yfinance history DataFrame
+            symbol: Stock symbol
+
+        Returns:
+            Future resolving to the analytics dictionary
+        """
+        if not self._slots.acquire(blocking=False):
+            # Back-pressure: the producer waits here until a job finishes
+            metrics.inc("analytics_backpressure_waits_total")
+            if not self._slots.acquire(timeout=self.submit_timeout):
+                metrics.inc("analytics_rejected_total")
+                raise AnalyticsPoolBusy(f"Analytics queue full ({self.max_queue_depth} jobs in flight)")
+
+        path = os.path.join(_shared_dir(), f"ohlcv-{os.getpid()}-{uuid.uuid4().hex}.npy")
+        try:
+            tz = write_ohlcv(hist, path)
+            future = self._executor.submit(_run_analytics, path, tz, symbol)
+        except Exception:
+            self._slots.release()
+            self._remove(path)
+            raise
+
+        def _release(_: Future) -> None:
+            self._slots.release()
+            self._remove(path)
+            self._track_depth(-1)
+
+        self._track_depth(1)
+        future.add_done_callback(_release)
+        return future
+
+    def _track_depth(self, delta: int) -> None:
+        with self._depth_lock:
+            self._in_flight += delta
+            metrics.set_gauge("analytics_queue_depth", self._in_flight)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Backtest Engine
+Array-based replay of investment strategies over stored daily closes
+
+Every strategy is expressed as whole-matrix operations on a (days x symbols)
+close matrix (cumulative sums for SIP units, cumulative products for
+strategy returns, per-period growth factors for rebalancing), so there is
+no per-day Python loop and adding symbols only widens the arrays.
+
+Run `python3 backtestEngine.py` for a synthetic 30-year x 100-symbol benchmark.
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ("sip", "lump_sum", "ma_crossover", "rebalance")
+FREQUENCIES = {"W": "W", "M": "M", "Q": "Q", "Y": "Y"}
+
+# The XIRR solver is the calculator pages' own (calculator_core imports only the
+# standard library eagerly and xirr_engine only NumPy), so both report the same rate
+CALCULATOR_CORE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client", "dist", "assets")
+
+
+def period_starts(dates: pd.DatetimeIndex, frequency: str = "M") -> np.ndarray:
+    """Boolean mask of the first trading day of each week/month/quarter/year"""
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{frequency}' (W/M/Q/Y)")
+    keys = np.asarray(dates.to_period(FREQUENCIES[frequency]).asi8)
+    return np.concatenate([[True], keys[1:] != keys[:-1]])
+
+
+def period_ends(dates: pd.DatetimeIndex, frequency: str = "M") -> np.ndarray:
+    """Boolean mask of the last trading day of each period (always includes the last day)"""
+    starts = period_starts(dates, frequency)
+    return np.append(starts[1:], True)
+
+
+def rolling_mean(prices: np.ndarray, window: int) -> np.ndarray:
+    """Column-wise trailing mean; NaN until a column has `window` valid prices"""
+    valid = ~np.isnan(prices)
+    sums = np.cumsum(np.where(valid, prices, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    sums = np.vstack([np.zeros((1, prices.shape[1])), sums])
+    counts = np.vstack([np.zeros((1, prices.shape[1]), dtype=counts.dtype), counts])
+
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    means = np.full(prices.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means[window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return means
+
+
+def max_drawdown(values: np.ndarray) -> np.ndarray:
+    """Column-wise maximum drawdown (negative fraction), ignoring leading NaNs"""
+    filled = np.where(np.isnan(values), -np.inf, values)
+    running_max = np.maximum.accumulate(filled, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdowns = np.where(running_max > 0, values / running_max - 1.0, 0.0)
+    return np.nanmin(np.where(np.isnan(values), 0.0, drawdowns), axis=0)
+
+
+def _xirr_batch() -> Callable[..., np.ndarray]:
+    """calculator_core's xirr_batch, imported on first use so other commands never need the client tree"""
+    if CALCULATOR_CORE_DIRECTORY not in sys.path:
+        sys.path.append(CALCULATOR_CORE_DIRECTORY)
+    from calculator_core.xirr_engine import xirr_batch
+    return xirr_batch
+
+
+def _years_between(dates: pd.DatetimeIndex) -> np.ndarray:
+    return (dates - dates[0]).days.to_numpy() / 365.25
+
+
+def simulate_sip(prices: np.ndarray, starts: np.ndarray, amount: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed amount invested on every period start once a column has a price
+
+    Returns:
+        (equity, invested) matrices
+    """
+    buys = starts[:, None] & ~np.isnan(prices)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        units = np.cumsum(np.where(buys, amount / prices, 0.0), axis=0)
+    invested = np.cumsum(buys * amount, axis=0)
+    return units * np.nan_to_num(prices), invested
+
+
+def simulate_lump_sum(prices: np.ndarray, amount: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Whole amount invested on each column's first available close"""
+    valid = ~np.isnan(prices)
+    first = valid.argmax(axis=0)
+    units = amount / prices[first, np.arange(prices.shape[1])]
+    started = (np.arange(len(prices))[:, None] >= first[None, :]) & valid.any(axis=0)
+    return np.where(started, units * np.nan_to_num(prices), 0.0), np.where(started, amount, 0.0)
+
+
+def simulate_ma_crossover(prices: np.ndarray, amount: float, fast: int, slow: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Long while the fast mean is above the slow mean, otherwise in cash
+
+    The signal at one close is traded at that close, so it earns the next day's return.
+
+    Returns:
+        (equity, invested, position) matrices
+    """
+    signal = rolling_mean(prices, fast) > rolling_mean(prices, slow)
+    position = np.vstack([np.zeros((1, prices.shape[1]), dtype=bool), signal[:-1]])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.vstack([np.zeros((1, prices.shape[1])), prices[1:] / prices[:-1] - 1.0])
+    strategy_returns = np.where(position, np.nan_to_num(returns), 0.0)
+
+    started = np.maximum.accumulate(~np.isnan(prices), axis=0)
+    equity = np.where(started, amount * np.cumprod(1.0 + strategy_returns, axis=0), 0.0)
+    return equity, np.where(started, amount, 0.0), position
+
+
+def simulate_rebalance(prices: np.ndarray, starts: np.ndarray, weights: np.ndarray,
+                       amount: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Portfolio reset to target weights on every period start
+
+    Between rebalances each holding drifts with its own price, so the value on
+    any day is the segment's opening value times the weighted price relatives
+    since the segment started.
+
+    Args:
+        prices: Fully populated (days x symbols) close matrix
+        starts: Period start mask (the first day is always a start)
+        weights: Target weights summing to 1
+
+    Returns:
+        (portfolio values, turnover fraction at each rebalance)
+    """
+    starts = starts.copy()
+    starts[0] = True
+    boundaries = np.flatnonzero(starts)
+    segment = np.cumsum(starts) - 1
+
+    relatives = prices / prices[boundaries][segment]
+    growth = relatives @ weights
+
+    # Growth of each segment up to the next boundary chains the segment opening values
+    boundary_prices = np.vstack([prices[boundaries], prices[-1:]])
+    segment_relatives = boundary_prices[1:] / boundary_prices[:-1]
+    segment_growth = segment_relatives @ weights
+    opening = amount * np.concatenate([[1.0], np.cumprod(segment_growth[:-1])])
+    values = opening[segment] * growth
+
+    drifted = segment_relatives[:-1] * weights / segment_growth[:-1, None]
+    turnover = 0.5 * np.abs(drifted - weights).sum(axis=1)
+    return values, turnover
+
+
+def _equity_curve(dates: pd.DatetimeIndex, values: np.ndarray, invested: np.ndarray,
+                  sample: np.ndarray) -> List[Dict[str, Any]]:
+    rows = np.flatnonzero(sample & (invested > 0))
+    return [{
+        "date": dates[i].strftime("%Y-%m-%d"),
+        "value": round(float(values[i]), 2),
+        "invested": round(float(invested[i]), 2)
+    } for i in rows]
+
+
+def run_backtest(closes: pd.DataFrame, strategy: str = "sip", amount: float = 10000.0,
+                 frequency: str = "M", fast: int = 50, slow: int = 200,
+                 weights: Optional[Dict[str, float]] = None, curve_frequency: str = "M") -> Dict[str, Any]:
+    """
+    Replay a strategy over stored closes
+
+    Args:
+        closes: Closes indexed by date, one column per symbol (NaN before a symbol's first bar)
+        strategy: sip, lump_sum, ma_crossover or rebalance
+        amount: Periodic investment (sip) or initial capital (other strategies)
+        frequency: Contribution/rebalancing frequency (W/M/Q/Y)
+        fast: Fast moving-average window (ma_crossover)
+        slow: Slow moving-average window (ma_crossover)
+        weights: Target weights keyed by symbol (rebalance; equal weights by default)
+        curve_frequency: Equity curve sampling frequency
+
+    Returns:
+        Dictionary with per-symbol results and equity curves plus the combined
+        portfolio (for rebalance, the rebalanced portfolio alone)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}' ({'/'.join(STRATEGIES)})")
+
+    symbols = list(closes.columns)
+    dates = pd.DatetimeIndex(closes.index)
+    prices = closes.ffill().to_numpy(dtype="f8")
+    sample = period_ends(dates, curve_frequency)
+    years = _years_between(dates)
+
+    if strategy == "rebalance":
+        # Portfolio strategies start once every holding has a price
+        first_complete = int(np.argmax(~np.isnan(prices).any(axis=1)))
+        prices, dates, sample = prices[first_complete:], dates[first_complete:], sample[first_complete:]
+        years = _years_between(dates)
+        target = np.array([(weights or {}).get(symbol, 1.0 if not weights else 0.0) for symbol in symbols])
+        target = target / target.sum()
+
+        values, turnover = simulate_rebalance(prices, period_starts(dates, frequency), target, amount)
+        invested = np.full(len(values), amount)
+        span = max(float(years[-1]), 1e-9)
+        rate = (values[-1] / amount) ** (1.0 / span) - 1.0
+
+        return {
+            "strategy": strategy,
+            "frequency": frequency,
+            "weights": {symbol: round(float(w), 4) for symbol, w in zip(symbols, target)},
+            "portfolio": {
+                "invested": round(float(amount), 2),
+                "finalValue": round(float(values[-1]), 2),
+                "xirrPercent": round(float(rate) * 100, 2),
+                "maxDrawdownPercent": round(float(max_drawdown(values[:, None])[0]) * 100, 2),
+                "annualTurnoverPercent": round(float(turnover.sum()) / span * 100, 2),
+                "rebalances": int(len(turnover)),
+                "equityCurve": _equity_curve(dates, values, invested, sample)
+            },
+            "startDate": dates[0].strftime("%Y-%m-%d"),
+            "endDate": dates[-1].strftime("%Y-%m-%d")
+        }
+
+    starts = period_starts(dates, frequency)
+    position = None
+    if strategy == "sip":
+        equity, invested = simulate_sip(prices, starts, amount)
+    elif strategy == "lump_sum":
+        equity, invested = simulate_lump_sum(prices, amount)
+    else:
+        equity, invested, position = simulate_ma_crossover(prices, amount, fast, slow)
+
+    # Cashflows: every investment is an outflow, the final value an inflow
+    contributions = np.diff(np.vstack([np.zeros((1, len(symbols))), invested]), axis=0)
+    flow_rows = np.flatnonzero((contributions > 0).any(axis=1) | (np.arange(len(dates)) == len(dates) - 1))
+    cashflows = -contributions[flow_rows]
+    cashflows[-1] += equity[-1]
+    # The last column is the combined portfolio: every symbol's flows on the same dates
+    cashflows = np.hstack([cashflows, cashflows.sum(axis=1, keepdims=True)])
+    rates = _xirr_batch()(cashflows.T, years[flow_rows] - years[flow_rows][0]) / 100
+
+    # Drawdowns are measured on a time-weighted index so contributions do not mask losses
+    if strategy == "ma_crossover":
+        nav = np.where(invested > 0, equity, np.nan)
+    else:
+        nav = np.where(invested > 0, prices, np.nan)
+    drawdowns = max_drawdown(nav)
+
+    active_years = np.maximum(years[-1] - years[(invested > 0).argmax(axis=0)], 1e-9)
+    if position is not None:
+        switches = np.abs(np.diff(position.astype("i1"), axis=0)).sum(axis=0)
+        turnover = switches / active_years
+    else:
+        turnover = np.zeros(len(symbols))
+
+    results = {}
+    for i, symbol in enumerate(symbols):
+        if invested[-1, i] <= 0:
+            results[symbol] = {"error": "No price history in range"}
+            continue
+        results[symbol] = {
+            "invested": round(float(invested[-1, i]), 2),
+            "finalValue": round(float(equity[-1, i]), 2),
+            "xirrPercent": round(float(rates[i]) * 100, 2) if np.isfinite(rates[i]) else None,
+            "maxDrawdownPercent": round(float(drawdowns[i]) * 100, 2),
+            "annualTurnoverPercent": round(float(turnover[i]) * 100, 2),
+            "startDate": dates[int((invested[:, i] > 0).argmax())].strftime("%Y-%m-%d"),
+            "equityCurve": _equity_curve(dates, equity[:, i], invested[:, i], sample)
+        }
+
+    portfolio_rate = rates[-1]
+    result = {
+        "strategy": strategy,
+        "frequency": frequency,
+        "results": results,
+        "portfolio": {
+            "invested": round(float(invested[-1].sum()), 2),
+            "finalValue": round(float(equity[-1].sum()), 2),
+            "xirrPercent": round(float(portfolio_rate) * 100, 2) if np.isfinite(portfolio_rate) else None
+        },
+        "startDate": dates[0].strftime("%Y-%m-%d"),
+        "endDate": dates[-1].strftime("%Y-%m-%d")
+    }
+    if strategy == "ma_crossover":
+        result["fast"], result["slow"] = fast, slow
+    return result
+
+
+def benchmark(years: int = 30, symbols: int = 100, seed: int = 7) -> Dict[str, float]:
+    """Time every strategy on synthetic closes (years x symbols of business days)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    paths = 100 * np.cumprod(1 + rng.normal(0.0004, 0.015, (len(dates), symbols)), axis=0)
+    # Stagger listings so early rows contain missing prices, as in real stored data
+    listing = rng.integers(0, len(dates) // 3, symbols)
+    paths[np.arange(len(dates))[:, None] < listing[None, :]] = np.nan
+    closes = pd.DataFrame(paths, index=dates, columns=[f"SYM{i}" for i in range(symbols)])
+
+    timings = {}
+    for strategy in STRATEGIES:
+        start = time.perf_counter()
+        run_backtest(closes, strategy)
+        timings[strategy] = round(time.perf_counter() - start, 3)
+    return timings
+
+
+if __name__ == "__main__":
+    print(benchmark())
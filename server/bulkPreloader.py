@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Bulk Preloader
+Parallel, rate-limited and resumable seeding of the local history and fundamentals stores
+
+A fresh deploy has an empty history store, so the first request for each
+symbol pays a full-history download. The preloader walks a universe on a
+worker pool, paces upstream calls with a shared token bucket, and records each
+finished ticker in a checkpoint file so an interrupted run resumes where it
+stopped. The history store itself only downloads the missing tail of tickers
+it already holds, so repeat runs are cheap.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, TextIO, Any
+
+# Seconds between progress lines and checkpoint writes
+PROGRESS_INTERVAL = 2.0
+
+
+class RateLimiter:
+    """Token bucket shared by worker threads; acquire() blocks until a call may go out"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Calls per second (0 or less disables limiting)
+            burst: Calls allowed back to back after an idle spell (defaults to one second's worth)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve a token now; a negative balance is the queue of callers ahead of us
+            self.tokens -= 1.0
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def read_symbol_file(path: str) -> List[str]:
+    """Symbols from a file: one per line or comma-separated, "#" starts a comment"""
+    symbols: List[str] = []
+    with open(path) as handle:
+        for line in handle:
+            line = line.split("#", 1)[0]
+            symbols.extend(symbol.strip() for symbol in line.replace(",", " ").split() if symbol.strip())
+    return list(dict.fromkeys(symbols))
+
+
+def checkpoint_path(directory: str, universe: str) -> str:
+    """Checkpoint file of a universe name or symbol-file path inside the store's state directory"""
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.basename(universe.lstrip("@")))[:64] or "universe"
+    return os.path.join(directory, "state", f"preload-{slug}.json")
+
+
+class PreloadCheckpoint:
+    """Finished tickers of a preload run, persisted atomically as JSON"""
+
+    def __init__(self, path: str, tickers: List[str]):
+        self.path = path
+        universe_hash = hashlib.sha1(",".join(sorted(tickers)).encode()).hexdigest()[:16]
+        self.state: Dict[str, Any] = {"tickers": len(tickers), "universeHash": universe_hash,
+                                      "startedAt": datetime.now().isoformat(), "finishedAt": None,
+                                      "done": {}, "failed": {}}
+        try:
+            with open(path) as handle:
+                previous = json.load(handle)
+            # Resume only an unfinished run over the same universe; its failures are retried
+            if previous.get("finishedAt") is None and previous.get("universeHash") == universe_hash:
+                self.state.update(previous, failed={})
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def done(self) -> Dict[str, int]:
+        return self.state["done"]
+
+    def record(self, ticker: str, bars_added: int) -> None:
+        self.state["done"][ticker] = bars_added
+        self.state["failed"].pop(ticker, None)
+
+    def record_failure(self, ticker: str, error: str) -> None:
+        self.state["failed"][ticker] = error
+
+    def save(self, finished: bool = False) -> None:
+        if finished:
+            self.state["finishedAt"] = datetime.now().isoformat()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(self.state, handle)
+        os.replace(temp_path, self.path)
+
+
+def run_preload(tickers: List[str], preload_one: Callable[[str], int], checkpoint: PreloadCheckpoint,
+                workers: int = 8, progress: Optional[TextIO] = sys.stderr) -> Dict[str, Any]:
+    """
+    Preload tickers on a thread pool, skipping those the checkpoint already has
+
+    Args:
+        tickers: Raw yfinance tickers
+        preload_one: Seeds one ticker and returns the number of bars it added
+        checkpoint: Checkpoint of this run (resumed when unfinished)
+        workers: Concurrent tickers
+        progress: Stream for progress lines (None for silence)
+
+    Returns:
+        Summary with counts, failures and throughput
+    """
+    pending = [ticker for ticker in tickers if ticker not in checkpoint.done]
+    resumed = len(tickers) - len(pending)
+    started = time.monotonic()
+    last_report = started
+    completed = 0
+    bars_added = 0
+
+    def report(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if progress is None or (not force and now - last_report < PROGRESS_INTERVAL):
+            return
+        last_report = now
+        elapsed = max(now - started, 1e-9)
+        rate = completed / elapsed
+        eta = (len(pending) - completed) / rate if rate > 0 else float("inf")
+        progress.write(
+            f"preload {resumed + completed}/{len(tickers)} "
+            f"({(resumed + completed) / max(len(tickers), 1) * 100:.1f}%) "
+            f"{rate:.2f} tickers/s {bars_added / elapsed:,.0f} bars/s "
+            f"failed {len(checkpoint.state['failed'])} eta {eta:.0f}s\n"
+        )
+        progress.flush()
+
+    last_save = started
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="preload")
+    try:
+        futures = {executor.submit(preload_one, ticker): ticker for ticker in pending}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                added = future.result()
+                checkpoint.record(ticker, added)
+                bars_added += added
+            except Exception as e:
+                checkpoint.record_failure(ticker, str(e))
+            completed += 1
+            if time.monotonic() - last_save >= PROGRESS_INTERVAL:
+                checkpoint.save()
+                last_save = time.monotonic()
+            report()
+    except BaseException:
+        # Interrupted (e.g. Ctrl-C): drop the queued tickers and wait only for those in flight
+        executor.shutdown(cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown()
+        # An interrupted run keeps what it finished for the next one to resume from
+        checkpoint.save(finished=completed == len(pending) and not checkpoint.state["failed"])
+    report(force=True)
+    elapsed = time.monotonic() - started
+    return {
+        "tickers": len(tickers),
+        "preloaded": completed - len(checkpoint.state["failed"]),
+        "resumedFromCheckpoint": resumed,
+        "failed": dict(checkpoint.state["failed"]),
+        "barsAdded": bars_added,
+        "elapsedSeconds": round(elapsed, 2),
+        "tickersPerSecond": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "checkpoint": checkpoint.path
+    }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Data Quality
+Validation and repair of fetched daily OHLCV bars before they are cached, stored or analysed
+
+Upstream daily bars occasionally arrive out of order, with a session repeated,
+with rows of NaN, as zero-volume copies of the previous close, with a low above
+the close, or with a one-bar spike that reverts the next session. Any of these
+skews CAGR, drawdown and RSI. clean_ohlcv repairs what can be repaired, drops
+what cannot, flags gaps it cannot fill, and returns a report of every change.
+
+All checks are whole-column array operations. The rolling median behind the
+spike test uses a fixed window, so a series costs O(n) work (a sort only runs
+when the dates are out of order).
+"""
+
+from typing import Dict, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from serviceMetrics import metrics
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+# Spike test: trailing window of returns and the robust z-score both legs must exceed
+OUTLIER_WINDOW = 63
+OUTLIER_THRESHOLD = 8.0
+# Floor on the robust daily volatility, so flat illiquid series do not flag every tick
+MIN_VOLATILITY = 1e-3
+# Calendar days between sessions beyond any holiday cluster
+GAP_DAYS = 10
+# Dates listed per report (counts are always complete)
+MAX_LISTED = 20
+
+REPAIR_KINDS = (
+    "reordered", "duplicates_dropped", "missing_close_dropped", "ohl_filled",
+    "phantom_bars_dropped", "outliers_repaired", "ohlc_fixed"
+)
+
+
+def empty_report() -> Dict[str, Any]:
+    return {"rows_checked": 0, "repairs": {kind: 0 for kind in REPAIR_KINDS}, "outlier_dates": [], "gaps": []}
+
+
+def merge_reports(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Accumulate the report of an appended tail onto the report of the stored series"""
+    if not previous:
+        return current
+    merged = empty_report()
+    merged["rows_checked"] = previous.get("rows_checked", 0) + current["rows_checked"]
+    for kind in REPAIR_KINDS:
+        merged["repairs"][kind] = previous.get("repairs", {}).get(kind, 0) + current["repairs"][kind]
+    merged["outlier_dates"] = sorted(set(previous.get("outlier_dates", [])) | set(current["outlier_dates"]))[-MAX_LISTED:]
+    gaps = {gap["from"]: gap for gap in previous.get("gaps", []) + current["gaps"]}
+    merged["gaps"] = [gaps[start] for start in sorted(gaps)][-MAX_LISTED:]
+    return merged
+
+
+def _session_dates(index: pd.DatetimeIndex) -> np.ndarray:
+    """Exchange-local session date of each bar"""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("M8[D]")
+
+
+def _spikes(close: np.ndarray, window: int, threshold: float) -> np.ndarray:
+    """
+    Bars whose move in and move out are both extreme and cancel each other
+
+    Volatility is the rolling median absolute daily log return of the preceding
+    `window` sessions (MAD about zero, scaled to a standard deviation). A level
+    shift such as a crash or an unadjusted split does not revert, so it is kept.
+    """
+    flagged = np.zeros(len(close), dtype=bool)
+    if len(close) < 3:
+        return flagged
+
+    returns = np.diff(np.log(close))
+    scale = pd.Series(np.abs(returns)).rolling(window, min_periods=min(window, 20)).median().shift(1)
+    sigma = np.maximum(1.4826 * scale.to_numpy(), MIN_VOLATILITY)
+
+    into, out = returns[:-1], returns[1:]
+    with np.errstate(invalid="ignore"):
+        extreme = (np.abs(into) > threshold * sigma[:-1]) & (np.abs(out) > threshold * sigma[:-1])
+        reverts = (np.sign(into) != np.sign(out)) & (np.abs(into + out) < 0.5 * np.abs(into))
+    # returns[i] is the move into bar i + 1
+    flagged[1:-1] = extreme & reverts
+    return flagged
+
+
+def clean_ohlcv(hist: pd.DataFrame, window: int = OUTLIER_WINDOW,
+                threshold: float = OUTLIER_THRESHOLD) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Validate a daily OHLCV frame and repair or drop bad bars
+
+    Checks, in order:
+        - dates out of order are sorted
+        - repeated sessions keep their last bar
+        - bars without a positive close are dropped; missing open/high/low take the close
+        - zero-volume bars repeating the previous close flat (in a series that trades volume)
+          are dropped, unless they carry a dividend or split
+        - one-bar spikes that revert are moved to the geometric mean of their neighbours
+        - high and low are widened to contain open and close
+        - gaps of more than GAP_DAYS calendar days are flagged (not filled)
+
+    Args:
+        hist: yfinance history frame; extra columns (Dividends, Stock Splits) are carried along
+        window: Trailing sessions used for the spike volatility estimate
+        threshold: Robust z-score both legs of a spike must exceed
+
+    Returns:
+        (cleaned frame, report with rows_checked, repair counts, outlier_dates and gaps)
+    """
+    report = empty_report()
+    report["rows_checked"] = int(len(hist))
+    if hist.empty or "Close" not in hist:
+        return hist, report
+    repairs = report["repairs"]
+
+    index = pd.DatetimeIndex(hist.index)
+    rows = np.arange(len(hist))
+    stamps = index.values.astype("M8[ns]").view("i8")
+    if len(stamps) > 1 and (np.diff(stamps) < 0).any():
+        repairs["reordered"] = int((np.diff(stamps) < 0).sum())
+        rows = np.argsort(stamps, kind="stable")
+
+    dates = _session_dates(index)[rows]
+    repeated = np.append(dates[1:] == dates[:-1], False)
+    repairs["duplicates_dropped"] = int(repeated.sum())
+    rows, dates = rows[~repeated], dates[~repeated]
+
+    prices = {column: hist[column].to_numpy(dtype="f8")[rows] if column in hist else np.full(len(rows), np.nan)
+              for column in PRICE_COLUMNS}
+    with np.errstate(invalid="ignore"):
+        valid = prices["Close"] > 0
+    repairs["missing_close_dropped"] = int((~valid).sum())
+
+    volume = hist["Volume"].to_numpy(dtype="f8")[rows] if "Volume" in hist else np.full(len(rows), np.nan)
+    events = np.zeros(len(rows), dtype=bool)
+    for column in ("Dividends", "Stock Splits"):
+        if column in hist:
+            events |= np.nan_to_num(hist[column].to_numpy(dtype="f8")[rows]) != 0
+
+    keep = valid.copy()
+    close = prices["Close"]
+    if len(rows) > 1 and np.nanmedian(volume) > 0:
+        previous_close = np.append(np.nan, close[:-1])
+        flat = np.logical_and.reduce([prices[column] == close for column in ("Open", "High", "Low")])
+        phantom = (volume == 0) & flat & (close == previous_close) & ~events
+        repairs["phantom_bars_dropped"] = int((phantom & valid).sum())
+        keep &= ~phantom
+
+    rows, dates = rows[keep], dates[keep]
+    prices = {column: values[keep] for column, values in prices.items()}
+    close = prices["Close"]
+
+    missing = np.zeros(len(rows), dtype=bool)
+    for column in ("Open", "High", "Low"):
+        gaps = np.isnan(prices[column])
+        prices[column] = np.where(gaps, close, prices[column])
+        missing |= gaps
+    repairs["ohl_filled"] = int(missing.sum())
+
+    spikes = _spikes(close, window, threshold)
+    if spikes.any():
+        at = np.flatnonzero(spikes)
+        original = close[at]
+        target = np.sqrt(close[at - 1] * close[at + 1])
+        spike_size = np.abs(np.log(original / target))
+        for column in PRICE_COLUMNS:
+            # Rescale the fields that spiked with the close; bad ticks often hit the close alone
+            values = prices[column][at]
+            spiked = np.abs(np.log(values / target)) > 0.5 * spike_size
+            prices[column][at] = np.where(spiked, values * target / original, values)
+        repairs["outliers_repaired"] = int(len(at))
+        report["outlier_dates"] = [str(day) for day in dates[at][:MAX_LISTED]]
+
+    stacked = np.vstack([prices[column] for column in PRICE_COLUMNS])
+    high, low = stacked.max(axis=0), stacked.min(axis=0)
+    inconsistent = (high != prices["High"]) | (low != prices["Low"])
+    repairs["ohlc_fixed"] = int(inconsistent.sum())
+    prices["High"], prices["Low"] = high, low
+
+    if len(dates) > 1:
+        spans = np.diff(dates).astype(int)
+        for i in np.flatnonzero(spans > GAP_DAYS)[:MAX_LISTED]:
+            report["gaps"].append({"from": str(dates[i]), "to": str(dates[i + 1]), "days": int(spans[i])})
+
+    for kind, count in repairs.items():
+        if count:
+            metrics.inc("data_repairs_total", count, kind=kind)
+
+    if not any(repairs.values()):
+        return hist, report
+    cleaned = hist.iloc[rows].copy()
+    for column in PRICE_COLUMNS:
+        if column in cleaned:
+            cleaned[column] = prices[column]
+    return cleaned, report
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+FX Matrix
+Cross-currency conversion from a minimal set of USD pivot rates
+
+Only one rate per currency is fetched: yfinance "<CCY>=X" quotes units of CCY
+per US dollar. Every cross rate is derived from those by triangulation,
+rate(a -> b) = usd[b] / usd[a], so converting between n currencies needs n - 1
+fetched pairs instead of n^2. Conversions run over whole columns at once:
+currencies are factorised to codes, one factor is computed per distinct
+currency, and the value matrix is multiplied by the expanded factors.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from serviceCache import TTLCache
+from tradingCalendar import INDEX_EXCHANGES, SUFFIX_EXCHANGES
+
+logger = logging.getLogger(__name__)
+
+PIVOT_CURRENCY = "USD"
+
+EXCHANGE_CURRENCIES = {
+    "NYSE": "USD", "NASDAQ": "USD", "NSE": "INR", "BSE": "INR", "LSE": "GBP", "XETRA": "EUR",
+    "FRA": "EUR", "EURONEXT": "EUR", "BIT": "EUR", "BME": "EUR", "SIX": "CHF", "JPX": "JPY",
+    "HKEX": "HKD", "ASX": "AUD", "TSX": "CAD", "B3": "BRL", "BMV": "MXN", "KRX": "KRW", "TWSE": "TWD",
+    "IDX": "IDR"
+}
+
+# Listing suffix to quote currency, from the exchange of each suffix; London listings quote in pence
+SUFFIX_CURRENCIES = {suffix: EXCHANGE_CURRENCIES[exchange] for suffix, exchange in SUFFIX_EXCHANGES.items()}
+SUFFIX_CURRENCIES[".L"] = "GBp"
+
+# Quote units that are a fraction of a currency
+MINOR_UNITS = {"GBp": ("GBP", 0.01), "GBX": ("GBP", 0.01), "ZAc": ("ZAR", 0.01), "ILA": ("ILS", 0.01)}
+
+
+def currency_for_ticker(ticker: str) -> str:
+    """Quote currency of a raw yfinance ticker (minor units such as GBp are kept)"""
+    if ticker.endswith("=X"):
+        pair = ticker[:-2]
+        return pair[3:] if len(pair) == 6 else pair
+    if ticker in INDEX_EXCHANGES:
+        return EXCHANGE_CURRENCIES.get(INDEX_EXCHANGES[ticker], PIVOT_CURRENCY)
+    for suffix, currency in SUFFIX_CURRENCIES.items():
+        if ticker.endswith(suffix):
+            return currency
+    if "-" in ticker and len(ticker.rsplit("-", 1)[1]) == 3:
+        # Crypto pairs such as BTC-USD or ETH-EUR
+        return ticker.rsplit("-", 1)[1]
+    return PIVOT_CURRENCY
+
+
+def major_currency(currency: str) -> Tuple[str, float]:
+    """Major currency and the factor turning one quote unit into it (GBp -> GBP, 0.01)"""
+    return MINOR_UNITS.get(currency, (currency.upper(), 1.0))
+
+
+def pivot_ticker(currency: str) -> str:
+    """yfinance ticker quoting units of `currency` per US dollar"""
+    return f"{currency}=X"
+
+
+class FXMatrix:
+    """Cached USD pivot rates and the cross-rate matrix derived from them"""
+
+    def __init__(self, fetch_quotes: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+                 fetch_history: Callable[[str], pd.DataFrame],
+                 ttl_for: Optional[Callable[[str], float]] = None, shared: Optional[Any] = None):
+        """
+        Args:
+            fetch_quotes: Batch quote fetcher returning {ticker: {"lastPrice": ...}}
+            fetch_history: Daily bars of one ticker from the history store
+            ttl_for: Cache lifetime of a pivot ticker (defaults to 60 seconds)
+            shared: Optional cross-process cache backend for the pivot rates
+        """
+        self.fetch_quotes = fetch_quotes
+        self.fetch_history = fetch_history
+        self.ttl_for = ttl_for or (lambda ticker: 60)
+        self.rates = TTLCache("fx", default_ttl=60, max_entries=256, shared=shared)
+
+    def usd_rates(self, currencies: Sequence[str]) -> Dict[str, float]:
+        """
+        Units of each major currency per US dollar, fetching missing pivots in one batch
+
+        Raises:
+            ValueError: If a currency has no pivot quote upstream
+        """
+        majors = sorted({major_currency(currency)[0] for currency in currencies})
+        rates = {PIVOT_CURRENCY: 1.0}
+        missing = []
+        for currency in majors:
+            if currency == PIVOT_CURRENCY:
+                continue
+            cached = self.rates.get(currency)
+            if cached is None:
+                missing.append(currency)
+            else:
+                rates[currency] = cached
+
+        if missing:
+            quotes = self.fetch_quotes([pivot_ticker(currency) for currency in missing])
+            for currency in missing:
+                quote = quotes.get(pivot_ticker(currency)) or {}
+                rate = quote.get("lastPrice")
+                if not rate or rate <= 0:
+                    raise ValueError(f"No FX rate available for {currency}")
+                rates[currency] = float(rate)
+                self.rates.set(currency, float(rate), ttl=self.ttl_for(pivot_ticker(currency)))
+
+        return rates
+
+    def matrix(self, currencies: Sequence[str]) -> Dict[str, Any]:
+        """
+        Cross-rate matrix between currencies
+
+        Returns:
+            Dictionary with the currency order and rates[i][j] = units of j per unit of i
+        """
+        majors = sorted({major_currency(currency)[0] for currency in currencies})
+        rates = self.usd_rates(majors)
+        usd = np.array([rates[currency] for currency in majors])
+        cross = usd[None, :] / usd[:, None]
+        return {
+            "currencies": majors,
+            "rates": [[round(float(value), 6) for value in row] for row in cross],
+            "usdRates": {currency: round(rates[currency], 6) for currency in majors},
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def factors(self, currencies: Sequence[str], base: str) -> np.ndarray:
+        """Per-value conversion factors into `base` for a column of quote currencies"""
+        codes, inverse = np.unique(np.asarray(currencies, dtype=str), return_inverse=True)
+        base_major, base_scale = major_currency(base)
+        rates = self.usd_rates(list(codes) + [base_major])
+
+        majors = [major_currency(code) for code in codes]
+        distinct = np.array([rates[base_major] / rates[major] * scale / base_scale for major, scale in majors])
+        return distinct[inverse]
+
+    def convert(self, values: np.ndarray, currencies: Sequence[str], base: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert rows of values quoted in different currencies into `base`
+
+        Args:
+            values: (rows,) or (rows x fields) array
+            currencies: Quote currency of each row
+            base: Target currency
+
+        Returns:
+            (converted values, factor applied to each row)
+        """
+        factors = self.factors(currencies, base)
+        values = np.asarray(values, dtype="f8")
+        return values * (factors if values.ndim == 1 else factors[:, None]), factors
+
+    def factor_series(self, currency: str, base: str, dates: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Daily conversion factors from `currency` into `base`, aligned to `dates`
+
+        Uses stored pivot histories; each date takes the latest fixing on or before it
+        (the first fixing for dates before the series starts).
+        """
+        major, scale = major_currency(currency)
+        base_major, base_scale = major_currency(base)
+        index = pd.DatetimeIndex(dates)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        index = index.normalize()
+
+        def usd_series(code: str) -> np.ndarray:
+            if code == PIVOT_CURRENCY:
+                return np.ones(len(index))
+            closes = self.fetch_history(pivot_ticker(code))["Close"]
+            if closes.empty:
+                raise ValueError(f"No FX history available for {code}")
+            aligned = closes.reindex(closes.index.union(index)).ffill().bfill().reindex(index)
+            return aligned.to_numpy(dtype="f8")
+
+        return usd_series(base_major) / usd_series(major) * scale / base_scale
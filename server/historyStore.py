@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+History Store
+Local on-disk store of daily bars and corporate actions, updated incrementally from upstream
+
+Each ticker is kept as a memory-mappable .npy file of (date, OHLCV, dividend,
+split, total-return index) rows plus a small JSON sidecar recording when it was
+last refreshed. Bars are stored unadjusted: upstream split-adjusts prices to
+the fetch date, and the split ratios in the same download are used to undo
+that, so a later split or dividend never rewrites stored rows. An update
+downloads only the last few sessions and appends them, extending the
+total-return index from its last stored value.
+
+Split-adjusted ("price") and dividend-reinvested ("total") series are derived
+on read with a reverse cumulative product over the split column, so serving
+either mode costs O(n) array work and no extra download. If the overlapping
+bars no longer match (an upstream data revision), the full history is
+downloaded again.
+
+Ticker fundamentals can be kept alongside as <ticker>.info.json, so a
+preloaded store also answers fundamentals lookups.
+
+Every download passes through dataQuality.clean_ohlcv before it is stored; the
+accumulated repair report is kept in the sidecar and attached to returned
+frames as attrs["data_quality"].
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from dataQuality import clean_ohlcv, merge_reports
+from serviceDeadline import deadlines
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+EVENT_COLUMNS = ("Dividends", "Splits")
+BAR_DTYPE = np.dtype(
+    [("date", "M8[D]")] + [(column, "<f8") for column in BAR_COLUMNS + EVENT_COLUMNS + ("TotalReturn",)]
+)
+
+# raw: as traded; price: split-adjusted; total: split-adjusted with dividends reinvested
+ADJUSTMENTS = ("raw", "price", "total")
+
+# Sessions refetched on every incremental update; the newest stored bar may
+# have been captured mid-session
+OVERLAP_DAYS = 7
+
+# Upper bound on one refresh (a full-history download) holding the cross-process lease
+LEASE_SECONDS = 120.0
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".history")
+
+
+def split_factors(splits: np.ndarray) -> np.ndarray:
+    """Product of the split ratios strictly after each bar (shares one share on that day became)"""
+    after = np.cumprod(splits[::-1])[::-1]
+    return np.append(after[1:], 1.0)
+
+
+def extend_total_return(bars: np.ndarray, start: int = 0) -> np.ndarray:
+    """
+    Fill the TotalReturn index from row `start` onward, continuing the stored value before it
+
+    One share held through a split becomes `ratio` shares, and dividends are
+    reinvested at the close, so growth(t) = ratio(t) * (close(t) + dividend(t)) / close(t - 1).
+    """
+    if len(bars) == 0 or start >= len(bars):
+        return bars
+    closes = bars["Close"]
+    growth = np.ones(len(bars) - start)
+    begin = max(start, 1)
+    growth[begin - start:] = bars["Splits"][begin:] * (closes[begin:] + bars["Dividends"][begin:]) / closes[begin - 1:-1]
+    previous = bars["TotalReturn"][start - 1] if start > 0 else 1.0
+    bars["TotalReturn"][start:] = previous * np.cumprod(growth)
+    return bars
+
+
+def frame_to_bars(hist: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a yfinance history frame (auto_adjust=False, actions=True) to unadjusted store rows
+
+    Args:
+        hist: yfinance history DataFrame
+
+    Returns:
+        Structured array sorted by local session date, one row per date
+    """
+    if hist.empty or "Close" not in hist:
+        return np.empty(0, dtype=BAR_DTYPE)
+    hist = hist.dropna(subset=["Close"])
+    index = pd.DatetimeIndex(hist.index)
+    if index.tz is not None:
+        # Keep the exchange-local wall date of each session
+        index = index.tz_localize(None)
+
+    dates = index.normalize().values.astype("M8[D]")
+    order = np.argsort(dates, kind="stable")
+    # Keep the last row of any duplicated date
+    keep = np.append(dates[order][1:] != dates[order][:-1], True) if len(order) else np.array([], dtype=bool)
+    rows = order[keep]
+
+    def column(name: str, default: float) -> np.ndarray:
+        values = hist[name].to_numpy(dtype="f8")[rows] if name in hist else np.full(len(rows), default)
+        return np.where(np.isnan(values), default, values)
+
+    splits = column("Stock Splits", 1.0)
+    splits = np.where(splits > 0, splits, 1.0)
+    factors = split_factors(splits)
+
+    bars = np.empty(len(rows), dtype=BAR_DTYPE)
+    bars["date"] = dates[rows]
+    for name in ("Open", "High", "Low", "Close"):
+        bars[name] = column(name, np.nan) * factors
+    bars["Volume"] = column("Volume", np.nan) / factors
+    bars["Dividends"] = column("Dividends", 0.0) * factors
+    bars["Splits"] = splits
+    return extend_total_return(bars)
+
+
+def adjust_bars(bars: np.ndarray, adjustment: str = "total") -> Dict[str, np.ndarray]:
+    """
+    OHLCV columns of stored bars in the requested adjustment
+
+    Args:
+        bars: Stored rows
+        adjustment: raw, price (split-adjusted) or total (split- and dividend-adjusted)
+
+    Returns:
+        Dictionary of columns, including Dividends and Stock Splits in the same adjustment
+    """
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(f"Unknown adjustment '{adjustment}' ({'/'.join(ADJUSTMENTS)})")
+
+    columns = {name: np.asarray(bars[name], dtype="f8") for name in BAR_COLUMNS + EVENT_COLUMNS}
+    if adjustment != "raw" and len(bars):
+        factors = split_factors(columns["Splits"])
+        for name in ("Open", "High", "Low", "Close", "Dividends"):
+            columns[name] = columns[name] / factors
+        columns["Volume"] = columns["Volume"] * factors
+
+        if adjustment == "total":
+            # Rescale the total-return index so it ends at the last close, as upstream adjusted closes do
+            total = np.asarray(bars["TotalReturn"], dtype="f8")
+            scale = total / total[-1] * columns["Close"][-1] / columns["Close"]
+            for name in ("Open", "High", "Low", "Close"):
+                columns[name] = columns[name] * scale
+
+    columns["Stock Splits"] = np.where(columns.pop("Splits") != 1.0, np.asarray(bars["Splits"]), 0.0)
+    return columns
+
+
+def bars_to_frame(bars: np.ndarray, adjustment: str = "total") -> pd.DataFrame:
+    """Convert store rows to a yfinance-style DataFrame indexed by session date"""
+    return pd.DataFrame(
+        adjust_bars(bars, adjustment),
+        index=pd.DatetimeIndex(np.asarray(bars["date"]).astype("M8[ns]"), name="Date")
+    )
+
+
+class HistoryStore:
+    """Per-ticker daily bar files with incremental refresh"""
+
+    def __init__(self, directory: Optional[str] = None, leases: Optional[Any] = None):
+        """
+        Args:
+            directory: Store directory (defaults to STOCK_HISTORY_DIR or server/.history)
+            leases: Optional sharedCache backend; refreshes then take a per-ticker lease so
+                processes sharing the directory download each ticker once
+        """
+        self.directory = directory or os.environ.get("STOCK_HISTORY_DIR") or DEFAULT_DIRECTORY
+        self.leases = leases
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str, suffix: str) -> str:
+        return os.path.join(self.directory, quote(ticker, safe="") + suffix)
+
+    def load(self, ticker: str) -> Optional[np.ndarray]:
+        """Memory-map the stored bars of a ticker, or None when nothing (or an older layout) is stored"""
+        try:
+            bars = np.load(self._path(ticker, ".npy"), mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        return bars if bars.dtype == BAR_DTYPE else None
+
+    def meta(self, ticker: str) -> Dict[str, Any]:
+        """Sidecar metadata (lastUpdated, rows, start, end) of a ticker"""
+        try:
+            with open(self._path(ticker, ".json")) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def last_updated(self, ticker: str) -> Optional[datetime]:
+        value = self.meta(ticker).get("lastUpdated")
+        return datetime.fromisoformat(value) if value else None
+
+    def save(self, ticker: str, bars: np.ndarray, **extra_meta: Any) -> None:
+        """Atomically replace the stored bars and metadata of a ticker"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(ticker, ".npy")
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as handle:
+            np.save(handle, bars, allow_pickle=False)
+        os.replace(temp_path, path)
+
+        meta = {
+            "ticker": ticker,
+            "lastUpdated": datetime.now(timezone.utc).isoformat(),
+            "rows": int(len(bars)),
+            "start": str(bars["date"][0]) if len(bars) else None,
+            "end": str(bars["date"][-1]) if len(bars) else None,
+            **extra_meta
+        }
+        meta_path = self._path(ticker, ".json")
+        temp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(meta, handle)
+        os.replace(temp_path, meta_path)
+
+    def _annotated_frame(self, ticker: str, bars: np.ndarray, adjustment: str) -> pd.DataFrame:
+        """bars_to_frame with the stored data-quality report attached as attrs["data_quality"]"""
+        frame = bars_to_frame(bars, adjustment)
+        frame.attrs["data_quality"] = self.meta(ticker).get("data_quality")
+        return frame
+
+    def load_info(self, ticker: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Stored fundamentals of a ticker if they were fetched less than max_age seconds ago"""
+        try:
+            with open(self._path(ticker, ".info.json")) as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        fetched_at = datetime.fromisoformat(stored.get("fetchedAt", "1970-01-01T00:00:00+00:00"))
+        if (datetime.now(timezone.utc) - fetched_at).total_seconds() > max_age:
+            return None
+        return stored.get("info") or None
+
+    def save_info(self, ticker: str, info: Dict[str, Any]) -> None:
+        """Atomically store the fundamentals of a ticker with their fetch time"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(ticker, ".info.json")
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump({"fetchedAt": datetime.now(timezone.utc).isoformat(), "info": info}, handle, default=str)
+        os.replace(temp_path, path)
+
+    def frame(self, ticker: str, start: Optional[date] = None, adjustment: str = "total") -> pd.DataFrame:
+        """Stored bars as a DataFrame, optionally from a start date"""
+        bars = self.load(ticker)
+        if bars is None:
+            return pd.DataFrame(columns=list(BAR_COLUMNS))
+        # Adjust over the full history first: split factors depend on later rows only, but the
+        # total-return rescaling is anchored to the last close
+        frame = self._annotated_frame(ticker, bars, adjustment)
+        return frame if start is None else frame[frame.index >= pd.Timestamp(start)]
+
+    def corporate_actions(self, ticker: str, start: Optional[date] = None) -> Dict[str, Any]:
+        """Stored dividends and splits of a ticker (dividends per share as paid)"""
+        bars = self.load(ticker)
+        if bars is None:
+            return {"dividends": [], "splits": []}
+        if start is not None:
+            bars = bars[bars["date"] >= np.datetime64(start, "D")]
+        dividends = bars[bars["Dividends"] > 0]
+        splits = bars[bars["Splits"] != 1.0]
+        return {
+            "dividends": [{"date": str(row["date"]), "amount": round(float(row["Dividends"]), 6)} for row in dividends],
+            "splits": [{"date": str(row["date"]), "ratio": float(row["Splits"])} for row in splits]
+        }
+
+    def update(self, ticker: str, fetch_range: Callable[[str, Optional[date]], pd.DataFrame],
+               is_stale: Callable[[str, Optional[datetime]], bool], adjustment: str = "total") -> pd.DataFrame:
+        """
+        Bring a ticker up to date and return its full stored history
+
+        Args:
+            ticker: Raw yfinance ticker
+            fetch_range: Called as fetch_range(ticker, start); start None means full history.
+                Must return unadjusted closes with Dividends and Stock Splits columns
+            is_stale: Called as is_stale(ticker, last_updated); False skips the download
+            adjustment: Adjustment of the returned frame (raw, price, total)
+
+        Returns:
+            Stored history DataFrame (empty when upstream has no data)
+        """
+        with self._lock(ticker):
+            stored = self.load(ticker)
+            last_updated = self.last_updated(ticker)
+            if stored is not None and not is_stale(ticker, last_updated):
+                return self._annotated_frame(ticker, stored, adjustment)
+
+            if self.leases is None:
+                return self._refresh(ticker, stored, fetch_range, adjustment)
+
+            key = f"history-store:{ticker}"
+            owned = self._lease_call(self.leases.acquire, key, LEASE_SECONDS)
+            if owned is False:
+                self._lease_call(self.leases.wait_released, key, deadlines.wait_limit(LEASE_SECONDS))
+                # Another process refreshed this ticker while we waited; its bars are as new as ours would be
+                stored = self.load(ticker)
+                if stored is not None and self.last_updated(ticker) != last_updated:
+                    return self._annotated_frame(ticker, stored, adjustment)
+            try:
+                return self._refresh(ticker, stored, fetch_range, adjustment)
+            finally:
+                if owned:
+                    self._lease_call(self.leases.release, key)
+
+    def _lease_call(self, function: Callable[..., Any], key: str, *args: Any) -> Optional[Any]:
+        """Call a method of the lease backend; None when the backend fails (the caller refreshes unleased)"""
+        try:
+            return function(key, *args)
+        except Exception as e:
+            logger.warning(f"History store lease failed for {key}: {str(e)}")
+            metrics.inc("cache_shared_errors_total", cache="history-store")
+            return None
+
+    def _refresh(self, ticker: str, stored: Optional[np.ndarray],
+                 fetch_range: Callable[[str, Optional[date]], pd.DataFrame], adjustment: str) -> pd.DataFrame:
+        """Download missing bars, save them and return the adjusted history"""
+        if stored is None or len(stored) == 0:
+            bars, quality = self._download(ticker, None, fetch_range)
+        else:
+            bars, quality = self._append(ticker, stored, fetch_range)
+
+        if len(bars) == 0:
+            return pd.DataFrame(columns=list(BAR_COLUMNS))
+
+        self.save(ticker, bars, data_quality=quality)
+        return self._annotated_frame(ticker, bars, adjustment)
+
+    def _download(self, ticker: str, start: Optional[date],
+                  fetch_range: Callable[[str, Optional[date]], pd.DataFrame]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Fetch, validate and convert bars from a start date, with the repair report"""
+        hist, quality = clean_ohlcv(fetch_range(ticker, start))
+        return frame_to_bars(hist), quality
+
+    def _append(self, ticker: str, stored: np.ndarray,
+                fetch_range: Callable[[str, Optional[date]], pd.DataFrame]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Fetch the recent tail and splice it onto stored bars"""
+        last_date = pd.Timestamp(stored["date"][-1]).date()
+        previous_quality = self.meta(ticker).get("data_quality")
+        recent, quality = self._download(ticker, last_date - timedelta(days=OVERLAP_DAYS), fetch_range)
+        if len(recent) == 0:
+            return np.array(stored), previous_quality
+
+        # Overlapping unadjusted sessions must agree; a mismatch means upstream revised history
+        common, stored_at, recent_at = np.intersect1d(stored["date"], recent["date"], return_indices=True)
+        if len(common) > 1:
+            old_close = stored["Close"][stored_at[:-1]]
+            new_close = recent["Close"][recent_at[:-1]]
+            if not np.allclose(old_close, new_close, rtol=1e-4, equal_nan=True):
+                logger.info(f"History for {ticker} was revised upstream; reloading in full")
+                return self._download(ticker, None, fetch_range)
+
+        head = stored[stored["date"] < recent["date"][0]]
+        bars = np.concatenate([np.array(head), recent])
+        # Stored rows keep their index values; only the appended tail is chained on
+        return extend_total_return(bars, len(head)), merge_reports(previous_quality, quality)
+
+    def aligned_closes(self, tickers: List[str], start: Optional[date] = None,
+                       complete: bool = True, adjustment: str = "total") -> pd.DataFrame:
+        """
+        Stored closes of several tickers on a shared date index
+
+        Dates missing for one ticker (e.g., a holiday on only one exchange) are
+        forward-filled. With complete=True, rows before every ticker has data
+        are dropped; otherwise they are kept with NaN for the missing tickers.
+        Closes are total-return adjusted unless another adjustment is asked for.
+        """
+        closes = {ticker: self.frame(ticker, start, adjustment)["Close"] for ticker in tickers}
+        frame = pd.DataFrame(closes).sort_index().ffill()
+        return frame.dropna() if complete else frame.dropna(how="all")
+
+    def tickers(self) -> List[str]:
+        """Tickers present in the store"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = [name[:-len(".npy")] for name in os.listdir(self.directory) if name.endswith(".npy")]
+        return sorted(unquote(name) for name in names)
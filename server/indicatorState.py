@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Indicator State
+Latest technical indicators of every stored ticker, kept as one columnar table
+
+The table holds one row per ticker in the history store with the same
+indicators the historical analytics report (MA20/50/200, 14-day RSI, 52-week
+range) plus volume and day-change columns. A refresh only recomputes tickers
+whose stored bars changed since the last refresh, and recomputes them together
+from a (tickers x 253 days) tail matrix, so the screener reads plain arrays.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from historyStore import HistoryStore, adjust_bars
+
+logger = logging.getLogger(__name__)
+
+# Bars needed for the longest lookback (52 weeks) plus the previous close
+TAIL_DAYS = 253
+AVG_VOLUME_DAYS = 63
+RSI_PERIOD = 14
+
+INDICATOR_COLUMNS = (
+    "close", "prevClose", "change", "changePercent", "ma20", "ma50", "ma200", "rsi",
+    "high52w", "low52w", "fromHigh52wPercent", "fromLow52wPercent",
+    "volume", "avgVolume", "volumeRatio"
+)
+INDICATOR_DTYPE = np.dtype(
+    [("ticker", "U32"), ("asOf", "M8[D]"), ("sourceVersion", "<i8")]
+    + [(column, "<f8") for column in INDICATOR_COLUMNS]
+)
+
+
+def _tail_mean(values: np.ndarray, days: int) -> np.ndarray:
+    """Row-wise mean of the last `days` columns; NaN when any of them is missing"""
+    window = values[:, -days:]
+    with np.errstate(invalid="ignore"):
+        return np.where(np.isnan(window).any(axis=1), np.nan, window.mean(axis=1))
+
+
+def compute_indicators(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                       volumes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Indicators for many tickers at once from right-aligned tail matrices
+
+    Args:
+        closes, highs, lows, volumes: (tickers x days) matrices, newest bar in the
+            last column and NaN-padded on the left for short histories
+
+    Returns:
+        Dictionary of indicator columns, one value per ticker
+    """
+    close = closes[:, -1]
+    prev_close = closes[:, -2]
+
+    # Simple-average RSI, matching historicalAnalytics._rsi
+    deltas = np.diff(closes[:, -(RSI_PERIOD + 1):], axis=1)
+    gains = np.where(deltas > 0, deltas, 0.0).mean(axis=1)
+    losses = np.where(deltas < 0, -deltas, 0.0).mean(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(losses > 0, 100.0 - 100.0 / (1.0 + gains / losses), 100.0)
+        rsi = np.where(np.isnan(deltas).any(axis=1), np.nan, rsi)
+
+        high52w = np.nanmax(highs[:, -252:], axis=1)
+        low52w = np.nanmin(lows[:, -252:], axis=1)
+        volume = volumes[:, -1]
+        avg_volume = np.nanmean(volumes[:, -AVG_VOLUME_DAYS:], axis=1)
+
+        return {
+            "close": close,
+            "prevClose": prev_close,
+            "change": close - prev_close,
+            "changePercent": (close / prev_close - 1.0) * 100,
+            "ma20": _tail_mean(closes, 20),
+            "ma50": _tail_mean(closes, 50),
+            "ma200": _tail_mean(closes, 200),
+            "rsi": rsi,
+            "high52w": high52w,
+            "low52w": low52w,
+            "fromHigh52wPercent": (close / high52w - 1.0) * 100,
+            "fromLow52wPercent": (close / low52w - 1.0) * 100,
+            "volume": volume,
+            "avgVolume": avg_volume,
+            "volumeRatio": np.where(avg_volume > 0, volume / avg_volume, np.nan)
+        }
+
+
+class IndicatorState:
+    """Indicator table over the history store, persisted next to it"""
+
+    def __init__(self, store: HistoryStore):
+        self.store = store
+        self.path = os.path.join(store.directory, "state", "indicators.npy")
+        self._lock = threading.Lock()
+        self._table: Optional[np.ndarray] = None
+
+    def _load(self) -> np.ndarray:
+        if self._table is None:
+            try:
+                table = np.load(self.path, allow_pickle=False)
+                self._table = table if table.dtype == INDICATOR_DTYPE else np.empty(0, dtype=INDICATOR_DTYPE)
+            except (OSError, ValueError):
+                self._table = np.empty(0, dtype=INDICATOR_DTYPE)
+        return self._table
+
+    def _save(self, table: np.ndarray) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as handle:
+            np.save(handle, table, allow_pickle=False)
+        os.replace(temp_path, self.path)
+
+    def _source_version(self, ticker: str) -> int:
+        """Modification time of the ticker's stored bars (0 when missing)"""
+        try:
+            return os.stat(self.store._path(ticker, ".npy")).st_mtime_ns
+        except OSError:
+            return 0
+
+    def refresh(self, tickers: Optional[List[str]] = None) -> int:
+        """
+        Recompute rows whose stored bars changed and drop tickers no longer stored
+
+        Args:
+            tickers: Tickers to consider (defaults to every stored ticker)
+
+        Returns:
+            Number of rows recomputed
+        """
+        with self._lock:
+            table = self._load()
+            stored = self.store.tickers()
+            stored_set = set(stored)
+            universe = stored if tickers is None else [ticker for ticker in tickers if ticker in stored_set]
+
+            known = {ticker: version for ticker, version in zip(table["ticker"], table["sourceVersion"])}
+            versions = {ticker: self._source_version(ticker) for ticker in universe}
+            stale = [ticker for ticker in universe if known.get(ticker) != versions[ticker]]
+            if not stale and len(table) == len(stored):
+                return 0
+
+            fresh = self._compute_rows(stale, versions)
+            keep = np.isin(table["ticker"], stored) & ~np.isin(table["ticker"], stale)
+            table = np.concatenate([table[keep], fresh])
+            table = table[np.argsort(table["ticker"], kind="stable")]
+
+            self._save(table)
+            self._table = table
+            return len(fresh)
+
+    def _compute_rows(self, tickers: List[str], versions: Dict[str, int]) -> np.ndarray:
+        """Build indicator rows for several tickers from their stored tails"""
+        tails = []
+        for ticker in tickers:
+            bars = self.store.load(ticker)
+            if bars is not None and len(bars) >= 2:
+                tail = bars[-TAIL_DAYS:]
+                # Split-adjusted, so ranges and averages span splits; the tail holds every later split
+                tails.append((ticker, tail["date"], adjust_bars(tail, "price")))
+
+        rows = np.empty(len(tails), dtype=INDICATOR_DTYPE)
+        if not tails:
+            return rows
+
+        matrices = {column: np.full((len(tails), TAIL_DAYS), np.nan) for column in ("Close", "High", "Low", "Volume")}
+        for i, (ticker, dates, tail) in enumerate(tails):
+            for column, matrix in matrices.items():
+                matrix[i, TAIL_DAYS - len(dates):] = tail[column]
+            rows[i]["ticker"] = ticker
+            rows[i]["asOf"] = dates[-1]
+            rows[i]["sourceVersion"] = versions[ticker]
+
+        indicators = compute_indicators(matrices["Close"], matrices["High"], matrices["Low"], matrices["Volume"])
+        for column in INDICATOR_COLUMNS:
+            rows[column] = indicators[column]
+        return rows
+
+    def table(self) -> np.ndarray:
+        """The current indicator table (one row per ticker, sorted by ticker)"""
+        with self._lock:
+            return self._load()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Portfolio Optimizer
+Long-only mean-variance optimisation over stored history
+
+Portfolios solve  min 0.5 w'Σw - t μ'w  subject to  sum(w) = 1, 0 <= w <= max_weight
+with accelerated projected gradient (FISTA). Every risk-tolerance t on the
+frontier is solved at once as one (points x assets) matrix, so the cost per
+iteration is a single matrix product regardless of how many points are asked for.
+"""
+
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+import pandas as pd
+
+from portfolioRisk import TRADING_DAYS, return_matrix
+
+
+def ledoit_wolf_covariance(returns: np.ndarray) -> np.ndarray:
+    """
+    Ledoit-Wolf shrinkage of the sample covariance towards a scaled identity
+
+    Args:
+        returns: (days x assets) return matrix
+
+    Returns:
+        Shrunk covariance matrix
+    """
+    centered = returns - returns.mean(axis=0)
+    days, assets = centered.shape
+    sample = centered.T @ centered / days
+    target_scale = np.trace(sample) / assets
+
+    delta = ((sample - target_scale * np.eye(assets)) ** 2).sum() / assets
+    squared = centered ** 2
+    beta = ((squared.T @ squared) / days - sample ** 2).sum() / (assets * days)
+    shrinkage = min(beta, delta) / delta if delta > 0 else 0.0
+
+    covariance = shrinkage * target_scale * np.eye(assets) + (1.0 - shrinkage) * sample
+    # Rescale from the 1/T estimator to match np.cov's unbiased scaling
+    return covariance * days / max(days - 1, 1)
+
+
+def project_to_capped_simplex(points: np.ndarray, max_weight: float = 1.0) -> np.ndarray:
+    """
+    Euclidean projection of each row onto {w : sum(w) = 1, 0 <= w <= max_weight}
+
+    Args:
+        points: (rows x assets) matrix
+        max_weight: Per-asset upper bound (max_weight * assets must be >= 1)
+
+    Returns:
+        Projected matrix of the same shape
+    """
+    if max_weight >= 1.0:
+        # Exact sort-based projection onto the simplex
+        ordered = -np.sort(-points, axis=1)
+        cumulative = np.cumsum(ordered, axis=1) - 1.0
+        ranks = np.arange(1, points.shape[1] + 1)
+        support = ordered - cumulative / ranks > 0
+        count = support.sum(axis=1, keepdims=True)
+        tau = np.take_along_axis(cumulative, count - 1, axis=1) / count
+        return np.maximum(points - tau, 0.0)
+
+    # Bisection on the threshold: sum(clip(v - tau, 0, cap)) decreases in tau
+    low = points.min(axis=1, keepdims=True) - max_weight
+    high = points.max(axis=1, keepdims=True)
+    for _ in range(30):
+        tau = (low + high) / 2.0
+        total = np.clip(points - tau, 0.0, max_weight).sum(axis=1, keepdims=True)
+        low = np.where(total > 1.0, tau, low)
+        high = np.where(total > 1.0, high, tau)
+
+    # The bracket now pins down which weights are free, capped or zero; solve for tau exactly
+    shifted = points - (low + high) / 2.0
+    free = (shifted > 0.0) & (shifted < max_weight)
+    capped = (shifted >= max_weight).sum(axis=1, keepdims=True)
+    free_count = free.sum(axis=1, keepdims=True)
+    exact = (np.where(free, points, 0.0).sum(axis=1, keepdims=True) + capped * max_weight - 1.0) \
+        / np.maximum(free_count, 1)
+    tau = np.where(free_count > 0, exact, (low + high) / 2.0)
+    return np.clip(points - tau, 0.0, max_weight)
+
+
+def solve_mean_variance(mean: np.ndarray, cov: np.ndarray, tolerances: np.ndarray, max_weight: float = 1.0,
+                        initial: Optional[np.ndarray] = None, max_iterations: int = 1000,
+                        tolerance: float = 1e-7) -> np.ndarray:
+    """
+    Solve min 0.5 w'Σw - t μ'w on the capped simplex for every risk tolerance t at once
+
+    Args:
+        mean: Expected returns (assets)
+        cov: Covariance matrix (assets x assets)
+        tolerances: Risk tolerances t (points)
+        max_weight: Per-asset upper bound
+        initial: Optional (points x assets) warm start
+        max_iterations: FISTA iteration cap
+        tolerance: Stop when no weight moves by more than this
+
+    Returns:
+        (points x assets) optimal weights
+    """
+    assets = len(mean)
+    step = 1.0 / max(float(np.linalg.eigvalsh(cov)[-1]), 1e-18)
+    linear = tolerances[:, None] * mean[None, :]
+
+    weights = initial if initial is not None else np.full((len(tolerances), assets), 1.0 / assets)
+    weights = project_to_capped_simplex(weights, max_weight)
+    momentum_point = weights
+    momentum = np.ones((len(tolerances), 1))
+
+    for _ in range(max_iterations):
+        gradient = momentum_point @ cov - linear
+        updated = project_to_capped_simplex(momentum_point - step * gradient, max_weight)
+        change = updated - weights
+        if np.abs(change).max() < tolerance:
+            return updated
+
+        # Adaptive restart: drop a row's momentum once it points uphill
+        restart = ((momentum_point - updated) * change).sum(axis=1, keepdims=True) > 0
+        momentum = np.where(restart, 1.0, momentum)
+        next_momentum = (1.0 + np.sqrt(1.0 + 4.0 * momentum ** 2)) / 2.0
+        momentum_point = updated + ((momentum - 1.0) / next_momentum) * change
+        weights, momentum = updated, next_momentum
+
+    return weights
+
+
+def portfolio_stats(weights: np.ndarray, mean: np.ndarray, cov: np.ndarray,
+                    risk_free_rate: float) -> Dict[str, np.ndarray]:
+    """Expected return, volatility and Sharpe ratio of each row of a weight matrix"""
+    expected = weights @ mean
+    volatility = np.sqrt(np.maximum(np.einsum("ij,jk,ik->i", weights, cov, weights), 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(volatility > 0, (expected - risk_free_rate) / volatility, 0.0)
+    return {"expected": expected, "volatility": volatility, "sharpe": sharpe}
+
+
+def optimize_portfolio(closes: pd.DataFrame, max_weight: float = 1.0, shrinkage: str = "ledoit_wolf",
+                       risk_free_rate: float = 0.05, frontier_points: int = 25,
+                       current_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Efficient frontier, minimum-variance and maximum-Sharpe portfolios from aligned closes
+
+    Args:
+        closes: Aligned closes, one column per asset
+        max_weight: Per-asset upper bound
+        shrinkage: Covariance estimator ("ledoit_wolf" or "none")
+        risk_free_rate: Annual risk-free rate
+        frontier_points: Number of frontier points returned
+        current_weights: Optional current holdings; adds rebalancing trades to the max-Sharpe portfolio
+
+    Returns:
+        Dictionary with the optimised portfolios and the frontier
+    """
+    symbols = list(closes.columns)
+    assets = len(symbols)
+    if max_weight * assets < 1.0 - 1e-12:
+        raise ValueError(f"max_weight {max_weight} is infeasible for {assets} assets")
+
+    returns = return_matrix(closes)
+    mean = returns.mean(axis=0) * TRADING_DAYS
+    if shrinkage == "ledoit_wolf":
+        cov = ledoit_wolf_covariance(returns) * TRADING_DAYS
+    elif shrinkage == "none":
+        cov = np.atleast_2d(np.cov(returns, rowvar=False)) * TRADING_DAYS
+    else:
+        raise ValueError(f"Unknown shrinkage '{shrinkage}' (ledoit_wolf/none)")
+
+    # Risk tolerances spanning minimum variance (t = 0) to the return-maximising corner
+    scale = float(np.trace(cov)) / assets / max(float(np.abs(mean - mean.mean()).max()), 1e-12)
+    tolerances = np.concatenate([[0.0], scale * np.logspace(-3, 2, max(2 * frontier_points, 48))])
+    frontier = solve_mean_variance(mean, cov, tolerances, max_weight)
+    stats = portfolio_stats(frontier, mean, cov, risk_free_rate)
+
+    # Refine the maximum-Sharpe point between the neighbouring grid tolerances
+    best = int(np.argmax(stats["sharpe"]))
+    low, high = tolerances[max(best - 1, 0)], tolerances[min(best + 1, len(tolerances) - 1)]
+    refined_tolerances = np.linspace(low, high, 16)
+    refined = solve_mean_variance(mean, cov, refined_tolerances, max_weight,
+                                  initial=np.repeat(frontier[best:best + 1], 16, axis=0))
+    refined_stats = portfolio_stats(refined, mean, cov, risk_free_rate)
+    refined_best = int(np.argmax(refined_stats["sharpe"]))
+    if refined_stats["sharpe"][refined_best] > stats["sharpe"][best]:
+        max_sharpe_weights = refined[refined_best]
+    else:
+        max_sharpe_weights = frontier[best]
+
+    def describe(weights: np.ndarray, include_weights: bool = True) -> Dict[str, Any]:
+        row = portfolio_stats(weights[None, :], mean, cov, risk_free_rate)
+        result = {
+            "expectedReturnPercent": round(float(row["expected"][0]) * 100, 2),
+            "volatilityPercent": round(float(row["volatility"][0]) * 100, 2),
+            "sharpeRatio": round(float(row["sharpe"][0]), 3)
+        }
+        if include_weights:
+            result["weights"] = {
+                symbols[i]: round(float(weights[i]), 4)
+                for i in np.argsort(-weights) if weights[i] >= 5e-5
+            }
+        return result
+
+    # Frontier points are the distinct portfolios, sampled evenly by volatility
+    order = np.argsort(stats["volatility"])
+    distinct: List[int] = []
+    for index in order:
+        if not distinct or stats["volatility"][index] - stats["volatility"][distinct[-1]] > 1e-6:
+            distinct.append(int(index))
+    if len(distinct) > frontier_points:
+        distinct = [distinct[int(i)] for i in np.linspace(0, len(distinct) - 1, frontier_points).round()]
+
+    result = {
+        "minVariance": describe(frontier[0]),
+        "maxSharpe": describe(max_sharpe_weights),
+        "frontier": [describe(frontier[index]) for index in distinct],
+        "assets": [{
+            "symbol": symbol,
+            "expectedReturnPercent": round(float(mean[i]) * 100, 2),
+            "volatilityPercent": round(float(np.sqrt(cov[i, i])) * 100, 2)
+        } for i, symbol in enumerate(symbols)],
+        "shrinkage": shrinkage,
+        "maxWeight": max_weight,
+        "riskFreeRate": risk_free_rate,
+        "dataStart": closes.index[0].strftime("%Y-%m-%d"),
+        "dataEnd": closes.index[-1].strftime("%Y-%m-%d"),
+        "tradingDays": int(len(closes))
+    }
+
+    if current_weights:
+        current = np.array([current_weights.get(symbol, 0.0) for symbol in symbols], dtype="f8")
+        current = current / current.sum() if current.sum() > 0 else current
+        trades = max_sharpe_weights - current
+        result["rebalance"] = {
+            "target": "maxSharpe",
+            "current": describe(current),
+            "trades": {
+                symbols[i]: round(float(trades[i]), 4)
+                for i in np.argsort(-np.abs(trades)) if abs(trades[i]) >= 5e-5
+            },
+            "turnoverPercent": round(float(np.abs(trades).sum()) / 2 * 100, 2)
+        }
+
+    return result
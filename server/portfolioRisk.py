@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Portfolio Risk
+Vectorized historical, parametric and Monte Carlo VaR/CVaR over an aligned return matrix
+
+All statistics are computed column-wise on a (days x holdings) matrix, so
+adding holdings costs one more column rather than one more Python loop.
+Monte Carlo paths are drawn in fixed-size chunks: memory is bounded by
+chunk_size x holdings, and only one portfolio return per path is kept.
+"""
+
+from statistics import NormalDist
+from typing import Dict, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def return_matrix(closes: pd.DataFrame) -> np.ndarray:
+    """Simple daily returns of aligned closes as a (days - 1) x holdings matrix"""
+    prices = closes.to_numpy(dtype="f8")
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def max_drawdowns(prices: np.ndarray) -> np.ndarray:
+    """Maximum drawdown (as a negative fraction) of every column of a price matrix"""
+    running_max = np.maximum.accumulate(prices, axis=0)
+    return np.min(prices / running_max - 1.0, axis=0)
+
+
+def sharpe_ratios(returns: np.ndarray, risk_free_rate: float = 0.05) -> np.ndarray:
+    """Annualised Sharpe ratio of every column of a daily return matrix"""
+    excess = returns - risk_free_rate / TRADING_DAYS
+    std = excess.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = excess.mean(axis=0) / std * np.sqrt(TRADING_DAYS)
+    return np.where(std > 0, ratios, 0.0)
+
+
+def tail_stats(portfolio_returns: np.ndarray, confidence: float) -> Tuple[float, float, np.ndarray]:
+    """
+    Empirical VaR and CVaR of a return sample, as positive loss fractions
+
+    Returns:
+        (VaR, CVaR, boolean mask of the tail observations)
+    """
+    cutoff = np.quantile(portfolio_returns, 1.0 - confidence)
+    tail = portfolio_returns <= cutoff
+    return -float(cutoff), -float(portfolio_returns[tail].mean()), tail
+
+
+def parametric_var(mean: np.ndarray, cov: np.ndarray, weights: np.ndarray,
+                   confidence: float, horizon_days: int) -> Dict[str, float]:
+    """Variance-covariance VaR and CVaR assuming normal returns"""
+    mu = float(weights @ mean) * horizon_days
+    sigma = float(np.sqrt(weights @ cov @ weights * horizon_days))
+    z = NormalDist().inv_cdf(1.0 - confidence)
+    var = -(mu + z * sigma)
+    cvar = sigma * NormalDist().pdf(z) / (1.0 - confidence) - mu
+    return {"var": var, "cvar": cvar, "sigma": sigma}
+
+
+def cholesky_factor(cov: np.ndarray) -> np.ndarray:
+    """Cholesky factor of a covariance matrix, clipping eigenvalues if it is not positive definite"""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        floor = max(1e-12, 1e-10 * float(np.abs(eigenvalues).max()))
+        repaired = (eigenvectors * np.maximum(eigenvalues, floor)) @ eigenvectors.T
+        return np.linalg.cholesky((repaired + repaired.T) / 2.0)
+
+
+def monte_carlo_var(mean: np.ndarray, cov: np.ndarray, weights: np.ndarray, confidence: float,
+                    horizon_days: int, paths: int = 100_000, chunk_size: int = 20_000,
+                    seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Monte Carlo VaR/CVaR from correlated normal draws
+
+    Each chunk draws chunk_size x holdings standard normals, correlates them with
+    the Cholesky factor of the covariance and keeps only the portfolio return.
+    """
+    rng = np.random.default_rng(seed)
+    factor = cholesky_factor(cov * horizon_days)
+    drift = mean * horizon_days
+    # Project the factor on the weights once: portfolio return = drift.w + z.(L^T w)
+    loading = factor.T @ weights
+    portfolio_drift = float(drift @ weights)
+
+    simulated = np.empty(paths)
+    for start in range(0, paths, chunk_size):
+        stop = min(start + chunk_size, paths)
+        draws = rng.standard_normal((stop - start, len(weights)))
+        simulated[start:stop] = portfolio_drift + draws @ loading
+
+    var, cvar, _ = tail_stats(simulated, confidence)
+    return {"var": var, "cvar": cvar, "paths": paths}
+
+
+def compute_portfolio_risk(closes: pd.DataFrame, weights: Dict[str, float], confidence: float = 0.95,
+                           horizon_days: int = 1, paths: int = 100_000, chunk_size: int = 20_000,
+                           seed: Optional[int] = None, portfolio_value: Optional[float] = None,
+                           risk_free_rate: float = 0.05) -> Dict[str, Any]:
+    """
+    Historical, parametric and Monte Carlo VaR/CVaR with per-holding risk contributions
+
+    Args:
+        closes: Aligned closes, one column per holding
+        weights: Portfolio weights keyed by column (normalised to sum to 1)
+        confidence: VaR confidence level (e.g., 0.95, 0.99)
+        horizon_days: Loss horizon in trading days
+        paths: Monte Carlo paths
+        chunk_size: Monte Carlo paths drawn per batch
+        seed: Random seed for reproducible Monte Carlo results
+        portfolio_value: If given, VaR/CVaR are also reported as amounts
+        risk_free_rate: Annual risk-free rate for Sharpe ratios
+
+    Returns:
+        Dictionary with portfolio and per-holding risk metrics
+    """
+    symbols = list(closes.columns)
+    w = np.array([weights[symbol] for symbol in symbols], dtype="f8")
+    w = w / w.sum()
+
+    prices = closes.to_numpy(dtype="f8")
+    returns = return_matrix(closes)
+    mean = returns.mean(axis=0)
+    cov = np.atleast_2d(np.cov(returns, rowvar=False))
+
+    # Historical simulation: overlapping horizon_days windows of the realised portfolio path
+    portfolio_daily = returns @ w
+    if horizon_days > 1:
+        growth = np.cumprod(1.0 + portfolio_daily)
+        growth = np.concatenate([[1.0], growth])
+        portfolio_horizon = growth[horizon_days:] / growth[:-horizon_days] - 1.0
+    else:
+        portfolio_horizon = portfolio_daily
+    hist_var, hist_cvar, _ = tail_stats(portfolio_horizon, confidence)
+
+    parametric = parametric_var(mean, cov, w, confidence, horizon_days)
+    monte_carlo = monte_carlo_var(mean, cov, w, confidence, horizon_days, paths, chunk_size, seed)
+
+    # Euler allocation: parametric contributions w_i (Sigma w)_i / sigma^2 and
+    # historical CVaR contributions from each holding's mean return on tail days
+    sigma_daily_sq = float(w @ cov @ w)
+    marginal = cov @ w
+    variance_share = w * marginal / sigma_daily_sq if sigma_daily_sq > 0 else np.zeros_like(w)
+    _, daily_cvar, daily_tail = tail_stats(portfolio_daily, confidence)
+    cvar_components = -(returns[daily_tail] * w).mean(axis=0)
+    cvar_share = cvar_components / daily_cvar if daily_cvar != 0 else np.zeros_like(w)
+
+    volatility = returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+    drawdowns = max_drawdowns(prices)
+    sharpes = sharpe_ratios(returns, risk_free_rate)
+
+    portfolio_growth = np.concatenate([[1.0], np.cumprod(1.0 + portfolio_daily)])
+    portfolio_drawdown = float(max_drawdowns(portfolio_growth[:, None])[0])
+    portfolio_sharpe = float(sharpe_ratios(portfolio_daily[:, None], risk_free_rate)[0])
+
+    def measure(var: float, cvar: float, **extra: Any) -> Dict[str, Any]:
+        result = {"varPercent": round(var * 100, 4), "cvarPercent": round(cvar * 100, 4), **extra}
+        if portfolio_value:
+            result["varAmount"] = round(var * portfolio_value, 2)
+            result["cvarAmount"] = round(cvar * portfolio_value, 2)
+        return result
+
+    holdings = []
+    for i, symbol in enumerate(symbols):
+        holdings.append({
+            "symbol": symbol,
+            "weight": round(float(w[i]), 6),
+            "annualVolatilityPercent": round(float(volatility[i]) * 100, 2),
+            "maxDrawdownPercent": round(float(drawdowns[i]) * 100, 2),
+            "sharpeRatio": round(float(sharpes[i]), 3),
+            "varianceContributionPercent": round(float(variance_share[i]) * 100, 2),
+            "componentVarPercent": round(float(variance_share[i]) * parametric["var"] * 100, 4),
+            "cvarContributionPercent": round(float(cvar_share[i]) * 100, 2)
+        })
+
+    return {
+        "confidence": confidence,
+        "horizonDays": horizon_days,
+        "historical": measure(hist_var, hist_cvar, observations=int(len(portfolio_horizon))),
+        "parametric": measure(parametric["var"], parametric["cvar"]),
+        "monteCarlo": measure(monte_carlo["var"], monte_carlo["cvar"], paths=monte_carlo["paths"]),
+        "portfolio": {
+            "annualReturnPercent": round(float(portfolio_daily.mean()) * TRADING_DAYS * 100, 2),
+            "annualVolatilityPercent": round(float(np.sqrt(sigma_daily_sq * TRADING_DAYS)) * 100, 2),
+            "maxDrawdownPercent": round(portfolio_drawdown * 100, 2),
+            "sharpeRatio": round(portfolio_sharpe, 3)
+        },
+        "holdings": holdings,
+        "dataStart": closes.index[0].strftime("%Y-%m-%d"),
+        "dataEnd": closes.index[-1].strftime("%Y-%m-%d"),
+        "tradingDays": int(len(closes))
+    }
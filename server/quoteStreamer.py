@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Quote Streamer
+Pushes changed quotes to subscribers instead of making callers poll full fetches
+"""
+
+import itertools
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Any
+
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Fields pushed to subscribers; a quote counts as changed when any of the
+# price fields differ from the last value the refresher saw
+DELTA_FIELDS = ("symbol", "lastPrice", "change", "changePercent", "timestamp")
+PRICE_FIELDS = ("lastPrice", "change", "changePercent")
+
+
+class QuoteStreamer:
+    """
+    Refreshes quotes for the union of all subscribed tickers and pushes coalesced deltas
+
+    A refresher thread fetches quotes every refresh_interval seconds and records
+    the ones whose price changed. A flusher thread wakes every tick_interval
+    seconds and emits, per subscription, only the latest pending value of each
+    changed ticker, so several changes within one tick collapse into one delta.
+    """
+
+    def __init__(self, fetch_quotes: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+                 emit: Callable[[Dict[str, Any]], None],
+                 tick_interval: float = 1.0, refresh_interval: float = 5.0,
+                 should_refresh: Optional[Callable[[str, Optional[datetime]], bool]] = None):
+        """
+        Args:
+            fetch_quotes: Callable returning quotes keyed by ticker for a list of tickers
+            emit: Callable that delivers one event message to the client
+            tick_interval: Seconds between delta flushes
+            refresh_interval: Seconds between upstream refreshes
+            should_refresh: Called as should_refresh(ticker, last_refreshed_at); tickers
+                whose market cannot have moved since the last refresh are skipped
+        """
+        self.fetch_quotes = fetch_quotes
+        self.emit = emit
+        self.tick_interval = tick_interval
+        self.refresh_interval = refresh_interval
+        self.should_refresh = should_refresh
+
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, List[str]] = {}
+        self._last_quotes: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._refreshed_at: Dict[str, datetime] = {}
+        self._ids = itertools.count(1)
+
+        self._stop = threading.Event()
+        self._wake_refresher = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the refresher and flusher threads"""
+        if self._threads:
+            return
+
+        for target, name in ((self._refresh_loop, "quote-refresher"), (self._flush_loop, "quote-flusher")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop both threads and wait for them to exit"""
+        self._stop.set()
+        self._wake_refresher.set()
+        for thread in self._threads:
+            thread.join(timeout=self.refresh_interval + self.tick_interval)
+        self._threads = []
+
+    def subscribe(self, tickers: List[str]) -> Dict[str, Any]:
+        """
+        Register a ticker set and return its id plus the quotes already known
+
+        Args:
+            tickers: Raw yfinance tickers to follow
+
+        Returns:
+            Dictionary with the subscription id, tickers and current snapshot
+        """
+        tickers = list(dict.fromkeys(t.strip() for t in tickers if t.strip()))
+        if not tickers:
+            raise ValueError("Tickers required")
+
+        subscription_id = f"sub-{next(self._ids)}"
+        with self._lock:
+            self._subscriptions[subscription_id] = tickers
+            snapshot = [self._delta(self._last_quotes[t]) for t in tickers if t in self._last_quotes]
+
+        # Fetch new tickers right away instead of waiting for the next refresh
+        self._wake_refresher.set()
+
+        return {
+            "subscription": subscription_id,
+            "tickers": tickers,
+            "snapshot": snapshot,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def unsubscribe(self, subscription_id: str) -> Dict[str, Any]:
+        """
+        Drop a subscription; tickers no other subscription follows stop being refreshed
+
+        Args:
+            subscription_id: Id returned by subscribe
+
+        Returns:
+            Dictionary telling whether the subscription existed
+        """
+        with self._lock:
+            removed = self._subscriptions.pop(subscription_id, None) is not None
+            tracked = self._tracked_tickers()
+            for ticker in list(self._last_quotes):
+                if ticker not in tracked:
+                    del self._last_quotes[ticker]
+                    self._pending.pop(ticker, None)
+                    self._refreshed_at.pop(ticker, None)
+
+        return {
+            "subscription": subscription_id,
+            "removed": removed,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _tracked_tickers(self) -> List[str]:
+        """Union of all subscribed tickers (caller holds the lock)"""
+        tracked = {}
+        for tickers in self._subscriptions.values():
+            tracked.update(dict.fromkeys(tickers))
+        return list(tracked)
+
+    @staticmethod
+    def _delta(quote: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a quote to the fields pushed to subscribers"""
+        return {field: quote.get(field) for field in DELTA_FIELDS}
+
+    def record_quotes(self, quotes: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Compare fresh quotes with the last seen values and queue the changed ones
+
+        Args:
+            quotes: Quotes keyed by ticker
+
+        Returns:
+            Number of tickers whose price changed
+        """
+        changed = 0
+        with self._lock:
+            tracked = set(self._tracked_tickers())
+            for ticker, quote in quotes.items():
+                if ticker not in tracked:
+                    continue
+
+                previous = self._last_quotes.get(ticker)
+                if previous is not None and all(previous.get(f) == quote.get(f) for f in PRICE_FIELDS):
+                    continue
+
+                delta = self._delta(quote)
+                self._last_quotes[ticker] = delta
+                # Overwrite any pending value: only the latest change per tick is sent
+                self._pending[ticker] = delta
+                changed += 1
+
+        return changed
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Emit one coalesced delta event per subscription that has pending changes
+
+        Returns:
+            The emitted event messages
+        """
+        with self._lock:
+            if not self._pending:
+                return []
+            pending, self._pending = self._pending, {}
+            subscriptions = list(self._subscriptions.items())
+
+        events = []
+        timestamp = datetime.now().isoformat()
+        for subscription_id, tickers in subscriptions:
+            deltas = [pending[t] for t in tickers if t in pending]
+            if not deltas:
+                continue
+
+            event = {
+                "event": "quotes",
+                "subscription": subscription_id,
+                "deltas": deltas,
+                "timestamp": timestamp
+            }
+            try:
+                self.emit(event)
+                events.append(event)
+                metrics.inc("stream_deltas_total", len(deltas))
+            except Exception as e:
+                logger.error(f"Error emitting quote deltas for {subscription_id}: {str(e)}")
+
+        return events
+
+    def _refresh_loop(self) -> None:
+        """Fetch quotes for all subscribed tickers until stopped"""
+        while not self._stop.is_set():
+            with self._lock:
+                tickers = self._tracked_tickers()
+                refreshed_at = dict(self._refreshed_at)
+                known = set(self._last_quotes)
+
+            if self.should_refresh is not None:
+                tickers = [t for t in tickers if t not in known or self.should_refresh(t, refreshed_at.get(t))]
+
+            if tickers:
+                started_at = datetime.now(timezone.utc)
+                try:
+                    with metrics.bound_command("stream"):
+                        changed = self.record_quotes(self.fetch_quotes(tickers))
+                    metrics.inc("stream_changed_quotes_total", changed)
+                    with self._lock:
+                        self._refreshed_at.update(dict.fromkeys(tickers, started_at))
+                except Exception as e:
+                    logger.error(f"Error refreshing streamed quotes: {str(e)}")
+
+            self._wake_refresher.wait(self.refresh_interval)
+            self._wake_refresher.clear()
+
+    def _flush_loop(self) -> None:
+        """Flush coalesced deltas once per tick until stopped"""
+        while not self._stop.wait(self.tick_interval):
+            self.flush()
@@ -4,7 +4,7 @@ import { storage } from "./storage";
 import { marketDataService } from "./services/marketDataService";
 import { marketSentimentService } from "./services/marketSentimentService";
 import { createCMSRoutes } from "./cms-routes";
-import { spawn } from "child_process";
+import { spawnWithDeadline } from "./services/stockServiceProcess";
 import path from "path";
 
 // No authentication required - open access
@@ -33,7 +33,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
       const scriptPath = path.join(process.cwd(), 'server', 'stockPriceService.py');
       const fullArgs = [scriptPath, command, ...args];
       
-      const pythonProcess = spawn(pythonPath, fullArgs);
+      const pythonProcess = spawnWithDeadline(pythonPath, fullArgs);
       let stdout = '';
       let stderr = '';
       
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Stock Service RPC Server
+Long-running JSON-lines server so the Node side can keep one Python process alive
+
+Protocol (one JSON object per line on stdin/stdout):
+    request:   {"id": 1, "command": "indices", "args": ["USA"]}
+               {"id": 3, "command": "historical", "args": ["AAPL", "US"], "profile": true}
+               {"id": 4, "command": "sectors", "args": ["USA"], "deadlineMs": 5000}
+    response:  {"id": 1, "ok": true, "result": {...}}   (result has "partial": true when the deadline cut it short)
+               {"id": 1, "ok": false, "error": "..."}
+    subscribe: {"id": 2, "command": "subscribe", "args": ["^GSPC,BTC-USD"]}
+    push:      {"event": "quotes", "subscription": "sub-1", "deltas": [...], "timestamp": "..."}
+"""
+
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any, TextIO
+
+from quoteStreamer import QuoteStreamer
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class StockServiceRPCServer:
+    """Reads requests from stdin, runs them on I/O threads and writes responses and pushes to stdout"""
+
+    def __init__(self, service: Any, execute: Callable[..., Any],
+                 tick_interval: float = 1.0, refresh_interval: float = 5.0, max_workers: int = 8,
+                 metrics_file: Optional[str] = None, metrics_interval: float = 15.0,
+                 default_deadline: Optional[float] = None,
+                 stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None):
+        """
+        Args:
+            service: StockPriceService instance shared by all requests
+            execute: Command dispatcher, called as execute(service, command, args, profile=..., deadline=...)
+            tick_interval: Seconds between coalesced quote pushes
+            refresh_interval: Seconds between streamed quote refreshes
+            max_workers: Number of threads handling requests concurrently
+            metrics_file: Optional path rewritten with a Prometheus text dump
+            metrics_interval: Seconds between Prometheus dumps
+            default_deadline: Seconds allowed per request that does not send deadlineMs (None for no limit)
+            stdin: Request stream (defaults to sys.stdin)
+            stdout: Response stream (defaults to sys.stdout)
+        """
+        self.service = service
+        self.execute = execute
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self.default_deadline = default_deadline
+
+        self._stopped = threading.Event()
+        self._write_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rpc-io")
+        self.streamer = QuoteStreamer(
+            service.get_quote_snapshots,
+            self.send,
+            should_refresh=service.quote_may_change,
+            tick_interval=tick_interval,
+            refresh_interval=refresh_interval
+        )
+
+    def send(self, message: Dict[str, Any], command: Optional[str] = None) -> None:
+        """Write one message as a single line; safe to call from any thread"""
+        with metrics.phase("serialize", command or message.get("event")):
+            line = json.dumps(message, default=str)
+        with self._write_lock:
+            self.stdout.write(line + "\n")
+            self.stdout.flush()
+
+    def serve_forever(self) -> None:
+        """Handle requests until stdin closes or a shutdown command arrives"""
+        self.streamer.start()
+        if self.metrics_file:
+            threading.Thread(target=self._dump_metrics_loop, name="metrics-dump", daemon=True).start()
+        self.send({"event": "ready", "timestamp": datetime.now().isoformat()})
+
+        try:
+            for line in self.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.send({"id": None, "ok": False, "error": f"Invalid JSON: {str(e)}"})
+                    continue
+
+                if request.get("command") == "shutdown":
+                    self.send({"id": request.get("id"), "ok": True, "result": {"shutdown": True}})
+                    break
+
+                self._executor.submit(self._handle, request)
+        finally:
+            self._stopped.set()
+            self.streamer.stop()
+            self._executor.shutdown(wait=True)
+            if self.metrics_file:
+                self._dump_metrics()
+
+    def _dump_metrics(self) -> None:
+        try:
+            metrics.dump_prometheus(self.metrics_file)
+        except OSError as e:
+            logger.error(f"Error writing metrics file {self.metrics_file}: {str(e)}")
+
+    def _dump_metrics_loop(self) -> None:
+        """Rewrite the Prometheus dump periodically until the server stops"""
+        while not self._stopped.wait(self.metrics_interval):
+            self._dump_metrics()
+
+    def _handle(self, request: Dict[str, Any]) -> None:
+        """Run one request and send its response"""
+        request_id = request.get("id")
+        command = request.get("command", "")
+        try:
+            deadline_ms = request.get("deadlineMs")
+            deadline = float(deadline_ms) / 1000.0 if deadline_ms is not None else self.default_deadline
+            result = self.dispatch(command, request.get("args") or [], bool(request.get("profile")), deadline)
+            self.send({"id": request_id, "ok": True, "result": result}, command)
+        except ValueError as e:
+            self.send({"id": request_id, "ok": False, "error": str(e)}, command)
+        except Exception as e:
+            logger.error(f"Error handling RPC request {request_id}: {str(e)}")
+            self.send({"id": request_id, "ok": False, "error": str(e)}, command)
+
+    def dispatch(self, command: str, args: List[str], profile: bool = False,
+                 deadline: Optional[float] = None) -> Any:
+        """
+        Route a command to the streamer or to the shared command dispatcher
+
+        Args:
+            command: Command name
+            args: Positional command arguments
+            profile: Capture a cProfile of the command
+            deadline: Optional time budget in seconds
+
+        Returns:
+            The command result
+        """
+        if command == "subscribe":
+            if len(args) < 1:
+                raise ValueError("Tickers required")
+            return self.streamer.subscribe(args[0].split(","))
+
+        elif command == "unsubscribe":
+            if len(args) < 1:
+                raise ValueError("Subscription id required")
+            return self.streamer.unsubscribe(args[0])
+
+        return self.execute(self.service, command, [str(arg) for arg in args], profile=profile, deadline=deadline)
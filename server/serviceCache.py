@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Service Cache
+Small thread-safe TTL cache for upstream responses, with hit/miss accounting
+
+A cache can sit in front of a shared backend (see sharedCache). Local misses
+then fall through to entries written by other processes, and loads take the
+key's refresh lease so that one process fetches while the rest wait for it.
+
+Expired entries stay in place until they are evicted or replaced, so a request
+that has run out of time can still answer from them (get_stale).
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Any
+
+from serviceDeadline import deadlines
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _cacheable(value: Any) -> bool:
+    return value is not None and not getattr(value, "empty", False)
+
+
+class TTLCache:
+    """In-process cache whose entries expire after a per-entry time-to-live"""
+
+    def __init__(self, name: str, default_ttl: float, max_entries: int = 2048, shared: Optional[Any] = None):
+        """
+        Args:
+            name: Cache name used as the metrics label
+            default_ttl: Seconds an entry stays fresh unless set() overrides it
+            max_entries: Entries kept before the oldest expiring ones are evicted
+            shared: Optional cross-process backend (sharedCache.SQLiteCacheBackend)
+        """
+        self.name = name
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"{self.name}:{key!r}"
+
+    def _get_shared(self, key: Hashable) -> Optional[Any]:
+        """Read a key from the shared backend, copying it into the local cache"""
+        try:
+            entry = self.shared.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {self.name}: {str(e)}")
+            metrics.inc("cache_shared_errors_total", cache=self.name)
+            return None
+        if entry is None:
+            return None
+
+        value, remaining = entry
+        metrics.inc("cache_shared_hits_total", cache=self.name)
+        self._set_local(key, value, remaining)
+        return value
+
+    def _set_shared(self, key: Hashable, value: Any, ttl: float) -> None:
+        try:
+            self.shared.set(self._shared_key(key), value, ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {self.name}: {str(e)}")
+            metrics.inc("cache_shared_errors_total", cache=self.name)
+
+    def _lease_call(self, function: Callable[..., Any], key: Hashable, *args: Any) -> Optional[Any]:
+        """Call a lease method of the shared backend; None when the backend fails (the caller loads unleased)"""
+        try:
+            return function(self._shared_key(key), *args)
+        except Exception as e:
+            logger.warning(f"Shared cache lease failed for {self.name}: {str(e)}")
+            metrics.inc("cache_shared_errors_total", cache=self.name)
+            return None
+
+    def _get_local(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Last value stored for key even if it has expired, or None; used as a deadline fallback"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry[1]
+        if self.shared is not None:
+            try:
+                stored = self.shared.get(self._shared_key(key), stale=True)
+            except Exception as e:
+                logger.warning(f"Shared cache read failed for {self.name}: {str(e)}")
+                return None
+            return stored[0] if stored is not None else None
+        return None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the fresh value for key, or None (counted as a miss)"""
+        value = self._get_local(key)
+        if value is not None:
+            metrics.inc("cache_hits_total", cache=self.name)
+            return value
+
+        if self.shared is not None:
+            value = self._get_shared(key)
+            if value is not None:
+                return value
+
+        metrics.inc("cache_misses_total", cache=self.name)
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ttl seconds (default_ttl when omitted), in the shared backend too"""
+        ttl = self.default_ttl if ttl is None else ttl
+        self._set_local(key, value, ttl)
+        if self.shared is not None:
+            self._set_shared(key, value, ttl)
+
+    def _set_local(self, key: Hashable, value: Any, ttl: float) -> None:
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # Evict the entry closest to expiry
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+                metrics.inc("cache_evictions_total", cache=self.name)
+            self._entries[key] = (expires_at, value)
+            metrics.set_gauge("cache_entries", len(self._entries), cache=self.name)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value or call loader and cache its result
+
+        Results that are None or empty DataFrames are not cached, so transient
+        upstream gaps are retried on the next call. With a shared backend only
+        the lease holder calls loader; other processes wait for its result and
+        fall back to loading themselves if it produced nothing. If the backend
+        fails (e.g. stays locked past its busy timeout) the value is loaded
+        without a lease, as for a process-local cache.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        owned = None
+        if self.shared is not None:
+            owned = self._lease_call(self.shared.acquire, key)
+            if owned is False:
+                metrics.inc("cache_lease_waits_total", cache=self.name)
+                self._lease_call(self.shared.wait_released, key, deadlines.wait_limit(self.shared.lease_seconds))
+                value = self._get_shared(key)
+                if value is not None:
+                    return value
+
+        try:
+            value = loader()
+            # Stored before the lease is released, so waiting processes find it
+            if _cacheable(value):
+                self.set(key, value, ttl)
+        finally:
+            if owned:
+                self._lease_call(self.shared.release, key)
+        return value
+
+    def get_or_load_many(self, keys: Iterable[Hashable], loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+                         ttl_for: Optional[Callable[[Hashable], float]] = None) -> Dict[Hashable, Any]:
+        """
+        Batch form of get_or_load for loaders that fetch many keys in one upstream call
+
+        Args:
+            keys: Keys wanted
+            loader: Called with the missing keys; returns {key: value} for those it found
+            ttl_for: Lifetime of each loaded key (default_ttl when omitted)
+
+        Returns:
+            Dictionary of the keys that are cached or were loaded
+        """
+        ttl_for = ttl_for or (lambda key: self.default_ttl)
+        results: Dict[Hashable, Any] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                results[key] = value
+
+        def load(batch: List[Hashable]) -> None:
+            if not batch:
+                return
+            for key, value in loader(batch).items():
+                results[key] = value
+                if _cacheable(value):
+                    self.set(key, value, ttl_for(key))
+
+        if self.shared is None or not missing:
+            load(missing)
+            return results
+
+        # Fetch the keys whose lease we get (or that the backend cannot lease) in one batch;
+        # wait for the other keys' holders
+        leases = {key: self._lease_call(self.shared.acquire, key) for key in missing}
+        batch = [key for key in missing if leases[key] is not False]
+        try:
+            load(batch)
+        finally:
+            for key in batch:
+                if leases[key]:
+                    self._lease_call(self.shared.release, key)
+
+        remaining = []
+        for key in missing:
+            if leases[key] is not False:
+                continue
+            metrics.inc("cache_lease_waits_total", cache=self.name)
+            self._lease_call(self.shared.wait_released, key, deadlines.wait_limit(self.shared.lease_seconds))
+            value = self._get_shared(key)
+            if value is None:
+                remaining.append(key)
+            else:
+                results[key] = value
+        load(remaining)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            metrics.set_gauge("cache_entries", 0, cache=self.name)
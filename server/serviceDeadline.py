@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Service Deadline
+Request-scoped time budgets for upstream fetches
+
+A command runs under a RequestBudget bound to its thread (and re-bound on any
+fetch threads it fans out to), the same way metrics labels phase timings with
+the current command. Fetch helpers ask the budget before each upstream call:
+once the remaining time falls below the reserve kept for computing and
+serialising the response, no new calls start, and the helpers fall back to
+expired cache entries or skip the item. The budget records what it fell back
+on, so the response can be marked partial.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
+
+# Share of the budget kept back for compute and serialisation, with a floor in seconds
+RESERVE_FRACTION = 0.1
+MIN_RESERVE_SECONDS = 0.25
+# Shortest socket timeout handed to an upstream call that is allowed to start
+MIN_CALL_TIMEOUT = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting an upstream call the request no longer has time for"""
+
+
+class RequestBudget:
+    """Time budget of one request and the items it had to serve stale or skip"""
+
+    def __init__(self, seconds: Optional[float]):
+        """
+        Args:
+            seconds: Budget from now (None for unlimited)
+        """
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self.reserve = 0.0 if seconds is None else max(seconds * RESERVE_FRACTION, MIN_RESERVE_SECONDS)
+        self._lock = threading.Lock()
+        self.stale: List[str] = []
+        self.skipped: List[str] = []
+
+    def remaining(self) -> float:
+        """Seconds left (infinite for an unlimited budget)"""
+        return float("inf") if self.expires_at is None else self.expires_at - time.monotonic()
+
+    def call_timeout(self, item: str, default: float = 10.0) -> float:
+        """
+        Socket timeout for the next upstream call of `item`
+
+        Raises:
+            DeadlineExceeded: If the budget is down to its reserve
+        """
+        available = self.remaining() - self.reserve
+        if available <= 0:
+            raise DeadlineExceeded(f"Deadline reached before fetching {item}")
+        return min(default, max(available, MIN_CALL_TIMEOUT))
+
+    def record_stale(self, item: str) -> None:
+        with self._lock:
+            self.stale.append(item)
+
+    def record_skipped(self, item: str) -> None:
+        with self._lock:
+            self.skipped.append(item)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.stale or self.skipped)
+
+    def summary(self) -> Dict[str, Any]:
+        """Response fields describing what the deadline cut short"""
+        with self._lock:
+            return {
+                "partial": True,
+                "deadlineSeconds": self.seconds,
+                "staleItems": sorted(set(self.stale)),
+                "skippedItems": sorted(set(self.skipped) - set(self.stale))
+            }
+
+
+class DeadlineContext:
+    """Thread-local binding of the budget of the request being handled"""
+
+    def __init__(self):
+        self._context = threading.local()
+
+    def current(self) -> Optional[RequestBudget]:
+        return getattr(self._context, "budget", None)
+
+    @contextmanager
+    def bound(self, budget: Optional[RequestBudget]) -> Iterator[Optional[RequestBudget]]:
+        """Run the block (on this thread) under a budget"""
+        previous = getattr(self._context, "budget", None)
+        self._context.budget = budget
+        try:
+            yield budget
+        finally:
+            self._context.budget = previous
+
+    def call_timeout(self, item: str, default: float = 10.0) -> float:
+        """Socket timeout for an upstream call under the current budget (default when unbounded)"""
+        budget = self.current()
+        return default if budget is None else budget.call_timeout(item, default)
+
+    def wait_limit(self, default: float) -> float:
+        """How long a blocking wait may last under the current budget"""
+        budget = self.current()
+        return default if budget is None else max(min(default, budget.remaining() - budget.reserve), 0.0)
+
+    def record_stale(self, item: str) -> None:
+        budget = self.current()
+        if budget is not None:
+            budget.record_stale(item)
+
+    def record_skipped(self, item: str) -> None:
+        budget = self.current()
+        if budget is not None:
+            budget.record_skipped(item)
+
+
+deadlines = DeadlineContext()
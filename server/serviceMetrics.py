@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Service Metrics
+Low-overhead counters, gauges and latency histograms for the stock price service
+
+Everything lives in process memory behind one lock; recording a sample is a
+dict update plus a bisect, so instrumentation can stay on in production.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+# Latency bucket upper bounds in seconds (Prometheus "le" semantics)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket histogram; not locked itself, ServiceMetrics guards it"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: upper bound of the bucket holding the q-th sample"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class ServiceMetrics:
+    """Registry of labelled counters, gauges and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._context = threading.local()
+        self.started_at = datetime.now().isoformat()
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """Increment a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value"""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record one latency sample"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @property
+    def current_command(self) -> str:
+        """Command being handled on this thread, used to label phase timings"""
+        return getattr(self._context, "command", None) or "none"
+
+    @contextmanager
+    def bound_command(self, command: str) -> Iterator[None]:
+        """
+        Label phase timings recorded on this thread with a command, without timing it
+
+        Args:
+            command: Command name
+        """
+        previous = getattr(self._context, "command", None)
+        self._context.command = command
+        try:
+            yield
+        finally:
+            self._context.command = previous
+
+    @contextmanager
+    def command(self, command: str) -> Iterator[None]:
+        """
+        Time a whole command and label phase timings recorded inside it
+
+        Args:
+            command: Command name
+        """
+        start = time.perf_counter()
+        try:
+            with self.bound_command(command):
+                yield
+        except Exception:
+            self.inc("command_errors_total", command=command)
+            raise
+        finally:
+            self.observe("command_seconds", time.perf_counter() - start, command=command)
+            self.inc("commands_total", command=command)
+
+    @contextmanager
+    def phase(self, phase: str, command: Optional[str] = None) -> Iterator[None]:
+        """
+        Time one phase (fetch, compute, serialize) of the current command
+
+        Args:
+            phase: Phase name
+            command: Command label; defaults to the command running on this thread
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("phase_seconds", time.perf_counter() - start,
+                         command=command or self.current_command, phase=phase)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all metrics as a JSON-serialisable dictionary
+
+        Histograms are summarised as count, sum, mean and approximate p50/p95/p99.
+        """
+        def labels_dict(key: LabelKey) -> Dict[str, str]:
+            return dict(key)
+
+        with self._lock:
+            counters = {
+                name: [{"labels": labels_dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            gauges = {
+                name: [{"labels": labels_dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._gauges.items()
+            }
+            histograms = {
+                name: [{
+                    "labels": labels_dict(key),
+                    "count": h.count,
+                    "sum": round(h.total, 6),
+                    "mean": round(h.total / h.count, 6) if h.count else 0.0,
+                    "p50": h.quantile(0.50),
+                    "p95": h.quantile(0.95),
+                    "p99": h.quantile(0.99)
+                } for key, h in series.items()]
+                for name, series in self._histograms.items()
+            }
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+            "pid": os.getpid(),
+            "startedAt": self.started_at,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def to_prometheus(self, prefix: str = "stock_service_") -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        def render_labels(key: LabelKey, extra: Optional[List[Tuple[str, str]]] = None) -> str:
+            pairs = list(key) + (extra or [])
+            if not pairs:
+                return ""
+            escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for key, value in series.items():
+                    lines.append(f"{prefix}{name}{render_labels(key)} {value}")
+
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {prefix}{name} gauge")
+                for key, value in series.items():
+                    lines.append(f"{prefix}{name}{render_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(LATENCY_BUCKETS, h.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{prefix}{name}_bucket{render_labels(key, [('le', str(bound))])} {cumulative}")
+                    lines.append(f"{prefix}{name}_bucket{render_labels(key, [('le', '+Inf')])} {h.count}")
+                    lines.append(f"{prefix}{name}_sum{render_labels(key)} {h.total}")
+                    lines.append(f"{prefix}{name}_count{render_labels(key)} {h.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path: str) -> str:
+        """
+        Atomically write the Prometheus text dump to a file
+
+        Args:
+            path: Destination file, e.g. a node-exporter textfile collector path
+
+        Returns:
+            The path written
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as handle:
+            handle.write(self.to_prometheus())
+        os.replace(temp_path, path)
+        return path
+
+
+# Process-wide registry shared by the service, cache, pool and RPC server
+metrics = ServiceMetrics()
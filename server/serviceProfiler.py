@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Service Profiler
+Opt-in cProfile captures of individual service commands
+
+A command is profiled when the caller asks for it (RPC "profile": true or
+STOCK_SERVICE_PROFILE=1) or when it is picked by the sampling rate
+(STOCK_SERVICE_PROFILE_RATE, e.g. 0.01). Each capture is written as a pstats
+file plus a JSON sidecar with the command and args, into a directory that is
+rotated to the newest max_files captures.
+
+cProfile only sees the thread it runs on, so work fanned out to fetch threads
+or the analytics process pool shows up as time spent waiting on futures.
+"""
+
+import cProfile
+import glob
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
+
+from serviceMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfiler:
+    """Wraps command handlers in cProfile and summarises recent captures"""
+
+    def __init__(self, directory: Optional[str] = None, sample_rate: float = 0.0,
+                 force: bool = False, max_files: int = 200):
+        """
+        Args:
+            directory: Capture directory (defaults to <tmp>/stock-service-profiles)
+            sample_rate: Fraction of commands profiled without being asked
+            force: Profile every command
+            max_files: Captures kept before the oldest are deleted
+        """
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "stock-service-profiles")
+        self.sample_rate = sample_rate
+        self.force = force
+        self.max_files = max_files
+        # Only one profiler may be active at a time; concurrent requests skip profiling
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Build a profiler configured from STOCK_SERVICE_PROFILE* environment variables"""
+        try:
+            sample_rate = float(os.environ.get("STOCK_SERVICE_PROFILE_RATE", "0"))
+        except ValueError:
+            sample_rate = 0.0
+
+        return cls(
+            directory=os.environ.get("STOCK_SERVICE_PROFILE_DIR"),
+            sample_rate=sample_rate,
+            force=os.environ.get("STOCK_SERVICE_PROFILE", "") in ("1", "true", "yes")
+        )
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """Decide whether the next command is profiled"""
+        return requested or self.force or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    @contextmanager
+    def profile(self, command: str, args: List[str], requested: bool = False) -> Iterator[None]:
+        """
+        Profile the enclosed block if requested or sampled
+
+        Args:
+            command: Command name, used to tag the capture
+            args: Command arguments, stored in the sidecar
+            requested: Caller explicitly asked for a profile
+        """
+        if not self.should_profile(requested) or not self._active.acquire(blocking=False):
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+            self._write(profiler, command, args, time.perf_counter() - start)
+
+    def _write(self, profiler: cProfile.Profile, command: str, args: List[str], seconds: float) -> None:
+        """Write one capture and rotate the directory"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9._-]+", "_", "-".join([command] + [str(a) for a in args]))[:80]
+            base = os.path.join(self.directory, f"{datetime.now().strftime('%Y%m%dT%H%M%S_%f')}-{slug}")
+
+            profiler.dump_stats(f"{base}.pstats")
+            with open(f"{base}.json", "w") as handle:
+                json.dump({
+                    "command": command,
+                    "args": [str(a) for a in args],
+                    "seconds": round(seconds, 6),
+                    "pid": os.getpid(),
+                    "timestamp": datetime.now().isoformat()
+                }, handle)
+
+            metrics.inc("profiles_captured_total", command=command)
+            self._rotate()
+        except OSError as e:
+            logger.error(f"Error writing profile for {command}: {str(e)}")
+
+    def _captures(self) -> List[str]:
+        """Capture base paths, oldest first"""
+        return sorted(path[:-len(".pstats")] for path in glob.glob(os.path.join(self.directory, "*.pstats")))
+
+    def _rotate(self) -> None:
+        captures = self._captures()
+        for base in captures[:max(0, len(captures) - self.max_files)]:
+            for suffix in (".pstats", ".json"):
+                try:
+                    os.remove(base + suffix)
+                except OSError:
+                    pass
+
+    def summary(self, limit: int = 20, recent: int = 50, command: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregate recent captures and list the top functions by cumulative time
+
+        Args:
+            limit: Number of functions returned
+            recent: Number of most recent captures aggregated
+            command: Only aggregate captures of this command
+
+        Returns:
+            Dictionary with the aggregated captures and top functions
+        """
+        captures = []
+        for base in reversed(self._captures()):
+            try:
+                with open(f"{base}.json") as handle:
+                    meta = json.load(handle)
+            except (OSError, ValueError):
+                meta = {}
+            if command and meta.get("command") != command:
+                continue
+            captures.append((base, meta))
+            if len(captures) >= recent:
+                break
+
+        if not captures:
+            return {
+                "directory": self.directory,
+                "captures": [],
+                "functions": [],
+                "timestamp": datetime.now().isoformat()
+            }
+
+        stats = pstats.Stats(f"{captures[0][0]}.pstats")
+        for base, _ in captures[1:]:
+            try:
+                stats.add(f"{base}.pstats")
+            except (OSError, TypeError, EOFError) as e:
+                logger.error(f"Skipping unreadable profile {base}: {str(e)}")
+
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        functions = [{
+            "function": pstats.func_std_string(func),
+            "cumulativeSeconds": round(cumulative, 6),
+            "totalSeconds": round(total, 6),
+            "calls": calls
+        } for func, (_, calls, total, cumulative, _) in rows]
+
+        return {
+            "directory": self.directory,
+            "captures": [dict(meta, file=os.path.basename(base) + ".pstats") for base, meta in captures],
+            "functions": functions,
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+# Process-wide profiler configured from the environment
+profiler = RequestProfiler.from_env()
@@ -1,5 +1,5 @@
-import { spawn } from 'child_process';
 import path from 'path';
+import { spawnWithDeadline } from './stockServiceProcess';
 
 export interface MarketDataResponse {
   success: boolean;
@@ -17,7 +17,7 @@ export class MarketDataService {
       
       console.log(`Executing: ${pythonPath} ${fullArgs.join(' ')}`);
       
-      const pythonProcess = spawn(pythonPath, fullArgs, {
+      const pythonProcess = spawnWithDeadline(pythonPath, fullArgs, {
         stdio: ['pipe', 'pipe', 'pipe'],
         cwd: process.cwd()
       });
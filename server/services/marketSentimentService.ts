@@ -1,5 +1,5 @@
-import { spawn } from 'child_process';
 import path from 'path';
+import { spawnWithDeadline } from './stockServiceProcess';
 
 interface MarketSentimentData {
   fearGreedIndex: number;
@@ -28,7 +28,7 @@ export class MarketSentimentService {
       const scriptPath = path.join(process.cwd(), 'server', 'stockPriceService.py');
       const fullArgs = [scriptPath, command, ...args];
       
-      const pythonProcess = spawn(pythonPath, fullArgs);
+      const pythonProcess = spawnWithDeadline(pythonPath, fullArgs);
       let stdout = '';
       let stderr = '';
       
@@ -0,0 +1,24 @@
+import { spawn, type ChildProcessWithoutNullStreams, type SpawnOptionsWithoutStdio } from 'child_process';
+
+// Budget handed to the Python service per command, and extra time before a stuck process is killed
+export const STOCK_SERVICE_DEADLINE_MS = 15000;
+export const STOCK_SERVICE_KILL_GRACE_MS = 5000;
+
+// Spawns a Python service process with the deadline budget in its environment.
+// The service stops starting upstream fetches near this budget and returns partial data;
+// the kill timer only catches a process that overruns it anyway
+export function spawnWithDeadline(
+  command: string,
+  args: string[],
+  options: SpawnOptionsWithoutStdio = {},
+  deadlineMs: number = STOCK_SERVICE_DEADLINE_MS
+): ChildProcessWithoutNullStreams {
+  const child = spawn(command, args, {
+    ...options,
+    env: { ...process.env, ...options.env, STOCK_SERVICE_DEADLINE_MS: String(deadlineMs) }
+  });
+  const killTimer = setTimeout(() => child.kill('SIGKILL'), deadlineMs + STOCK_SERVICE_KILL_GRACE_MS);
+  child.on('close', () => clearTimeout(killTimer));
+  child.on('error', () => clearTimeout(killTimer));
+  return child;
+}
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Shared Cache
+SQLite-backed cache and refresh leases shared by every service process
+
+Each API node spawns its own Python workers, and each worker used to fetch the
+same tickers from upstream independently. Pointing them at one cache file
+(STOCK_SERVICE_SHARED_CACHE) lets a value fetched by any process serve all of
+them, and a per-key lease makes sure only one process refreshes a key at a
+time while the others wait for its result.
+
+The file runs in WAL mode: readers never block the writer and each write is an
+atomic transaction. WAL relies on shared memory, so every process using a file
+must run on the same host; for several hosts, give each host its own file (or a
+host-local path) and upstream load grows with hosts rather than processes.
+Values are pickled, so the file must only be writable by the service itself.
+"""
+
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds a refresh may hold its lease before other processes take over
+DEFAULT_LEASE_SECONDS = 30.0
+LEASE_POLL_SECONDS = 0.05
+# Expired entries are purged after this many writes from one process, once they are
+# older than the stale grace period (until then they serve deadline fallbacks)
+PURGE_EVERY = 256
+STALE_GRACE_SECONDS = 86400.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+)
+
+
+class SQLiteCacheBackend:
+    """Key-value entries with wall-clock expiry and per-key refresh leases in one SQLite file"""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Args:
+            path: Cache file, created on first use
+            busy_timeout: Seconds a write waits for another process's transaction
+            lease_seconds: Default lifetime of a refresh lease
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @classmethod
+    def from_env(cls) -> Optional["SQLiteCacheBackend"]:
+        """Backend for STOCK_SERVICE_SHARED_CACHE, or None when the variable is unset"""
+        path = os.environ.get("STOCK_SERVICE_SHARED_CACHE")
+        if not path:
+            return None
+        try:
+            return cls(path)
+        except sqlite3.Error as e:
+            logger.error(f"Shared cache {path} unavailable, using process-local caches: {str(e)}")
+            return None
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not shared across threads"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _query_one(self, sql: str, parameters: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        """First row of a query; the cursor is closed so no read snapshot stays open between polls"""
+        cursor = self._connection().execute(sql, parameters)
+        try:
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def owner() -> str:
+        """Lease owner id of the calling thread"""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def get(self, key: str, stale: bool = False) -> Optional[Tuple[Any, float]]:
+        """
+        Fresh value of a key and its remaining lifetime in seconds, or None
+
+        With stale=True an expired entry is returned too (its lifetime is then
+        negative). Entries that cannot be unpickled (e.g., written by an
+        incompatible version) are treated as missing.
+        """
+        now = time.time()
+        row = self._query_one("SELECT value, expires FROM entries WHERE key = ? AND expires > ?",
+                              (key, float("-inf") if stale else now))
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0]), row[1] - now
+        except Exception:
+            return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, replacing any previous entry atomically"""
+        now = time.time()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)", (key, payload, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                connection.execute("DELETE FROM entries WHERE expires <= ?", (now - STALE_GRACE_SECONDS,))
+                connection.execute("DELETE FROM leases WHERE expires <= ?", (now,))
+
+    def acquire(self, key: str, seconds: Optional[float] = None) -> bool:
+        """
+        Take the refresh lease of a key unless another owner holds an unexpired one
+
+        Re-acquiring a lease the caller already holds extends it.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO leases (key, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE leases.expires <= ? OR leases.owner = excluded.owner",
+                (key, self.owner(), now + (seconds or self.lease_seconds), now)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Drop the caller's lease on a key (a lease taken over by someone else is left alone)"""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self.owner()))
+
+    def wait_released(self, key: str, timeout: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """
+        Block until no live lease is held on a key
+
+        Returns:
+            True if the lease was released or expired, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._query_one("SELECT 1 FROM leases WHERE key = ? AND expires > ?", (key, time.time())) is None:
+                return True
+            time.sleep(LEASE_POLL_SECONDS)
+        return False
+
+    @contextmanager
+    def lease(self, key: str, seconds: Optional[float] = None, wait: Optional[float] = None) -> Iterator[bool]:
+        """
+        Hold the refresh lease of a key for the duration of the block
+
+        Yields True when the caller owns the lease. Otherwise it first waits for
+        the current holder to finish (at most `wait` seconds, by default the
+        lease lifetime) and yields False, so the caller should re-check the
+        shared state before refreshing itself.
+        """
+        seconds = seconds or self.lease_seconds
+        if not self.acquire(key, seconds):
+            self.wait_released(key, seconds if wait is None else wait)
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self.release(key)
+
+    def clear(self) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM entries")
+            connection.execute("DELETE FROM leases")
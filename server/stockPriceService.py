@@ -4,15 +4,38 @@ Stock Price Service using yfinance
 Provides real-time stock price data for Indian stocks
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import yfinance as yf
 import json
+import os
 import sys
 import logging
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 
+from analyticsPool import AnalyticsPool
+from fxMatrix import FXMatrix, currency_for_ticker
+from backtestEngine import run_backtest
+from bulkPreloader import PreloadCheckpoint, RateLimiter, checkpoint_path, read_symbol_file, run_preload
+from dataQuality import clean_ohlcv
+from historicalAnalytics import calculate_historical_analytics
+from historyStore import HistoryStore
+from indicatorState import IndicatorState
+from portfolioOptimizer import optimize_portfolio
+from portfolioRisk import compute_portfolio_risk
+from serviceCache import TTLCache
+from serviceDeadline import DeadlineExceeded, RequestBudget, deadlines
+from serviceMetrics import metrics
+from serviceProfiler import profiler
+from sharedCache import SQLiteCacheBackend
+from stockScreener import run_screen
+from tradingCalendar import trading_calendar
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -137,6 +160,286 @@ class StockPriceService:
             "^TWII": "Taiwan Weighted",
             "^JKSE": "Jakarta Composite"
         }
+        
+        # Process pool for historical analytics, created on first batch request
+        self.analytics_pool = None
+        
+        # Upstream response caches; they pay off in the long-running serve mode, and with
+        # STOCK_SERVICE_SHARED_CACHE set they are shared by every worker process on the host
+        self.shared_cache = SQLiteCacheBackend.from_env()
+        self.history_cache = TTLCache("history", default_ttl=60, shared=self.shared_cache)
+        self.info_cache = TTLCache("fundamentals", default_ttl=6 * 3600, max_entries=512, shared=self.shared_cache)
+        self.quote_cache = TTLCache("quotes", default_ttl=5, max_entries=4096, shared=self.shared_cache)
+        
+        # Exchange sessions and holidays, used to skip refetches on closed markets
+        self.calendar = trading_calendar
+        
+        # On-disk daily bars for multi-asset analytics (risk, optimisation, backtests)
+        self.history_store = HistoryStore(leases=self.shared_cache)
+        # Latest indicators of every stored ticker, recomputed only when its bars change
+        self.indicator_state = IndicatorState(self.history_store)
+        
+        # USD pivot rates for cross-currency conversion, cached like any other short-window quote
+        self.fx = FXMatrix(
+            self.get_quote_snapshots,
+            self.get_history_frame,
+            ttl_for=lambda ticker: self._history_ttl(ticker, "1d"),
+            shared=self.shared_cache
+        )
+    
+    def _get_analytics_pool(self) -> AnalyticsPool:
+        """Create the analytics process pool on first use"""
+        if self.analytics_pool is None:
+            self.analytics_pool = AnalyticsPool()
+        return self.analytics_pool
+    
+    def _fetch_history(self, ticker_symbol: str, period: str) -> pd.DataFrame:
+        """
+        Fetch price history through the history cache, counting upstream calls
+        
+        Bars are validated and repaired before they are cached; the repair report
+        is attached as attrs["data_quality"]. Once the request deadline is spent, an
+        expired cache entry is returned instead of starting a download.
+        
+        Args:
+            ticker_symbol: yfinance ticker
+            period: yfinance period string
+        
+        Returns:
+            History DataFrame (a copy, so callers may add columns)
+        """
+        def load() -> pd.DataFrame:
+            timeout = deadlines.call_timeout(ticker_symbol)
+            metrics.inc("upstream_calls_total", endpoint="history")
+            with metrics.phase("fetch"):
+                try:
+                    hist = yf.Ticker(ticker_symbol).history(period=period, timeout=timeout)
+                except Exception:
+                    metrics.inc("upstream_errors_total", endpoint="history")
+                    raise
+            hist, quality = clean_ohlcv(hist)
+            hist.attrs["data_quality"] = quality
+            return hist
+        
+        key = (ticker_symbol, period)
+        try:
+            return self.history_cache.get_or_load(key, load, ttl=self._history_ttl(ticker_symbol, period)).copy()
+        except DeadlineExceeded:
+            return self._stale_fallback(self.history_cache, key, ticker_symbol).copy()
+    
+    def _stale_fallback(self, cache: TTLCache, key: Any, item: str) -> Any:
+        """
+        Expired cache entry for a request out of time, recorded on its budget
+        
+        Raises:
+            DeadlineExceeded: If nothing was ever cached for the key
+        """
+        stale = cache.get_stale(key)
+        if stale is None:
+            metrics.inc("deadline_skips_total", cache=cache.name)
+            deadlines.record_skipped(item)
+            raise DeadlineExceeded(f"Deadline reached with no cached data for {item}")
+        metrics.inc("deadline_stale_fallbacks_total", cache=cache.name)
+        deadlines.record_stale(item)
+        return stale
+    
+    def _history_ttl(self, ticker_symbol: str, period: str) -> float:
+        """Cache lifetime for a history window, held until the next open while the market is closed"""
+        # Short windows drive live quotes; long windows only change once per bar
+        ttl = 60 if period in ("1d", "5d") else 900
+        
+        if not self.quote_may_change(ticker_symbol, datetime.now(timezone.utc)):
+            ttl = max(ttl, min(self.calendar.seconds_until_open(ticker_symbol), 3 * 86400))
+        return ttl
+    
+    def _quote_ttl(self, ticker_symbol: str) -> float:
+        """Cache lifetime for a quote snapshot: one streamer refresh while trading, until the open otherwise"""
+        if not self.quote_may_change(ticker_symbol, datetime.now(timezone.utc)):
+            return max(5, min(self.calendar.seconds_until_open(ticker_symbol), 3 * 86400))
+        return self.quote_cache.default_ttl
+    
+    def quote_may_change(self, ticker_symbol: str, since: Optional[datetime]) -> bool:
+        """
+        Whether data fetched at `since` can be stale by now according to the trading calendar
+        
+        Closing prints get 15 minutes to settle, so a fetch made just after the
+        close is not trusted until the next session.
+        """
+        if since is None:
+            return True
+        return self.calendar.can_change_since(ticker_symbol, since - timedelta(minutes=15))
+    
+    def _session_bars(self, data: pd.DataFrame, ticker_symbol: str) -> pd.DataFrame:
+        """
+        Drop bars dated on days the ticker's exchange was closed
+        
+        Upstream sometimes repeats the last session as a bar on a weekend or
+        holiday, which would make the previous close equal the last price.
+        """
+        if data.empty:
+            return data
+        
+        trading_days = [self.calendar.is_trading_day(ticker_symbol, ts.date()) for ts in data.index]
+        return data if all(trading_days) else data[trading_days]
+    
+    def _fetch_history_range(self, ticker_symbol: str, start: Optional[date]) -> pd.DataFrame:
+        """Fetch unadjusted daily bars with dividends and splits from a start date (full history when None)"""
+        timeout = deadlines.call_timeout(ticker_symbol, default=30.0)
+        metrics.inc("upstream_calls_total", endpoint="history_range")
+        with metrics.phase("fetch"):
+            try:
+                ticker = yf.Ticker(ticker_symbol)
+                if start is None:
+                    return ticker.history(period="max", auto_adjust=False, actions=True, timeout=timeout)
+                return ticker.history(start=start.isoformat(), auto_adjust=False, actions=True, timeout=timeout)
+            except Exception:
+                metrics.inc("upstream_errors_total", endpoint="history_range")
+                raise
+    
+    def get_history_frame(self, ticker_symbol: str, adjustment: str = "total") -> pd.DataFrame:
+        """
+        Stored daily bars of a ticker, refreshed incrementally when the market may have moved
+        
+        Args:
+            ticker_symbol: Raw yfinance ticker
+            adjustment: raw, price (split-adjusted) or total (splits and reinvested dividends)
+        
+        Raises:
+            DeadlineExceeded: If the request ran out of time and nothing is stored yet
+        """
+        try:
+            return self.history_store.update(ticker_symbol, self._fetch_history_range, self.quote_may_change, adjustment)
+        except DeadlineExceeded:
+            if self.history_store.load(ticker_symbol) is None:
+                deadlines.record_skipped(ticker_symbol)
+                raise
+            # Out of time for the incremental refresh; serve the bars already stored
+            metrics.inc("deadline_stale_fallbacks_total", cache="history_store")
+            deadlines.record_stale(ticker_symbol)
+            return self.history_store.frame(ticker_symbol, adjustment=adjustment)
+    
+    def refresh_history(self, tickers: List[str], max_fetch_workers: int = 4) -> None:
+        """Bring several tickers up to date in the history store; failures are logged and counted"""
+        command = metrics.current_command
+        budget = deadlines.current()
+        
+        def refresh(ticker: str) -> None:
+            with metrics.bound_command(command), deadlines.bound(budget):
+                try:
+                    self.get_history_frame(ticker)
+                except Exception as e:
+                    logger.error(f"Error refreshing stored history for {ticker}: {str(e)}")
+                    metrics.inc("ticker_failures_total", ticker=ticker)
+        
+        with ThreadPoolExecutor(max_workers=max_fetch_workers, thread_name_prefix="history-store") as executor:
+            list(executor.map(refresh, tickers))
+    
+    def preload(self, universe: str, workers: int = 8, requests_per_second: float = 4.0,
+                fundamentals: bool = True) -> Dict[str, Any]:
+        """
+        Seed the history store (and stored fundamentals) for a whole universe
+        
+        Args:
+            universe: Named universe (see _universe_tickers), comma list, or a symbol file ("@path" or a path)
+            workers: Tickers downloaded concurrently
+            requests_per_second: Upstream calls allowed per second across all workers
+            fundamentals: Also store ticker fundamentals
+        
+        Returns:
+            Dictionary with counts, failures and throughput; progress lines go to stderr
+        """
+        path = universe[1:] if universe.startswith("@") else universe
+        tickers = read_symbol_file(path) if os.path.isfile(path) else self._universe_tickers(universe)
+        if not tickers:
+            raise ValueError(f"Universe '{universe}' has no symbols")
+        
+        limiter = RateLimiter(requests_per_second)
+        command = metrics.current_command
+        
+        def fetch_range(ticker_symbol: str, start: Optional[date]) -> pd.DataFrame:
+            limiter.acquire()
+            return self._fetch_history_range(ticker_symbol, start)
+        
+        def preload_one(ticker_symbol: str) -> int:
+            with metrics.bound_command(command):
+                rows_before = self.history_store.meta(ticker_symbol).get("rows", 0)
+                self.history_store.update(ticker_symbol, fetch_range, self.quote_may_change)
+                if self.history_store.load(ticker_symbol) is None:
+                    raise ValueError("No history available upstream")
+                if fundamentals and self.history_store.load_info(ticker_symbol, self.info_cache.default_ttl) is None:
+                    limiter.acquire()
+                    try:
+                        self._fetch_info(ticker_symbol)
+                    except Exception as e:
+                        # Fundamentals are best effort; a later run fetches them again
+                        logger.warning(f"Could not preload fundamentals for {ticker_symbol}: {str(e)}")
+                return max(self.history_store.meta(ticker_symbol).get("rows", 0) - rows_before, 0)
+        
+        checkpoint = PreloadCheckpoint(checkpoint_path(self.history_store.directory, universe), tickers)
+        summary = run_preload(tickers, preload_one, checkpoint, workers)
+        return {
+            "success": not summary["failed"],
+            "universe": universe,
+            **summary,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def get_aligned_closes(self, tickers: List[str], lookback_years: float,
+                           max_fetch_workers: int = 4, complete: bool = True) -> pd.DataFrame:
+        """
+        Refresh several tickers in the history store and return their closes on a shared date index
+        
+        Args:
+            tickers: Raw yfinance tickers
+            lookback_years: Years of history returned
+            max_fetch_workers: Concurrent upstream downloads
+            complete: Drop dates before every ticker has data (otherwise keep them as NaN)
+        
+        Returns:
+            DataFrame of closes, one column per ticker with data
+        """
+        self.refresh_history(tickers, max_fetch_workers)
+        
+        start = (datetime.now() - timedelta(days=int(lookback_years * 365.25))).date()
+        available = [ticker for ticker in tickers if self.history_store.load(ticker) is not None]
+        return self.history_store.aligned_closes(available, start, complete=complete)
+    
+    def _fetch_info(self, ticker_symbol: str) -> Dict[str, Any]:
+        """Fetch ticker fundamentals through the fundamentals cache, backed by the history store's copy"""
+        def load() -> Dict[str, Any]:
+            stored = self.history_store.load_info(ticker_symbol, max_age=self.info_cache.default_ttl)
+            if stored is not None:
+                return stored
+            
+            # yfinance's info lookup takes no timeout; this only refuses to start once out of time
+            deadlines.call_timeout(ticker_symbol)
+            metrics.inc("upstream_calls_total", endpoint="info")
+            with metrics.phase("fetch"):
+                try:
+                    info = yf.Ticker(ticker_symbol).info
+                except Exception:
+                    metrics.inc("upstream_errors_total", endpoint="info")
+                    raise
+            if info:
+                self.history_store.save_info(ticker_symbol, info)
+            return info
+        
+        try:
+            return self.info_cache.get_or_load(ticker_symbol, load) or {}
+        except DeadlineExceeded:
+            # Fundamentals only decorate quotes; without any cached copy they are left out
+            stale = self.info_cache.get_stale(ticker_symbol)
+            if stale:
+                deadlines.record_stale(ticker_symbol)
+            else:
+                deadlines.record_skipped(ticker_symbol)
+            return stale or {}
+    
+    def close(self) -> None:
+        """Release worker processes held by the service"""
+        if self.analytics_pool is not None:
+            self.analytics_pool.shutdown()
+            self.analytics_pool = None
     
     def get_stock_price(self, symbol: str, exchange: str = "US") -> Optional[Dict[str, Any]]:
         """
@@ -163,14 +466,12 @@ class StockPriceService:
                 currency = "USD"
                 exchange = "US"
             
-            # Create ticker object
-            ticker = yf.Ticker(ticker_symbol)
-            
             # Get historical data for last 5 days to ensure we have previous close
-            data = ticker.history(period="5d")
+            data = self._session_bars(self._fetch_history(ticker_symbol, "5d"), ticker_symbol)
             
             if data.empty:
                 logger.warning(f"No data found for {ticker_symbol}")
+                metrics.inc("ticker_failures_total", ticker=ticker_symbol)
                 return None
             
             # Get the last closing price
@@ -181,15 +482,16 @@ class StockPriceService:
             last_volume = int(data['Volume'].iloc[-1])
             
             # Get additional info
-            info = ticker.info
+            info = self._fetch_info(ticker_symbol)
             
             # Calculate technical indicators - use proper previous day close
             if len(data) > 1:
                 prev_close = float(data['Close'].iloc[-2])  # Previous trading day close
             else:
                 # Fallback: get more data to find previous close
+                metrics.inc("retries_total", reason="previous_close")
                 try:
-                    extended_data = ticker.history(period="1mo")
+                    extended_data = self._session_bars(self._fetch_history(ticker_symbol, "1mo"), ticker_symbol)
                     if len(extended_data) > 1:
                         prev_close = float(extended_data['Close'].iloc[-2])
                     else:
@@ -202,9 +504,7 @@ class StockPriceService:
             
             # Get company name
             company_name = info.get('longName', 'Unknown Company')
-            if market == "INDIA" and symbol in self.indian_stocks:
-                company_name = self.indian_stocks[symbol]
-            elif market == "USA" and symbol in self.us_stocks:
+            if market == "USA" and symbol in self.us_stocks:
                 company_name = self.us_stocks[symbol]
             
             return {
@@ -238,23 +538,36 @@ class StockPriceService:
             
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {str(e)}")
+            metrics.inc("ticker_failures_total", ticker=symbol)
             return None
     
-    def get_multiple_stocks(self, symbols: List[str], exchange: str = "NSE") -> Dict[str, Any]:
+    def get_multiple_stocks(self, symbols: List[str], exchange: str = "NSE",
+                            max_fetch_workers: int = 4) -> Dict[str, Any]:
         """
         Get stock prices for multiple symbols
         
+        Quotes are fetched on a small I/O thread pool, as in refresh_history.
+        
         Args:
             symbols: List of stock symbols
             exchange: Exchange ("NSE", "BSE", "US")
+            max_fetch_workers: Concurrent upstream downloads
         
         Returns:
             Dictionary with stock data for each symbol
         """
-        results = {}
+        command = metrics.current_command
+        budget = deadlines.current()
+        
+        def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+            with metrics.bound_command(command), deadlines.bound(budget):
+                return self.get_stock_price(symbol, exchange)
         
-        for symbol in symbols:
-            stock_data = self.get_stock_price(symbol, exchange)
+        with ThreadPoolExecutor(max_workers=max_fetch_workers, thread_name_prefix="quote-fetch") as executor:
+            quotes = list(executor.map(fetch, symbols))
+        
+        results = {}
+        for symbol, stock_data in zip(symbols, quotes):
             if stock_data:
                 results[symbol] = stock_data
             else:
@@ -265,7 +578,88 @@ class StockPriceService:
                 }
         
         return results
-    
+
+    def get_quote_snapshots(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get lightweight quotes for many raw yfinance tickers in one batch download
+
+        Used by the streaming refresher, so it skips ticker.info and only returns
+        the fields pushed to subscribers. Snapshots go through the quote cache,
+        so only tickers without a fresh entry are downloaded.
+
+        Args:
+            tickers: Raw yfinance tickers (e.g., "AAPL", "^GSPC", "BTC-USD", "EURUSD=X")
+
+        Returns:
+            Dictionary keyed by ticker with symbol, lastPrice, change, changePercent and timestamp
+        """
+        if not tickers:
+            return {}
+        try:
+            quotes = self.quote_cache.get_or_load_many(tickers, self._download_quote_snapshots, ttl_for=self._quote_ttl)
+        except DeadlineExceeded:
+            quotes = {}
+            for ticker in tickers:
+                quote = self.quote_cache.get(ticker)
+                try:
+                    quotes[ticker] = quote if quote is not None else self._stale_fallback(self.quote_cache, ticker, ticker)
+                except DeadlineExceeded:
+                    continue
+        # Copies, since callers add fields (e.g., base-currency blocks) to the rows
+        return {ticker: dict(quote) for ticker, quote in quotes.items()}
+
+    def _download_quote_snapshots(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Download quote snapshots for tickers in one upstream call (tickers without data are omitted)"""
+        results = {}
+        timeout = deadlines.call_timeout(",".join(tickers))
+        metrics.inc("upstream_calls_total", endpoint="download")
+        try:
+            with metrics.phase("fetch"):
+                data = yf.download(
+                    tickers,
+                    period="5d",
+                    interval="1d",
+                    group_by="ticker",
+                    auto_adjust=False,
+                    progress=False,
+                    threads=True,
+                    timeout=timeout
+                )
+        except Exception as e:
+            logger.error(f"Error fetching quote snapshots: {str(e)}")
+            metrics.inc("upstream_errors_total", endpoint="download")
+            return results
+
+        if data is None or data.empty:
+            return results
+
+        for ticker_symbol in tickers:
+            try:
+                frame = data[ticker_symbol] if isinstance(data.columns, pd.MultiIndex) else data
+                frame = self._session_bars(frame, ticker_symbol)
+                closes = frame['Close'].dropna()
+                if closes.empty:
+                    continue
+
+                last_close = float(closes.iloc[-1])
+                prev_close = float(closes.iloc[-2]) if len(closes) > 1 else float(frame['Open'].dropna().iloc[-1])
+                digits = 4 if ticker_symbol.endswith("=X") else 2
+
+                results[ticker_symbol] = {
+                    "symbol": ticker_symbol,
+                    "currency": currency_for_ticker(ticker_symbol),
+                    "lastPrice": round(last_close, digits),
+                    "change": round(last_close - prev_close, digits),
+                    "changePercent": round(((last_close - prev_close) / prev_close) * 100, 2) if prev_close > 0 else 0,
+                    "timestamp": datetime.now().isoformat()
+                }
+            except Exception as e:
+                logger.error(f"Error reading quote snapshot for {ticker_symbol}: {str(e)}")
+                metrics.inc("ticker_failures_total", ticker=ticker_symbol)
+                continue
+
+        return results
+
     def get_market_indices(self, market: str = "INDIA") -> Dict[str, Any]:
         """
         Get major market indices for India and US markets
@@ -297,8 +691,7 @@ class StockPriceService:
             results = {}
             for index_name, ticker_symbol in indices.items():
                 try:
-                    ticker = yf.Ticker(ticker_symbol)
-                    data = ticker.history(period="5d")
+                    data = self._session_bars(self._fetch_history(ticker_symbol, "5d"), ticker_symbol)
                     
                     if not data.empty:
                         last_close = float(data['Close'].iloc[-1])
@@ -308,8 +701,9 @@ class StockPriceService:
                             prev_close = float(data['Close'].iloc[-2])
                         else:
                             # Get more data to find previous close
+                            metrics.inc("retries_total", reason="previous_close")
                             try:
-                                extended_data = ticker.history(period="1mo")
+                                extended_data = self._session_bars(self._fetch_history(ticker_symbol, "1mo"), ticker_symbol)
                                 prev_close = float(extended_data['Close'].iloc[-2]) if len(extended_data) > 1 else last_open
                             except:
                                 prev_close = last_open
@@ -331,6 +725,7 @@ class StockPriceService:
                             "timestamp": datetime.now().isoformat()
                         }
                 except Exception as e:
+                    metrics.inc("ticker_failures_total", ticker=ticker_symbol)
                     results[index_name] = {
                         "name": index_name,
                         "error": f"Error: {str(e)}",
@@ -473,8 +868,8 @@ class StockPriceService:
             results = {}
             for symbol, name in self.commodities.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d")
+                    # 5d so the previous session is present for the previous close
+                    data = self._session_bars(self._fetch_history(symbol, "5d"), symbol)
                     
                     if not data.empty:
                         last_close = float(data['Close'].iloc[-1])
@@ -493,6 +888,7 @@ class StockPriceService:
                         }
                 except Exception as e:
                     logger.error(f"Error fetching commodity {symbol}: {str(e)}")
+                    metrics.inc("ticker_failures_total", ticker=symbol)
                     continue
             
             return {
@@ -518,8 +914,8 @@ class StockPriceService:
             results = {}
             for symbol, name in self.cryptocurrencies.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d")
+                    # 5d so the previous session is present for the previous close
+                    data = self._session_bars(self._fetch_history(symbol, "5d"), symbol)
                     
                     if not data.empty:
                         last_close = float(data['Close'].iloc[-1])
@@ -538,6 +934,7 @@ class StockPriceService:
                         }
                 except Exception as e:
                     logger.error(f"Error fetching cryptocurrency {symbol}: {str(e)}")
+                    metrics.inc("ticker_failures_total", ticker=symbol)
                     continue
             
             return {
@@ -563,8 +960,8 @@ class StockPriceService:
             results = {}
             for symbol, name in self.currency_pairs.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d")
+                    # 5d so the previous session is present for the previous close
+                    data = self._session_bars(self._fetch_history(symbol, "5d"), symbol)
                     
                     if not data.empty:
                         last_close = float(data['Close'].iloc[-1])
@@ -583,6 +980,7 @@ class StockPriceService:
                         }
                 except Exception as e:
                     logger.error(f"Error fetching currency {symbol}: {str(e)}")
+                    metrics.inc("ticker_failures_total", ticker=symbol)
                     continue
             
             return {
@@ -608,8 +1006,8 @@ class StockPriceService:
             results = {}
             for symbol, name in self.global_indices.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d")
+                    # 5d so the previous session is present for the previous close
+                    data = self._session_bars(self._fetch_history(symbol, "5d"), symbol)
                     
                     if not data.empty:
                         last_close = float(data['Close'].iloc[-1])
@@ -628,6 +1026,7 @@ class StockPriceService:
                         }
                 except Exception as e:
                     logger.error(f"Error fetching index {symbol}: {str(e)}")
+                    metrics.inc("ticker_failures_total", ticker=symbol)
                     continue
             
             return {
@@ -676,12 +1075,14 @@ class StockPriceService:
                 }
                 exchange = "US"
             
+            # Every sector's quotes are fetched together so the pool is shared across sectors
+            quotes = self.get_multiple_stocks(list(dict.fromkeys(
+                symbol for stocks in sector_stocks.values() for symbol in stocks)), exchange)
             sector_performance = {}
             
             for sector, stocks in sector_stocks.items():
                 try:
-                    # Get data for sector stocks
-                    sector_data = self.get_multiple_stocks(stocks, exchange)
+                    sector_data = {symbol: quotes[symbol] for symbol in stocks}
                     
                     # Calculate sector average performance
                     valid_changes = []
@@ -725,12 +1126,58 @@ class StockPriceService:
                 "timestamp": datetime.now().isoformat()
             }
     
-    def get_portfolio_prices(self, portfolio_symbols: List[str]) -> Dict[str, Any]:
+    def convert_to_base(self, rows: List[Dict[str, Any]], base_currency: str,
+                        fields: tuple = ("lastPrice", "openPrice", "highPrice", "lowPrice", "change")) -> Dict[str, float]:
+        """
+        Add a "base" block with values converted into base_currency to each quote row
+        
+        All rows are converted in one step: their price fields form a matrix that is
+        multiplied by one FX factor per row. Rows with an error are left untouched.
+        
+        Args:
+            rows: Quote dictionaries with a currency (or ticker) field
+            base_currency: Target currency (e.g., "USD", "INR")
+            fields: Price fields converted when present in every row
+        
+        Returns:
+            FX factor used for each quote currency
+        """
+        rows = [row for row in rows if "error" not in row]
+        if not rows:
+            return {}
+        
+        currencies = [row.get("currency") or currency_for_ticker(row.get("ticker", row.get("symbol", ""))) for row in rows]
+        present = [field for field in fields if all(row.get(field) is not None for row in rows)]
+        values = np.array([[row[field] for field in present] for row in rows], dtype="f8").reshape(len(rows), len(present))
+        converted, factors = self.fx.convert(values, currencies, base_currency)
+        
+        for row, factor, row_values in zip(rows, factors, converted):
+            row["base"] = {
+                "currency": base_currency,
+                "fxRate": round(float(factor), 6),
+                **{field: round(float(value), 2) for field, value in zip(present, row_values)}
+            }
+        return {currency: round(float(factor), 6) for currency, factor in zip(currencies, factors)}
+    
+    def _to_base_currency(self, hist: pd.DataFrame, ticker_symbol: str, base_currency: Optional[str]) -> pd.DataFrame:
+        """Convert OHLC columns of a history into base_currency with date-aligned FX fixings"""
+        currency = currency_for_ticker(ticker_symbol)
+        if not base_currency or hist.empty or currency == base_currency:
+            return hist
+        
+        factors = self.fx.factor_series(currency, base_currency, hist.index)
+        hist = hist.copy()
+        for column in ("Open", "High", "Low", "Close"):
+            hist[column] = hist[column].to_numpy(dtype="f8") * factors
+        return hist
+    
+    def get_portfolio_prices(self, portfolio_symbols: List[str], base_currency: Optional[str] = None) -> Dict[str, Any]:
         """
         Get current prices for a portfolio of stocks
         
         Args:
             portfolio_symbols: List of stock symbols in portfolio
+            base_currency: Optional currency every price is also reported in
         
         Returns:
             Dictionary with portfolio price data
@@ -743,6 +1190,7 @@ class StockPriceService:
             failed_symbols = [symbol for symbol, data in nse_results.items() if "error" in data]
             if failed_symbols:
                 logger.info(f"Retrying {len(failed_symbols)} symbols on BSE")
+                metrics.inc("retries_total", len(failed_symbols), reason="bse_fallback")
                 bse_results = self.get_multiple_stocks(failed_symbols, "BSE")
                 
                 # Update with BSE results
@@ -754,16 +1202,22 @@ class StockPriceService:
             total_stocks = len(portfolio_symbols)
             successful_fetches = len([data for data in nse_results.values() if "error" not in data])
             
+            summary = {
+                "totalStocks": total_stocks,
+                "successfulFetches": successful_fetches,
+                "failedFetches": total_stocks - successful_fetches,
+                "successRate": round((successful_fetches / total_stocks) * 100, 2) if total_stocks > 0 else 0,
+                "timestamp": datetime.now().isoformat(),
+                "dataSource": "yfinance"
+            }
+            
+            if base_currency:
+                summary["baseCurrency"] = base_currency
+                summary["fxRates"] = self.convert_to_base(list(nse_results.values()), base_currency)
+            
             return {
                 "stocks": nse_results,
-                "summary": {
-                    "totalStocks": total_stocks,
-                    "successfulFetches": successful_fetches,
-                    "failedFetches": total_stocks - successful_fetches,
-                    "successRate": round((successful_fetches / total_stocks) * 100, 2) if total_stocks > 0 else 0,
-                    "timestamp": datetime.now().isoformat(),
-                    "dataSource": "yfinance"
-                }
+                "summary": summary
             }
             
         except Exception as e:
@@ -773,367 +1227,740 @@ class StockPriceService:
                 "timestamp": datetime.now().isoformat()
             }
 
-    def get_historical_data(self, symbol: str, exchange: str = "NSE", period: str = "30y") -> Dict[str, Any]:
+    def get_portfolio_risk(self, holdings: Dict[str, float], exchange: str = "NSE", confidence: float = 0.95,
+                           horizon_days: int = 1, lookback_years: float = 3,
+                           paths: int = 100000) -> Dict[str, Any]:
         """
-        Get comprehensive historical data with 30-year analytics including XRR, average returns, and detailed metrics
+        Get portfolio VaR/CVaR (historical, parametric and Monte Carlo) with per-holding risk contributions
         
         Args:
-            symbol: Stock symbol
+            holdings: Portfolio weights (or position values) keyed by symbol
             exchange: Exchange (NSE, BSE, US)
-            period: Time period (30y, 20y, 10y, 5y, 3y, 1y, 6mo, 3mo, 1mo)
+            confidence: VaR confidence level (e.g., 0.95, 0.99)
+            horizon_days: Loss horizon in trading days
+            lookback_years: Years of stored history used for returns
+            paths: Monte Carlo paths
         
         Returns:
-            Dictionary with comprehensive historical analytics
+            Dictionary with portfolio risk metrics
         """
         try:
-            # Format ticker based on exchange
-            if exchange.upper() == "NSE":
-                ticker = f"{symbol}{self.nse_suffix}"
-            elif exchange.upper() == "BSE":
-                ticker = f"{symbol}{self.bse_suffix}"
-            else:
-                ticker = symbol
-            
-            # Get historical data
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
+            tickers = {symbol: self._get_history_ticker(symbol, exchange) for symbol in holdings}
+            closes = self.get_aligned_closes(list(tickers.values()), lookback_years)
+            closes = closes.rename(columns={ticker: symbol for symbol, ticker in tickers.items()})
             
-            if hist.empty:
+            missing = [symbol for symbol in holdings if symbol not in closes.columns]
+            if missing:
                 return {
                     "success": False,
-                    "error": "No historical data available",
-                    "symbol": symbol,
-                    "exchange": exchange,
+                    "error": f"No historical data available for {', '.join(missing)}",
+                    "timestamp": datetime.now().isoformat()
+                }
+            if len(closes) < 30:
+                return {
+                    "success": False,
+                    "error": "Not enough overlapping history to estimate risk",
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # Calculate comprehensive analytics
-            analytics = self._calculate_historical_analytics(hist, symbol)
-            
-            # Format historical data for charting
-            chart_data = []
-            for date, row in hist.iterrows():
-                chart_data.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "open": round(row['Open'], 2),
-                    "high": round(row['High'], 2),
-                    "low": round(row['Low'], 2),
-                    "close": round(row['Close'], 2),
-                    "volume": int(row['Volume']),
-                    "returns": round(((row['Close'] - row['Open']) / row['Open']) * 100, 2) if row['Open'] != 0 else 0
-                })
+            with metrics.phase("compute"):
+                risk = compute_portfolio_risk(closes[list(holdings)], holdings, confidence=confidence,
+                                              horizon_days=horizon_days, paths=paths)
             
             return {
                 "success": True,
-                "symbol": symbol,
                 "exchange": exchange,
-                "period": period,
-                "analytics": analytics,
-                "chart_data": chart_data,
-                "data_points": len(chart_data),
+                **risk,
                 "timestamp": datetime.now().isoformat()
             }
             
         except Exception as e:
-            logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
+            logger.error(f"Error calculating portfolio risk: {str(e)}")
             return {
                 "success": False,
                 "error": str(e),
-                "symbol": symbol,
-                "exchange": exchange,
                 "timestamp": datetime.now().isoformat()
             }
 
-    def _calculate_historical_analytics(self, hist: pd.DataFrame, symbol: str) -> Dict[str, Any]:
+    def get_portfolio_optimization(self, symbols: List[str], exchange: str = "NSE", lookback_years: float = 3,
+                                   max_weight: float = 1.0, shrinkage: str = "ledoit_wolf",
+                                   current_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
-        Calculate comprehensive historical analytics including XRR, average returns, volatility, and risk metrics
+        Get the efficient frontier, minimum-variance and maximum-Sharpe portfolios for a symbol list
         
         Args:
-            hist: Historical price data DataFrame
-            symbol: Stock symbol
-            
+            symbols: List of stock symbols
+            exchange: Exchange (NSE, BSE, US)
+            lookback_years: Years of stored history used for returns
+            max_weight: Per-asset upper bound
+            shrinkage: Covariance estimator (ledoit_wolf, none)
+            current_weights: Optional current holdings, to get rebalancing trades
+        
         Returns:
-            Dictionary with detailed analytics
+            Dictionary with the optimised portfolios
         """
         try:
-            # Basic price metrics
-            current_price = hist['Close'].iloc[-1]
-            start_price = hist['Close'].iloc[0]
+            tickers = {symbol: self._get_history_ticker(symbol, exchange) for symbol in symbols}
+            closes = self.get_aligned_closes(list(tickers.values()), lookback_years)
+            closes = closes.rename(columns={ticker: symbol for symbol, ticker in tickers.items()})
             
-            # Calculate returns
-            hist['Daily_Returns'] = hist['Close'].pct_change()
-            hist['Cumulative_Returns'] = (1 + hist['Daily_Returns']).cumprod()
-            
-            # Time-based calculations
-            years = len(hist) / 252  # Approximate trading days per year
-            
-            # Total return and CAGR
-            total_return = ((current_price - start_price) / start_price) * 100
-            cagr = (((current_price / start_price) ** (1/years)) - 1) * 100 if years > 0 else 0
+            # Symbols without history are reported and left out rather than failing the request
+            skipped = [symbol for symbol in symbols if symbol not in closes.columns]
+            included = [symbol for symbol in symbols if symbol in closes.columns]
+            if len(included) < 2 or len(closes) < 60:
+                return {
+                    "success": False,
+                    "error": "Not enough overlapping history to optimise",
+                    "skipped": skipped,
+                    "timestamp": datetime.now().isoformat()
+                }
             
-            # XRR (Extended Rate of Return) - Annualized return with compounding
-            xrr = cagr  # XRR is essentially CAGR for stock analysis
+            with metrics.phase("compute"):
+                optimization = optimize_portfolio(closes[included], max_weight=max_weight, shrinkage=shrinkage,
+                                                  current_weights=current_weights)
             
-            # Average returns
-            daily_returns = hist['Daily_Returns'].dropna()
-            avg_daily_return = daily_returns.mean() * 100
-            avg_monthly_return = avg_daily_return * 21  # Approximate trading days per month
-            avg_annual_return = avg_daily_return * 252  # Approximate trading days per year
+            return {
+                "success": True,
+                "exchange": exchange,
+                **optimization,
+                "skipped": skipped,
+                "timestamp": datetime.now().isoformat()
+            }
             
-            # Volatility metrics
-            volatility_daily = daily_returns.std() * 100
-            volatility_annual = volatility_daily * np.sqrt(252)
+        except Exception as e:
+            logger.error(f"Error optimising portfolio: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def get_backtest(self, holdings: Dict[str, float], exchange: str = "NSE", strategy: str = "sip",
+                     amount: float = 10000, years: float = 20, frequency: str = "M",
+                     fast: int = 50, slow: int = 200) -> Dict[str, Any]:
+        """
+        Replay an investment strategy over stored history for many symbols at once
+        
+        Args:
+            holdings: Symbols to test, with target weights for the rebalance strategy
+            exchange: Exchange (NSE, BSE, US)
+            strategy: sip, lump_sum, ma_crossover or rebalance
+            amount: Periodic investment (sip) or initial capital (other strategies)
+            years: Years of history replayed
+            frequency: Contribution/rebalancing frequency (W, M, Q, Y)
+            fast: Fast moving-average window (ma_crossover)
+            slow: Slow moving-average window (ma_crossover)
+        
+        Returns:
+            Dictionary with results, XIRR, drawdown, turnover and equity curves
+        """
+        try:
+            tickers = {symbol: self._get_history_ticker(symbol, exchange) for symbol in holdings}
+            closes = self.get_aligned_closes(list(tickers.values()), years, complete=False)
+            closes = closes.rename(columns={ticker: symbol for symbol, ticker in tickers.items()})
             
-            # Risk metrics
-            max_drawdown = self._calculate_max_drawdown(hist['Close'])
-            sharpe_ratio = self._calculate_sharpe_ratio(daily_returns)
+            skipped = [symbol for symbol in holdings if symbol not in closes.columns]
+            if closes.empty or len(closes.columns) == 0:
+                return {
+                    "success": False,
+                    "error": "No historical data available",
+                    "skipped": skipped,
+                    "timestamp": datetime.now().isoformat()
+                }
             
-            # Price ranges
-            price_52w_high = hist['High'].tail(252).max() if len(hist) >= 252 else hist['High'].max()
-            price_52w_low = hist['Low'].tail(252).min() if len(hist) >= 252 else hist['Low'].min()
-            price_range = ((price_52w_high - price_52w_low) / price_52w_low) * 100
+            included = [symbol for symbol in holdings if symbol in closes.columns]
+            with metrics.phase("compute"):
+                backtest = run_backtest(closes[included], strategy, amount=amount, frequency=frequency,
+                                        fast=fast, slow=slow,
+                                        weights={symbol: holdings[symbol] for symbol in included})
             
-            # Moving averages
-            ma_20 = hist['Close'].rolling(20).mean().iloc[-1] if len(hist) >= 20 else current_price
-            ma_50 = hist['Close'].rolling(50).mean().iloc[-1] if len(hist) >= 50 else current_price
-            ma_200 = hist['Close'].rolling(200).mean().iloc[-1] if len(hist) >= 200 else current_price
+            return {
+                "success": True,
+                "exchange": exchange,
+                **backtest,
+                "skipped": skipped,
+                "timestamp": datetime.now().isoformat()
+            }
             
-            # Yearly breakdown
-            yearly_returns = self._calculate_yearly_returns(hist)
+        except Exception as e:
+            logger.error(f"Error running {strategy} backtest: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def _universe_tickers(self, universe: str) -> List[str]:
+        """Raw tickers of a named universe (US, CRYPTO, COMMODITIES, CURRENCIES, GLOBAL) or a comma list"""
+        universes = {
+            "US": list(self.us_stocks) + list(self.us_etfs),
+            "CRYPTO": list(self.cryptocurrencies),
+            "COMMODITIES": list(self.commodities),
+            "CURRENCIES": list(self.currency_pairs),
+            "GLOBAL": list(self.global_indices)
+        }
+        return universes.get(universe.upper(), [ticker for ticker in universe.split(",") if ticker])
+
+    def get_screen(self, expression: str, sort_by: Optional[str] = None, limit: int = 50,
+                   universe: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Screen every stored ticker with a filter expression over precomputed indicators
+        
+        Args:
+            expression: Filter expression, e.g. "rsi < 30 and close > ma200"
+            sort_by: Indicator column to sort by ("-" prefix for descending)
+            limit: Maximum matches returned
+            universe: Optional universe to refresh in the history store first (otherwise no fetches)
+        
+        Returns:
+            Dictionary with matching tickers and their indicators
+        """
+        try:
+            if universe:
+                self.refresh_history(self._universe_tickers(universe))
             
-            # Risk-adjusted returns
-            risk_adjusted_return = cagr / volatility_annual if volatility_annual != 0 else 0
+            with metrics.phase("compute"):
+                self.indicator_state.refresh()
+                screen = run_screen(self.indicator_state.table(), expression, sort_by, limit)
             
             return {
-                "price_metrics": {
-                    "current_price": round(current_price, 2),
-                    "start_price": round(start_price, 2),
-                    "total_return_percent": round(total_return, 2),
-                    "price_52w_high": round(price_52w_high, 2),
-                    "price_52w_low": round(price_52w_low, 2),
-                    "price_range_percent": round(price_range, 2)
-                },
-                "returns_analysis": {
-                    "xrr_percent": round(xrr, 2),  # Extended Rate of Return
-                    "cagr_percent": round(cagr, 2),  # Compound Annual Growth Rate
-                    "avg_daily_return_percent": round(avg_daily_return, 4),
-                    "avg_monthly_return_percent": round(avg_monthly_return, 2),
-                    "avg_annual_return_percent": round(avg_annual_return, 2),
-                    "risk_adjusted_return": round(risk_adjusted_return, 2)
-                },
-                "risk_metrics": {
-                    "volatility_daily_percent": round(volatility_daily, 4),
-                    "volatility_annual_percent": round(volatility_annual, 2),
-                    "max_drawdown_percent": round(max_drawdown, 2),
-                    "sharpe_ratio": round(sharpe_ratio, 3),
-                    "beta": 1.0  # Default beta, would need market data for actual calculation
-                },
-                "technical_indicators": {
-                    "ma_20": round(ma_20, 2),
-                    "ma_50": round(ma_50, 2),
-                    "ma_200": round(ma_200, 2),
-                    "rsi": self._calculate_rsi(hist['Close'])
-                },
-                "yearly_performance": yearly_returns,
-                "analysis_period": {
-                    "years": round(years, 2),
-                    "total_trading_days": len(hist),
-                    "data_start": hist.index[0].strftime("%Y-%m-%d"),
-                    "data_end": hist.index[-1].strftime("%Y-%m-%d")
-                }
+                "success": True,
+                **screen,
+                "timestamp": datetime.now().isoformat()
             }
             
+        except ValueError:
+            raise
         except Exception as e:
-            logger.error(f"Error calculating analytics: {str(e)}")
+            logger.error(f"Error running screen '{expression}': {str(e)}")
             return {
+                "success": False,
                 "error": str(e),
-                "symbol": symbol
+                "timestamp": datetime.now().isoformat()
             }
 
-    def _calculate_max_drawdown(self, prices: pd.Series) -> float:
-        """Calculate maximum drawdown"""
-        try:
-            rolling_max = prices.expanding().max()
-            drawdown = (prices - rolling_max) / rolling_max
-            return drawdown.min() * 100
-        except:
-            return 0.0
+    def _get_history_ticker(self, symbol: str, exchange: str) -> str:
+        """Format the yfinance ticker used for historical requests"""
+        if exchange.upper() == "NSE":
+            return f"{symbol}{self.nse_suffix}"
+        elif exchange.upper() == "BSE":
+            return f"{symbol}{self.bse_suffix}"
+        return symbol
 
-    def _calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = 0.05) -> float:
-        """Calculate Sharpe ratio"""
-        try:
-            excess_returns = returns - (risk_free_rate / 252)  # Daily risk-free rate
-            return excess_returns.mean() / excess_returns.std() * np.sqrt(252)
-        except:
-            return 0.0
+    def _format_chart_data(self, hist: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Format historical bars for charting"""
+        chart_data = []
+        for date, row in hist.iterrows():
+            chart_data.append({
+                "date": date.strftime("%Y-%m-%d"),
+                "open": round(row['Open'], 2),
+                "high": round(row['High'], 2),
+                "low": round(row['Low'], 2),
+                "close": round(row['Close'], 2),
+                "volume": int(row['Volume']),
+                "returns": round(((row['Close'] - row['Open']) / row['Open']) * 100, 2) if row['Open'] != 0 else 0
+            })
+        return chart_data
 
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
-        """Calculate RSI (Relative Strength Index)"""
+    def _period_start(self, period: str) -> Optional[date]:
+        """First date covered by a yfinance period string (None for "max")"""
+        today = datetime.now().date()
+        if period == "max":
+            return None
+        if period == "ytd":
+            return today.replace(month=1, day=1)
+        
+        units = {"y": 365.25, "mo": 30.44, "wk": 7, "d": 1}
+        for unit, days in units.items():
+            if period.endswith(unit) and period[:-len(unit)].isdigit():
+                return today - timedelta(days=int(int(period[:-len(unit)]) * days))
+        raise ValueError(f"Unknown period '{period}'")
+    
+    def _load_history(self, ticker: str, period: str, return_mode: Optional[str]) -> pd.DataFrame:
+        """
+        History for analytics: the cached period download, or the history store in a return mode
+        
+        Args:
+            ticker: Raw yfinance ticker
+            period: Time period (30y, 20y, 10y, 5y, 3y, 1y, 6mo, 3mo, 1mo)
+            return_mode: None for upstream-adjusted bars, "price" (splits only) or "total" (dividends reinvested)
+        """
+        if return_mode is None:
+            return self._fetch_history(ticker, period)
+        if return_mode not in ("price", "total"):
+            raise ValueError(f"Unknown return mode '{return_mode}' (price/total)")
+        
+        hist = self.get_history_frame(ticker, return_mode)
+        start = self._period_start(period)
+        return hist if start is None or hist.empty else hist[hist.index >= pd.Timestamp(start)]
+    
+    def get_historical_data(self, symbol: str, exchange: str = "NSE", period: str = "30y",
+                            base_currency: Optional[str] = None, return_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get comprehensive historical data with 30-year analytics including XRR, average returns, and detailed metrics
+        
+        Args:
+            symbol: Stock symbol
+            exchange: Exchange (NSE, BSE, US)
+            period: Time period (30y, 20y, 10y, 5y, 3y, 1y, 6mo, 3mo, 1mo)
+            base_currency: Optional currency prices are converted into before analytics
+            return_mode: Optional "price" or "total" to compute from stored unadjusted bars and corporate actions
+        
+        Returns:
+            Dictionary with comprehensive historical analytics
+        """
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return round(rsi.iloc[-1], 2)
-        except:
-            return 50.0
+            # Format ticker based on exchange
+            ticker = self._get_history_ticker(symbol, exchange)
+            
+            # Get historical data
+            hist = self._to_base_currency(self._load_history(ticker, period, return_mode), ticker, base_currency)
+            
+            if hist.empty:
+                return {
+                    "success": False,
+                    "error": "No historical data available",
+                    "symbol": symbol,
+                    "exchange": exchange,
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            # Calculate comprehensive analytics, off-thread when a pool is already running
+            with metrics.phase("compute"):
+                if self.analytics_pool is not None:
+                    analytics = self.analytics_pool.submit(hist, symbol).result()
+                else:
+                    analytics = calculate_historical_analytics(hist, symbol)
+            
+            # Format historical data for charting
+            chart_data = self._format_chart_data(hist)
+            
+            result = {
+                "success": True,
+                "symbol": symbol,
+                "exchange": exchange,
+                "period": period,
+                "currency": base_currency or currency_for_ticker(ticker),
+                "analytics": analytics,
+                "chart_data": chart_data,
+                "data_points": len(chart_data),
+                "data_quality": hist.attrs.get("data_quality"),
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            if return_mode is not None:
+                result["return_mode"] = return_mode
+                result["corporate_actions"] = self.history_store.corporate_actions(ticker, hist.index[0].date())
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
+            metrics.inc("ticker_failures_total", ticker=symbol)
+            return {
+                "success": False,
+                "error": str(e),
+                "symbol": symbol,
+                "exchange": exchange,
+                "timestamp": datetime.now().isoformat()
+            }
 
-    def _calculate_yearly_returns(self, hist: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Calculate year-wise returns"""
-        try:
-            yearly_data = []
-            hist_copy = hist.copy()
-            hist_copy['Year'] = hist_copy.index.year
+    def get_historical_batch(self, symbols: List[str], exchange: str = "NSE", period: str = "30y",
+                             max_fetch_workers: int = 4, base_currency: Optional[str] = None,
+                             return_mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get historical analytics for many symbols at once
+        
+        Downloads run on a small I/O thread pool and each history is handed to the
+        analytics process pool as soon as it arrives, so heavy batches never run
+        pandas work on the threads that serve quote requests. Chart data is left
+        out to keep the response small; use the historical command for charts.
+        
+        Args:
+            symbols: List of stock symbols
+            exchange: Exchange (NSE, BSE, US)
+            period: Time period (30y, 20y, 10y, 5y, 3y, 1y, 6mo, 3mo, 1mo)
+            max_fetch_workers: Concurrent upstream downloads
+            base_currency: Optional currency prices are converted into before analytics
+            return_mode: Optional "price" or "total" to compute from the history store
+        
+        Returns:
+            Dictionary with analytics for each symbol
+        """
+        pool = self._get_analytics_pool()
+        # Fetch threads label their phase timings with the calling command and share its deadline
+        command = metrics.current_command
+        budget = deadlines.current()
+        
+        def fetch_and_submit(symbol: str):
+            ticker = self._get_history_ticker(symbol, exchange)
+            with metrics.bound_command(command), deadlines.bound(budget):
+                hist = self._to_base_currency(self._load_history(ticker, period, return_mode), ticker, base_currency)
+            if hist.empty:
+                return hist, None
+            # Blocks here (not in the caller) when the analytics queue is full
+            return hist, pool.submit(hist, symbol)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_fetch_workers, thread_name_prefix="history-fetch") as fetchers:
+            pending = {symbol: fetchers.submit(fetch_and_submit, symbol) for symbol in symbols}
             
-            for year in hist_copy['Year'].unique():
-                year_data = hist_copy[hist_copy['Year'] == year]
-                if len(year_data) > 0:
-                    year_start = year_data['Close'].iloc[0]
-                    year_end = year_data['Close'].iloc[-1]
-                    year_return = ((year_end - year_start) / year_start) * 100
-                    year_high = year_data['High'].max()
-                    year_low = year_data['Low'].min()
+            for symbol, fetch in pending.items():
+                try:
+                    hist, analytics_future = fetch.result()
+                    if analytics_future is None:
+                        results[symbol] = {
+                            "success": False,
+                            "error": "No historical data available",
+                            "symbol": symbol
+                        }
+                        continue
                     
-                    yearly_data.append({
-                        "year": int(year),
-                        "return_percent": round(year_return, 2),
-                        "start_price": round(year_start, 2),
-                        "end_price": round(year_end, 2),
-                        "high": round(year_high, 2),
-                        "low": round(year_low, 2),
-                        "trading_days": len(year_data)
-                    })
-            
-            return sorted(yearly_data, key=lambda x: x['year'])
-        except:
-            return []
+                    results[symbol] = {
+                        "success": True,
+                        "symbol": symbol,
+                        "analytics": analytics_future.result(),
+                        "data_points": len(hist),
+                        "data_quality": hist.attrs.get("data_quality")
+                    }
+                except Exception as e:
+                    logger.error(f"Error in historical batch for {symbol}: {str(e)}")
+                    results[symbol] = {
+                        "success": False,
+                        "error": str(e),
+                        "symbol": symbol
+                    }
+        
+        successful = len([data for data in results.values() if data.get("success")])
+        return {
+            "exchange": exchange,
+            "period": period,
+            "results": results,
+            "summary": {
+                "totalSymbols": len(symbols),
+                "successfulSymbols": successful,
+                "failedSymbols": len(symbols) - successful
+            },
+            "timestamp": datetime.now().isoformat()
+        }
 
-def main():
-    """Main function for CLI usage"""
-    if len(sys.argv) < 2:
-        print("Usage: python stockPriceService.py <command> [args]")
-        print("Commands:")
-        print("  single <symbol> [exchange]  - Get single stock price")
-        print("  multiple <symbol1,symbol2,...> [exchange]  - Get multiple stock prices")
-        print("  portfolio <symbol1,symbol2,...>  - Get portfolio prices")
-        print("  indices <market>  - Get market indices (INDIA/USA)")
-        print("  movers <market> <type>  - Get market movers (INDIA/USA, gainers/losers)")
-        print("  sectors <market>  - Get sector performance (INDIA/USA)")
-        print("  etfs <market>  - Get ETF data (INDIA/USA)")
-        print("  commodities  - Get commodity futures data")
-        print("  crypto  - Get cryptocurrency data")
-        print("  currencies  - Get currency pairs data")
-        print("  global_indices  - Get global market indices")
-        print("  historical <symbol> [exchange] [period]  - Get historical data with analytics")
-        return
-    
-    service = StockPriceService()
-    command = sys.argv[1]
+def execute_command(service: StockPriceService, command: str, args: List[str], profile: bool = False,
+                    deadline: Optional[float] = None) -> Any:
+    """
+    Run a single service command and return its JSON-serialisable result
+
+    Shared by the one-shot CLI and the long-running RPC server so both accept
+    exactly the same commands and arguments.
+
+    Args:
+        service: Service instance to run the command against
+        command: Command name (e.g., "single", "indices", "historical")
+        args: Positional command arguments, as they appear on the command line
+        profile: Capture a cProfile of this command regardless of the sampling rate
+        deadline: Optional time budget in seconds; upstream fetches stop once it is nearly
+            spent, and a dict result that had to use expired cache entries or skip items
+            is returned with partial: true
+
+    Returns:
+        The command result
+
+    Raises:
+        ValueError: If required arguments are missing or the command is unknown
+    """
+    budget = RequestBudget(deadline)
+    with metrics.command(command), profiler.profile(command, args, requested=profile), deadlines.bound(budget):
+        result = _run_command(service, command, args)
     
+    if budget.partial:
+        metrics.inc("partial_responses_total", command=command)
+        if isinstance(result, dict):
+            result.update(budget.summary())
+    return result
+
+def _deadline_from_env() -> Optional[float]:
+    """Per-command deadline in seconds from STOCK_SERVICE_DEADLINE_MS (None when unset)"""
+    value = os.environ.get("STOCK_SERVICE_DEADLINE_MS")
+    return float(value) / 1000.0 if value else None
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "SYM:weight,SYM:weight" into weights (a missing weight counts as 1)"""
+    weights = {}
+    for item in spec.split(","):
+        symbol, _, weight = item.partition(":")
+        if symbol:
+            try:
+                weights[symbol.strip()] = float(weight) if weight else 1.0
+            except ValueError:
+                raise ValueError(f"Invalid weight for {symbol}: '{weight}'")
+    if not weights:
+        raise ValueError("Holdings required (SYMBOL:weight,...)")
+    return weights
+
+def _run_command(service: StockPriceService, command: str, args: List[str]) -> Any:
+    """Command dispatch behind execute_command's instrumentation"""
     if command == "single":
-        if len(sys.argv) < 3:
-            print("Error: Symbol required")
-            return
+        if len(args) < 1:
+            raise ValueError("Symbol required")
         
-        symbol = sys.argv[2]
-        exchange = sys.argv[3] if len(sys.argv) > 3 else "NSE"
+        symbol = args[0]
+        exchange = args[1] if len(args) > 1 else "NSE"
         
-        result = service.get_stock_price(symbol, exchange)
-        print(json.dumps(result, indent=2))
+        return service.get_stock_price(symbol, exchange)
     
     elif command == "multiple":
-        if len(sys.argv) < 3:
-            print("Error: Symbols required")
-            return
+        if len(args) < 1:
+            raise ValueError("Symbols required")
         
-        symbols = sys.argv[2].split(",")
-        exchange = sys.argv[3] if len(sys.argv) > 3 else "NSE"
+        symbols = args[0].split(",")
+        exchange = args[1] if len(args) > 1 else "NSE"
         
-        result = service.get_multiple_stocks(symbols, exchange)
-        print(json.dumps(result, indent=2))
+        return service.get_multiple_stocks(symbols, exchange)
     
     elif command == "portfolio":
-        if len(sys.argv) < 3:
-            print("Error: Portfolio symbols required")
-            return
+        if len(args) < 1:
+            raise ValueError("Portfolio symbols required")
         
-        symbols = sys.argv[2].split(",")
+        symbols = args[0].split(",")
+        base_currency = args[1].upper() if len(args) > 1 else None
         
-        result = service.get_portfolio_prices(symbols)
-        print(json.dumps(result, indent=2))
+        return service.get_portfolio_prices(symbols, base_currency)
     
     elif command == "indices":
-        if len(sys.argv) < 3:
-            print("Error: Market required (INDIA/USA)")
-            return
-        
-        market = sys.argv[2]
+        if len(args) < 1:
+            raise ValueError("Market required (INDIA/USA)")
         
-        result = service.get_market_indices(market)
-        print(json.dumps(result, indent=2))
+        return service.get_market_indices(args[0])
     
     elif command == "movers":
-        if len(sys.argv) < 4:
-            print("Error: Market and type required (INDIA/USA, gainers/losers)")
-            return
+        if len(args) < 2:
+            raise ValueError("Market and type required (INDIA/USA, gainers/losers)")
         
-        market = sys.argv[2]
-        mover_type = sys.argv[3]
-        
-        result = service.get_market_movers(market, mover_type)
-        print(json.dumps(result, indent=2))
+        return service.get_market_movers(args[0], args[1])
     
     elif command == "sectors":
-        if len(sys.argv) < 3:
-            print("Error: Market required (INDIA/USA)")
-            return
-        
-        market = sys.argv[2]
+        if len(args) < 1:
+            raise ValueError("Market required (INDIA/USA)")
         
-        result = service.get_sector_performance(market)
-        print(json.dumps(result, indent=2))
+        return service.get_sector_performance(args[0])
     
     elif command == "etfs":
-        if len(sys.argv) < 3:
-            print("Error: Market required (INDIA/USA)")
-            return
-        
-        market = sys.argv[2]
+        if len(args) < 1:
+            raise ValueError("Market required (INDIA/USA)")
         
-        result = service.get_etf_data(market)
-        print(json.dumps(result, indent=2))
+        return service.get_etf_data(args[0])
     
     elif command == "commodities":
-        result = service.get_commodity_data()
-        print(json.dumps(result, indent=2))
+        return service.get_commodity_data()
     
     elif command == "crypto":
-        result = service.get_cryptocurrency_data()
-        print(json.dumps(result, indent=2))
+        return service.get_cryptocurrency_data()
     
     elif command == "currencies":
-        result = service.get_currency_data()
-        print(json.dumps(result, indent=2))
+        return service.get_currency_data()
     
     elif command == "global_indices":
-        result = service.get_global_indices()
-        print(json.dumps(result, indent=2))
+        return service.get_global_indices()
+    
+    elif command == "quotes":
+        if len(args) < 1:
+            raise ValueError("Tickers required")
+        
+        quotes = service.get_quote_snapshots(args[0].split(","))
+        if len(args) > 1:
+            service.convert_to_base(list(quotes.values()), args[1].upper(), fields=("lastPrice", "change"))
+        return quotes
+    
+    elif command == "market_status":
+        if len(args) < 1:
+            raise ValueError("Tickers required")
+        
+        return {
+            "markets": {ticker: service.calendar.market_status(ticker) for ticker in args[0].split(",")},
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    elif command == "fx":
+        if len(args) < 1:
+            raise ValueError("Currencies required (e.g., USD,INR,EUR)")
+        
+        return service.fx.matrix(args[0].upper().split(","))
     
     elif command == "historical":
-        if len(sys.argv) < 3:
-            print("Error: Symbol required")
-            return
+        if len(args) < 1:
+            raise ValueError("Symbol required")
+        
+        symbol = args[0]
+        exchange = args[1] if len(args) > 1 else "NSE"
+        period = args[2] if len(args) > 2 else "30y"
+        base_currency = args[3].upper() if len(args) > 3 and args[3] else None
+        return_mode = args[4] if len(args) > 4 else None
+        
+        return service.get_historical_data(symbol, exchange, period, base_currency, return_mode)
+    
+    elif command == "historical_batch":
+        if len(args) < 1:
+            raise ValueError("Symbols required")
+        
+        symbols = args[0].split(",")
+        exchange = args[1] if len(args) > 1 else "NSE"
+        period = args[2] if len(args) > 2 else "30y"
+        base_currency = args[3].upper() if len(args) > 3 and args[3] else None
+        return_mode = args[4] if len(args) > 4 else None
+        
+        return service.get_historical_batch(symbols, exchange, period, base_currency=base_currency,
+                                            return_mode=return_mode)
+    
+    elif command == "risk":
+        if len(args) < 1:
+            raise ValueError("Holdings required (SYMBOL:weight,...)")
+        
+        holdings = _parse_weights(args[0])
+        exchange = args[1] if len(args) > 1 else "NSE"
+        confidence = float(args[2]) if len(args) > 2 else 0.95
+        horizon_days = int(args[3]) if len(args) > 3 else 1
+        lookback_years = float(args[4]) if len(args) > 4 else 3
+        
+        return service.get_portfolio_risk(holdings, exchange, confidence, horizon_days, lookback_years)
+    
+    elif command == "optimize":
+        if len(args) < 1:
+            raise ValueError("Symbols required")
+        
+        # "SYM:weight" entries are current holdings and add rebalancing trades; bare symbols are candidates
+        symbols = list(_parse_weights(args[0]))
+        held = [item for item in args[0].split(",") if ":" in item]
+        current_weights = _parse_weights(",".join(held)) if held else None
+        exchange = args[1] if len(args) > 1 else "NSE"
+        lookback_years = float(args[2]) if len(args) > 2 else 3
+        max_weight = float(args[3]) if len(args) > 3 else 1.0
+        shrinkage = args[4] if len(args) > 4 else "ledoit_wolf"
+        
+        return service.get_portfolio_optimization(symbols, exchange, lookback_years, max_weight,
+                                                  shrinkage, current_weights)
+    
+    elif command == "backtest":
+        if len(args) < 1:
+            raise ValueError("Symbols required")
+        
+        holdings = _parse_weights(args[0])
+        exchange = args[1] if len(args) > 1 else "NSE"
+        # Moving-average windows ride on the strategy name, e.g. "ma_crossover:20:100"
+        strategy, *windows = (args[2] if len(args) > 2 else "sip").split(":")
+        amount = float(args[3]) if len(args) > 3 else 10000
+        years = float(args[4]) if len(args) > 4 else 20
+        frequency = args[5].upper() if len(args) > 5 else "M"
+        fast = int(windows[0]) if len(windows) > 0 else 50
+        slow = int(windows[1]) if len(windows) > 1 else 200
+        
+        return service.get_backtest(holdings, exchange, strategy, amount, years, frequency, fast, slow)
+    
+    elif command == "screen":
+        if len(args) < 1:
+            raise ValueError("Screen expression required (e.g. \"rsi < 30 and close > ma200\")")
+        
+        expression = args[0]
+        sort_by = args[1] if len(args) > 1 and args[1] else None
+        limit = int(args[2]) if len(args) > 2 else 50
+        universe = args[3] if len(args) > 3 else None
+        
+        return service.get_screen(expression, sort_by, limit, universe)
+    
+    elif command == "preload":
+        if len(args) < 1:
+            raise ValueError("Universe required (US, CRYPTO, COMMODITIES, CURRENCIES, GLOBAL, a comma list or @symbol_file)")
+        
+        universe = args[0]
+        workers = int(args[1]) if len(args) > 1 else 8
+        requests_per_second = float(args[2]) if len(args) > 2 else 4.0
+        fundamentals = args[3].lower() not in ("no", "false", "0") if len(args) > 3 else True
         
-        symbol = sys.argv[2]
-        exchange = sys.argv[3] if len(sys.argv) > 3 else "NSE"
-        period = sys.argv[4] if len(sys.argv) > 4 else "30y"
+        return service.preload(universe, workers, requests_per_second, fundamentals)
+    
+    elif command == "stats":
+        # Optional path: also write a Prometheus text dump there
+        stats = metrics.snapshot()
+        if len(args) > 0:
+            stats["prometheusFile"] = metrics.dump_prometheus(args[0])
+        return stats
+    
+    elif command == "profile_summary":
+        limit = int(args[0]) if len(args) > 0 else 20
+        only_command = args[1] if len(args) > 1 else None
         
-        result = service.get_historical_data(symbol, exchange, period)
-        print(json.dumps(result, indent=2))
+        return profiler.summary(limit=limit, command=only_command)
     
     else:
-        print(f"Error: Unknown command '{command}'")
+        raise ValueError(f"Unknown command '{command}'")
+
+def main():
+    """Main function for CLI usage"""
+    if len(sys.argv) < 2:
+        print("Usage: python stockPriceService.py <command> [args]")
+        print("Commands:")
+        print("  single <symbol> [exchange]  - Get single stock price")
+        print("  multiple <symbol1,symbol2,...> [exchange]  - Get multiple stock prices")
+        print("  portfolio <symbol1,symbol2,...> [base_currency]  - Get portfolio prices")
+        print("  indices <market>  - Get market indices (INDIA/USA)")
+        print("  movers <market> <type>  - Get market movers (INDIA/USA, gainers/losers)")
+        print("  sectors <market>  - Get sector performance (INDIA/USA)")
+        print("  etfs <market>  - Get ETF data (INDIA/USA)")
+        print("  commodities  - Get commodity futures data")
+        print("  crypto  - Get cryptocurrency data")
+        print("  currencies  - Get currency pairs data")
+        print("  global_indices  - Get global market indices")
+        print("  quotes <ticker1,ticker2,...> [base_currency]  - Get lightweight quotes for raw tickers")
+        print("  fx <currency1,currency2,...>  - Cross-rate matrix triangulated from USD pivot rates")
+        print("  market_status <ticker1,ticker2,...>  - Get exchange open/closed state from the trading calendar")
+        print("  historical <symbol> [exchange] [period] [base_currency] [price|total]  - Get historical data with analytics")
+        print("  historical_batch <symbol1,symbol2,...> [exchange] [period] [base_currency] [price|total]  - Get analytics for many symbols")
+        print("  risk <symbol:weight,...> [exchange] [confidence] [horizon_days] [lookback_years]  - Portfolio VaR/CVaR")
+        print("  optimize <symbol[:weight],...> [exchange] [lookback_years] [max_weight] [shrinkage]  - Efficient frontier and rebalancing")
+        print("  backtest <symbol[:weight],...> [exchange] [strategy] [amount] [years] [frequency]  - Replay sip/lump_sum/ma_crossover[:fast:slow]/rebalance")
+        print("  screen <expression> [sort_column] [limit] [universe]  - Filter stored tickers, e.g. \"rsi < 30 and close > ma200\"")
+        print("  preload <universe|@symbol_file> [workers] [requests_per_second] [fundamentals yes|no]  - Seed the local history store, resumable")
+        print("  stats [prometheus_file]  - Get service metrics, optionally writing a Prometheus text dump")
+        print("  profile_summary [limit] [command]  - Top cumulative-time functions across recent profiles")
+        print("  serve [tick_seconds] [refresh_seconds]  - Run as a JSON-lines RPC server on stdin/stdout")
+        return
+    
+    service = StockPriceService()
+    command = sys.argv[1]
+    metrics.set_gauge("process_startup_seconds", time.perf_counter() - _IMPORT_STARTED)
+    
+    if command == "serve":
+        from rpcServer import StockServiceRPCServer
+        
+        tick_interval = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+        refresh_interval = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+        
+        # Long-running mode: keep analytics off the request threads from the start
+        service._get_analytics_pool()
+        
+        server = StockServiceRPCServer(
+            service,
+            execute_command,
+            tick_interval=tick_interval,
+            refresh_interval=refresh_interval,
+            metrics_file=os.environ.get("STOCK_SERVICE_METRICS_FILE"),
+            default_deadline=_deadline_from_env()
+        )
+        try:
+            server.serve_forever()
+        finally:
+            service.close()
+        return
+    
+    try:
+        result = execute_command(service, command, sys.argv[2:], deadline=_deadline_from_env())
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return
+    finally:
+        service.close()
+    
+    with metrics.phase("serialize", command):
+        output = json.dumps(result, indent=2)
+    print(output)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Stock Screener
+Filter expressions compiled to vectorized masks over the indicator table
+
+Expressions use Python comparison syntax over indicator columns, e.g.
+
+    rsi < 30 and close > ma200
+    fromHigh52wPercent > -5 and volumeRatio >= 2
+    -2 <= changePercent <= 5 or not (ma50 > ma200)
+
+Each expression is parsed once into a tree of NumPy operations; evaluating it
+against the table is a handful of whole-column comparisons. Rows with a missing
+value fail any comparison on that column, negated or not.
+
+Run `python3 stockScreener.py` to check that missing values never match.
+"""
+
+import ast
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import numpy as np
+
+from indicatorState import INDICATOR_COLUMNS
+
+ColumnFunction = Callable[[Dict[str, np.ndarray]], np.ndarray]
+Condition = Tuple[np.ndarray, np.ndarray]
+ConditionFunction = Callable[[Dict[str, np.ndarray]], Condition]
+
+_COMPARISONS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne
+}
+_ARITHMETIC = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv
+}
+
+
+def _is_condition(node: ast.AST) -> bool:
+    """Whether a node is true/false per row (a comparison or a logical combination of them)"""
+    return isinstance(node, (ast.BoolOp, ast.Compare)) or (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not))
+
+
+def _compile_condition(node: ast.AST) -> ConditionFunction:
+    """
+    Translate a condition into a function returning (definitely true, definitely false) row masks
+
+    A comparison involving a missing value is neither, so "not" and "or" cannot
+    turn it into a match: logic is three-valued, and only definitely true rows pass.
+    """
+    if not _is_condition(node):
+        raise ValueError("Expected a comparison, e.g. rsi < 30")
+
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_condition(value) for value in node.values]
+        conjunction = isinstance(node.op, ast.And)
+
+        def combine(columns: Dict[str, np.ndarray]) -> Condition:
+            trues, falses = zip(*(part(columns) for part in parts))
+            if conjunction:
+                return np.logical_and.reduce(trues), np.logical_or.reduce(falses)
+            return np.logical_or.reduce(trues), np.logical_and.reduce(falses)
+        return combine
+
+    if isinstance(node, ast.UnaryOp):
+        inner = _compile_condition(node.operand)
+
+        def negate(columns: Dict[str, np.ndarray]) -> Condition:
+            is_true, is_false = inner(columns)
+            return is_false, is_true
+        return negate
+
+    # Chained comparisons (a < b < c) become (a < b) and (b < c)
+    operands = [_compile_value(node.left)] + [_compile_value(comparator) for comparator in node.comparators]
+    operations = []
+    for op in node.ops:
+        if type(op) not in _COMPARISONS:
+            raise ValueError(f"Unsupported comparison '{type(op).__name__}'")
+        operations.append(_COMPARISONS[type(op)])
+
+    def compare(columns: Dict[str, np.ndarray]) -> Condition:
+        values = [operand(columns) for operand in operands]
+        missing = [np.isnan(value) for value in values]
+        trues, falses = [], []
+        with np.errstate(invalid="ignore"):
+            for i, op in enumerate(operations):
+                result = op(values[i], values[i + 1])
+                present = ~missing[i] & ~missing[i + 1]
+                # NaN != x is true, so both masks need the missing rows removed
+                trues.append(result & present)
+                falses.append(~result & present)
+        return np.logical_and.reduce(trues), np.logical_or.reduce(falses)
+    return compare
+
+
+def _compile_value(node: ast.AST) -> ColumnFunction:
+    """Translate a numeric expression node into a function of the column dictionary"""
+    if _is_condition(node):
+        raise ValueError("Comparisons cannot be used as numbers; combine them with and/or/not")
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        inner = _compile_value(node.operand)
+        return lambda columns: -inner(columns)
+
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in _ARITHMETIC:
+            raise ValueError(f"Unsupported operator '{type(node.op).__name__}'")
+        left, right, op = _compile_value(node.left), _compile_value(node.right), _ARITHMETIC[type(node.op)]
+
+        def arithmetic(columns: Dict[str, np.ndarray]) -> np.ndarray:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return op(left(columns), right(columns))
+        return arithmetic
+
+    if isinstance(node, ast.Name):
+        if node.id not in INDICATOR_COLUMNS:
+            raise ValueError(f"Unknown column '{node.id}' (available: {', '.join(INDICATOR_COLUMNS)})")
+        name = node.id
+        return lambda columns: columns[name]
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = float(node.value)
+        return lambda columns: value
+
+    raise ValueError(f"Unsupported expression element '{type(node).__name__}'")
+
+
+@lru_cache(maxsize=256)
+def compile_screen(expression: str) -> ColumnFunction:
+    """
+    Compile a filter expression into a function returning a boolean row mask
+
+    Args:
+        expression: Filter expression over indicator columns
+
+    Returns:
+        Function taking a column dictionary and returning a boolean mask
+
+    Raises:
+        ValueError: If the expression is malformed or uses unsupported syntax
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid screen expression: {e.msg}")
+
+    if not _is_condition(tree.body):
+        raise ValueError("Screen expression must be a comparison")
+    evaluate = _compile_condition(tree.body)
+
+    def mask(columns: Dict[str, np.ndarray]) -> np.ndarray:
+        rows = len(next(iter(columns.values())))
+        # Expressions over constants only (1 < 2) give one value for every row
+        return np.broadcast_to(evaluate(columns)[0], (rows,))
+    return mask
+
+
+def run_screen(table: np.ndarray, expression: str, sort_by: Optional[str] = None,
+               limit: int = 50) -> Dict[str, Any]:
+    """
+    Evaluate a screen against the indicator table
+
+    Args:
+        table: Indicator table from IndicatorState
+        expression: Filter expression
+        sort_by: Column to sort matches by; prefix with "-" for descending
+        limit: Maximum matches returned
+
+    Returns:
+        Dictionary with the matching rows and counts
+    """
+    mask_function = compile_screen(expression)
+    columns = {column: table[column] for column in INDICATOR_COLUMNS}
+    mask = mask_function(columns) if len(table) else np.zeros(0, dtype=bool)
+    matches = np.flatnonzero(mask)
+
+    if sort_by:
+        descending = sort_by.startswith("-")
+        key = sort_by.lstrip("-")
+        if key not in INDICATOR_COLUMNS:
+            raise ValueError(f"Unknown sort column '{key}'")
+        values = table[key][matches]
+        # NaNs sort last in either direction
+        order = np.argsort(np.where(np.isnan(values), np.inf, -values if descending else values), kind="stable")
+        matches = matches[order]
+
+    rows: List[Dict[str, Any]] = []
+    for index in matches[:limit]:
+        row = table[index]
+        entry = {"ticker": str(row["ticker"]), "asOf": str(row["asOf"])}
+        for column in INDICATOR_COLUMNS:
+            value = float(row[column])
+            entry[column] = round(value, 2) if np.isfinite(value) else None
+        rows.append(entry)
+
+    return {
+        "expression": expression,
+        "matches": rows,
+        "matchCount": int(len(matches)),
+        "universeSize": int(len(table))
+    }
+
+
+def check_missing_values() -> None:
+    """Assert that rows with a missing value fail every comparison, negated or not"""
+    columns = {column: np.array([np.nan, 40.0, 60.0]) for column in INDICATOR_COLUMNS}
+    expected = {
+        "rsi != 50": [False, True, True],
+        "not (rsi == 50)": [False, True, True],
+        "rsi == 40": [False, True, False],
+        "not (rsi != 40)": [False, True, False],
+        "not (rsi > 50)": [False, True, False],
+        "rsi > 50 or not (rsi < 50)": [False, False, True],
+        "not (rsi > 50 and rsi != 40)": [False, True, False],
+    }
+    for expression, mask in expected.items():
+        result = compile_screen(expression)(columns).tolist()
+        assert result == mask, f"{expression}: {result}, expected {mask}"
+
+
+if __name__ == "__main__":
+    check_missing_values()
+    print("ok")
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Trading Calendar
+Offline exchange sessions and holidays, used to skip fetches while markets are closed
+
+Holidays come from rules (weekday-of-month, Easter-relative, observed-date
+shifts) where an exchange publishes stable rules, and from yearly tables where
+it does not (NSE/BSE festival holidays, lunar new year closures). Years missing
+from a table fall back to the fixed-date national holidays, which errs on the
+side of treating a day as open: a wrong "open" only costs one extra fetch,
+while a wrong "closed" would serve stale data.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+from zoneinfo import ZoneInfo
+
+MON, TUE, WED, THU, FRI, SAT, SUN = range(7)
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=1 is the first)"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def last_weekday(year: int, month: int, weekday: int) -> date:
+    """Last given weekday of a month"""
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed_nearest(day: date) -> date:
+    """US-style observance: Saturday moves to Friday, Sunday to Monday"""
+    if day.weekday() == SAT:
+        return day - timedelta(days=1)
+    if day.weekday() == SUN:
+        return day + timedelta(days=1)
+    return day
+
+
+def observed_monday(day: date) -> date:
+    """Weekend holidays move to the following Monday"""
+    if day.weekday() >= SAT:
+        return day + timedelta(days=7 - day.weekday())
+    return day
+
+
+def _weekdays(days: Iterable[date]) -> Dict[date, str]:
+    return {d: "Holiday" for d in days if d.weekday() < SAT}
+
+
+# ---------------------------------------------------------------------------
+# Holiday rules per exchange
+# ---------------------------------------------------------------------------
+
+def nyse_holidays(year: int) -> Dict[date, str]:
+    holidays = {}
+    new_year = date(year, 1, 1)
+    # NYSE does not close on Friday Dec 31 when Jan 1 falls on a Saturday
+    if new_year.weekday() != SAT:
+        holidays[observed_nearest(new_year)] = "New Year's Day"
+    holidays[nth_weekday(year, 1, MON, 3)] = "Martin Luther King Jr. Day"
+    holidays[nth_weekday(year, 2, MON, 3)] = "Washington's Birthday"
+    holidays[easter_sunday(year) - timedelta(days=2)] = "Good Friday"
+    holidays[last_weekday(year, 5, MON)] = "Memorial Day"
+    if year >= 2022:
+        holidays[observed_nearest(date(year, 6, 19))] = "Juneteenth"
+    holidays[observed_nearest(date(year, 7, 4))] = "Independence Day"
+    holidays[nth_weekday(year, 9, MON, 1)] = "Labor Day"
+    holidays[nth_weekday(year, 11, THU, 4)] = "Thanksgiving Day"
+    holidays[observed_nearest(date(year, 12, 25))] = "Christmas Day"
+    holidays.update({d: name for d, name in NYSE_SPECIAL_CLOSURES.items() if d.year == year})
+    return holidays
+
+
+NYSE_SPECIAL_CLOSURES = {
+    date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+
+def nyse_early_closes(year: int) -> Dict[date, time]:
+    early = {}
+    holidays = nyse_holidays(year)
+    july_3 = date(year, 7, 3)
+    if july_3.weekday() < SAT and july_3 not in holidays:
+        early[july_3] = time(13, 0)
+    early[nth_weekday(year, 11, THU, 4) + timedelta(days=1)] = time(13, 0)
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < SAT and christmas_eve not in holidays:
+        early[christmas_eve] = time(13, 0)
+    return early
+
+
+# NSE and BSE publish festival holidays yearly; both follow the same list
+NSE_HOLIDAY_TABLE = {
+    2024: [
+        (date(2024, 1, 22), "Special Holiday"),
+        (date(2024, 1, 26), "Republic Day"),
+        (date(2024, 3, 8), "Mahashivratri"),
+        (date(2024, 3, 25), "Holi"),
+        (date(2024, 3, 29), "Good Friday"),
+        (date(2024, 4, 11), "Id-Ul-Fitr"),
+        (date(2024, 4, 17), "Shri Ram Navmi"),
+        (date(2024, 5, 1), "Maharashtra Day"),
+        (date(2024, 5, 20), "General Elections"),
+        (date(2024, 6, 17), "Bakri Id"),
+        (date(2024, 7, 17), "Moharram"),
+        (date(2024, 8, 15), "Independence Day"),
+        (date(2024, 10, 2), "Mahatma Gandhi Jayanti"),
+        (date(2024, 11, 1), "Diwali Laxmi Pujan"),
+        (date(2024, 11, 15), "Gurunanak Jayanti"),
+        (date(2024, 11, 20), "Maharashtra Assembly Elections"),
+        (date(2024, 12, 25), "Christmas"),
+    ],
+    2025: [
+        (date(2025, 2, 26), "Mahashivratri"),
+        (date(2025, 3, 14), "Holi"),
+        (date(2025, 3, 31), "Id-Ul-Fitr"),
+        (date(2025, 4, 10), "Shri Mahavir Jayanti"),
+        (date(2025, 4, 14), "Dr. Baba Saheb Ambedkar Jayanti"),
+        (date(2025, 4, 18), "Good Friday"),
+        (date(2025, 5, 1), "Maharashtra Day"),
+        (date(2025, 8, 15), "Independence Day"),
+        (date(2025, 8, 27), "Ganesh Chaturthi"),
+        (date(2025, 10, 2), "Mahatma Gandhi Jayanti/Dussehra"),
+        (date(2025, 10, 21), "Diwali Laxmi Pujan"),
+        (date(2025, 10, 22), "Balipratipada"),
+        (date(2025, 11, 5), "Guru Nanak Jayanti"),
+        (date(2025, 12, 25), "Christmas"),
+    ],
+    2026: [
+        (date(2026, 1, 26), "Republic Day"),
+        (date(2026, 3, 3), "Holi"),
+        (date(2026, 3, 26), "Shri Ram Navami"),
+        (date(2026, 3, 31), "Shri Mahavir Jayanti"),
+        (date(2026, 4, 3), "Good Friday"),
+        (date(2026, 4, 14), "Dr. Baba Saheb Ambedkar Jayanti"),
+        (date(2026, 5, 1), "Maharashtra Day"),
+        (date(2026, 5, 28), "Bakri Id"),
+        (date(2026, 6, 26), "Muharram"),
+        (date(2026, 9, 14), "Ganesh Chaturthi"),
+        (date(2026, 10, 2), "Mahatma Gandhi Jayanti"),
+        (date(2026, 10, 20), "Dussehra"),
+        (date(2026, 11, 10), "Diwali Balipratipada"),
+        (date(2026, 11, 24), "Guru Nanak Jayanti"),
+        (date(2026, 12, 25), "Christmas"),
+    ],
+}
+
+# Diwali Muhurat trading: a one-hour evening session on an otherwise closed day
+NSE_SPECIAL_SESSIONS = {
+    date(2024, 11, 1): (time(18, 0), time(19, 0)),
+    date(2025, 10, 21): (time(13, 45), time(14, 45)),
+}
+
+
+def nse_holidays(year: int) -> Dict[date, str]:
+    if year in NSE_HOLIDAY_TABLE:
+        return dict(NSE_HOLIDAY_TABLE[year])
+
+    # Unpublished year: only the fixed-date national holidays are certain
+    fixed = [date(year, 1, 26), date(year, 5, 1), date(year, 8, 15), date(year, 10, 2), date(year, 12, 25)]
+    return _weekdays(fixed)
+
+
+def uk_christmas(year: int) -> List[date]:
+    """Christmas and Boxing Day with UK substitute days"""
+    christmas = date(year, 12, 25)
+    if christmas.weekday() == FRI:
+        return [christmas, date(year, 12, 28)]
+    if christmas.weekday() == SAT:
+        return [date(year, 12, 27), date(year, 12, 28)]
+    if christmas.weekday() == SUN:
+        return [date(year, 12, 26), date(year, 12, 27)]
+    return [christmas, date(year, 12, 26)]
+
+
+def lse_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        observed_monday(date(year, 1, 1)),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        nth_weekday(year, 5, MON, 1),
+        last_weekday(year, 5, MON),
+        last_weekday(year, 8, MON),
+    ] + uk_christmas(year)
+    return _weekdays(days)
+
+
+def lse_early_closes(year: int) -> Dict[date, time]:
+    return {d: time(12, 30) for d in (date(year, 12, 24), date(year, 12, 31)) if d.weekday() < SAT}
+
+
+def xetra_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1), date(year, 5, 1),
+        date(year, 12, 24), date(year, 12, 25), date(year, 12, 26), date(year, 12, 31),
+    ]
+    return _weekdays(days)
+
+
+def euronext_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1), date(year, 5, 1),
+        date(year, 12, 25), date(year, 12, 26),
+    ]
+    return _weekdays(days)
+
+
+def euronext_early_closes(year: int) -> Dict[date, time]:
+    return {d: time(14, 5) for d in (date(year, 12, 24), date(year, 12, 31)) if d.weekday() < SAT}
+
+
+def borsa_italiana_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1), date(year, 5, 1),
+        date(year, 8, 15), date(year, 12, 24), date(year, 12, 25), date(year, 12, 26), date(year, 12, 31),
+    ]
+    return _weekdays(days)
+
+
+def six_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), date(year, 1, 2), easter - timedelta(days=2), easter + timedelta(days=1),
+        date(year, 5, 1), easter + timedelta(days=39), easter + timedelta(days=50), date(year, 8, 1),
+        date(year, 12, 24), date(year, 12, 25), date(year, 12, 26), date(year, 12, 31),
+    ]
+    return _weekdays(days)
+
+
+def tsx_holidays(year: int) -> Dict[date, str]:
+    victoria_day = date(year, 5, 24) - timedelta(days=date(year, 5, 24).weekday())
+    days = [
+        observed_monday(date(year, 1, 1)), nth_weekday(year, 2, MON, 3), easter_sunday(year) - timedelta(days=2),
+        victoria_day, observed_monday(date(year, 7, 1)), nth_weekday(year, 8, MON, 1),
+        nth_weekday(year, 9, MON, 1), nth_weekday(year, 10, MON, 2),
+    ] + uk_christmas(year)
+    return _weekdays(days)
+
+
+def tsx_early_closes(year: int) -> Dict[date, time]:
+    christmas_eve = date(year, 12, 24)
+    return {christmas_eve: time(13, 0)} if christmas_eve.weekday() < SAT else {}
+
+
+def jpx_holidays(year: int) -> Dict[date, str]:
+    years_since_1980 = year - 1980
+    leap_shift = years_since_1980 // 4
+    vernal_equinox = date(year, 3, int(20.8431 + 0.242194 * years_since_1980 - leap_shift))
+    autumn_equinox = date(year, 9, int(23.2488 + 0.242194 * years_since_1980 - leap_shift))
+
+    national = [
+        date(year, 1, 1), nth_weekday(year, 1, MON, 2), date(year, 2, 11), date(year, 2, 23),
+        vernal_equinox, date(year, 4, 29), date(year, 5, 3), date(year, 5, 4), date(year, 5, 5),
+        nth_weekday(year, 7, MON, 3), date(year, 8, 11), nth_weekday(year, 9, MON, 3), autumn_equinox,
+        nth_weekday(year, 10, MON, 2), date(year, 11, 3), date(year, 11, 23),
+    ]
+    # Substitute holiday: a Sunday holiday moves to the next non-holiday weekday
+    days = set(national)
+    for day in national:
+        if day.weekday() == SUN:
+            substitute = day + timedelta(days=1)
+            while substitute in days:
+                substitute += timedelta(days=1)
+            days.add(substitute)
+
+    # Exchange year-end closure
+    days.update([date(year, 1, 2), date(year, 1, 3), date(year, 12, 31)])
+    return _weekdays(days)
+
+
+# Lunar new year (first day), used by the Asian exchanges below
+LUNAR_NEW_YEAR = {
+    2024: date(2024, 2, 10),
+    2025: date(2025, 1, 29),
+    2026: date(2026, 2, 17),
+    2027: date(2027, 2, 6),
+}
+
+
+def hkex_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        observed_monday(date(year, 1, 1)), easter - timedelta(days=2), easter + timedelta(days=1),
+        date(year, 5, 1), date(year, 7, 1), date(year, 10, 1), date(year, 12, 25), date(year, 12, 26),
+    ]
+    lunar = LUNAR_NEW_YEAR.get(year)
+    if lunar:
+        days += [lunar + timedelta(days=offset) for offset in range(3)]
+    return _weekdays(days)
+
+
+def krx_holidays(year: int) -> Dict[date, str]:
+    days = [
+        date(year, 1, 1), date(year, 3, 1), date(year, 5, 5), date(year, 6, 6), date(year, 8, 15),
+        date(year, 10, 3), date(year, 10, 9), date(year, 12, 25), date(year, 12, 31),
+    ]
+    lunar = LUNAR_NEW_YEAR.get(year)
+    if lunar:
+        days += [lunar + timedelta(days=offset) for offset in (-1, 0, 1)]
+    return _weekdays(days)
+
+
+def twse_holidays(year: int) -> Dict[date, str]:
+    days = [date(year, 1, 1), date(year, 2, 28), date(year, 4, 4), date(year, 10, 10)]
+    lunar = LUNAR_NEW_YEAR.get(year)
+    if lunar:
+        days += [lunar + timedelta(days=offset) for offset in (-1, 0, 1, 2)]
+    return _weekdays(days)
+
+
+def asx_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        observed_monday(date(year, 1, 1)), observed_monday(date(year, 1, 26)),
+        easter - timedelta(days=2), easter + timedelta(days=1), date(year, 4, 25),
+        nth_weekday(year, 6, MON, 2),
+    ] + uk_christmas(year)
+    return _weekdays(days)
+
+
+def b3_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), easter - timedelta(days=48), easter - timedelta(days=47), easter - timedelta(days=2),
+        date(year, 4, 21), date(year, 5, 1), easter + timedelta(days=60), date(year, 9, 7),
+        date(year, 10, 12), date(year, 11, 2), date(year, 11, 15), date(year, 12, 24),
+        date(year, 12, 25), date(year, 12, 31),
+    ]
+    if year >= 2024:
+        days.append(date(year, 11, 20))
+    return _weekdays(days)
+
+
+def bmv_holidays(year: int) -> Dict[date, str]:
+    easter = easter_sunday(year)
+    days = [
+        date(year, 1, 1), nth_weekday(year, 2, MON, 1), nth_weekday(year, 3, MON, 3),
+        easter - timedelta(days=3), easter - timedelta(days=2), date(year, 5, 1), date(year, 9, 16),
+        nth_weekday(year, 11, MON, 3), date(year, 12, 12), date(year, 12, 25),
+    ]
+    return _weekdays(days)
+
+
+def idx_holidays(year: int) -> Dict[date, str]:
+    # Islamic and lunar holidays move every year; only fixed dates are encoded
+    days = [date(year, 1, 1), date(year, 5, 1), date(year, 6, 1), date(year, 8, 17), date(year, 12, 25), date(year, 12, 26)]
+    return _weekdays(days)
+
+
+# ---------------------------------------------------------------------------
+# Calendars
+# ---------------------------------------------------------------------------
+
+class ExchangeCalendar:
+    """Sessions of one exchange in its local timezone"""
+
+    def __init__(self, code: str, name: str, tz: str, open_time: time, close_time: time,
+                 holiday_rules: Callable[[int], Dict[date, str]],
+                 early_close_rules: Optional[Callable[[int], Dict[date, time]]] = None,
+                 special_sessions: Optional[Dict[date, Tuple[time, time]]] = None):
+        """
+        Args:
+            code: Exchange code (e.g., "NYSE", "NSE")
+            name: Display name
+            tz: IANA timezone of the exchange
+            open_time: Regular session open (local time)
+            close_time: Regular session close (local time)
+            holiday_rules: Callable returning {date: holiday name} for a year
+            early_close_rules: Callable returning {date: early close time} for a year
+            special_sessions: Sessions on otherwise closed days, {date: (open, close)}
+        """
+        self.code = code
+        self.name = name
+        self.tz = ZoneInfo(tz)
+        self.open_time = open_time
+        self.close_time = close_time
+        self._holiday_rules = holiday_rules
+        self._early_close_rules = early_close_rules
+        self.special_sessions = special_sessions or {}
+        self.holidays = lru_cache(maxsize=64)(self._holidays)
+        self.early_closes = lru_cache(maxsize=64)(self._early_closes)
+
+    def _holidays(self, year: int) -> Dict[date, str]:
+        return self._holiday_rules(year)
+
+    def _early_closes(self, year: int) -> Dict[date, time]:
+        return self._early_close_rules(year) if self._early_close_rules else {}
+
+    def is_trading_day(self, day: date) -> bool:
+        if day in self.special_sessions:
+            return True
+        return day.weekday() < SAT and day not in self.holidays(day.year)
+
+    def session(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """Open and close of the session on a local date, or None when closed"""
+        if day in self.special_sessions:
+            open_time, close_time = self.special_sessions[day]
+        elif self.is_trading_day(day):
+            open_time = self.open_time
+            close_time = self.early_closes(day.year).get(day, self.close_time)
+        else:
+            return None
+
+        return (datetime.combine(day, open_time, tzinfo=self.tz),
+                datetime.combine(day, close_time, tzinfo=self.tz))
+
+    def is_open(self, at: datetime) -> bool:
+        session = self.session(at.astimezone(self.tz).date())
+        return session is not None and session[0] <= at < session[1]
+
+    def next_open(self, at: datetime) -> datetime:
+        """First session open at or after the given moment"""
+        day = at.astimezone(self.tz).date()
+        for offset in range(0, 30):
+            session = self.session(day + timedelta(days=offset))
+            if session and session[1] > at:
+                return max(session[0], at)
+        return at
+
+    def last_close(self, at: datetime) -> Optional[datetime]:
+        """Close of the most recent session that ended at or before the given moment"""
+        day = at.astimezone(self.tz).date()
+        for offset in range(0, 30):
+            session = self.session(day - timedelta(days=offset))
+            if session and session[1] <= at:
+                return session[1]
+        return None
+
+
+class ContinuousCalendar:
+    """Markets without exchange sessions: crypto trades 24/7, FX and futures 24/5"""
+
+    def __init__(self, code: str, name: str, weekend_close: bool):
+        """
+        Args:
+            code: Calendar code
+            name: Display name
+            weekend_close: Closed from Friday 17:00 to Sunday 17:00 New York time
+        """
+        self.code = code
+        self.name = name
+        self.tz = ZoneInfo("America/New_York")
+        self.weekend_close = weekend_close
+
+    def is_trading_day(self, day: date) -> bool:
+        return not self.weekend_close or day.weekday() != SAT
+
+    def is_open(self, at: datetime) -> bool:
+        if not self.weekend_close:
+            return True
+        local = at.astimezone(self.tz)
+        weekday, hour = local.weekday(), local.hour
+        return not (weekday == SAT or (weekday == FRI and hour >= 17) or (weekday == SUN and hour < 17))
+
+    def next_open(self, at: datetime) -> datetime:
+        if self.is_open(at):
+            return at
+        local = at.astimezone(self.tz)
+        sunday = local.date() + timedelta(days=(SUN - local.weekday()) % 7)
+        return datetime.combine(sunday, time(17, 0), tzinfo=self.tz)
+
+    def last_close(self, at: datetime) -> Optional[datetime]:
+        if self.is_open(at):
+            return None
+        local = at.astimezone(self.tz)
+        friday = local.date() - timedelta(days=(local.weekday() - FRI) % 7)
+        return datetime.combine(friday, time(17, 0), tzinfo=self.tz)
+
+
+def _build_exchanges() -> Dict[str, Any]:
+    nyse_args = ("America/New_York", time(9, 30), time(16, 0), nyse_holidays, nyse_early_closes)
+    return {
+        "NYSE": ExchangeCalendar("NYSE", "New York Stock Exchange", *nyse_args),
+        "NASDAQ": ExchangeCalendar("NASDAQ", "Nasdaq", *nyse_args),
+        "NSE": ExchangeCalendar("NSE", "National Stock Exchange of India", "Asia/Kolkata",
+                                time(9, 15), time(15, 30), nse_holidays, special_sessions=NSE_SPECIAL_SESSIONS),
+        "BSE": ExchangeCalendar("BSE", "BSE", "Asia/Kolkata",
+                                time(9, 15), time(15, 30), nse_holidays, special_sessions=NSE_SPECIAL_SESSIONS),
+        "LSE": ExchangeCalendar("LSE", "London Stock Exchange", "Europe/London",
+                                time(8, 0), time(16, 30), lse_holidays, lse_early_closes),
+        "XETRA": ExchangeCalendar("XETRA", "Xetra", "Europe/Berlin", time(9, 0), time(17, 30), xetra_holidays),
+        "FRA": ExchangeCalendar("FRA", "Börse Frankfurt", "Europe/Berlin", time(8, 0), time(22, 0), xetra_holidays),
+        "EURONEXT": ExchangeCalendar("EURONEXT", "Euronext Paris", "Europe/Paris",
+                                     time(9, 0), time(17, 30), euronext_holidays, euronext_early_closes),
+        "BIT": ExchangeCalendar("BIT", "Borsa Italiana", "Europe/Rome", time(9, 0), time(17, 30), borsa_italiana_holidays),
+        "BME": ExchangeCalendar("BME", "Bolsa de Madrid", "Europe/Madrid",
+                                time(9, 0), time(17, 30), euronext_holidays, euronext_early_closes),
+        "SIX": ExchangeCalendar("SIX", "SIX Swiss Exchange", "Europe/Zurich", time(9, 0), time(17, 30), six_holidays),
+        "JPX": ExchangeCalendar("JPX", "Japan Exchange Group", "Asia/Tokyo", time(9, 0), time(15, 30), jpx_holidays),
+        "HKEX": ExchangeCalendar("HKEX", "Hong Kong Exchanges", "Asia/Hong_Kong",
+                                 time(9, 30), time(16, 0), hkex_holidays),
+        "ASX": ExchangeCalendar("ASX", "Australian Securities Exchange", "Australia/Sydney",
+                                time(10, 0), time(16, 0), asx_holidays),
+        "TSX": ExchangeCalendar("TSX", "Toronto Stock Exchange", "America/Toronto",
+                                time(9, 30), time(16, 0), tsx_holidays, tsx_early_closes),
+        "B3": ExchangeCalendar("B3", "B3", "America/Sao_Paulo", time(10, 0), time(17, 0), b3_holidays),
+        "BMV": ExchangeCalendar("BMV", "Bolsa Mexicana de Valores", "America/Mexico_City",
+                                time(8, 30), time(15, 0), bmv_holidays),
+        "KRX": ExchangeCalendar("KRX", "Korea Exchange", "Asia/Seoul", time(9, 0), time(15, 30), krx_holidays),
+        "TWSE": ExchangeCalendar("TWSE", "Taiwan Stock Exchange", "Asia/Taipei",
+                                 time(9, 0), time(13, 30), twse_holidays),
+        "IDX": ExchangeCalendar("IDX", "Indonesia Stock Exchange", "Asia/Jakarta",
+                                time(9, 0), time(16, 0), idx_holidays),
+        "CRYPTO": ContinuousCalendar("CRYPTO", "Cryptocurrency", weekend_close=False),
+        "FX": ContinuousCalendar("FX", "Foreign exchange", weekend_close=True),
+        "CME": ContinuousCalendar("CME", "CME Globex futures", weekend_close=True),
+    }
+
+
+# Index tickers mapped to the exchange whose session moves them
+INDEX_EXCHANGES = {
+    "^GSPC": "NYSE", "^DJI": "NYSE", "^IXIC": "NASDAQ", "^RUT": "NYSE", "^VIX": "NYSE",
+    "^NSEI": "NSE", "^NSEBANK": "NSE", "^CNXIT": "NSE", "^CNXFMCG": "NSE", "^BSESN": "BSE",
+    "^FTSE": "LSE", "^GDAXI": "XETRA", "^FCHI": "EURONEXT", "^N225": "JPX", "^HSI": "HKEX",
+    "^AXJO": "ASX", "^BVSP": "B3", "^MXX": "BMV", "^KS11": "KRX", "^TWII": "TWSE", "^JKSE": "IDX",
+}
+
+# Listing suffix of a yfinance ticker to its exchange (fxMatrix derives quote currencies from this)
+SUFFIX_EXCHANGES = {
+    ".NS": "NSE", ".BO": "BSE", ".L": "LSE", ".DE": "XETRA", ".F": "FRA", ".PA": "EURONEXT", ".AS": "EURONEXT",
+    ".BR": "EURONEXT", ".MI": "BIT", ".MC": "BME", ".SW": "SIX", ".T": "JPX", ".HK": "HKEX", ".AX": "ASX",
+    ".SA": "B3", ".MX": "BMV", ".KS": "KRX", ".KQ": "KRX", ".TW": "TWSE", ".JK": "IDX", ".TO": "TSX",
+}
+
+
+class TradingCalendar:
+    """Maps yfinance tickers to exchange calendars and answers when their data can change"""
+
+    def __init__(self):
+        self.exchanges = _build_exchanges()
+
+    def exchange_for_ticker(self, ticker: str) -> str:
+        """Exchange code for a raw yfinance ticker"""
+        if ticker in INDEX_EXCHANGES:
+            return INDEX_EXCHANGES[ticker]
+        _, dot, suffix = ticker.rpartition(".")
+        if dot and "." + suffix in SUFFIX_EXCHANGES:
+            return SUFFIX_EXCHANGES["." + suffix]
+        if ticker.endswith("-USD"):
+            return "CRYPTO"
+        if ticker.endswith("=X"):
+            return "FX"
+        if ticker.endswith("=F"):
+            return "CME"
+        return "NYSE"
+
+    def calendar_for(self, ticker: str) -> Any:
+        return self.exchanges[self.exchange_for_ticker(ticker)]
+
+    @staticmethod
+    def _now(now: Optional[datetime]) -> datetime:
+        return now if now is not None else datetime.now(timezone.utc)
+
+    def is_open(self, ticker: str, now: Optional[datetime] = None) -> bool:
+        return self.calendar_for(ticker).is_open(self._now(now))
+
+    def is_trading_day(self, ticker: str, day: date) -> bool:
+        """Whether a bar dated on this local date can be a real session"""
+        return self.calendar_for(ticker).is_trading_day(day)
+
+    def can_change_since(self, ticker: str, since: Optional[datetime], now: Optional[datetime] = None) -> bool:
+        """
+        Whether a quote fetched at `since` may be stale by `now`
+
+        True while the market is open, or when a session closed after the fetch
+        (so the final closing print has not been seen yet).
+        """
+        if since is None:
+            return True
+        now = self._now(now)
+        calendar = self.calendar_for(ticker)
+        if calendar.is_open(now):
+            return True
+        last_close = calendar.last_close(now)
+        return last_close is not None and last_close > since
+
+    def seconds_until_open(self, ticker: str, now: Optional[datetime] = None) -> float:
+        """Seconds until the ticker's market next opens (0 while open)"""
+        now = self._now(now)
+        return max(0.0, (self.calendar_for(ticker).next_open(now) - now).total_seconds())
+
+    def market_status(self, ticker: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Open/closed state of the ticker's market with the next open and last close"""
+        now = self._now(now)
+        calendar = self.calendar_for(ticker)
+        is_open = calendar.is_open(now)
+        last_close = calendar.last_close(now)
+
+        status = {
+            "ticker": ticker,
+            "exchange": calendar.code,
+            "exchangeName": calendar.name,
+            "marketState": "OPEN" if is_open else "CLOSED",
+            "nextOpen": calendar.next_open(now).isoformat(),
+            "lastClose": last_close.isoformat() if last_close else None,
+            "timestamp": now.isoformat()
+        }
+        if isinstance(calendar, ExchangeCalendar):
+            local_day = now.astimezone(calendar.tz).date()
+            status["holiday"] = calendar.holidays(local_day.year).get(local_day)
+            status["earlyClose"] = local_day in calendar.early_closes(local_day.year)
+        return status
+
+
+# Shared instance; holiday tables are cached per year on first use
+trading_calendar = TradingCalendar()